@@ -0,0 +1,143 @@
+"""
+Sustained like toggles per second on one viral post: a single counter item vs
+write-sharded like counters (src/api/utils/like_counters.py).
+
+DynamoDB serves roughly 1000 writes per second to any one item and throttles
+the rest. This drives like_counters.add_like against an in-memory table that
+enforces that per-item limit on a simulated clock, with `--offered` toggles
+per second arriving for one post:
+
+    single  - the counter pinned to one item (MAX_SHARDS = 1)
+    sharded - shards double on throttling, up to MAX_SHARDS
+
+and reports the toggles per second that actually land over the second half of
+the run, once sharding has settled. Runs locally with no AWS access (botocore
+must be importable):
+
+    python benchmarks/like_counters_load.py --offered 5000 --seconds 30
+"""
+import io
+import os
+import sys
+import types
+import random
+import argparse
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'api', 'utils'))
+import like_counters  # noqa: E402
+from token_bucket import TokenBucket  # noqa: E402
+from botocore.exceptions import ClientError  # noqa: E402
+
+
+POST_ID = 'viral-post'
+TICKS_PER_SECOND = 100
+DEFAULT_MAX_SHARDS = like_counters.MAX_SHARDS
+
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ThrottledTable:
+    """In-memory counters table allowing `item_rate` writes per second per item."""
+
+    def __init__(self, clock, item_rate):
+        self.clock = clock
+        self.item_rate = item_rate
+        self.items = {}
+        self.buckets = {}
+        self.applied = 0
+        self.throttled = 0
+
+    def _key(self, key):
+        return key['target_id'], int(key['shard'])
+
+    def _write(self, key):
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(self.item_rate, clock=self.clock)
+        if not bucket.try_consume():
+            self.throttled += 1
+            raise ClientError({'Error': {'Code': 'ThrottlingException', 'Message': 'Rate exceeded'}}, 'UpdateItem')
+
+    def get_item(self, Key, **kwargs):
+        item = self.items.get(self._key(Key))
+        return {'Item': dict(item)} if item else {}
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeValues, **kwargs):
+        key = self._key(Key)
+        self._write(key)
+        item = self.items.setdefault(key, {})
+        if UpdateExpression.startswith('ADD likes'):
+            item['likes'] = item.get('likes', 0) + ExpressionAttributeValues[':delta']
+            self.applied += 1
+        else:
+            grown = ExpressionAttributeValues[':grown']
+            if item.get('shards', 0) >= grown:
+                raise ClientError({'Error': {'Code': 'ConditionalCheckFailedException', 'Message': ''}}, 'UpdateItem')
+            item['shards'] = grown
+
+    def query(self, ExpressionAttributeValues, **kwargs):
+        target_id = ExpressionAttributeValues[':target_id']
+        return {'Items': [dict(item) for (item_target, _), item in self.items.items() if item_target == target_id]}
+
+
+def run(mode, offered, seconds, item_rate, rng):
+    clock = SimulatedClock()
+    table = ThrottledTable(clock, item_rate)
+    # Container caches expire on the simulated clock, as they would across real containers
+    like_counters.time = types.SimpleNamespace(monotonic=clock)
+    like_counters.random = rng
+    like_counters.MAX_SHARDS = 1 if mode == 'single' else DEFAULT_MAX_SHARDS
+    like_counters._shard_counts.clear()
+    like_counters._counts.clear()
+
+    per_tick = offered / TICKS_PER_SECOND
+    pending = 0.0
+    net_likes = 0
+    applied_at_half = 0
+    with redirect_stdout(io.StringIO()):  # add_like logs every write it gives up on
+        for tick in range(seconds * TICKS_PER_SECOND):
+            clock.now = tick / TICKS_PER_SECOND
+            if tick == seconds * TICKS_PER_SECOND // 2:
+                applied_at_half = table.applied
+            pending += per_tick
+            while pending >= 1:
+                pending -= 1
+                delta = 1 if rng.random() < 0.5 else -1
+                before = table.applied
+                like_counters.add_like(table, POST_ID, delta)
+                if table.applied > before:
+                    net_likes += delta
+
+    counted, shards = like_counters.sum_shards(table, POST_ID)
+    assert counted == net_likes, 'shard sum drifted from the writes that landed'
+    sustained = (table.applied - applied_at_half) / (seconds - seconds // 2)
+    return sustained, shards, table.throttled
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--offered', type=int, default=5000, help='toggles per second sent to one post')
+    parser.add_argument('--seconds', type=int, default=30, help='simulated run length')
+    parser.add_argument('--item-rate', type=int, default=1000, help='writes per second one item accepts')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    os.environ['LIKE_COUNTER_MODE'] = 'write'
+
+    print(f"{args.offered} toggles/s offered to one post for {args.seconds}s, "
+          f"{args.item_rate} writes/s per item")
+    print(f"{'mode':>8} {'sustained/s':>11} {'landed':>7} {'shards':>6} {'throttles':>9}")
+    for mode in ('single', 'sharded'):
+        sustained, shards, throttled = run(mode, args.offered, args.seconds, args.item_rate,
+                                           random.Random(args.seed))
+        print(f"{mode:>8} {sustained:>11.0f} {sustained / args.offered:>7.1%} {shards:>6} {throttled:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+False-positive rate of the per-user like filter against filter size.
+
+For each filter size (bits per expected like) a filter is filled with `likes`
+random target ids and probed with `probes` ids that were never added. Each
+false positive is a target the read handlers have to confirm with BatchGetItem,
+so the measured rate is the fraction of "not liked" targets that still cost a
+read. Runs locally with no AWS access:
+
+    python benchmarks/like_filter_false_positives.py --likes 256 --probes 100000
+"""
+import os
+import sys
+import time
+import uuid
+import random
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'api', 'utils'))
+from bloom_filter import (  # noqa: E402
+    BloomFilter,
+    optimal_num_hashes,
+    expected_false_positive_rate
+)
+
+
+BITS_PER_LIKE = (2, 4, 6, 8, 10, 12, 16, 20)
+
+
+def random_ids(count, rng):
+    return [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(count)]
+
+
+def measure(num_bits, num_hashes, liked, probes):
+    like_filter = BloomFilter(num_bits, num_hashes)
+    for target_id in liked:
+        like_filter.add(target_id)
+
+    start = time.perf_counter()
+    false_positives = sum(1 for target_id in probes if target_id in like_filter)
+    elapsed = time.perf_counter() - start
+    return false_positives / len(probes), elapsed / len(probes) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--likes', type=int, default=256, help='liked targets per filter')
+    parser.add_argument('--probes', type=int, default=100000, help='never-liked targets to test')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    liked = random_ids(args.likes, rng)
+    probes = random_ids(args.probes, rng)
+
+    print(f"{args.likes} likes per filter, {args.probes} never-liked probes")
+    print(f"{'bits/like':>9} {'bytes':>7} {'hashes':>6} {'expected':>9} {'measured':>9} {'us/check':>8}")
+    for bits_per_like in BITS_PER_LIKE:
+        num_bits = (bits_per_like * args.likes + 7) // 8 * 8
+        num_hashes = optimal_num_hashes(num_bits, args.likes)
+        rate, micros = measure(num_bits, num_hashes, liked, probes)
+        expected = expected_false_positive_rate(num_bits, num_hashes, args.likes)
+        print(f"{bits_per_like:>9} {num_bits // 8:>7} {num_hashes:>6} "
+              f"{expected:>9.4%} {rate:>9.4%} {micros:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Post detail read cost: legacy tables vs the single-table post aggregate.
+
+For a sample of posts held in both layouts, reads the full post detail (post,
+comments, and the likes on the post and on every comment) each way and reports
+requests, consumed read capacity and latency per post:
+
+    legacy    - GetItem on the posts table, a comments Query, then one likes
+                Query for the post and for each comment
+    aggregate - one paginated Query of the post's partition
+
+Needs AWS credentials (or --endpoint-url for DynamoDB Local) and a backfilled
+aggregate table (see migrations/post_aggregates.py):
+
+    python benchmarks/post_detail_layouts.py --sample 50 --repeat 3
+"""
+import time
+import argparse
+import statistics
+import boto3
+
+
+def timed_query(table, stats, **query_kwargs):
+    items = []
+    query_kwargs['ReturnConsumedCapacity'] = 'TOTAL'
+    while True:
+        response = table.query(**query_kwargs)
+        stats['requests'] += 1
+        stats['rcu'] += response['ConsumedCapacity']['CapacityUnits']
+        items.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return items
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def read_legacy(tables, post_id):
+    stats = {'requests': 1, 'rcu': 0.0}
+    response = tables['posts'].get_item(Key={'post_id': post_id}, ReturnConsumedCapacity='TOTAL')
+    stats['rcu'] += response['ConsumedCapacity']['CapacityUnits']
+    comments = timed_query(tables['comments'], stats,
+                           KeyConditionExpression='post_id = :post_id',
+                           ExpressionAttributeValues={':post_id': post_id})
+    for target_id in [post_id] + [comment['comment_id'] for comment in comments]:
+        timed_query(tables['likes'], stats,
+                    KeyConditionExpression='target_id = :target_id',
+                    ExpressionAttributeValues={':target_id': target_id})
+    return stats
+
+
+def read_aggregate(tables, post_id):
+    stats = {'requests': 0, 'rcu': 0.0}
+    timed_query(tables['aggregates'], stats,
+                KeyConditionExpression='post_id = :post_id',
+                ExpressionAttributeValues={':post_id': post_id})
+    return stats
+
+
+def sample_post_ids(tables, sample):
+    # Posts that made it into the aggregate, so both layouts are read for the same data
+    post_ids = []
+    scan_kwargs = {
+        'ProjectionExpression': 'post_id',
+        'FilterExpression': 'sk = :post',
+        'ExpressionAttributeValues': {':post': 'POST'}
+    }
+    while len(post_ids) < sample:
+        response = tables['aggregates'].scan(**scan_kwargs)
+        post_ids.extend(item['post_id'] for item in response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    return post_ids[:sample]
+
+
+def run(read, tables, post_ids, repeat):
+    latencies = []
+    requests = []
+    rcus = []
+    for _ in range(repeat):
+        for post_id in post_ids:
+            start = time.perf_counter()
+            stats = read(tables, post_id)
+            latencies.append((time.perf_counter() - start) * 1000)
+            requests.append(stats['requests'])
+            rcus.append(stats['rcu'])
+    return latencies, requests, rcus
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--posts-table', default='politicnz-posts')
+    parser.add_argument('--comments-table', default='politicnz-post-comments')
+    parser.add_argument('--likes-table', default='politicnz-post-likes')
+    parser.add_argument('--aggregates-table', default='politicnz-post-aggregates')
+    parser.add_argument('--sample', type=int, default=50, help='posts to read')
+    parser.add_argument('--repeat', type=int, default=3, help='passes over the sample')
+    parser.add_argument('--region')
+    parser.add_argument('--endpoint-url')
+    args = parser.parse_args()
+
+    dynamodb = boto3.resource('dynamodb', region_name=args.region, endpoint_url=args.endpoint_url)
+    tables = {
+        'posts': dynamodb.Table(args.posts_table),
+        'comments': dynamodb.Table(args.comments_table),
+        'likes': dynamodb.Table(args.likes_table),
+        'aggregates': dynamodb.Table(args.aggregates_table)
+    }
+    post_ids = sample_post_ids(tables, args.sample)
+    if not post_ids:
+        raise SystemExit('No posts in the aggregate table - run the backfill first')
+
+    print(f"{len(post_ids)} posts x {args.repeat} passes")
+    print(f"{'layout':>9} {'requests':>8} {'RCU':>7} {'p50 ms':>7} {'p95 ms':>7} {'mean ms':>7}")
+    for name, read in (('legacy', read_legacy), ('aggregate', read_aggregate)):
+        latencies, requests, rcus = run(read, tables, post_ids, args.repeat)
+        print(f"{name:>9} {statistics.mean(requests):>8.1f} {statistics.mean(rcus):>7.2f} "
+              f"{percentile(latencies, 0.5):>7.1f} {percentile(latencies, 0.95):>7.1f} "
+              f"{statistics.mean(latencies):>7.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Response size and encode cost: plain JSON rows vs the columnar format.
+
+Builds synthetic feed pages shaped like GET /posts (post fields, counts,
+liked_by_user and up to three latest_comments) drawn from a pool of authors,
+then for each page size reports the body in both formats:
+
+    bytes   - serialized body, and gzip-compressed as API Gateway would send it
+              when compression is enabled
+    encode  - time to produce the body string (columnar includes the rewrite)
+    decode  - time to json.loads plus, for columnar, decode back to rows
+
+Fewer distinct authors means more repetition for the dictionary to remove.
+Runs locally with no AWS access:
+
+    python benchmarks/response_formats.py --authors 40 --repeat 200
+"""
+import os
+import sys
+import gzip
+import json
+import time
+import uuid
+import random
+import argparse
+import statistics
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'api', 'utils'))
+from columnar import encode_columnar, decode_columnar  # noqa: E402
+
+
+PAGE_SIZES = (10, 50, 100)
+WORDS = ('policy', 'government', 'election', 'budget', 'tax', 'housing', 'health', 'vote',
+         'council', 'minister', 'support', 'oppose', 'coalition', 'debate', 'change', 'local')
+
+
+def random_text(rng, max_words):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, max_words)))
+
+
+def make_feed(count, authors, rng):
+    start = datetime(2026, 10, 1)
+    posts = []
+    for index in range(count):
+        user_id, display_name = rng.choice(authors)
+        created_at = (start + timedelta(minutes=17 * index)).isoformat()
+        post = {
+            'post_id': str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            'user_id': user_id,
+            'display_name': display_name,
+            'content': random_text(rng, 40),
+            'created_at': created_at,
+            'updated_at': created_at,
+            'like_count': rng.randint(0, 50),
+            'liked_by_user': rng.random() < 0.2,
+            'comment_count': rng.randint(0, 12)
+        }
+        comments = []
+        for _ in range(min(post['comment_count'], 3)):
+            commenter_id, commenter_name = rng.choice(authors)
+            comments.append({
+                'comment_id': str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                'user_id': commenter_id,
+                'display_name': commenter_name,
+                'content': random_text(rng, 15),
+                'created_at': created_at
+            })
+        if comments:
+            post['latest_comments'] = comments
+        posts.append(post)
+    return {'posts': posts, 'next_cursor': None}
+
+
+def median_us(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e6
+
+
+def measure(body, repeat):
+    row_text = json.dumps(body)
+    columnar_text = json.dumps(encode_columnar(body))
+    assert decode_columnar(json.loads(columnar_text)) == body
+    return {
+        'row': {
+            'bytes': len(row_text.encode('utf-8')),
+            'gzip': len(gzip.compress(row_text.encode('utf-8'))),
+            'encode_us': median_us(lambda: json.dumps(body), repeat),
+            'decode_us': median_us(lambda: json.loads(row_text), repeat)
+        },
+        'columnar': {
+            'bytes': len(columnar_text.encode('utf-8')),
+            'gzip': len(gzip.compress(columnar_text.encode('utf-8'))),
+            'encode_us': median_us(lambda: json.dumps(encode_columnar(body)), repeat),
+            'decode_us': median_us(lambda: decode_columnar(json.loads(columnar_text)), repeat)
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--authors', type=int, default=40, help='distinct authors across the feed')
+    parser.add_argument('--repeat', type=int, default=200, help='timing repetitions per measurement')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    authors = [(str(uuid.UUID(int=rng.getrandbits(128), version=4)), f'{rng.choice(WORDS).title()} Voter {index}')
+               for index in range(args.authors)]
+
+    print(f"{'posts':>5}  {'format':<8}  {'bytes':>8}  {'gzip':>7}  {'encode us':>10}  {'decode us':>10}")
+    for count in PAGE_SIZES:
+        result = measure(make_feed(count, authors, rng), args.repeat)
+        for name in ('row', 'columnar'):
+            stats = result[name]
+            print(f"{count:>5}  {name:<8}  {stats['bytes']:>8}  {stats['gzip']:>7}  "
+                  f"{stats['encode_us']:>10.0f}  {stats['decode_us']:>10.0f}")
+        saved = 1 - result['columnar']['bytes'] / result['row']['bytes']
+        saved_gzip = 1 - result['columnar']['gzip'] / result['row']['gzip']
+        print(f"{'':>5}  columnar saves {saved:.0%} raw, {saved_gzip:.0%} gzipped")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+Streaming export of the app's tables to gzip JSONL, for analytics and poll
+reporting.
+
+Each table is read with a parallel scan; every segment runs in a worker
+process that writes items to gzip files as each page arrives, so memory stays
+at roughly one scan page per worker however large the table is. Files rotate
+once they reach --max-file-mb of compressed output:
+    {output_dir}/{table}/segment-{segment:03d}-part-{part:04d}.jsonl.gz
+
+Items are read with the low-level client and converted straight from
+DynamoDB's wire format to JSON types (numbers become int or float, binary
+becomes base64) instead of going through boto3's Decimal-based deserializer.
+
+Run from src/api with the table env vars set, e.g.
+    python -m exports.export_tables --output-dir ./export --segments 4
+    python -m exports.export_tables posts poll_votes --max-read-units 200
+"""
+import os
+import sys
+import json
+import gzip
+import time
+import base64
+import argparse
+import multiprocessing
+
+
+EXPORT_TABLES = {
+    'posts': 'POSTS_TABLE_NAME',
+    'comments': 'COMMENTS_TABLE_NAME',
+    'likes': 'LIKES_TABLE_NAME',
+    'profiles': 'PROFILES_TABLE_NAME',
+    'polls': 'POLLS_TABLE_NAME',
+    'poll_votes': 'POLL_VOTES_TABLE_NAME'
+}
+DEFAULT_MAX_FILE_MB = 64
+PAGE_SIZE = 1000
+
+
+#####################################################################
+# WIRE FORMAT TO JSON
+#####################################################################
+
+def _number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+_CONVERTERS = {
+    'S': lambda value: value,
+    'N': _number,
+    'BOOL': lambda value: value,
+    'NULL': lambda value: None,
+    'B': lambda value: base64.b64encode(value).decode('ascii'),
+    'SS': lambda values: values,
+    'NS': lambda values: [_number(value) for value in values],
+    'BS': lambda values: [base64.b64encode(value).decode('ascii') for value in values],
+    'M': lambda value: plain_item(value),
+    'L': lambda values: [plain_value(value) for value in values]
+}
+
+
+def plain_value(attribute):
+    (kind, value), = attribute.items()
+    return _CONVERTERS[kind](value)
+
+
+def plain_item(item):
+    return {name: plain_value(attribute) for name, attribute in item.items()}
+
+
+#####################################################################
+# ROTATING GZIP WRITER
+#####################################################################
+
+class RotatingJsonlWriter:
+    """Writes JSON lines to gzip files, starting a new part past max_bytes compressed."""
+
+    def __init__(self, directory, prefix, max_bytes):
+        self._directory = directory
+        self._prefix = prefix
+        self._max_bytes = max_bytes
+        self._part = 0
+        self._raw = None
+        self._gzip = None
+        self.files = []
+        self.bytes_written = 0
+
+    def _open(self):
+        path = os.path.join(self._directory, f'{self._prefix}-part-{self._part:04d}.jsonl.gz')
+        self._raw = open(path, 'wb')
+        self._gzip = gzip.GzipFile(fileobj=self._raw, mode='wb', compresslevel=6)
+        self.files.append(path)
+        self._part += 1
+
+    def write(self, record):
+        if self._gzip is None:
+            self._open()
+        self._gzip.write(json.dumps(record, separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
+        self._gzip.write(b'\n')
+        # tell() only sees what zlib has flushed so far, so parts overshoot by
+        # up to one compressor buffer
+        if self._raw.tell() >= self._max_bytes:
+            self._close_part()
+
+    def _close_part(self):
+        self._gzip.close()
+        self.bytes_written += self._raw.tell()
+        self._raw.close()
+        self._gzip = None
+        self._raw = None
+
+    def close(self):
+        if self._gzip is not None:
+            self._close_part()
+
+
+#####################################################################
+# WORKERS
+#####################################################################
+
+def consumed_units(response):
+    return response.get('ConsumedCapacity', {}).get('CapacityUnits', 0)
+
+
+def export_segment(task):
+    """Scan one segment into rotating gzip files. Returns (table, items, compressed bytes)."""
+    table_key, table_name, segment, total_segments, directory, max_bytes, read_rate = task
+    import boto3
+    from utils.token_bucket import TokenBucket
+
+    client = boto3.client('dynamodb')
+    bucket = TokenBucket(read_rate) if read_rate else None
+    writer = RotatingJsonlWriter(directory, f'segment-{segment:03d}', max_bytes)
+    scan_kwargs = {
+        'TableName': table_name,
+        'Segment': segment,
+        'TotalSegments': total_segments,
+        'Limit': PAGE_SIZE,
+        'ReturnConsumedCapacity': 'TOTAL'
+    }
+    items = 0
+    try:
+        while True:
+            if bucket:
+                bucket.wait()
+            response = client.scan(**scan_kwargs)
+            if bucket:
+                bucket.charge(consumed_units(response))
+            for item in response.get('Items', []):
+                writer.write(plain_item(item))
+            items += len(response.get('Items', []))
+            if 'LastEvaluatedKey' not in response:
+                break
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    finally:
+        writer.close()
+    return table_key, items, writer.bytes_written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export tables to gzip JSONL')
+    parser.add_argument('tables', nargs='*', choices=sorted(EXPORT_TABLES), metavar='table',
+                        help=f'tables to export (default: all of {", ".join(EXPORT_TABLES)})')
+    parser.add_argument('--output-dir', default='export')
+    parser.add_argument('--segments', type=int, default=4, help='parallel scan segments per table')
+    parser.add_argument('--workers', type=int, default=4, help='worker processes')
+    parser.add_argument('--max-file-mb', type=float, default=DEFAULT_MAX_FILE_MB, help='rotate files at this compressed size')
+    parser.add_argument('--max-read-units', type=float, default=0,
+                        help='read capacity units per second per table, split across segments (0 = unlimited)')
+    args = parser.parse_args(argv)
+
+    tasks = []
+    for table_key in args.tables or list(EXPORT_TABLES):
+        directory = os.path.join(args.output_dir, table_key)
+        os.makedirs(directory, exist_ok=True)
+        table_name = os.environ[EXPORT_TABLES[table_key]]
+        read_rate = args.max_read_units / args.segments if args.max_read_units else 0
+        tasks.extend((table_key, table_name, segment, args.segments, directory,
+                      int(args.max_file_mb * 1024 * 1024), read_rate)
+                     for segment in range(args.segments))
+
+    started = time.monotonic()
+    totals = {}
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(processes=args.workers) as pool:
+        for table_key, items, compressed in pool.imap_unordered(export_segment, tasks):
+            table_items, table_bytes = totals.get(table_key, (0, 0))
+            totals[table_key] = (table_items + items, table_bytes + compressed)
+    elapsed = time.monotonic() - started
+
+    for table_key, (items, compressed) in sorted(totals.items()):
+        print(f"{table_key:>12}: {items} items, {compressed / 1024 / 1024:.1f} MB compressed")
+    total_items = sum(items for items, _ in totals.values())
+    print(f"Exported {total_items} items in {elapsed:.1f}s ({total_items / elapsed if elapsed else 0:.0f} items/s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""
+Seed ARCHIVE_TOTALS_TABLE_NAME (utils/profile_counters.py) from the segments
+archived before archive_posts kept the totals itself. Unlike the other modules
+here this is not a runner migration - its source is the archive bucket, not a
+table - so it runs on its own:
+
+    python -m migrations.archive_totals
+
+Every segment is read once and each user's totals are overwritten, so a rerun
+is harmless. Disable the archive_posts schedule while it runs: a segment
+finished in the meantime would be overwritten by the recount.
+"""
+from utils.helpers import get_table, batch_get_items
+from utils.archive_store import SEGMENT_PREFIX, get_archive_store, read_segment
+from utils.profile_counters import ARCHIVED_COUNTER_FIELDS, archived_totals
+
+posts_table = get_table('POSTS_TABLE_NAME')
+archive_totals_table = get_table('ARCHIVE_TOTALS_TABLE_NAME')
+
+
+def archived_records(store):
+    # Every archived record once; segments written before archiving was made
+    # crash-safe can repeat a post or hold one that was edited and stayed live
+    seen = set()
+    for key in store.list(f'{SEGMENT_PREFIX}/'):
+        records = [record for record in read_segment(store, key) if record['post']['post_id'] not in seen]
+        live = batch_get_items(posts_table, [{'post_id': record['post']['post_id']} for record in records],
+                               projection_expression='post_id, archived')
+        live_ids = {post['post_id'] for post in live if not post.get('archived')}
+        for record in records:
+            seen.add(record['post']['post_id'])
+            if record['post']['post_id'] not in live_ids:
+                yield record
+
+
+def main():
+    totals = archived_totals(archived_records(get_archive_store()))
+    with archive_totals_table.batch_writer() as batch:
+        for user_id, counts in totals.items():
+            batch.put_item(Item={'user_id': user_id, **{field: counts[field] for field in ARCHIVED_COUNTER_FIELDS}})
+    print(f"Wrote archived totals for {len(totals)} users")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""
+Reserve the display names of profiles created before DISPLAY_NAMES_TABLE_NAME
+existed. Names that are already reserved are left alone, so live reservations
+win. Where older profiles share a name, one of them ends up holding the
+reservation; the others keep their name until they next rename.
+
+Each reservation is a conditional put straight to the table rather than a
+batched ctx.put, so one that create_profile or update_profile commits while
+the migration runs is never overwritten. Those writes bypass the runner's
+write pacing - there is at most one per profile.
+
+    python -m migrations.runner display_name_reservations
+"""
+from botocore.exceptions import ClientError
+from utils.helpers import get_table
+from utils.display_names import normalize_display_name
+
+SOURCE_TABLE = 'PROFILES_TABLE_NAME'
+SCAN_KWARGS = {'ProjectionExpression': 'user_id, display_name, created_at'}
+
+display_names_table = get_table('DISPLAY_NAMES_TABLE_NAME')
+
+
+def process(profile, ctx):
+    display_name = profile.get('display_name')
+    if not display_name:
+        return
+    name_key = normalize_display_name(display_name)
+    try:
+        display_names_table.put_item(
+            Item={
+                'name_key': name_key,
+                'user_id': profile['user_id'],
+                'display_name': display_name,
+                'reserved_at': profile.get('created_at', '')
+            },
+            ConditionExpression='attribute_not_exists(name_key)'
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        # Already reserved - by a live profile, or by this profile on an earlier run
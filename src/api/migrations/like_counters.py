@@ -0,0 +1,29 @@
+"""
+Seed the sharded like counters (utils/like_counters.py) of existing posts and
+repair counters that have drifted from the likes table. Run once
+LIKE_COUNTER_MODE is write for the API; a second run that repairs nothing
+confirms the counters are ready for reads.
+
+Live likes keep landing on random shards while this runs, so a drifted counter
+is corrected with one ADD of the difference to shard 0 rather than a put. That
+update goes straight to the table, outside the runner's write pacing - there
+is at most one per post. A like racing the two reads can leave a counter off
+by one, which the next run repairs.
+
+    python -m migrations.runner like_counters
+"""
+from utils.helpers import get_table
+from utils.like_counters import repair_like_counter
+
+SOURCE_TABLE = 'POSTS_TABLE_NAME'
+SCAN_KWARGS = {'ProjectionExpression': 'post_id, archived'}
+
+likes_table = get_table('LIKES_TABLE_NAME')
+like_counters_table = get_table('LIKE_COUNTERS_TABLE_NAME')
+
+
+def process(post, ctx):
+    if post.get('archived'):
+        return
+    # Reads are metered; the one corrective update passes straight through
+    repair_like_counter(ctx.metered(likes_table), ctx.metered(like_counters_table), post['post_id'])
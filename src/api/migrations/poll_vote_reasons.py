@@ -0,0 +1,19 @@
+"""
+Add reason_key to votes cast with a reason before ReasonsIndex existed, so
+they show up in GET /polls/{poll_id}/reasons. Votes are never edited, so
+rewriting the scanned item is safe; a re-run skips votes already keyed.
+
+    python -m migrations.runner poll_vote_reasons
+"""
+from utils.helpers import get_table
+from utils.polls import reason_key
+
+SOURCE_TABLE = 'POLL_VOTES_TABLE_NAME'
+
+poll_votes_table = get_table('POLL_VOTES_TABLE_NAME')
+
+
+def process(vote, ctx):
+    if not vote.get('reason') or vote.get('reason_key'):
+        return
+    ctx.put(poll_votes_table, dict(vote, reason_key=reason_key(vote['poll_id'], vote['answer'])))
@@ -0,0 +1,27 @@
+"""
+Copy live posts, with their comments and likes, into the single-table post
+aggregate (utils/post_aggregate.py) and repair partitions that have drifted.
+Run once POST_AGGREGATE_MODE is dual_write for the API; a second run that
+writes nothing confirms the aggregate is ready for reads.
+
+    python -m migrations.runner post_aggregates
+"""
+from utils.helpers import get_table
+from utils.post_aggregate import read_legacy_post, plan_post_aggregate_sync
+
+SOURCE_TABLE = 'POSTS_TABLE_NAME'
+
+comments_table = get_table('COMMENTS_TABLE_NAME')
+likes_table = get_table('LIKES_TABLE_NAME')
+aggregates_table = get_table('POST_AGGREGATES_TABLE_NAME')
+
+
+def process(post, ctx):
+    if post.get('archived'):
+        return
+    comments, likes = read_legacy_post(ctx.metered(comments_table), ctx.metered(likes_table), post['post_id'])
+    puts, deletes = plan_post_aggregate_sync(ctx.metered(aggregates_table), post, comments, likes)
+    for item in puts:
+        ctx.put(aggregates_table, item)
+    for key in deletes:
+        ctx.delete(aggregates_table, key)
@@ -0,0 +1,298 @@
+"""
+Resumable, rate-limited migration runner for backfills over existing tables.
+
+The source table is read with a parallel scan (Segment/TotalSegments) spread
+over worker processes. After each scanned page has been processed and its
+writes flushed, the segment's LastEvaluatedKey is checkpointed in
+MIGRATIONS_TABLE_NAME, so a stopped run picks up where it left off. Reads and
+writes are paced by token buckets on *consumed* capacity units, split evenly
+between workers, so a migration can run against production without starving
+live traffic of on-demand throughput. Writes go out through chunked
+BatchWriteItem calls with UnprocessedItems retried.
+
+A migration is a module in this package defining:
+    SOURCE_TABLE       - env var naming the table to scan
+    SCAN_KWARGS        - optional extra scan arguments (projection, filter)
+    process(item, ctx) - called for every scanned item; writes with ctx.put and
+                         ctx.delete, and reads other tables through
+                         ctx.metered(table) so those reads are paced too
+The page in flight when a run stops is scanned again on resume, so process
+must be idempotent.
+
+Run from src/api with the migration's table env vars set, e.g.
+    python -m migrations.runner post_aggregates --segments 8 --workers 4 \\
+        --max-read-units 200 --max-write-units 100
+Add --restart to discard the checkpoints and start over.
+"""
+import sys
+import time
+import argparse
+import importlib
+import multiprocessing
+from datetime import datetime
+
+
+BATCH_WRITE_LIMIT = 25
+MAX_WRITE_ATTEMPTS = 8
+DEFAULT_PAGE_SIZE = 100
+
+
+#####################################################################
+# METERED READS AND BATCHED WRITES
+#####################################################################
+
+def consumed_units(response):
+    capacity = response.get('ConsumedCapacity') or []
+    if isinstance(capacity, dict):
+        capacity = [capacity]
+    return sum(entry.get('CapacityUnits', 0) for entry in capacity)
+
+
+class MeteredTable:
+    """Table proxy whose reads wait on, and are charged to, a read bucket."""
+
+    def __init__(self, table, bucket):
+        self._table = table
+        self._bucket = bucket
+
+    def _read(self, operation, kwargs):
+        self._bucket.wait()
+        response = operation(ReturnConsumedCapacity='TOTAL', **kwargs)
+        self._bucket.charge(consumed_units(response))
+        return response
+
+    def query(self, **kwargs):
+        return self._read(self._table.query, kwargs)
+
+    def scan(self, **kwargs):
+        return self._read(self._table.scan, kwargs)
+
+    def get_item(self, **kwargs):
+        return self._read(self._table.get_item, kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._table, name)
+
+
+class BatchWriter:
+    """
+    Buffers puts and deletes and sends them as BatchWriteItem calls of up to
+    25 requests. A later request for the same key replaces an earlier one,
+    since a batch may not name a key twice.
+    """
+
+    def __init__(self, dynamodb, bucket):
+        self._dynamodb = dynamodb
+        self._bucket = bucket
+        self._key_names = {}
+        self._pending = {}
+        self.written = 0
+
+    def _key(self, table, item):
+        if table.name not in self._key_names:
+            self._key_names[table.name] = [key['AttributeName'] for key in table.key_schema]
+        return (table.name,) + tuple(item[name] for name in self._key_names[table.name])
+
+    def put(self, table, item):
+        self._pending[self._key(table, item)] = (table.name, {'PutRequest': {'Item': item}})
+        if len(self._pending) >= BATCH_WRITE_LIMIT:
+            self.flush()
+
+    def delete(self, table, key):
+        self._pending[self._key(table, key)] = (table.name, {'DeleteRequest': {'Key': key}})
+        if len(self._pending) >= BATCH_WRITE_LIMIT:
+            self.flush()
+
+    def flush(self):
+        requests = list(self._pending.values())
+        self._pending = {}
+        for start in range(0, len(requests), BATCH_WRITE_LIMIT):
+            request_items = {}
+            for table_name, request in requests[start:start + BATCH_WRITE_LIMIT]:
+                request_items.setdefault(table_name, []).append(request)
+            self._send(request_items)
+
+    def _send(self, request_items):
+        attempt = 0
+        while request_items:
+            self._bucket.wait()
+            response = self._dynamodb.batch_write_item(RequestItems=request_items, ReturnConsumedCapacity='TOTAL')
+            self._bucket.charge(consumed_units(response))
+            unprocessed = response.get('UnprocessedItems') or {}
+            self.written += sum(len(batch) for batch in request_items.values()) - \
+                sum(len(batch) for batch in unprocessed.values())
+            request_items = unprocessed
+            if request_items:
+                attempt += 1
+                if attempt >= MAX_WRITE_ATTEMPTS:
+                    raise RuntimeError('BatchWriteItem left unprocessed items after retries')
+                time.sleep(min(0.05 * (2 ** attempt), 5.0))
+
+
+class MigrationContext:
+    def __init__(self, writer, read_bucket):
+        self._writer = writer
+        self._read_bucket = read_bucket
+
+    def put(self, table, item):
+        self._writer.put(table, item)
+
+    def delete(self, table, key):
+        self._writer.delete(table, key)
+
+    def metered(self, table):
+        return MeteredTable(table, self._read_bucket)
+
+
+#####################################################################
+# CHECKPOINTS
+#####################################################################
+
+def load_checkpoints(checkpoints_table, migration_id):
+    checkpoints = {}
+    query_kwargs = {
+        'KeyConditionExpression': 'migration_id = :migration_id',
+        'ExpressionAttributeValues': {':migration_id': migration_id},
+        'ConsistentRead': True
+    }
+    while True:
+        response = checkpoints_table.query(**query_kwargs)
+        for item in response.get('Items', []):
+            checkpoints[int(item['segment'])] = item
+        if 'LastEvaluatedKey' not in response:
+            return checkpoints
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def save_checkpoint(checkpoints_table, migration_id, segment, total_segments, last_key, scanned, written):
+    item = {
+        'migration_id': migration_id,
+        'segment': segment,
+        'total_segments': total_segments,
+        'done': last_key is None,
+        'scanned': scanned,
+        'written': written,
+        'updated_at': datetime.utcnow().isoformat()
+    }
+    if last_key is not None:
+        item['last_evaluated_key'] = last_key
+    checkpoints_table.put_item(Item=item)
+
+
+def clear_checkpoints(checkpoints_table, migration_id):
+    with checkpoints_table.batch_writer() as batch:
+        for segment in load_checkpoints(checkpoints_table, migration_id):
+            batch.delete_item(Key={'migration_id': migration_id, 'segment': segment})
+
+
+#####################################################################
+# WORKERS
+#####################################################################
+
+def run_segment(migration, source, ctx, writer, checkpoints_table, migration_id,
+                segment, total_segments, page_size, checkpoint):
+    scan_kwargs = dict(getattr(migration, 'SCAN_KWARGS', {}), Segment=segment,
+                       TotalSegments=total_segments, Limit=page_size)
+    scanned = int(checkpoint.get('scanned', 0))
+    written = int(checkpoint.get('written', 0))
+    if checkpoint.get('last_evaluated_key'):
+        scan_kwargs['ExclusiveStartKey'] = checkpoint['last_evaluated_key']
+
+    while True:
+        response = source.scan(**scan_kwargs)
+        before = writer.written
+        for item in response.get('Items', []):
+            migration.process(item, ctx)
+        # Writes for the page are durable before the checkpoint moves past it
+        writer.flush()
+        scanned += len(response.get('Items', []))
+        written += writer.written - before
+
+        last_key = response.get('LastEvaluatedKey')
+        save_checkpoint(checkpoints_table, migration_id, segment, total_segments, last_key, scanned, written)
+        if last_key is None:
+            return scanned, written
+        scan_kwargs['ExclusiveStartKey'] = last_key
+
+
+def worker_main(name, migration_id, segments, total_segments, page_size, read_rate, write_rate):
+    # Each worker is a fresh (spawned) process with its own boto3 session
+    from utils.helpers import dynamodb, get_table
+    from utils.token_bucket import TokenBucket
+
+    migration = importlib.import_module(f'migrations.{name}')
+    checkpoints_table = get_table('MIGRATIONS_TABLE_NAME')
+    read_bucket = TokenBucket(read_rate)
+    writer = BatchWriter(dynamodb, TokenBucket(write_rate))
+    ctx = MigrationContext(writer, read_bucket)
+    source = ctx.metered(get_table(migration.SOURCE_TABLE))
+
+    checkpoints = load_checkpoints(checkpoints_table, migration_id)
+    for segment in segments:
+        checkpoint = checkpoints.get(segment, {})
+        if checkpoint.get('done'):
+            continue
+        started = time.monotonic()
+        scanned, written = run_segment(migration, source, ctx, writer, checkpoints_table, migration_id,
+                                       segment, total_segments, page_size, checkpoint)
+        print(f"[{migration_id}] segment {segment}/{total_segments} done: "
+              f"{scanned} scanned, {written} written ({time.monotonic() - started:.1f}s this run)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run a resumable, rate-limited table migration')
+    parser.add_argument('migration', help='module name in src/api/migrations')
+    parser.add_argument('--run-id', help='checkpoint namespace (default: the migration name)')
+    parser.add_argument('--segments', type=int, default=8, help='parallel scan TotalSegments')
+    parser.add_argument('--workers', type=int, default=4, help='worker processes')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help='items per scan page')
+    parser.add_argument('--max-read-units', type=float, default=100, help='read capacity units per second, all workers')
+    parser.add_argument('--max-write-units', type=float, default=50, help='write capacity units per second, all workers')
+    parser.add_argument('--restart', action='store_true', help='discard checkpoints and start over')
+    args = parser.parse_args(argv)
+
+    from utils.helpers import get_table
+
+    importlib.import_module(f'migrations.{args.migration}')  # fail fast on a bad name
+    migration_id = args.run_id or args.migration
+    checkpoints_table = get_table('MIGRATIONS_TABLE_NAME')
+    if args.restart:
+        clear_checkpoints(checkpoints_table, migration_id)
+
+    checkpoints = load_checkpoints(checkpoints_table, migration_id)
+    previous_segments = {int(checkpoint['total_segments']) for checkpoint in checkpoints.values()}
+    if previous_segments and previous_segments != {args.segments}:
+        parser.error(f'{migration_id} was started with --segments {previous_segments.pop()}; '
+                     'resume with that value or pass --restart')
+
+    workers = max(1, min(args.workers, args.segments))
+    assignments = [list(range(worker, args.segments, workers)) for worker in range(workers)]
+    context = multiprocessing.get_context('spawn')
+    processes = [
+        context.Process(target=worker_main, args=(
+            args.migration, migration_id, segments, args.segments, args.page_size,
+            args.max_read_units / workers, args.max_write_units / workers
+        ))
+        for segments in assignments
+    ]
+    started = time.monotonic()
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    checkpoints = load_checkpoints(checkpoints_table, migration_id)
+    done = sum(1 for checkpoint in checkpoints.values() if checkpoint.get('done'))
+    scanned = sum(int(checkpoint.get('scanned', 0)) for checkpoint in checkpoints.values())
+    written = sum(int(checkpoint.get('written', 0)) for checkpoint in checkpoints.values())
+    print(f"[{migration_id}] {done}/{args.segments} segments done, {scanned} items scanned, "
+          f"{written} written, {time.monotonic() - started:.1f}s")
+    failed = [process for process in processes if process.exitcode != 0]
+    if failed or done < args.segments:
+        print(f"[{migration_id}] incomplete - rerun the same command to resume")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+from utils.response_builder import (
+    success_response,
+    error_response,
+    not_found_response,
+    error_handler
+)
+from utils.helpers import (
+    get_user_id_from_event,
+    get_table,
+    get_query_param,
+    get_path_param,
+    encode_cursor,
+    decode_cursor
+)
+from utils.validators import validate_poll_answer
+from utils.polls import REASONS_INDEX, get_poll, reason_key
+
+polls_table = get_table('POLLS_TABLE_NAME')
+poll_votes_table = get_table('POLL_VOTES_TABLE_NAME')
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 50
+
+@error_handler
+def lambda_handler(event, context):
+    """
+    GET /polls/{poll_id}/reasons?answer={answer}&limit={n}&cursor={cursor} - Reasons
+    voters gave for one answer, newest first, as {'reasons': [...], 'next_cursor': ...}
+    """
+    # Extract user_id from Cognito authorizer claims
+    user_id = get_user_id_from_event(event)
+
+    # Get poll_id
+    poll_id = get_path_param(event, 'poll_id')
+
+    # The answer must be one the poll offers
+    poll = get_poll(polls_table, poll_id)
+    if poll is None:
+        return not_found_response('Poll not found')
+    answer = get_query_param(event, 'answer', '')
+    is_valid, error_msg = validate_poll_answer(answer, poll.get('options', []))
+    if not is_valid:
+        return error_response(error_msg)
+
+    try:
+        limit = int(get_query_param(event, 'limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        limit = DEFAULT_PAGE_SIZE
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    # Reasons reveal how people voted, so the same rule as results applies
+    user_vote_response = poll_votes_table.get_item(
+        Key={
+            'poll_id': poll_id,
+            'user_id': user_id
+        }
+    )
+    if 'Item' not in user_vote_response:
+        return error_response('You must vote before viewing results', 403)
+
+    # Only votes with a reason are in the sparse index, newest first
+    query_kwargs = {
+        'IndexName': REASONS_INDEX,
+        'KeyConditionExpression': 'reason_key = :reason_key',
+        'ExpressionAttributeValues': {
+            ':reason_key': reason_key(poll_id, answer)
+        },
+        'ProjectionExpression': 'user_id, display_name, answer, reason, voted_at',
+        'ScanIndexForward': False,
+        'Limit': limit
+    }
+    raw_cursor = get_query_param(event, 'cursor')
+    cursor = decode_cursor(raw_cursor, ('poll_id', 'user_id', 'reason_key', 'voted_at'))
+    if raw_cursor and (cursor is None or cursor['reason_key'] != reason_key(poll_id, answer)):
+        return error_response('Invalid cursor')
+    if cursor:
+        query_kwargs['ExclusiveStartKey'] = cursor
+    response = poll_votes_table.query(**query_kwargs)
+
+    return success_response({
+        'reasons': response.get('Items', []),
+        'next_cursor': encode_cursor(response.get('LastEvaluatedKey'))
+    })
@@ -8,12 +8,19 @@ from utils.helpers import (
     get_table,
     get_path_param
 )
+from utils.polls import get_poll
+from utils.poll_tallies import build_results
 
 polls_table = get_table('POLLS_TABLE_NAME')
 poll_votes_table = get_table('POLL_VOTES_TABLE_NAME')
+poll_tallies_table = get_table('POLL_TALLIES_TABLE_NAME')
 
 @error_handler
 def lambda_handler(event, context):
+    """
+    GET /polls/{poll_id}/results - Vote counts and percentages per answer,
+    overall and broken down by voters' political_alignment
+    """
     # Extract user_id from Cognito authorizer claims
     user_id = get_user_id_from_event(event)
     
@@ -30,32 +37,11 @@ def lambda_handler(event, context):
     if 'Item' not in user_vote_response:
         return error_response('You must vote before viewing results', 403)
     
-    # Query all votes for this poll
-    votes_response = poll_votes_table.query(
-        KeyConditionExpression='poll_id = :poll_id',
-        ExpressionAttributeValues={
-            ':poll_id': poll_id
-        }
-    )
-    votes = votes_response.get('Items', [])
-    
-    # Calculate results
-    total_votes = len(votes)
-    yes_votes = sum(1 for vote in votes if vote.get('answer') == 'Yes')
-    no_votes = total_votes - yes_votes
+    # Read the poll's tallies - counts per answer and per alignment, in one item
+    tally_response = poll_tallies_table.get_item(Key={'poll_id': poll_id})
+    tally = tally_response.get('Item', {})
     
-    # Calculate percentages
-    yes_percentage = round((yes_votes / total_votes * 100), 1) if total_votes > 0 else 0
-    no_percentage = round((no_votes / total_votes * 100), 1) if total_votes > 0 else 0
+    poll = get_poll(polls_table, poll_id)
+    options = poll.get('options', ['Yes', 'No']) if poll else ['Yes', 'No']
     
-    results = {
-        'poll_id': poll_id,
-        'total_votes': total_votes,
-        'yes_votes': yes_votes,
-        'no_votes': no_votes,
-        'yes_percentage': yes_percentage,
-        'no_percentage': no_percentage
-    }
-    
-    return success_response(results)
-
+    return success_response(build_results(poll_id, options, tally))
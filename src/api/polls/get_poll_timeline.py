@@ -0,0 +1,87 @@
+from datetime import datetime
+from utils.response_builder import (
+    success_response,
+    error_response,
+    not_found_response,
+    error_handler
+)
+from utils.helpers import (
+    get_user_id_from_event,
+    get_table,
+    get_query_param,
+    get_path_param
+)
+from utils.polls import get_poll
+from utils.poll_timeline import (
+    HOUR,
+    DAY,
+    BUCKET_STEPS,
+    MAX_BUCKETS,
+    bucket_label,
+    parse_bucket_label,
+    read_timeline
+)
+
+polls_table = get_table('POLLS_TABLE_NAME')
+poll_votes_table = get_table('POLL_VOTES_TABLE_NAME')
+poll_timeline_table = get_table('POLL_TIMELINE_TABLE_NAME')
+
+# Range returned when the caller does not give one
+DEFAULT_BUCKETS = {HOUR: 24, DAY: 30}
+
+@error_handler
+def lambda_handler(event, context):
+    """
+    GET /polls/{poll_id}/timeline?granularity={hour|day}&from={bucket}&to={bucket}
+    Votes per answer in each hour (from/to as 2026-10-19T13) or day (2026-10-19),
+    oldest first. Defaults to the last 24 hours or 30 days
+    """
+    # Extract user_id from Cognito authorizer claims
+    user_id = get_user_id_from_event(event)
+
+    # Get poll_id
+    poll_id = get_path_param(event, 'poll_id')
+
+    granularity = get_query_param(event, 'granularity', DAY)
+    if granularity not in (HOUR, DAY):
+        return error_response('granularity must be hour or day')
+
+    # Resolve the range, defaulting to the most recent buckets
+    step = BUCKET_STEPS[granularity]
+    now = datetime.utcnow()
+    end = parse_bucket_label(get_query_param(event, 'to', bucket_label(now, granularity)), granularity)
+    if end is None:
+        return error_response('to is not a valid bucket')
+    start_param = get_query_param(event, 'from')
+    start = parse_bucket_label(start_param, granularity) if start_param else end - step * (DEFAULT_BUCKETS[granularity] - 1)
+    if start is None:
+        return error_response('from is not a valid bucket')
+    if start > end:
+        return error_response('from must not be after to')
+
+    # Bound the range so a single request does a bounded number of reads
+    if (end - start) // step + 1 > MAX_BUCKETS[granularity]:
+        return error_response(f'A {granularity} timeline covers at most {MAX_BUCKETS[granularity]} buckets')
+
+    if get_poll(polls_table, poll_id) is None:
+        return not_found_response('Poll not found')
+
+    # Trends reveal results, so the same rule applies: vote first
+    user_vote_response = poll_votes_table.get_item(
+        Key={
+            'poll_id': poll_id,
+            'user_id': user_id
+        }
+    )
+    if 'Item' not in user_vote_response:
+        return error_response('You must vote before viewing results', 403)
+
+    buckets = read_timeline(poll_timeline_table, poll_id, granularity, start, end, now)
+
+    return success_response({
+        'poll_id': poll_id,
+        'granularity': granularity,
+        'from': buckets[0]['bucket'],
+        'to': buckets[-1]['bucket'],
+        'buckets': buckets
+    })
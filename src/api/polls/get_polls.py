@@ -1,4 +1,3 @@
-import uuid
 from utils.response_builder import (
     success_response,
     error_handler
@@ -6,45 +5,41 @@ from utils.response_builder import (
 from utils.helpers import (
     get_user_id_from_event,
     get_table,
-    get_current_timestamp
+    batch_get_items
 )
+from utils.polls import get_active_polls
 
 polls_table = get_table('POLLS_TABLE_NAME')
 poll_votes_table = get_table('POLL_VOTES_TABLE_NAME')
 
 @error_handler
 def lambda_handler(event, context):
+    """
+    GET /polls - Active polls, each with the caller's vote if they have voted
+    """
     # Extract user_id from Cognito authorizer claims
     user_id = get_user_id_from_event(event)
     
-    # For now, return hardcoded initial poll
-    # In the future, this could query the polls table
-    poll_id = "national-coalition-2024"
+    # Active poll definitions (cached per container, see utils.polls)
+    polls = get_active_polls(polls_table)
     
-    poll = {
-        'poll_id': poll_id,
-        'question': 'Do you support the current government (National led coalition)?',
-        'info_text': 'Current government includes; National, ACT, NZ First',
-        'options': ['Yes', 'No'],
-        'created_at': '2024-01-01T00:00:00.000000'
-    }
-    
-    # Check if user has already voted on this poll
-    vote_response = poll_votes_table.get_item(
-        Key={
-            'poll_id': poll_id,
-            'user_id': user_id
-        }
+    # Look up the user's votes on every active poll in one batch
+    votes = batch_get_items(
+        poll_votes_table,
+        [{'poll_id': poll['poll_id'], 'user_id': user_id} for poll in polls],
+        projection_expression='poll_id, answer, reason, voted_at'
     )
-    has_voted = 'Item' in vote_response
-    if has_voted:
-        poll['user_vote'] = {
-            'answer': vote_response['Item'].get('answer'),
-            'reason': vote_response['Item'].get('reason', ''),
-            'voted_at': vote_response['Item'].get('voted_at')
-        }
+    votes_by_poll = {vote['poll_id']: vote for vote in votes}
     
-    poll['has_voted'] = has_voted
+    for poll in polls:
+        poll.pop('active', None)
+        vote = votes_by_poll.get(poll['poll_id'])
+        poll['has_voted'] = vote is not None
+        if vote:
+            poll['user_vote'] = {
+                'answer': vote.get('answer'),
+                'reason': vote.get('reason', ''),
+                'voted_at': vote.get('voted_at')
+            }
     
-    # Return as array (for future expansion to multiple polls)
-    return success_response([poll])
+    return success_response(polls)
@@ -1,39 +1,68 @@
 from utils.response_builder import (
     success_response,
+    error_response,
     error_handler
 )
 from utils.helpers import (
     get_user_id_from_event,
     get_table,
-    get_query_param
+    get_query_param,
+    encode_cursor,
+    decode_cursor
 )
+from utils.polls import add_poll_questions
 
+polls_table = get_table('POLLS_TABLE_NAME')
 poll_votes_table = get_table('POLL_VOTES_TABLE_NAME')
 
+MAX_PAGE_SIZE = 100
+
 @error_handler
 def lambda_handler(event, context):
+    """
+    GET /polls/user/votes?user_id={id} - All of a user's poll votes
+    GET /polls/user/votes?user_id={id}&limit={n}&cursor={cursor} - One page,
+    newest first, as {'votes': [...], 'next_cursor': ...}
+    """
     # Extract authenticated user_id from Cognito authorizer claims
     auth_user_id = get_user_id_from_event(event)
     
     # Allow querying other users' votes (for profile viewing)
     target_user_id = get_query_param(event, 'user_id', auth_user_id)
     
+    # Paged when the caller asks for a limit (the profile page continues from its cursor)
+    paged = get_query_param(event, 'limit') is not None
+    
     # Query votes by user using GSI
-    votes_response = poll_votes_table.query(
-        IndexName='UserVotesIndex',
-        KeyConditionExpression='user_id = :user_id',
-        ExpressionAttributeValues={
+    query_kwargs = {
+        'IndexName': 'UserVotesIndex',
+        'KeyConditionExpression': 'user_id = :user_id',
+        'ExpressionAttributeValues': {
             ':user_id': target_user_id
         }
-    )
+    }
+    if paged:
+        try:
+            limit = int(get_query_param(event, 'limit'))
+        except ValueError:
+            limit = MAX_PAGE_SIZE
+        query_kwargs['Limit'] = max(1, min(limit, MAX_PAGE_SIZE))
+        query_kwargs['ScanIndexForward'] = False  # Newest vote first
+        raw_cursor = get_query_param(event, 'cursor')
+        cursor = decode_cursor(raw_cursor, ('poll_id', 'user_id', 'voted_at'))
+        if raw_cursor and (cursor is None or cursor['user_id'] != target_user_id):
+            return error_response('Invalid cursor')
+        if cursor:
+            query_kwargs['ExclusiveStartKey'] = cursor
+    votes_response = poll_votes_table.query(**query_kwargs)
     votes = votes_response.get('Items', [])
     
-    # Enrich votes with poll questions (hardcoded for now)
-    # In the future, this could query the polls table
-    for vote in votes:
-        if vote.get('poll_id') == 'national-coalition-2024':
-            vote['question'] = 'Do you support the current government (National led coalition)?'
-            vote['info_text'] = 'Current government includes; National, ACT, NZ First'
+    # Enrich votes with poll questions from the cached poll definitions
+    add_poll_questions(polls_table, votes)
     
+    if paged:
+        return success_response({
+            'votes': votes,
+            'next_cursor': encode_cursor(votes_response.get('LastEvaluatedKey'))
+        })
     return success_response(votes)
-
@@ -0,0 +1,102 @@
+import os
+from collections import Counter
+from botocore.exceptions import ClientError
+from utils.response_builder import event_handler
+from utils.helpers import get_table, parallel_scan
+from utils.poll_tallies import TOTAL_FIELD, count_votes
+
+profiles_table = get_table('PROFILES_TABLE_NAME')
+poll_votes_table = get_table('POLL_VOTES_TABLE_NAME')
+poll_tallies_table = get_table('POLL_TALLIES_TABLE_NAME')
+
+DEFAULT_SCAN_SEGMENTS = 4
+
+
+def read_tallies():
+    tallies = {}
+    scan_kwargs = {'ConsistentRead': True}
+    while True:
+        response = poll_tallies_table.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            tallies[item['poll_id']] = item
+        if 'LastEvaluatedKey' not in response:
+            return tallies
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def read_alignments(segments):
+    def reduce_segment(profiles):
+        return {profile['user_id']: profile.get('political_alignment', '') for profile in profiles}
+
+    alignments = {}
+    for segment_alignments in parallel_scan(profiles_table, reduce_segment, segments,
+                                            ProjectionExpression='user_id, political_alignment'):
+        alignments.update(segment_alignments)
+    return alignments
+
+
+def count_all_votes(segments, alignments):
+    # poll_id -> expected counters, each segment counted separately then merged
+    def reduce_segment(votes):
+        by_poll = {}
+        for vote in votes:
+            by_poll.setdefault(vote['poll_id'], []).append(vote)
+        return {poll_id: count_votes(poll_votes, alignments) for poll_id, poll_votes in by_poll.items()}
+
+    expected = {}
+    for segment_counts in parallel_scan(poll_votes_table, reduce_segment, segments,
+                                        ProjectionExpression='poll_id, user_id, answer'):
+        for poll_id, counts in segment_counts.items():
+            expected.setdefault(poll_id, Counter()).update(counts)
+    return {poll_id: dict(counts) for poll_id, counts in expected.items()}
+
+
+def replace_tally(poll_id, current, expected):
+    """
+    Overwrite a drifted tally. The write is conditional on the total read
+    before the votes were scanned, so a poll that took votes mid-run is left
+    for the next run rather than losing them.
+    """
+    current_counts = {field: int(value) for field, value in current.items() if field != 'poll_id'} if current else {}
+    if current_counts == expected:
+        return False
+
+    put_kwargs = {'Item': dict(expected, poll_id=poll_id)}
+    if current:
+        put_kwargs['ConditionExpression'] = '#total = :current_total'
+        put_kwargs['ExpressionAttributeNames'] = {'#total': TOTAL_FIELD}
+        put_kwargs['ExpressionAttributeValues'] = {':current_total': current.get(TOTAL_FIELD, 0)}
+    else:
+        put_kwargs['ConditionExpression'] = 'attribute_not_exists(poll_id)'
+    try:
+        poll_tallies_table.put_item(**put_kwargs)
+        return True
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        print(f"Poll {poll_id} took votes during the rebuild; leaving it for the next run")
+        return False
+
+
+@event_handler
+def lambda_handler(event, context):
+    """
+    Scheduled job - recompute poll tallies from the votes table against each
+    voter's current political_alignment, repairing tallies that have drifted
+    (alignment changes, failed writes). Profiles and votes are read with
+    parallel scans.
+    """
+    segments = int(os.environ.get('POLL_TALLY_SCAN_SEGMENTS', DEFAULT_SCAN_SEGMENTS))
+
+    # Current tallies first, so their totals predate every vote the scan sees
+    current = read_tallies()
+    alignments = read_alignments(segments)
+    expected = count_all_votes(segments, alignments)
+
+    rebuilt = 0
+    for poll_id in set(current) | set(expected):
+        if replace_tally(poll_id, current.get(poll_id), expected.get(poll_id, {TOTAL_FIELD: 0})):
+            rebuilt += 1
+
+    print(f"Rebuilt poll tallies: {len(expected)} polls with votes, {rebuilt} rewritten")
+    return {'polls': len(expected), 'rebuilt': rebuilt}
@@ -1,3 +1,4 @@
+from botocore.exceptions import ClientError
 from utils.response_builder import (
     success_response,
     error_response,
@@ -5,6 +6,7 @@ from utils.response_builder import (
     error_handler
 )
 from utils.helpers import (
+    dynamodb,
     get_user_id_from_event,
     get_table,
     get_current_timestamp,
@@ -12,12 +14,23 @@ from utils.helpers import (
     get_path_param
 )
 from utils.validators import validate_poll_answer, validate_poll_reason
+from utils.shared_cache import cached_get_item
+from utils.idempotency import idempotent
+from utils.profile_counters import increment_profile_counters
+from utils.rate_limit import rate_limited
+from utils.polls import get_poll, reason_key
+from utils.poll_tallies import tally_update
+from utils.poll_timeline import timeline_update
 
 polls_table = get_table('POLLS_TABLE_NAME')
 poll_votes_table = get_table('POLL_VOTES_TABLE_NAME')
 profiles_table = get_table('PROFILES_TABLE_NAME')
+poll_tallies_table = get_table('POLL_TALLIES_TABLE_NAME')
+poll_timeline_table = get_table('POLL_TIMELINE_TABLE_NAME')
 
 @error_handler
+@rate_limited('votes')
+@idempotent('vote_poll')
 def lambda_handler(event, context):
     # Extract user_id from Cognito authorizer claims
     user_id = get_user_id_from_event(event)
@@ -27,12 +40,7 @@ def lambda_handler(event, context):
     
     # Parse request body
     body = parse_request_body(event)
-    
-    # Validate answer
     answer = body.get('answer', '').strip()
-    is_valid, error_msg = validate_poll_answer(answer)
-    if not is_valid:
-        return error_response(error_msg)
     
     # Validate optional reason
     reason = body.get('reason', '').strip()
@@ -40,6 +48,16 @@ def lambda_handler(event, context):
     if not is_valid:
         return error_response(error_msg)
     
+    # Poll must exist, be open, and offer the chosen answer
+    poll = get_poll(polls_table, poll_id)
+    if poll is None:
+        return not_found_response('Poll not found')
+    if not poll.get('active'):
+        return error_response('This poll is closed')
+    is_valid, error_msg = validate_poll_answer(answer, poll.get('options', []))
+    if not is_valid:
+        return error_response(error_msg)
+    
     # Check if user has already voted on this poll
     existing_vote = poll_votes_table.get_item(
         Key={
@@ -51,10 +69,10 @@ def lambda_handler(event, context):
         return error_response('You have already voted on this poll', 400)
     
     # Get user's profile to retrieve display_name
-    profile_response = profiles_table.get_item(Key={'user_id': user_id})
-    if 'Item' not in profile_response:
+    profile = cached_get_item(profiles_table, {'user_id': user_id}, 'profiles')
+    if profile is None:
         return not_found_response('Profile not found. Please complete onboarding first.')
-    display_name = profile_response['Item'].get('display_name', 'Unknown User')
+    display_name = profile.get('display_name', 'Unknown User')
     
     # Create vote record
     timestamp = get_current_timestamp()
@@ -67,12 +85,36 @@ def lambda_handler(event, context):
         'voted_at': timestamp
     }
     
-    # Add reason if provided
+    # Add reason if provided, with the key that puts the vote in ReasonsIndex
     if reason:
         vote['reason'] = reason
+        vote['reason_key'] = reason_key(poll_id, answer)
+    
+    # Save the vote and count it in the poll's tallies and hourly timeline
+    # atomically. The put is conditional so a concurrent duplicate vote is
+    # neither stored nor counted.
+    try:
+        dynamodb.meta.client.transact_write_items(TransactItems=[
+            {
+                'Put': {
+                    'TableName': poll_votes_table.name,
+                    'Item': vote,
+                    'ConditionExpression': 'attribute_not_exists(user_id)'
+                }
+            },
+            tally_update(poll_tallies_table.name, poll_id, profile.get('political_alignment', ''), answer),
+            timeline_update(poll_timeline_table.name, poll_id, timestamp, answer)
+        ])
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'TransactionCanceledException':
+            raise
+        reasons = e.response.get('CancellationReasons') or [{}]
+        if reasons[0].get('Code') != 'ConditionalCheckFailed':
+            raise
+        return error_response('You have already voted on this poll', 400)
     
-    # Save vote to DynamoDB
-    poll_votes_table.put_item(Item=vote)
+    # Count the vote on the voter's profile
+    increment_profile_counters(profiles_table, user_id, poll_votes=1)
     
     return success_response(vote, 201)
 
@@ -0,0 +1,220 @@
+import os
+import uuid
+from datetime import datetime, timedelta
+from botocore.exceptions import ClientError
+from utils.response_builder import event_handler
+from utils.helpers import get_table, get_current_timestamp, batch_get_items
+from utils.archive_store import (
+    PENDING_PREFIX,
+    get_archive_store,
+    segment_key,
+    pending_segment_key,
+    final_segment_key,
+    read_segment,
+    write_segment
+)
+from utils.search_index import unindex_post
+from utils.shared_cache import invalidate_cached_item
+from utils.post_aggregate import aggregate_delete_post
+from utils.feed_sync import record_archival
+from utils.profile_counters import add_archived_totals, release_archived_segment
+
+posts_table = get_table('POSTS_TABLE_NAME')
+comments_table = get_table('COMMENTS_TABLE_NAME')
+likes_table = get_table('LIKES_TABLE_NAME')
+search_index_table = get_table('SEARCH_INDEX_TABLE_NAME')
+aggregates_table = get_table('POST_AGGREGATES_TABLE_NAME')
+deletions_table = get_table('DELETIONS_TABLE_NAME')
+archive_totals_table = get_table('ARCHIVE_TOTALS_TABLE_NAME')
+
+DEFAULT_ARCHIVE_AFTER_DAYS = 365
+DEFAULT_TOMBSTONE_TTL_DAYS = 90
+MAX_POSTS_PER_RUN = 2000
+# Stop starting new batches when the invocation is this close to timing out
+TIME_BUFFER_MS = 30000
+
+
+def query_all(table, **kwargs):
+    # Query every page for a key condition.
+    items = []
+    while True:
+        response = table.query(**kwargs)
+        items.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return items
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def find_archive_candidates(cutoff, limit):
+    # Live posts created before the cutoff. Tombstones are skipped by the filter.
+    candidates = []
+    scan_kwargs = {
+        'FilterExpression': 'created_at < :cutoff AND attribute_not_exists(archived)',
+        'ExpressionAttributeValues': {':cutoff': cutoff}
+    }
+    while len(candidates) < limit:
+        response = posts_table.scan(**scan_kwargs)
+        candidates.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            break
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    return candidates[:limit]
+
+
+def build_record(post):
+    # Collect a post with its comments and every like on the post or its comments.
+    comments = query_all(
+        comments_table,
+        KeyConditionExpression='post_id = :post_id',
+        ExpressionAttributeValues={':post_id': post['post_id']}
+    )
+    likes = []
+    for target_id in [post['post_id']] + [comment['comment_id'] for comment in comments]:
+        likes.extend(query_all(
+            likes_table,
+            KeyConditionExpression='target_id = :target_id',
+            ExpressionAttributeValues={':target_id': target_id}
+        ))
+    return {'post': post, 'comments': comments, 'likes': likes}
+
+
+def write_tombstone(post, archive_key, expires_at):
+    # Replace the post with a tombstone unless it was edited since we read it.
+    try:
+        posts_table.put_item(
+            Item={
+                'post_id': post['post_id'],
+                'user_id': post['user_id'],
+                'created_at': post['created_at'],
+                'updated_at': post['updated_at'],
+                'archived': True,
+                'archive_key': archive_key,
+                'expires_at': expires_at
+            },
+            ConditionExpression='updated_at = :updated_at AND attribute_not_exists(archived)',
+            ExpressionAttributeValues={':updated_at': post['updated_at']}
+        )
+        return True
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        return False
+
+
+def purge_record(record):
+    # Remove archived comments and likes from the hot tables.
+    with comments_table.batch_writer() as batch:
+        for comment in record['comments']:
+            batch.delete_item(Key={'post_id': comment['post_id'], 'comment_id': comment['comment_id']})
+    with likes_table.batch_writer() as batch:
+        for like in record['likes']:
+            batch.delete_item(Key={'target_id': like['target_id'], 'user_id': like['user_id']})
+    unindex_post(search_index_table, record['post'])
+    aggregate_delete_post(aggregates_table, record['post']['post_id'])
+
+
+def merge_records(first, second):
+    # Union of two records of the same post, children deduplicated by key
+    comments = {comment['comment_id']: comment for comment in first['comments'] + second['comments']}
+    likes = {(like['target_id'], like['user_id']): like for like in first['likes'] + second['likes']}
+    return {'post': first['post'], 'comments': list(comments.values()), 'likes': list(likes.values())}
+
+
+def finish_archived(store, key, records):
+    # Write the final segment, then clear the archived posts out of the hot tables
+    if records:
+        write_segment(store, key, records)
+    add_archived_totals(archive_totals_table, key, records)
+    now = get_current_timestamp()
+    for record in records:
+        purge_record(record)
+        # Delta-syncing feeds drop the post like a deleted one
+        record_archival(deletions_table, record['post']['post_id'], now)
+
+
+def archive_user_posts(store, user_id, posts, run_id, tombstone_expires_at):
+    records = [build_record(post) for post in posts]
+    created = sorted(post['created_at'] for post in posts)
+    key = segment_key(user_id, created[0], created[-1], run_id)
+    pending_key = pending_segment_key(key)
+
+    # The pending segment is durable before anything is removed from DynamoDB
+    write_segment(store, pending_key, records)
+
+    # Posts edited mid-run stay live and are left out of the final segment
+    tombstoned = [record['post'] for record in records
+                  if write_tombstone(record['post'], key, tombstone_expires_at)]
+    now = get_current_timestamp()
+    for post in tombstoned:
+        invalidate_cached_item({'post_id': post['post_id']}, 'posts', now)
+
+    # Likes and comments are refused from here on; read them again to pick up
+    # any that landed after the first read, so none are left behind
+    archived = [build_record(post) for post in tombstoned]
+    finish_archived(store, key, archived)
+    store.delete(pending_key)
+    release_archived_segment(archive_totals_table, key, archived)
+    return len(archived)
+
+
+def finish_pending_segments(store):
+    """
+    Complete segments of runs that stopped between writing the pending segment
+    and deleting it. A final segment that was already written is complete (it
+    was read after the tombstones) and is finished as is. Otherwise only posts
+    whose tombstone points at the segment go into it, their children merged
+    with whatever is still in the hot tables, since the purge may not have run
+    or may have stopped part way.
+    """
+    finished = 0
+    for pending_key in store.list(f'{PENDING_PREFIX}/'):
+        key = final_segment_key(pending_key)
+        archived = read_segment(store, key)
+        if archived is None:
+            records = read_segment(store, pending_key) or []
+            tombstones = batch_get_items(posts_table, [{'post_id': record['post']['post_id']} for record in records],
+                                         projection_expression='post_id, archive_key')
+            archived_ids = {post['post_id'] for post in tombstones if post.get('archive_key') == key}
+            archived = [merge_records(record, build_record(record['post']))
+                        for record in records if record['post']['post_id'] in archived_ids]
+        finish_archived(store, key, archived)
+        store.delete(pending_key)
+        release_archived_segment(archive_totals_table, key, archived)
+        finished += len(archived)
+    return finished
+
+
+@event_handler
+def lambda_handler(event, context):
+    """
+    Scheduled job - archive posts older than ARCHIVE_AFTER_DAYS
+    Moves each post with its comments and likes into a gzip JSONL segment and
+    leaves a tombstone (expiring after ARCHIVE_TOMBSTONE_TTL_DAYS) in its place
+    """
+    archive_after_days = int(os.environ.get('ARCHIVE_AFTER_DAYS', DEFAULT_ARCHIVE_AFTER_DAYS))
+    tombstone_ttl_days = int(os.environ.get('ARCHIVE_TOMBSTONE_TTL_DAYS', DEFAULT_TOMBSTONE_TTL_DAYS))
+
+    now = datetime.utcnow()
+    cutoff = (now - timedelta(days=archive_after_days)).isoformat()
+    tombstone_expires_at = int((now + timedelta(days=tombstone_ttl_days)).timestamp())
+    run_id = uuid.uuid4().hex[:12]
+    store = get_archive_store()
+
+    # Finish whatever an interrupted run left half done before starting more
+    recovered = finish_pending_segments(store)
+    if recovered:
+        print(f"Finished archiving {recovered} posts from interrupted runs")
+
+    # Group candidates by author so each segment serves one user's history
+    posts_by_user = {}
+    for post in find_archive_candidates(cutoff, MAX_POSTS_PER_RUN):
+        posts_by_user.setdefault(post['user_id'], []).append(post)
+
+    archived_count = 0
+    for user_id, posts in posts_by_user.items():
+        if context is not None and context.get_remaining_time_in_millis() < TIME_BUFFER_MS:
+            break  # the next scheduled run picks up where this one stopped
+        archived_count += archive_user_posts(store, user_id, posts, run_id, tombstone_expires_at)
+
+    print(f"Archived {archived_count} posts older than {cutoff}")
+    return {'archived': archived_count, 'cutoff': cutoff}
@@ -3,6 +3,7 @@ from utils.response_builder import (
     success_response,
     error_response,
     not_found_response,
+    forbidden_response,
     error_handler
 )
 from utils.validators import validate_comment_content
@@ -12,12 +13,21 @@ from utils.helpers import (
     get_current_timestamp,
     parse_request_body
 )
+from utils.shared_cache import cached_get_item
+from utils.idempotency import idempotent
+from utils.comment_previews import add_comment_preview
+from utils.profile_counters import increment_profile_counters
+from utils.post_aggregate import aggregate_add_comment
+from utils.rate_limit import rate_limited
 
 posts_table = get_table('POSTS_TABLE_NAME')
 comments_table = get_table('COMMENTS_TABLE_NAME')
 profiles_table = get_table('PROFILES_TABLE_NAME')
+aggregates_table = get_table('POST_AGGREGATES_TABLE_NAME')
 
 @error_handler
+@rate_limited('comments')
+@idempotent('create_comment')
 def lambda_handler(event, context):
     # Extract user_id from Cognito authorizer claims
     user_id = get_user_id_from_event(event)
@@ -37,15 +47,17 @@ def lambda_handler(event, context):
         return error_response(error_msg)
     
     # Check if post exists
-    post_response = posts_table.get_item(Key={'post_id': post_id})
-    if 'Item' not in post_response:
+    post = cached_get_item(posts_table, {'post_id': post_id}, 'posts')
+    if post is None:
         return not_found_response('Post not found')
+    if post.get('archived'):
+        return forbidden_response('Archived posts are read-only')
     
     # Get user's profile to retrieve display_name
-    profile_response = profiles_table.get_item(Key={'user_id': user_id})
-    if 'Item' not in profile_response:
+    profile = cached_get_item(profiles_table, {'user_id': user_id}, 'profiles')
+    if profile is None:
         return not_found_response('Profile not found. Please complete onboarding first.')
-    display_name = profile_response['Item'].get('display_name', 'Unknown User')
+    display_name = profile.get('display_name', 'Unknown User')
     
     # Create comment
     timestamp = get_current_timestamp()
@@ -63,4 +75,11 @@ def lambda_handler(event, context):
     # Save to DynamoDB
     comments_table.put_item(Item=comment)
     
+    # Keep the post's latest-comments preview current for the feed
+    add_comment_preview(posts_table, comment)
+    aggregate_add_comment(aggregates_table, comment)
+    
+    # Count the comment on the commenter's profile
+    increment_profile_counters(profiles_table, user_id, comment_count=1)
+    
     return success_response(comment, 201)
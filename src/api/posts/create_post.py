@@ -14,11 +14,21 @@ from utils.helpers import (
     get_current_timestamp,
     parse_request_body
 )
+from utils.search_index import index_post
+from utils.shared_cache import cached_get_item
+from utils.idempotency import idempotent
+from utils.profile_counters import increment_profile_counters
+from utils.post_aggregate import aggregate_put_post
+from utils.rate_limit import rate_limited
 
 posts_table = get_table('POSTS_TABLE_NAME')
 profiles_table = get_table('PROFILES_TABLE_NAME')
+search_index_table = get_table('SEARCH_INDEX_TABLE_NAME')
+aggregates_table = get_table('POST_AGGREGATES_TABLE_NAME')
 
 @error_handler
+@rate_limited('posts')
+@idempotent('create_post')
 def lambda_handler(event, context):
     """
     POST /posts - Create a new post
@@ -38,10 +48,10 @@ def lambda_handler(event, context):
     
     # Get user's profile to retrieve display_name
     try:
-        profile_response = profiles_table.get_item(Key={'user_id': user_id})
-        if 'Item' not in profile_response:
+        profile = cached_get_item(profiles_table, {'user_id': user_id}, 'profiles')
+        if profile is None:
             return not_found_response('Profile not found. Please complete onboarding first.')
-        display_name = profile_response['Item'].get('display_name', 'Unknown User')
+        display_name = profile.get('display_name', 'Unknown User')
     except ClientError as e:
         print(f"Error fetching profile: {str(e)}")
         return server_error_response('Failed to retrieve user profile')
@@ -62,5 +72,14 @@ def lambda_handler(event, context):
     # Save to DynamoDB
     posts_table.put_item(Item=post)
     
+    # Add the post's terms to the search index
+    index_post(search_index_table, post)
+    
+    # Mirror into the single-table post aggregate during the migration
+    aggregate_put_post(aggregates_table, post)
+    
+    # Count the post on the author's profile
+    increment_profile_counters(profiles_table, user_id, post_count=1)
+    
     return success_response(post, 201)
 
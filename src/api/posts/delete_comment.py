@@ -1,18 +1,26 @@
+from botocore.exceptions import ClientError
 from utils.response_builder import (
     success_response,
     error_response,
-    not_found_response,
-    forbidden_response,
+    conditional_failure_response,
     error_handler
 )
 from utils.helpers import (
     get_user_id_from_event,
     get_table
 )
+from utils.comment_previews import remove_comment_preview
+from utils.profile_counters import increment_profile_counters
+from utils.post_aggregate import aggregate_remove_comment
+from utils.rate_limit import rate_limited
 
+posts_table = get_table('POSTS_TABLE_NAME')
 comments_table = get_table('COMMENTS_TABLE_NAME')
+profiles_table = get_table('PROFILES_TABLE_NAME')
+aggregates_table = get_table('POST_AGGREGATES_TABLE_NAME')
 
 @error_handler
+@rate_limited('comment_edits')
 def lambda_handler(event, context):
     # Extract user_id from Cognito authorizer claims
     user_id = get_user_id_from_event(event)
@@ -24,30 +32,26 @@ def lambda_handler(event, context):
     if not post_id or not comment_id:
         return error_response('post_id and comment_id are required')
     
-    # Get the comment
-    response = comments_table.get_item(
-        Key={
-            'post_id': post_id,
-            'comment_id': comment_id
-        }
-    )
-    
-    if 'Item' not in response:
-        return not_found_response('Comment not found')
-    
-    comment = response['Item']
-    
-    # Check if user is the comment owner
-    if comment['user_id'] != user_id:
-        return forbidden_response('You can only delete your own comments')
-    
-    # Delete the comment
-    comments_table.delete_item(
-        Key={
-            'post_id': post_id,
-            'comment_id': comment_id
-        }
-    )
+    # Delete the comment only if it exists and belongs to the caller
+    try:
+        response = comments_table.delete_item(
+            Key={
+                'post_id': post_id,
+                'comment_id': comment_id
+            },
+            ConditionExpression='attribute_exists(comment_id) AND user_id = :user_id',
+            ExpressionAttributeValues={':user_id': user_id},
+            ReturnValues='ALL_OLD',
+            ReturnValuesOnConditionCheckFailure='ALL_OLD'
+        )
+    except ClientError as e:
+        return conditional_failure_response(e, 'Comment not found', 'You can only delete your own comments')
+    
+    # Drop the comment from the post's preview if it was shown there
+    remove_comment_preview(posts_table, comments_table, post_id, comment_id)
+    aggregate_remove_comment(aggregates_table, response['Attributes'])
+    
+    increment_profile_counters(profiles_table, user_id, comment_count=-1)
     
     return success_response({'message': 'Comment deleted successfully'})
 
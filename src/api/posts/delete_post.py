@@ -1,18 +1,34 @@
+from botocore.exceptions import ClientError
 from utils.response_builder import (
     success_response,
-    not_found_response,
     forbidden_response,
+    conditional_failure_response,
     error_handler
 )
 from utils.helpers import (
     get_user_id_from_event,
     get_table,
+    get_current_timestamp,
     get_path_param
 )
+from utils.search_index import unindex_post
+from utils.shared_cache import invalidate_cached_item
+from utils.profile_counters import increment_profile_counters
+from utils.feed_sync import record_deletion
+from utils.post_aggregate import aggregate_delete_post
+from utils.like_counters import count_post_likes, delete_like_counter
+from utils.rate_limit import rate_limited
 
 table = get_table('POSTS_TABLE_NAME')
+search_index_table = get_table('SEARCH_INDEX_TABLE_NAME')
+likes_table = get_table('LIKES_TABLE_NAME')
+profiles_table = get_table('PROFILES_TABLE_NAME')
+deletions_table = get_table('DELETIONS_TABLE_NAME')
+aggregates_table = get_table('POST_AGGREGATES_TABLE_NAME')
+like_counters_table = get_table('LIKE_COUNTERS_TABLE_NAME')
 
 @error_handler
+@rate_limited('post_edits')
 def lambda_handler(event, context):
     """
     DELETE /posts/{post_id} - Delete a post
@@ -24,17 +40,35 @@ def lambda_handler(event, context):
     # Get post_id from path parameters
     post_id = get_path_param(event, 'post_id')
     
-    # Get existing post to verify ownership
-    existing = table.get_item(Key={'post_id': post_id})
-    if 'Item' not in existing:
-        return not_found_response('Post not found')
+    # Delete post only if it exists and belongs to the caller (single round trip)
+    try:
+        response = table.delete_item(
+            Key={'post_id': post_id},
+            ConditionExpression='attribute_exists(post_id) AND user_id = :user_id AND attribute_not_exists(archived)',
+            ExpressionAttributeValues={':user_id': user_id},
+            ReturnValues='ALL_OLD',
+            ReturnValuesOnConditionCheckFailure='ALL_OLD'
+        )
+    except ClientError as e:
+        if 'archived' in e.response.get('Item', {}):
+            return forbidden_response('Archived posts are read-only')
+        return conditional_failure_response(e, 'Post not found', 'Forbidden - You can only delete your own posts')
     
-    # Verify ownership
-    if existing['Item']['user_id'] != user_id:
-        return forbidden_response('Forbidden - You can only delete your own posts')
+    # Remove the post from the search index
+    unindex_post(search_index_table, response['Attributes'])
+    aggregate_delete_post(aggregates_table, post_id)
     
-    # Delete post
-    table.delete_item(Key={'post_id': post_id})
+    # Drop the cached copy so existence checks stop seeing the post
+    timestamp = get_current_timestamp()
+    invalidate_cached_item({'post_id': post_id}, 'posts', timestamp)
+    
+    # Log the deletion so delta-syncing feeds can drop the post
+    record_deletion(deletions_table, response['Attributes'], timestamp)
+    
+    # The post and the likes it received no longer count towards the author's profile
+    increment_profile_counters(profiles_table, user_id, post_count=-1,
+                               likes_received=-count_post_likes(likes_table, post_id))
+    delete_like_counter(like_counters_table, post_id)
     
     return success_response({'message': 'Post deleted successfully'})
 
@@ -8,10 +8,16 @@ from utils.helpers import (
     get_user_id_from_event,
     get_table
 )
+from utils.shared_cache import cached_get_item
+from utils.archive_store import get_archive_store, load_archived_record
+from utils.like_filter import liked_target_ids
+from utils.post_aggregate import aggregate_reads_enabled, load_comments
 
 posts_table = get_table('POSTS_TABLE_NAME')
 comments_table = get_table('COMMENTS_TABLE_NAME')
 likes_table = get_table('LIKES_TABLE_NAME')
+like_filters_table = get_table('LIKE_FILTERS_TABLE_NAME')
+aggregates_table = get_table('POST_AGGREGATES_TABLE_NAME')
 
 @error_handler
 def lambda_handler(event, context):
@@ -24,10 +30,27 @@ def lambda_handler(event, context):
         return error_response('post_id is required')
     
     # Check if post exists
-    post_response = posts_table.get_item(Key={'post_id': post_id})
-    if 'Item' not in post_response:
+    post = cached_get_item(posts_table, {'post_id': post_id}, 'posts')
+    if post is None:
         return not_found_response('Post not found')
     
+    # Archived post - comments and their likes come from the archive segment
+    if post.get('archived'):
+        record = load_archived_record(get_archive_store(), post['archive_key'], post_id) or {}
+        comments = sorted(record.get('comments', []), key=lambda c: c.get('created_at', ''))
+        for comment in comments:
+            comment_likes = [like for like in record.get('likes', [])
+                             if like['target_id'] == comment['comment_id'] and like.get('target_type') == 'comment']
+            comment['like_count'] = len(comment_likes)
+            comment['liked_by_user'] = any(like['user_id'] == user_id for like in comment_likes)
+        return success_response(comments)
+    
+    # Single-table layout - comments and their likes in one Query
+    if aggregate_reads_enabled():
+        comments = load_comments(aggregates_table, post_id, user_id)
+        if comments is not None:
+            return success_response(comments)
+    
     # Query all comments for this post using GSI
     response = comments_table.query(
         IndexName='PostCommentsIndex',
@@ -40,6 +63,9 @@ def lambda_handler(event, context):
     
     comments = response.get('Items', [])
     
+    # Comments the current user liked - their like filter rules most out without a read
+    liked_ids = liked_target_ids(like_filters_table, likes_table, user_id, [comment['comment_id'] for comment in comments])
+    
     # For each comment, get like count and whether current user liked it
     for comment in comments:
         comment_id = comment['comment_id']
@@ -47,15 +73,15 @@ def lambda_handler(event, context):
         # Get like count for this comment
         likes_response = likes_table.query(
             KeyConditionExpression='target_id = :target_id',
+            FilterExpression='target_type = :target_type',
             ExpressionAttributeValues={
-                ':target_id': comment_id
-            }
+                ':target_id': comment_id,
+                ':target_type': 'comment'
+            },
+            Select='COUNT'
         )
-        comment_likes = [like for like in likes_response.get('Items', []) if like.get('target_type') == 'comment']
-        comment['like_count'] = len(comment_likes)
-        
-        # Check if current user liked this comment
-        comment['liked_by_user'] = any(like['user_id'] == user_id for like in comment_likes)
+        comment['like_count'] = likes_response.get('Count', 0)
+        comment['liked_by_user'] = comment_id in liked_ids
     
     return success_response(comments)
 
@@ -1,19 +1,56 @@
 from utils.response_builder import success_response, error_handler
-from utils.helpers import get_user_id_from_event, get_table
+from utils.helpers import get_user_id_from_event, get_table, get_query_param
+from utils.like_filter import liked_target_ids
+from utils.like_counters import post_like_counts
+from utils.feed_sync import (
+    CHANGED_SINCE_FILTER,
+    new_watermark,
+    watermark_expired,
+    deleted_post_ids
+)
 
 posts_table = get_table('POSTS_TABLE_NAME')
 likes_table = get_table('LIKES_TABLE_NAME')
 comments_table = get_table('COMMENTS_TABLE_NAME')
+deletions_table = get_table('DELETIONS_TABLE_NAME')
+like_filters_table = get_table('LIKE_FILTERS_TABLE_NAME')
+like_counters_table = get_table('LIKE_COUNTERS_TABLE_NAME')
 
 @error_handler
 def lambda_handler(event, context):
+    """
+    GET /posts - Get the feed (most recent 100 posts)
+    GET /posts?since={watermark} - Only posts changed since the watermark, the ids
+    of posts deleted since then, and a new watermark. An empty or expired
+    watermark returns the full feed in the same shape with full=true.
+    """
     # Extract user_id from Cognito authorizer claims for authentication
     user_id = get_user_id_from_event(event)
     
-    # Scan all posts (for small scale app)
-    # For production with many posts, consider using pagination or DynamoDB Streams
-    response = posts_table.scan()
-    posts = response.get('Items', [])
+    since = get_query_param(event, 'since')
+    delta_sync = since is not None
+    if delta_sync and (not since or watermark_expired(since)):
+        since = None
+    watermark = new_watermark()
+    
+    if since:
+        # Only posts created, edited or otherwise changed after the watermark
+        posts = []
+        scan_kwargs = {
+            'FilterExpression': CHANGED_SINCE_FILTER,
+            'ExpressionAttributeValues': {':since': since}
+        }
+        while True:
+            response = posts_table.scan(**scan_kwargs)
+            posts.extend(post for post in response.get('Items', []) if not post.get('archived'))
+            if 'LastEvaluatedKey' not in response:
+                break
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    else:
+        # Scan all posts (for small scale app)
+        # For production with many posts, consider using pagination or DynamoDB Streams
+        response = posts_table.scan()
+        posts = [post for post in response.get('Items', []) if not post.get('archived')]
     
     # Sort by created_at timestamp in descending order (newest first)
     posts.sort(key=lambda x: x.get('created_at', ''), reverse=True)
@@ -21,22 +58,19 @@ def lambda_handler(event, context):
     # Limit to most recent 100 posts
     posts = posts[:100]
     
+    # Posts the current user liked - their like filter rules most posts out
+    # without a read, and only possible matches are confirmed
+    liked_ids = liked_target_ids(like_filters_table, likes_table, user_id, [post['post_id'] for post in posts])
+    
+    # Like counts - summed counter shards, or counted from the likes table
+    like_counts = post_like_counts(like_counters_table, likes_table, [post['post_id'] for post in posts])
+    
     # For each post, add like and comment counts
     for post in posts:
         post_id = post['post_id']
         
-        # Get like count
-        likes_response = likes_table.query(
-            KeyConditionExpression='target_id = :target_id',
-            ExpressionAttributeValues={
-                ':target_id': post_id
-            }
-        )
-        post_likes = [like for like in likes_response.get('Items', []) if like.get('target_type') == 'post']
-        post['like_count'] = len(post_likes)
-        
-        # Check if current user liked this post
-        post['liked_by_user'] = any(like['user_id'] == user_id for like in post_likes)
+        post['like_count'] = like_counts[post_id]
+        post['liked_by_user'] = post_id in liked_ids
         
         # Get comment count
         comments_response = comments_table.query(
@@ -48,4 +82,12 @@ def lambda_handler(event, context):
         )
         post['comment_count'] = comments_response.get('Count', 0)
     
-    return success_response(posts)
+    if not delta_sync:
+        return success_response(posts)
+    
+    return success_response({
+        'posts': posts,
+        'deleted': deleted_post_ids(deletions_table, since) if since else [],
+        'watermark': watermark,
+        'full': since is None
+    })
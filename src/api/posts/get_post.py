@@ -0,0 +1,91 @@
+from utils.response_builder import (
+    success_response,
+    not_found_response,
+    error_handler
+)
+from utils.helpers import (
+    get_user_id_from_event,
+    get_table,
+    get_path_param,
+    get_query_param
+)
+from utils.like_filter import liked_target_ids
+from utils.like_counters import post_like_counts
+from utils.post_aggregate import (
+    aggregate_reads_enabled,
+    load_post_detail,
+    load_post_summary,
+    read_legacy_post,
+    build_post_detail
+)
+from utils.archive_store import (
+    get_archive_store,
+    load_archived_record,
+    archived_post_view
+)
+
+posts_table = get_table('POSTS_TABLE_NAME')
+likes_table = get_table('LIKES_TABLE_NAME')
+comments_table = get_table('COMMENTS_TABLE_NAME')
+like_filters_table = get_table('LIKE_FILTERS_TABLE_NAME')
+aggregates_table = get_table('POST_AGGREGATES_TABLE_NAME')
+like_counters_table = get_table('LIKE_COUNTERS_TABLE_NAME')
+
+@error_handler
+def lambda_handler(event, context):
+    """
+    GET /posts/{post_id} - Get a single post with like and comment counts
+    GET /posts/{post_id}?detail=true - Also who liked it and its comments with
+    their like counts, for the post detail page
+    Archived posts are read through from their archive segment
+    """
+    # Extract user_id from Cognito authorizer claims for authentication
+    user_id = get_user_id_from_event(event)
+    
+    # Get post_id from path parameters
+    post_id = get_path_param(event, 'post_id')
+    detail = get_query_param(event, 'detail') == 'true'
+    
+    # Single-table layout: detail is one Query, the summary one BatchGetItem
+    if aggregate_reads_enabled():
+        load = load_post_detail if detail else load_post_summary
+        aggregate_post = load(aggregates_table, post_id, user_id)
+        if aggregate_post is not None:
+            return success_response(aggregate_post)
+    
+    response = posts_table.get_item(Key={'post_id': post_id})
+    if 'Item' not in response:
+        return not_found_response('Post not found')
+    post = response['Item']
+    
+    # Tombstone - serve the archived copy
+    if post.get('archived'):
+        record = load_archived_record(get_archive_store(), post['archive_key'], post_id)
+        if record is None:
+            return not_found_response('Post not found')
+        if detail:
+            return success_response(build_post_detail(record['post'], record.get('comments', []),
+                                                      record.get('likes', []), user_id))
+        return success_response(archived_post_view(record, user_id))
+    
+    if detail:
+        comments, likes = read_legacy_post(comments_table, likes_table, post_id)
+        return success_response(build_post_detail(post, comments, likes, user_id))
+    
+    # Get like count
+    post['like_count'] = post_like_counts(like_counters_table, likes_table, [post_id])[post_id]
+    
+    # Check if current user liked this post (like filter first)
+    post['liked_by_user'] = post_id in liked_target_ids(like_filters_table, likes_table, user_id, [post_id])
+    
+    # Get comment count
+    comments_response = comments_table.query(
+        KeyConditionExpression='post_id = :post_id',
+        ExpressionAttributeValues={
+            ':post_id': post_id
+        },
+        Select='COUNT'
+    )
+    post['comment_count'] = comments_response.get('Count', 0)
+    
+    return success_response(post)
@@ -8,6 +8,8 @@ from utils.helpers import (
     get_user_id_from_event,
     get_table
 )
+from utils.shared_cache import cached_get_item
+from utils.archive_store import get_archive_store, load_archived_record
 
 posts_table = get_table('POSTS_TABLE_NAME')
 likes_table = get_table('LIKES_TABLE_NAME')
@@ -23,19 +25,23 @@ def lambda_handler(event, context):
         return error_response('post_id is required')
     
     # Check if post exists
-    post_response = posts_table.get_item(Key={'post_id': post_id})
-    if 'Item' not in post_response:
+    post = cached_get_item(posts_table, {'post_id': post_id}, 'posts')
+    if post is None:
         return not_found_response('Post not found')
     
-    # Query all likes for this post
-    response = likes_table.query(
-        KeyConditionExpression='target_id = :target_id',
-        ExpressionAttributeValues={
-            ':target_id': post_id
-        }
-    )
-    
-    likes = response.get('Items', [])
+    if post.get('archived'):
+        # Archived post - likes were moved into the archive segment
+        record = load_archived_record(get_archive_store(), post['archive_key'], post_id) or {}
+        likes = [like for like in record.get('likes', []) if like['target_id'] == post_id]
+    else:
+        # Query all likes for this post
+        response = likes_table.query(
+            KeyConditionExpression='target_id = :target_id',
+            ExpressionAttributeValues={
+                ':target_id': post_id
+            }
+        )
+        likes = response.get('Items', [])
     
     # Filter to only post likes (in case we have comment likes with same target_id)
     post_likes = [like for like in likes if like.get('target_type') == 'post']
@@ -1,56 +1,99 @@
-from utils.response_builder import success_response, error_handler
-from utils.helpers import get_user_id_from_event, get_table, get_query_param
+from utils.response_builder import success_response, error_response, error_handler
+from utils.helpers import (
+    get_user_id_from_event,
+    get_table,
+    get_query_param,
+    encode_cursor,
+    decode_cursor
+)
+from utils.user_posts import add_post_counts, read_user_posts_page, valid_page_cursor
+from utils.feed_sync import (
+    CHANGED_SINCE_FILTER,
+    new_watermark,
+    watermark_expired,
+    deleted_post_ids
+)
 
 posts_table = get_table('POSTS_TABLE_NAME')
 likes_table = get_table('LIKES_TABLE_NAME')
 comments_table = get_table('COMMENTS_TABLE_NAME')
+deletions_table = get_table('DELETIONS_TABLE_NAME')
+like_filters_table = get_table('LIKE_FILTERS_TABLE_NAME')
+like_counters_table = get_table('LIKE_COUNTERS_TABLE_NAME')
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+
+def changed_user_posts(user_id, since):
+    # Every live post by the user changed after the watermark (all pages)
+    posts = []
+    query_kwargs = {
+        'IndexName': 'UserIdIndex',
+        'KeyConditionExpression': 'user_id = :user_id',
+        'FilterExpression': CHANGED_SINCE_FILTER,
+        'ExpressionAttributeValues': {
+            ':user_id': user_id,
+            ':since': since
+        },
+        'ScanIndexForward': False
+    }
+    while True:
+        response = posts_table.query(**query_kwargs)
+        posts.extend(post for post in response.get('Items', []) if not post.get('archived'))
+        if 'LastEvaluatedKey' not in response:
+            return posts
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
 
 @error_handler
 def lambda_handler(event, context):
+    """
+    GET /posts/user?user_id={id}&limit={n}&cursor={cursor} - Get a user's posts, newest first
+    Pages through live posts first, then continues into the archive once the
+    cursor passes the oldest post still held in DynamoDB
+    GET /posts/user?user_id={id}&since={watermark} - Delta sync: only posts changed
+    since the watermark plus ids deleted since then (see get_feed)
+    """
     # Extract authenticated user_id from Cognito authorizer claims (for authorization)
     auth_user_id = get_user_id_from_event(event)
     
     # Check if requesting another user's posts via query parameter
     target_user_id = get_query_param(event, 'user_id', auth_user_id)
     
-    # Query posts by user_id using GSI
-    response = posts_table.query(
-        IndexName='UserIdIndex',
-        KeyConditionExpression='user_id = :user_id',
-        ExpressionAttributeValues={
-            ':user_id': target_user_id
-        },
-        ScanIndexForward=False  # Sort by created_at descending (newest first)
-    )
-    
-    posts = response.get('Items', [])
-    
-    # For each post, add like and comment counts
-    for post in posts:
-        post_id = post['post_id']
-        
-        # Get like count
-        likes_response = likes_table.query(
-            KeyConditionExpression='target_id = :target_id',
-            ExpressionAttributeValues={
-                ':target_id': post_id
-            }
-        )
-        post_likes = [like for like in likes_response.get('Items', []) if like.get('target_type') == 'post']
-        post['like_count'] = len(post_likes)
-        
-        # Check if current user liked this post
-        post['liked_by_user'] = any(like['user_id'] == auth_user_id for like in post_likes)
-        
-        # Get comment count
-        comments_response = comments_table.query(
-            KeyConditionExpression='post_id = :post_id',
-            ExpressionAttributeValues={
-                ':post_id': post_id
-            },
-            Select='COUNT'
-        )
-        post['comment_count'] = comments_response.get('Count', 0)
-    
-    return success_response(posts)
-
+    since = get_query_param(event, 'since')
+    delta_sync = since is not None
+    if delta_sync and (not since or watermark_expired(since)):
+        since = None
+    watermark = new_watermark()
+    
+    if since:
+        posts = changed_user_posts(target_user_id, since)
+        add_post_counts(likes_table, comments_table, like_filters_table, like_counters_table, posts, auth_user_id)
+        return success_response({
+            'posts': posts,
+            'deleted': deleted_post_ids(deletions_table, since, target_user_id),
+            'watermark': watermark,
+            'full': False
+        })
+    
+    try:
+        limit = int(get_query_param(event, 'limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        limit = DEFAULT_PAGE_SIZE
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    
+    raw_cursor = get_query_param(event, 'cursor')
+    cursor = decode_cursor(raw_cursor)
+    if raw_cursor and (cursor is None or not valid_page_cursor(cursor, target_user_id)):
+        return error_response('Invalid cursor')
+    
+    posts, next_cursor = read_user_posts_page(posts_table, target_user_id, auth_user_id, cursor, limit)
+    
+    add_post_counts(likes_table, comments_table, like_filters_table, like_counters_table, posts, auth_user_id)
+    
+    result = {'posts': posts, 'next_cursor': encode_cursor(next_cursor)}
+    if delta_sync:
+        # Full resync - the client starts delta syncing from this watermark
+        result.update({'deleted': [], 'watermark': watermark, 'full': True})
+    return success_response(result)
@@ -8,12 +8,19 @@ from utils.helpers import (
     get_user_id_from_event,
     get_table
 )
+from utils.shared_cache import cached_get_item
+from utils.like_filter import add_liked_target
+from utils.post_aggregate import aggregate_add_comment_like, aggregate_remove_comment_like
+from utils.rate_limit import rate_limited
 
 comments_table = get_table('COMMENTS_TABLE_NAME')
 likes_table = get_table('LIKES_TABLE_NAME')
 profiles_table = get_table('PROFILES_TABLE_NAME')
+like_filters_table = get_table('LIKE_FILTERS_TABLE_NAME')
+aggregates_table = get_table('POST_AGGREGATES_TABLE_NAME')
 
 @error_handler
+@rate_limited('likes')
 def lambda_handler(event, context):
     # Extract user_id from Cognito authorizer claims
     user_id = get_user_id_from_event(event)
@@ -36,10 +43,10 @@ def lambda_handler(event, context):
         return not_found_response('Comment not found')
     
     # Get user's profile to retrieve display_name
-    profile_response = profiles_table.get_item(Key={'user_id': user_id})
-    if 'Item' not in profile_response:
+    profile = cached_get_item(profiles_table, {'user_id': user_id}, 'profiles')
+    if profile is None:
         return not_found_response('Profile not found. Please complete onboarding first.')
-    display_name = profile_response['Item'].get('display_name', 'Unknown User')
+    display_name = profile.get('display_name', 'Unknown User')
     
     # Check if like already exists
     like_response = likes_table.get_item(
@@ -57,9 +64,12 @@ def lambda_handler(event, context):
                 'user_id': user_id
             }
         )
+        aggregate_remove_comment_like(aggregates_table, comment_response['Item'], user_id)
         return success_response({'liked': False, 'message': 'Comment unliked'})
     else:
-        # Like - create the like
+        # Like - create the like, recording it in the user's like filter first
+        # so readers never rule out a like that exists
+        add_liked_target(like_filters_table, user_id, comment_id)
         like_item = {
             'target_id': comment_id,
             'user_id': user_id,
@@ -67,5 +77,6 @@ def lambda_handler(event, context):
             'display_name': display_name
         }
         likes_table.put_item(Item=like_item)
+        aggregate_add_comment_like(aggregates_table, comment_response['Item'], like_item)
         return success_response({'liked': True, 'message': 'Comment liked'})
 
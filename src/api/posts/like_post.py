@@ -1,20 +1,34 @@
+from botocore.exceptions import ClientError
 from utils.response_builder import (
     success_response,
     error_response,
     not_found_response,
+    forbidden_response,
     server_error_response,
     error_handler
 )
 from utils.helpers import (
     get_user_id_from_event,
-    get_table
+    get_table,
+    get_current_timestamp
 )
+from utils.shared_cache import cached_get_item
+from utils.profile_counters import increment_profile_counters
+from utils.feed_sync import touch_post
+from utils.like_filter import add_liked_target
+from utils.post_aggregate import aggregate_add_post_like, aggregate_remove_post_like
+from utils.like_counters import add_like
+from utils.rate_limit import rate_limited
 
 posts_table = get_table('POSTS_TABLE_NAME')
 likes_table = get_table('LIKES_TABLE_NAME')
 profiles_table = get_table('PROFILES_TABLE_NAME')
+like_filters_table = get_table('LIKE_FILTERS_TABLE_NAME')
+aggregates_table = get_table('POST_AGGREGATES_TABLE_NAME')
+like_counters_table = get_table('LIKE_COUNTERS_TABLE_NAME')
 
 @error_handler
+@rate_limited('likes')
 def lambda_handler(event, context):
     """
     POST /posts/{post_id}/like - Toggle like on a post
@@ -29,15 +43,17 @@ def lambda_handler(event, context):
         return error_response('post_id is required')
     
     # Check if post exists
-    post_response = posts_table.get_item(Key={'post_id': post_id})
-    if 'Item' not in post_response:
+    post = cached_get_item(posts_table, {'post_id': post_id}, 'posts')
+    if post is None:
         return not_found_response('Post not found')
+    if post.get('archived'):
+        return forbidden_response('Archived posts are read-only')
     
     # Get user's profile to retrieve display_name
-    profile_response = profiles_table.get_item(Key={'user_id': user_id})
-    if 'Item' not in profile_response:
+    profile = cached_get_item(profiles_table, {'user_id': user_id}, 'profiles')
+    if profile is None:
         return not_found_response('Profile not found. Please complete onboarding first.')
-    display_name = profile_response['Item'].get('display_name', 'Unknown User')
+    display_name = profile.get('display_name', 'Unknown User')
     
     # Check if like already exists
     like_response = likes_table.get_item(
@@ -49,21 +65,40 @@ def lambda_handler(event, context):
     
     if 'Item' in like_response:
         # Unlike - delete the like
-        likes_table.delete_item(
+        delete_response = likes_table.delete_item(
             Key={
                 'target_id': post_id,
                 'user_id': user_id
-            }
+            },
+            ReturnValues='ALL_OLD'
         )
+        # Only the request that actually removed the like adjusts the counter
+        if 'Attributes' in delete_response:
+            increment_profile_counters(profiles_table, post['user_id'], likes_received=-1)
+            touch_post(posts_table, post_id, get_current_timestamp())
+            aggregate_remove_post_like(aggregates_table, post_id, user_id)
+            add_like(like_counters_table, post_id, -1)
         return success_response({'liked': False, 'message': 'Post unliked'})
     else:
-        # Like - create the like
+        # Like - create the like, recording it in the user's like filter first
+        # so readers never rule out a like that exists
+        add_liked_target(like_filters_table, user_id, post_id)
         like_item = {
             'target_id': post_id,
             'user_id': user_id,
             'target_type': 'post',
             'display_name': display_name
         }
-        likes_table.put_item(Item=like_item)
+        try:
+            likes_table.put_item(Item=like_item, ConditionExpression='attribute_not_exists(user_id)')
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            # A concurrent request already liked the post
+            return success_response({'liked': True, 'message': 'Post liked'})
+        increment_profile_counters(profiles_table, post['user_id'], likes_received=1)
+        touch_post(posts_table, post_id, get_current_timestamp())
+        aggregate_add_post_like(aggregates_table, like_item)
+        add_like(like_counters_table, post_id, 1)
         return success_response({'liked': True, 'message': 'Post liked'})
 
@@ -0,0 +1,62 @@
+import os
+from utils.response_builder import event_handler
+from utils.helpers import get_table, parallel_scan
+from utils.like_filter import save_rebuilt_filter
+
+like_filters_table = get_table('LIKE_FILTERS_TABLE_NAME')
+likes_table = get_table('LIKES_TABLE_NAME')
+
+DEFAULT_SCAN_SEGMENTS = 4
+
+
+def snapshot_versions(segments):
+    # user_id -> filter_version, read before the likes scan starts
+    def reduce_segment(items):
+        return {item['user_id']: item['filter_version'] for item in items}
+
+    versions = {}
+    for segment_versions in parallel_scan(like_filters_table, reduce_segment, segments,
+                                          ProjectionExpression='user_id, filter_version'):
+        versions.update(segment_versions)
+    return versions
+
+
+def liked_targets_by_user(segments):
+    def reduce_segment(items):
+        targets = {}
+        for like in items:
+            targets.setdefault(like['user_id'], set()).add(like['target_id'])
+        return targets
+
+    targets = {}
+    for segment_targets in parallel_scan(likes_table, reduce_segment, segments,
+                                         ProjectionExpression='target_id, user_id',
+                                         ConsistentRead=True):
+        for user_id, target_ids in segment_targets.items():
+            targets.setdefault(user_id, set()).update(target_ids)
+    return targets
+
+
+@event_handler
+def lambda_handler(event, context):
+    """
+    Scheduled job - rebuild every user's like filter from the likes table
+    Clears bits left behind by unlikes and deleted targets, and resizes filters
+    that have grown past their capacity. A filter written to after the snapshot
+    is skipped and picked up by the next run.
+    """
+    segments = int(os.environ.get('LIKE_FILTER_SCAN_SEGMENTS', DEFAULT_SCAN_SEGMENTS))
+
+    versions = snapshot_versions(segments)
+    targets = liked_targets_by_user(segments)
+
+    rebuilt = 0
+    skipped = 0
+    for user_id in set(versions) | set(targets):
+        if save_rebuilt_filter(like_filters_table, user_id, targets.get(user_id, ()), versions.get(user_id)):
+            rebuilt += 1
+        else:
+            skipped += 1
+
+    print(f"Rebuilt {rebuilt} like filters, skipped {skipped} changed during the run")
+    return {'rebuilt': rebuilt, 'skipped': skipped}
@@ -0,0 +1,52 @@
+import os
+from datetime import datetime, timedelta
+from utils.response_builder import event_handler
+from utils.helpers import get_table
+from utils.like_counters import like_counter_writes_enabled, repair_like_counter
+
+posts_table = get_table('POSTS_TABLE_NAME')
+likes_table = get_table('LIKES_TABLE_NAME')
+like_counters_table = get_table('LIKE_COUNTERS_TABLE_NAME')
+
+# Twice the schedule interval, so a run that fails is covered by the next
+DEFAULT_LOOKBACK_HOURS = 48
+
+
+def recently_liked_post_ids(since):
+    # Live posts whose likes changed after `since` (like_post touches changed_at)
+    post_ids = []
+    scan_kwargs = {
+        'FilterExpression': 'changed_at > :since AND attribute_not_exists(archived)',
+        'ExpressionAttributeValues': {':since': since},
+        'ProjectionExpression': 'post_id'
+    }
+    while True:
+        response = posts_table.scan(**scan_kwargs)
+        post_ids.extend(post['post_id'] for post in response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return post_ids
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+@event_handler
+def lambda_handler(event, context):
+    """
+    Scheduled job - recount the likes of every post liked or unliked in the
+    last LIKE_COUNTER_REPAIR_LOOKBACK_HOURS and correct sharded like counters
+    that drifted when a best-effort counter write failed
+    """
+    if not like_counter_writes_enabled():
+        return {'checked': 0, 'repaired': 0}
+    lookback_hours = int(os.environ.get('LIKE_COUNTER_REPAIR_LOOKBACK_HOURS', DEFAULT_LOOKBACK_HOURS))
+    since = (datetime.utcnow() - timedelta(hours=lookback_hours)).isoformat()
+
+    post_ids = recently_liked_post_ids(since)
+    repaired = 0
+    for post_id in post_ids:
+        drift = repair_like_counter(likes_table, like_counters_table, post_id)
+        if drift:
+            print(f"Repaired like counter for {post_id} by {drift}")
+            repaired += 1
+
+    print(f"Checked {len(post_ids)} like counters changed since {since}, repaired {repaired}")
+    return {'checked': len(post_ids), 'repaired': repaired}
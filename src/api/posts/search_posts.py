@@ -0,0 +1,54 @@
+from utils.response_builder import success_response, error_response, error_handler
+from utils.helpers import (
+    get_user_id_from_event,
+    get_table,
+    get_query_param,
+    encode_cursor,
+    decode_cursor,
+    batch_get_items
+)
+from utils.search_index import search_post_ids
+
+posts_table = get_table('POSTS_TABLE_NAME')
+search_index_table = get_table('SEARCH_INDEX_TABLE_NAME')
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 50
+
+@error_handler
+def lambda_handler(event, context):
+    """
+    GET /posts/search?query={terms}&limit={n}&cursor={cursor} - Search post content
+    Authenticated endpoint - returns posts containing every search term, newest first
+    """
+    # Extract user_id from Cognito authorizer claims for authentication
+    user_id = get_user_id_from_event(event)
+
+    query = get_query_param(event, 'query', '').strip()
+    if not query:
+        return success_response({'posts': [], 'count': 0, 'next_cursor': None})
+
+    try:
+        limit = int(get_query_param(event, 'limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        limit = DEFAULT_PAGE_SIZE
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    # Resume after the last posting of the previous page
+    raw_cursor = get_query_param(event, 'cursor')
+    cursor = decode_cursor(raw_cursor, ('sort_key',))
+    if raw_cursor and cursor is None:
+        return error_response('Invalid cursor')
+    before = cursor['sort_key'] if cursor else None
+
+    # Intersect the posting lists of all search terms
+    post_ids, next_sort_key = search_post_ids(search_index_table, query, limit, before)
+
+    # Hydrate matching posts in one batch, preserving posting order
+    items = batch_get_items(posts_table, [{'post_id': post_id} for post_id in post_ids])
+    posts_by_id = {item['post_id']: item for item in items}
+    posts = [posts_by_id[post_id] for post_id in post_ids if post_id in posts_by_id]
+
+    next_cursor = encode_cursor({'sort_key': next_sort_key}) if next_sort_key else None
+
+    return success_response({'posts': posts, 'count': len(posts), 'next_cursor': next_cursor})
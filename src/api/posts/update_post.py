@@ -1,8 +1,9 @@
+from botocore.exceptions import ClientError
 from utils.response_builder import (
     success_response,
     error_response,
-    not_found_response,
     forbidden_response,
+    conditional_failure_response,
     error_handler
 )
 from utils.validators import validate_post_content
@@ -13,10 +14,17 @@ from utils.helpers import (
     parse_request_body,
     get_path_param
 )
+from utils.search_index import reindex_post
+from utils.shared_cache import invalidate_cached_item
+from utils.post_aggregate import aggregate_update_post
+from utils.rate_limit import rate_limited
 
 table = get_table('POSTS_TABLE_NAME')
+search_index_table = get_table('SEARCH_INDEX_TABLE_NAME')
+aggregates_table = get_table('POST_AGGREGATES_TABLE_NAME')
 
 @error_handler
+@rate_limited('post_edits')
 def lambda_handler(event, context):
     """
     PUT /posts/{post_id} - Update a post
@@ -37,27 +45,36 @@ def lambda_handler(event, context):
     if not is_valid:
         return error_response(error_msg)
     
-    # Get existing post to verify ownership
-    existing = table.get_item(Key={'post_id': post_id})
-    if 'Item' not in existing:
-        return not_found_response('Post not found')
+    # Update post only if it exists and belongs to the caller (single round trip)
+    timestamp = get_current_timestamp()
     
-    # Verify ownership
-    if existing['Item']['user_id'] != user_id:
-        return forbidden_response('Forbidden - You can only edit your own posts')
+    try:
+        response = table.update_item(
+            Key={'post_id': post_id},
+            UpdateExpression='SET content = :content, updated_at = :updated_at',
+            ConditionExpression='attribute_exists(post_id) AND user_id = :user_id AND attribute_not_exists(archived)',
+            ExpressionAttributeValues={
+                ':content': content,
+                ':updated_at': timestamp,
+                ':user_id': user_id
+            },
+            ReturnValues='ALL_OLD',
+            ReturnValuesOnConditionCheckFailure='ALL_OLD'
+        )
+    except ClientError as e:
+        if 'archived' in e.response.get('Item', {}):
+            return forbidden_response('Archived posts are read-only')
+        return conditional_failure_response(e, 'Post not found', 'Forbidden - You can only edit your own posts')
     
-    # Update post
-    timestamp = get_current_timestamp()
+    old_post = response['Attributes']
+    updated_post = dict(old_post, content=content, updated_at=timestamp)
+    
+    # Update search postings for terms that were added or removed
+    reindex_post(search_index_table, old_post, updated_post)
+    aggregate_update_post(aggregates_table, updated_post)
+    
+    # Drop the cached copy; older fills are rejected until it expires
+    invalidate_cached_item({'post_id': post_id}, 'posts', timestamp)
     
-    response = table.update_item(
-        Key={'post_id': post_id},
-        UpdateExpression='SET content = :content, updated_at = :updated_at',
-        ExpressionAttributeValues={
-            ':content': content,
-            ':updated_at': timestamp
-        },
-        ReturnValues='ALL_NEW'
-    )
-    
-    return success_response(response['Attributes'])
+    return success_response(updated_post)
 
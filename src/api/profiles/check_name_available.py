@@ -0,0 +1,37 @@
+from utils.response_builder import (
+    success_response,
+    error_response,
+    error_handler
+)
+from utils.validators import validate_display_name
+from utils.helpers import (
+    get_user_id_from_event,
+    get_table,
+    get_query_param
+)
+from utils.display_names import normalize_display_name
+
+display_names_table = get_table('DISPLAY_NAMES_TABLE_NAME')
+
+@error_handler
+def lambda_handler(event, context):
+    """
+    GET /profile/name-available?name={display_name} - Whether a display name can be used
+    A name the caller already holds counts as available to them
+    """
+    # Extract authenticated user_id from Cognito authorizer claims
+    user_id = get_user_id_from_event(event)
+
+    display_name = (get_query_param(event, 'name') or '').strip()
+    is_valid, error_msg = validate_display_name(display_name)
+    if not is_valid:
+        return error_response(error_msg)
+
+    # One read of the name's reservation
+    response = display_names_table.get_item(Key={'name_key': normalize_display_name(display_name)})
+    owner = response.get('Item', {}).get('user_id')
+
+    return success_response({
+        'display_name': display_name,
+        'available': owner is None or owner == user_id
+    })
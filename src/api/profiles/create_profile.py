@@ -1,3 +1,4 @@
+from botocore.exceptions import ClientError
 from utils.response_builder import (
     success_response,
     error_response,
@@ -5,15 +6,20 @@ from utils.response_builder import (
 )
 from utils.validators import validate_profile_data
 from utils.helpers import (
+    dynamodb,
     get_user_id_from_event,
     get_table,
     get_current_timestamp,
     parse_request_body
 )
+from utils.rate_limit import rate_limited
+from utils.display_names import reservation_put, failed_transaction_items
 
 table = get_table('TABLE_NAME')
+display_names_table = get_table('DISPLAY_NAMES_TABLE_NAME')
 
 @error_handler
+@rate_limited('profile_edits')
 def lambda_handler(event, context):
     """
     POST /profile - Create user profile
@@ -48,13 +54,28 @@ def lambda_handler(event, context):
         'updated_at': timestamp
     }
     
-    # Check if profile already exists
-    existing = table.get_item(Key={'user_id': user_id})
-    if 'Item' in existing:
-        return error_response('Profile already exists. Use PUT to update.', 409)
-    
-    # Save to DynamoDB
-    table.put_item(Item=profile)
+    # Create the profile and reserve its display name together; the profile
+    # put is conditional, so an existing profile needs no separate read
+    try:
+        dynamodb.meta.client.transact_write_items(TransactItems=[
+            {
+                'Put': {
+                    'TableName': table.name,
+                    'Item': profile,
+                    'ConditionExpression': 'attribute_not_exists(user_id)'
+                }
+            },
+            reservation_put(display_names_table.name, display_name, user_id, timestamp)
+        ])
+    except ClientError as e:
+        failed = failed_transaction_items(e)
+        if failed is None:
+            raise
+        if 0 in failed:
+            return error_response('Profile already exists. Use PUT to update.', 409)
+        if 1 in failed:
+            return error_response('display_name is already taken', 409)
+        raise
     
     return success_response(profile, 201)
 
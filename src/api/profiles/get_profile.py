@@ -8,26 +8,13 @@ from utils.helpers import (
     get_table,
     get_query_param
 )
+from utils.shared_cache import cached_get_item
+from utils.profile_counters import with_counter_defaults
+from utils.profile_privacy import filter_private_profile
 
 table = get_table('TABLE_NAME')
 
 
-def filter_private_profile(profile, is_own_profile):
-    # If viewing own profile or profile is not private, return full profile
-    if is_own_profile or not profile.get('profile_private', False):
-        return profile
-    
-    # For private profiles viewed by others, only show name and metadata
-    return {
-        'user_id': profile.get('user_id'),
-        'display_name': profile.get('display_name'),
-        'bio': '',
-        'political_alignment': '',
-        'profile_private': True,
-        'created_at': profile.get('created_at'),
-        'updated_at': profile.get('updated_at')
-    }
-
 @error_handler
 def lambda_handler(event, context):
     """
@@ -41,17 +28,17 @@ def lambda_handler(event, context):
     # Check if requesting another user's profile via query parameter
     target_user_id = get_query_param(event, 'user_id', auth_user_id)
     
-    # Get profile from DynamoDB
-    response = table.get_item(Key={'user_id': target_user_id})
+    # Get profile (read-through the shared cache when configured)
+    profile = cached_get_item(table, {'user_id': target_user_id}, 'profiles')
     
-    if 'Item' not in response:
+    if profile is None:
         return not_found_response('Profile not found')
     
     # Determine if viewing own profile
     is_own_profile = auth_user_id == target_user_id
     
     # Filter profile data based on privacy settings
-    filtered_profile = filter_private_profile(response['Item'], is_own_profile)
+    filtered_profile = filter_private_profile(with_counter_defaults(profile), is_own_profile)
     
     return success_response(filtered_profile)
 
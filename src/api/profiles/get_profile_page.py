@@ -0,0 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor
+from utils.response_builder import (
+    success_response,
+    not_found_response,
+    error_handler
+)
+from utils.helpers import (
+    get_user_id_from_event,
+    get_table,
+    get_query_param,
+    get_path_param,
+    encode_cursor
+)
+from utils.shared_cache import cached_get_item
+from utils.profile_counters import with_counter_defaults
+from utils.profile_privacy import filter_private_profile
+from utils.user_posts import add_post_counts, read_user_posts_page
+from utils.polls import add_poll_questions
+
+profiles_table = get_table('PROFILES_TABLE_NAME')
+posts_table = get_table('POSTS_TABLE_NAME')
+likes_table = get_table('LIKES_TABLE_NAME')
+comments_table = get_table('COMMENTS_TABLE_NAME')
+like_filters_table = get_table('LIKE_FILTERS_TABLE_NAME')
+like_counters_table = get_table('LIKE_COUNTERS_TABLE_NAME')
+polls_table = get_table('POLLS_TABLE_NAME')
+poll_votes_table = get_table('POLL_VOTES_TABLE_NAME')
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 50
+
+
+def load_posts(target_user_id, auth_user_id, limit):
+    posts, next_cursor = read_user_posts_page(posts_table, target_user_id, auth_user_id, None, limit)
+    add_post_counts(likes_table, comments_table, like_filters_table, like_counters_table, posts, auth_user_id)
+    return posts, next_cursor
+
+
+def load_votes(target_user_id, limit):
+    # Newest votes first via the user's GSI partition
+    response = poll_votes_table.query(
+        IndexName='UserVotesIndex',
+        KeyConditionExpression='user_id = :user_id',
+        ExpressionAttributeValues={
+            ':user_id': target_user_id
+        },
+        ScanIndexForward=False,
+        Limit=limit
+    )
+    votes = response.get('Items', [])
+    add_poll_questions(polls_table, votes)
+    return votes, response.get('LastEvaluatedKey')
+
+
+@error_handler
+def lambda_handler(event, context):
+    """
+    GET /profile/{user_id}/page?limit={n} - Everything the profile page shows in one request:
+    the profile plus the first page of the user's posts and poll votes
+    Use `me` as the user_id for the caller's own profile. Older posts continue
+    from posts_next_cursor via GET /posts/user, older votes from votes_next_cursor
+    via GET /polls/user/votes?limit=
+    """
+    # Extract authenticated user_id from Cognito authorizer claims
+    auth_user_id = get_user_id_from_event(event)
+
+    target_user_id = get_path_param(event, 'user_id')
+    if target_user_id == 'me':
+        target_user_id = auth_user_id
+
+    try:
+        limit = int(get_query_param(event, 'limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        limit = DEFAULT_PAGE_SIZE
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    # The three reads are independent, so issue them concurrently
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        profile_future = executor.submit(cached_get_item, profiles_table, {'user_id': target_user_id}, 'profiles')
+        posts_future = executor.submit(load_posts, target_user_id, auth_user_id, limit)
+        votes_future = executor.submit(load_votes, target_user_id, limit)
+        profile = profile_future.result()
+        posts, posts_next_cursor = posts_future.result()
+        votes, votes_next_key = votes_future.result()
+
+    if profile is None:
+        return not_found_response('Profile not found')
+
+    # Filter profile data based on privacy settings
+    is_own_profile = auth_user_id == target_user_id
+    filtered_profile = filter_private_profile(with_counter_defaults(profile), is_own_profile)
+
+    return success_response({
+        'profile': filtered_profile,
+        'is_own_profile': is_own_profile,
+        'posts': posts,
+        'posts_next_cursor': encode_cursor(posts_next_cursor),
+        'votes': votes,
+        'votes_next_cursor': encode_cursor(votes_next_key)
+    })
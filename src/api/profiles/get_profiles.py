@@ -0,0 +1,54 @@
+from utils.response_builder import (
+    success_response,
+    error_response,
+    error_handler
+)
+from utils.helpers import (
+    get_user_id_from_event,
+    get_table,
+    get_query_param,
+    batch_get_items
+)
+from utils.profile_counters import with_counter_defaults
+from utils.profile_privacy import filter_private_profile
+
+table = get_table('TABLE_NAME')
+
+MAX_BATCH_IDS = 100
+
+
+@error_handler
+def lambda_handler(event, context):
+    """
+    GET /profiles?ids={id1,id2,...} - Retrieve up to 100 profiles in one request
+    Authenticated endpoint - requires valid JWT token
+    Returns profiles keyed by user_id; IDs with no profile are listed in `missing`
+    """
+    # Extract authenticated user_id from Cognito authorizer claims
+    auth_user_id = get_user_id_from_event(event)
+
+    # Parse the comma-separated IDs, dropping blanks and duplicates
+    user_ids = []
+    for user_id in get_query_param(event, 'ids', '').split(','):
+        user_id = user_id.strip()
+        if user_id and user_id not in user_ids:
+            user_ids.append(user_id)
+
+    if not user_ids:
+        return error_response('ids is required')
+
+    if len(user_ids) > MAX_BATCH_IDS:
+        return error_response(f'ids must not contain more than {MAX_BATCH_IDS} user IDs')
+
+    # Fetch with chunked BatchGetItem (unprocessed keys are retried)
+    items = batch_get_items(table, [{'user_id': user_id} for user_id in user_ids])
+
+    # Filter each profile based on privacy settings
+    profiles = {}
+    for profile in items:
+        is_own_profile = auth_user_id == profile['user_id']
+        profiles[profile['user_id']] = filter_private_profile(with_counter_defaults(profile), is_own_profile)
+
+    missing = [user_id for user_id in user_ids if user_id not in profiles]
+
+    return success_response({'profiles': profiles, 'missing': missing})
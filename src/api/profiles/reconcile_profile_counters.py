@@ -0,0 +1,146 @@
+import os
+from datetime import datetime
+from collections import Counter
+from botocore.exceptions import ClientError
+from utils.response_builder import event_handler
+from utils.helpers import get_table, parallel_scan
+from utils.profile_counters import COUNTER_FIELDS, ARCHIVED_COUNTER_FIELDS
+from utils.shared_cache import invalidate_cached_item
+
+profiles_table = get_table('PROFILES_TABLE_NAME')
+posts_table = get_table('POSTS_TABLE_NAME')
+likes_table = get_table('LIKES_TABLE_NAME')
+comments_table = get_table('COMMENTS_TABLE_NAME')
+poll_votes_table = get_table('POLL_VOTES_TABLE_NAME')
+archive_totals_table = get_table('ARCHIVE_TOTALS_TABLE_NAME')
+
+DEFAULT_SCAN_SEGMENTS = 4
+
+
+def merge_counters(results):
+    total = Counter()
+    for counts in results:
+        total.update(counts)
+    return total
+
+
+def count_live_posts(segments):
+    # post_id -> author for every live post; tombstones are counted from the archive
+    def reduce_segment(items):
+        return {item['post_id']: item['user_id'] for item in items if not item.get('archived')}
+
+    post_authors = {}
+    for authors in parallel_scan(posts_table, reduce_segment, segments,
+                                 ProjectionExpression='post_id, user_id, archived'):
+        post_authors.update(authors)
+    return post_authors
+
+
+def count_likes_received(segments, post_authors):
+    def reduce_segment(items):
+        counts = Counter()
+        for like in items:
+            author = post_authors.get(like['target_id'])
+            if author and like.get('target_type') == 'post':
+                counts[author] += 1
+        return counts
+
+    return merge_counters(parallel_scan(likes_table, reduce_segment, segments,
+                                        ProjectionExpression='target_id, target_type'))
+
+
+def count_by_user(table, segments):
+    def reduce_segment(items):
+        return Counter(item['user_id'] for item in items)
+
+    return merge_counters(parallel_scan(table, reduce_segment, segments,
+                                        ProjectionExpression='user_id'))
+
+
+def count_archived(expected, segments):
+    # Archived posts keep counting towards their author, as do comments on them;
+    # archive_posts keeps the per-user totals as it finishes each segment
+    def reduce_segment(items):
+        counts = {field: Counter() for field in ARCHIVED_COUNTER_FIELDS}
+        for item in items:
+            for field in ARCHIVED_COUNTER_FIELDS:
+                counts[field][item['user_id']] += int(item.get(field, 0))
+        return counts
+
+    for counts in parallel_scan(archive_totals_table, reduce_segment, segments,
+                                ProjectionExpression='user_id, ' + ', '.join(ARCHIVED_COUNTER_FIELDS)):
+        for field in ARCHIVED_COUNTER_FIELDS:
+            expected[field].update(counts[field])
+
+
+def repair_profile(profile, expected_counts):
+    """
+    Overwrite drifted counters. The write is conditional on the values we read,
+    so an increment that lands mid-run is never lost - that profile is simply
+    left for the next run.
+    """
+    current = {field: profile.get(field) for field in COUNTER_FIELDS}
+    if all(current[field] == expected_counts[field] for field in COUNTER_FIELDS):
+        return False
+
+    conditions = []
+    values = {}
+    for field in COUNTER_FIELDS:
+        values[f':{field}'] = expected_counts[field]
+        if current[field] is None:
+            conditions.append(f'attribute_not_exists(#{field})')
+        else:
+            conditions.append(f'#{field} = :current_{field}')
+            values[f':current_{field}'] = current[field]
+
+    changed_at = datetime.utcnow().isoformat()
+    values[':changed_at'] = changed_at
+    try:
+        profiles_table.update_item(
+            Key={'user_id': profile['user_id']},
+            UpdateExpression='SET changed_at = :changed_at, ' + ', '.join(f'#{field} = :{field}' for field in COUNTER_FIELDS),
+            ConditionExpression='attribute_exists(user_id) AND ' + ' AND '.join(conditions),
+            ExpressionAttributeNames={f'#{field}': field for field in COUNTER_FIELDS},
+            ExpressionAttributeValues=values
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        return False
+    invalidate_cached_item({'user_id': profile['user_id']}, 'profiles', changed_at)
+    return True
+
+
+@event_handler
+def lambda_handler(event, context):
+    """
+    Scheduled job - recompute profile activity counters and repair drift
+    Each source table is read with a parallel scan
+    """
+    segments = int(os.environ.get('RECONCILE_SCAN_SEGMENTS', DEFAULT_SCAN_SEGMENTS))
+
+    post_authors = count_live_posts(segments)
+    expected = {
+        'post_count': Counter(post_authors.values()),
+        'likes_received': count_likes_received(segments, post_authors),
+        'comment_count': count_by_user(comments_table, segments),
+        'poll_votes': count_by_user(poll_votes_table, segments)
+    }
+    count_archived(expected, segments)
+
+    def reduce_segment(profiles):
+        repaired = 0
+        for profile in profiles:
+            expected_counts = {field: expected[field][profile['user_id']] for field in COUNTER_FIELDS}
+            if repair_profile(profile, expected_counts):
+                repaired += 1
+        return repaired
+
+    repaired = sum(parallel_scan(
+        profiles_table, reduce_segment, segments,
+        ProjectionExpression='user_id, ' + ', '.join(f'#{field}' for field in COUNTER_FIELDS),
+        ExpressionAttributeNames={f'#{field}': field for field in COUNTER_FIELDS}
+    ))
+
+    print(f"Reconciled profile counters, repaired {repaired} profiles")
+    return {'repaired': repaired}
@@ -8,27 +8,11 @@ from utils.helpers import (
     get_table,
     get_query_param
 )
+from utils.profile_privacy import filter_private_profile
 
 table = get_table('TABLE_NAME')
 
 
-def filter_private_profile(profile, is_own_profile):
-    # If viewing own profile or profile is not private, return full profile
-    if is_own_profile or not profile.get('profile_private', False):
-        return profile
-    
-    # For private profiles viewed by others, only show name and metadata
-    return {
-        'user_id': profile.get('user_id'),
-        'display_name': profile.get('display_name'),
-        'bio': '',
-        'political_alignment': '',
-        'profile_private': True,
-        'created_at': profile.get('created_at'),
-        'updated_at': profile.get('updated_at')
-    }
-
-
 @error_handler
 def lambda_handler(event, context):
     """
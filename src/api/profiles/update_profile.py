@@ -1,3 +1,4 @@
+from botocore.exceptions import ClientError
 from utils.response_builder import (
     success_response,
     error_response,
@@ -6,15 +7,102 @@ from utils.response_builder import (
 )
 from utils.validators import validate_profile_data
 from utils.helpers import (
+    dynamodb,
     get_user_id_from_event,
     get_table,
     get_current_timestamp,
     parse_request_body
 )
+from utils.shared_cache import invalidate_cached_item
+from utils.rate_limit import rate_limited
+from utils.display_names import (
+    normalize_display_name,
+    reservation_put,
+    reservation_delete,
+    failed_transaction_items
+)
 
 table = get_table('TABLE_NAME')
+display_names_table = get_table('DISPLAY_NAMES_TABLE_NAME')
+
+
+def rename_profile(user_id, display_name, update_expression, expression_values):
+    """
+    Apply an update that sets display_name. The update is conditional on the
+    display_name we read, so a concurrent rename cannot leave a reservation
+    behind. Only a real rename (a different normalized name) touches the
+    reservations: the new name is reserved and the old one released, if we hold
+    it, in the same transaction. Keeping the name (or only changing its case)
+    never checks the reservation, so profiles whose legacy name was never
+    reserved, or is reserved by someone else, can still be saved.
+    Returns (updated profile, None) or (None, error response).
+    """
+    current = table.get_item(Key={'user_id': user_id}, ConsistentRead=True).get('Item')
+    if current is None:
+        return (None, not_found_response('Profile not found. Use POST to create.'))
+    old_name = current.get('display_name', '')
+    
+    condition_values = dict(expression_values)
+    condition_values[':current_display_name'] = old_name
+    condition_expression = 'attribute_exists(user_id) AND display_name = :current_display_name'
+    
+    if old_name and normalize_display_name(old_name) == normalize_display_name(display_name):
+        try:
+            response = table.update_item(
+                Key={'user_id': user_id},
+                UpdateExpression=update_expression,
+                ConditionExpression=condition_expression,
+                ExpressionAttributeValues=condition_values,
+                ReturnValues='ALL_NEW'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            return (None, error_response('Profile was changed by another request, please try again', 409))
+        return (response['Attributes'], None)
+    
+    transact_items = [
+        {
+            'Update': {
+                'TableName': table.name,
+                'Key': {'user_id': user_id},
+                'UpdateExpression': update_expression,
+                'ConditionExpression': condition_expression,
+                'ExpressionAttributeValues': condition_values
+            }
+        },
+        reservation_put(display_names_table.name, display_name, user_id, expression_values[':updated_at'])
+    ]
+    # Release the old name only if it is ours - a legacy name that was never
+    # reserved, or that another profile holds, is simply left alone
+    if old_name:
+        old_reservation = display_names_table.get_item(
+            Key={'name_key': normalize_display_name(old_name)},
+            ConsistentRead=True
+        ).get('Item')
+        if old_reservation and old_reservation.get('user_id') == user_id:
+            transact_items.append(reservation_delete(display_names_table.name, old_name, user_id))
+    
+    try:
+        dynamodb.meta.client.transact_write_items(TransactItems=transact_items)
+    except ClientError as e:
+        failed = failed_transaction_items(e)
+        if failed is None:
+            raise
+        if 1 in failed:
+            return (None, error_response('display_name is already taken', 409))
+        # The profile or the old reservation changed since we read them
+        return (None, error_response('Profile was changed by another request, please try again', 409))
+    
+    # The transaction returns no attributes; the profile is what we read plus our changes
+    updated = dict(current)
+    for placeholder, value in expression_values.items():
+        updated[placeholder[1:]] = value
+    return (updated, None)
+
 
 @error_handler
+@rate_limited('profile_edits')
 def lambda_handler(event, context):
     """
     PUT /profile - Update user profile
@@ -37,11 +125,6 @@ def lambda_handler(event, context):
     if not is_valid:
         return error_response(error_msg)
     
-    # Check if profile exists
-    existing = table.get_item(Key={'user_id': user_id})
-    if 'Item' not in existing:
-        return not_found_response('Profile not found. Use POST to create.')
-    
     # Build update expression dynamically
     update_expression = "SET updated_at = :updated_at"
     expression_values = {':updated_at': get_current_timestamp()}
@@ -62,13 +145,28 @@ def lambda_handler(event, context):
         update_expression += ", profile_private = :profile_private"
         expression_values[':profile_private'] = profile_private
     
-    # Update profile
-    response = table.update_item(
-        Key={'user_id': user_id},
-        UpdateExpression=update_expression,
-        ExpressionAttributeValues=expression_values,
-        ReturnValues='ALL_NEW'
-    )
+    if display_name:
+        attributes, rename_error = rename_profile(user_id, display_name, update_expression, expression_values)
+        if rename_error:
+            return rename_error
+    else:
+        # Update profile only if it exists (no separate existence read)
+        try:
+            response = table.update_item(
+                Key={'user_id': user_id},
+                UpdateExpression=update_expression,
+                ConditionExpression='attribute_exists(user_id)',
+                ExpressionAttributeValues=expression_values,
+                ReturnValues='ALL_NEW'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            return not_found_response('Profile not found. Use POST to create.')
+        attributes = response['Attributes']
+    
+    # Drop the cached copy so display_name changes are picked up everywhere
+    invalidate_cached_item({'user_id': user_id}, 'profiles', expression_values[':updated_at'])
     
-    return success_response(response['Attributes'])
+    return success_response(attributes)
 
@@ -0,0 +1,136 @@
+import os
+from boto3.dynamodb.types import TypeDeserializer
+from utils.response_builder import event_handler
+from utils.helpers import get_table, batch_get_items
+from utils.realtime import (
+    FEED_TOPIC,
+    post_topic,
+    broadcast,
+    get_connection_manager
+)
+
+connections_table = get_table('CONNECTIONS_TABLE_NAME')
+posts_table = get_table('POSTS_TABLE_NAME')
+
+POSTS_TABLE = os.environ['POSTS_TABLE_NAME']
+LIKES_TABLE = os.environ['LIKES_TABLE_NAME']
+COMMENTS_TABLE = os.environ['COMMENTS_TABLE_NAME']
+
+_deserializer = TypeDeserializer()
+
+
+def source_table(record):
+    # eventSourceARN: arn:aws:dynamodb:{region}:{account}:table/{name}/stream/{label}
+    return record['eventSourceARN'].split(':table/', 1)[1].split('/', 1)[0]
+
+
+def image(record, name):
+    raw = record['dynamodb'].get(name) or {}
+    return {key: _deserializer.deserialize(value) for key, value in raw.items()}
+
+
+def post_event(record):
+    old, new = image(record, 'OldImage'), image(record, 'NewImage')
+    if record['eventName'] == 'INSERT':
+        return ([FEED_TOPIC], {
+            'type': 'post_created',
+            'post_id': new['post_id'],
+            'user_id': new['user_id'],
+            'display_name': new.get('display_name'),
+            'content': new.get('content'),
+            'created_at': new.get('created_at')
+        })
+    if record['eventName'] == 'REMOVE':
+        # An expiring archive tombstone is not a deletion - the post lives on in the archive
+        if old.get('archived'):
+            return None
+        return ([FEED_TOPIC, post_topic(old['post_id'])], {'type': 'post_deleted', 'post_id': old['post_id']})
+    # Only edits are news - counter, preview and archive updates are not
+    if new.get('content') != old.get('content') and not new.get('archived'):
+        return ([FEED_TOPIC, post_topic(new['post_id'])], {
+            'type': 'post_updated',
+            'post_id': new['post_id'],
+            'content': new.get('content'),
+            'updated_at': new.get('updated_at')
+        })
+    return None
+
+
+def like_event(record):
+    like = image(record, 'NewImage') or image(record, 'OldImage')
+    if record['eventName'] == 'MODIFY' or like.get('target_type') != 'post':
+        return None
+    return ([FEED_TOPIC, post_topic(like['target_id'])], {
+        'type': 'like',
+        'post_id': like['target_id'],
+        'user_id': like['user_id'],
+        'liked': record['eventName'] == 'INSERT'
+    })
+
+
+def comment_event(record):
+    if record['eventName'] == 'INSERT':
+        comment = image(record, 'NewImage')
+        return ([FEED_TOPIC, post_topic(comment['post_id'])], {
+            'type': 'comment_created',
+            'post_id': comment['post_id'],
+            'comment_id': comment['comment_id'],
+            'user_id': comment['user_id'],
+            'display_name': comment.get('display_name'),
+            'content': comment.get('content'),
+            'created_at': comment.get('created_at')
+        })
+    if record['eventName'] == 'REMOVE':
+        comment = image(record, 'OldImage')
+        return ([FEED_TOPIC, post_topic(comment['post_id'])], {
+            'type': 'comment_deleted',
+            'post_id': comment['post_id'],
+            'comment_id': comment['comment_id']
+        })
+    return None
+
+
+EVENT_BUILDERS = {
+    POSTS_TABLE: post_event,
+    LIKES_TABLE: like_event,
+    COMMENTS_TABLE: comment_event
+}
+
+
+def is_removal(payload):
+    # A like or comment going away - which archive_posts also causes
+    return payload['type'] == 'comment_deleted' or (payload['type'] == 'like' and not payload['liked'])
+
+
+def drop_archive_removals(events):
+    # archive_posts tombstones a post before purging its likes and comments
+    # from the hot tables, so removals on an archived post are not news
+    post_ids = {payload['post_id'] for _, payload in events if is_removal(payload)}
+    if not post_ids:
+        return events
+    posts = batch_get_items(posts_table, [{'post_id': post_id} for post_id in post_ids],
+                            projection_expression='post_id, archived')
+    archived = {post['post_id'] for post in posts if post.get('archived')}
+    return [(topics, payload) for topics, payload in events
+            if not (is_removal(payload) and payload['post_id'] in archived)]
+
+
+@event_handler
+def lambda_handler(event, context):
+    """
+    DynamoDB Streams consumer for the posts, likes and comments tables
+    Turns each batch of changes into compact events and pushes them to
+    WebSocket subscribers of the feed and of the affected posts
+    Errors propagate so the stream retries the batch rather than dropping it
+    """
+    events = []
+    for record in event.get('Records', []):
+        builder = EVENT_BUILDERS.get(source_table(record))
+        built = builder(record) if builder else None
+        if built:
+            events.append(built)
+    events = drop_archive_removals(events)
+    
+    sent = broadcast(connections_table, get_connection_manager(), events)
+    
+    return {'events': len(events), 'messages': sent}
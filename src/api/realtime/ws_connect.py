@@ -0,0 +1,31 @@
+from utils.response_builder import (
+    success_response,
+    unauthorized_response,
+    error_handler
+)
+from utils.helpers import get_table, get_query_param
+from utils.cognito_jwt import verify_id_token
+from utils.realtime import register_connection
+
+connections_table = get_table('CONNECTIONS_TABLE_NAME')
+
+@error_handler
+def lambda_handler(event, context):
+    """
+    WebSocket $connect - wss://.../{stage}?token={id_token}
+    Browsers cannot set an Authorization header on a WebSocket, so the Cognito
+    ID token arrives as a query parameter and is verified here
+    """
+    token = get_query_param(event, 'token')
+    if not token:
+        return unauthorized_response()
+    
+    try:
+        claims = verify_id_token(token)
+    except ValueError as e:
+        print(f"Rejected WebSocket connection: {str(e)}")
+        return unauthorized_response()
+    
+    register_connection(connections_table, event['requestContext']['connectionId'], claims['sub'])
+    
+    return success_response({'message': 'Connected'})
@@ -0,0 +1,14 @@
+from utils.response_builder import success_response, error_handler
+from utils.helpers import get_table
+from utils.realtime import remove_connection
+
+connections_table = get_table('CONNECTIONS_TABLE_NAME')
+
+@error_handler
+def lambda_handler(event, context):
+    """
+    WebSocket $disconnect - drop the connection and all of its subscriptions
+    """
+    remove_connection(connections_table, event['requestContext']['connectionId'])
+    
+    return success_response({'message': 'Disconnected'})
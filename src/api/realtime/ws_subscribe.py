@@ -0,0 +1,35 @@
+from utils.response_builder import (
+    success_response,
+    error_response,
+    not_found_response,
+    error_handler
+)
+from utils.helpers import get_table, parse_request_body
+from utils.realtime import is_valid_topic, subscribe
+
+connections_table = get_table('CONNECTIONS_TABLE_NAME')
+
+@error_handler
+def lambda_handler(event, context):
+    """
+    WebSocket subscribe route - {"action": "subscribe", "topics": ["feed", "post:{post_id}"]}
+    """
+    connection_id = event['requestContext']['connectionId']
+    
+    # Parse and validate topics
+    body = parse_request_body(event)
+    topics = body.get('topics')
+    if not isinstance(topics, list) or not topics:
+        return error_response('topics must be a non-empty list')
+    invalid = [topic for topic in topics if not is_valid_topic(topic)]
+    if invalid:
+        return error_response(f'Invalid topics: {", ".join(map(str, invalid))}')
+    
+    try:
+        subscribed = subscribe(connections_table, connection_id, topics)
+    except ValueError as e:
+        return error_response(str(e))
+    if subscribed is None:
+        return not_found_response('Connection not found')
+    
+    return success_response({'subscribed': subscribed})
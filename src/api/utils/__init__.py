@@ -7,7 +7,10 @@ from .response_builder import (
     not_found_response,
     forbidden_response,
     server_error_response,
+    too_many_requests_response,
+    conditional_failure_response,
     error_handler,
+    event_handler,
     decimal_default
 )
 from .validators import (
@@ -23,7 +26,34 @@ from .helpers import (
     get_current_timestamp,
     parse_request_body,
     get_query_param,
-    get_path_param
+    get_path_param,
+    encode_cursor,
+    decode_cursor,
+    batch_get_items,
+    parallel_scan
+)
+from .search_index import (
+    tokenize,
+    index_post,
+    unindex_post,
+    reindex_post,
+    search_post_ids
+)
+from .shared_cache import (
+    cached_get_item,
+    invalidate_cached_item
+)
+from .idempotency import idempotent
+from .rate_limit import rate_limited
+from .profile_counters import increment_profile_counters
+from .profile_privacy import filter_private_profile
+from .comment_previews import (
+    add_comment_preview,
+    remove_comment_preview
+)
+from .like_filter import (
+    liked_target_ids,
+    add_liked_target
 )
 
 __all__ = [
@@ -34,7 +64,10 @@ __all__ = [
     'not_found_response',
     'forbidden_response',
     'server_error_response',
+    'too_many_requests_response',
+    'conditional_failure_response',
     'error_handler',
+    'event_handler',
     'decimal_default',
     'validate_display_name',
     'validate_bio',
@@ -46,6 +79,25 @@ __all__ = [
     'get_current_timestamp',
     'parse_request_body',
     'get_query_param',
-    'get_path_param'
+    'get_path_param',
+    'encode_cursor',
+    'decode_cursor',
+    'batch_get_items',
+    'parallel_scan',
+    'tokenize',
+    'index_post',
+    'unindex_post',
+    'reindex_post',
+    'search_post_ids',
+    'cached_get_item',
+    'invalidate_cached_item',
+    'idempotent',
+    'rate_limited',
+    'add_comment_preview',
+    'remove_comment_preview',
+    'increment_profile_counters',
+    'filter_private_profile',
+    'liked_target_ids',
+    'add_liked_target'
 ]
 
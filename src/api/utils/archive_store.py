@@ -0,0 +1,237 @@
+"""
+Cold-storage tier for archived posts.
+Old posts are moved, together with their comments and likes, into gzip JSONL
+segments in S3 (or a local directory stand-in for tests) and replaced in
+DynamoDB by small tombstones. These helpers write segments and read them back
+so handlers can serve archived posts transparently.
+
+Segment keys are grouped per author and named by the time range they cover:
+    posts/{user_id}/{oldest}_{newest}_{run_id}.jsonl.gz
+Each line is one record: {"post": {...}, "comments": [...], "likes": [...]}.
+
+archive_posts first writes each segment under pending/ (same key otherwise),
+tombstones the posts with the final key, then writes the final segment with
+only the posts it tombstoned and deletes the pending copy. Listings only look
+under posts/, so posts that were never tombstoned never show up there; a
+tombstone whose final segment is not written yet reads from the pending copy.
+"""
+import os
+import re
+import gzip
+import json
+from collections import OrderedDict
+from .response_builder import decimal_default
+from .comment_previews import latest_previews
+from .tracing import instrument_client
+
+
+SEGMENT_PREFIX = 'posts'
+PENDING_PREFIX = 'pending'
+SEGMENT_SUFFIX = '.jsonl.gz'
+SEGMENT_CACHE_SIZE = 32
+
+
+def _time_token(timestamp):
+    # ISO timestamps are filesystem-hostile; keep only digits and the 'T' separator.
+    return re.sub(r'[^0-9T]', '', timestamp)
+
+
+def segment_key(user_id, oldest_created_at, newest_created_at, run_id):
+    return (f'{SEGMENT_PREFIX}/{user_id}/'
+            f'{_time_token(oldest_created_at)}_{_time_token(newest_created_at)}_{run_id}{SEGMENT_SUFFIX}')
+
+
+def pending_segment_key(key):
+    return f'{PENDING_PREFIX}/{key}'
+
+
+def final_segment_key(pending_key):
+    return pending_key[len(PENDING_PREFIX) + 1:]
+
+
+def parse_segment_key(key):
+    # Returns (oldest_token, newest_token) for a segment key.
+    name = key.rsplit('/', 1)[-1][:-len(SEGMENT_SUFFIX)]
+    oldest, newest, _ = name.split('_', 2)
+    return (oldest, newest)
+
+
+#####################################################################
+# OBJECT STORES
+#####################################################################
+
+class S3ArchiveStore:
+    def __init__(self, bucket_name):
+        import boto3
+        self.bucket_name = bucket_name
+        self._client = boto3.client('s3')
+        instrument_client(self._client)
+
+    def put(self, key, data):
+        self._client.put_object(Bucket=self.bucket_name, Key=key, Body=data,
+                                ContentType='application/x-ndjson', ContentEncoding='gzip')
+
+    def get(self, key):
+        # None when there is no such object
+        try:
+            return self._client.get_object(Bucket=self.bucket_name, Key=key)['Body'].read()
+        except self._client.exceptions.NoSuchKey:
+            return None
+
+    def delete(self, key):
+        self._client.delete_object(Bucket=self.bucket_name, Key=key)
+
+    def list(self, prefix):
+        keys = []
+        paginator = self._client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            keys.extend(obj['Key'] for obj in page.get('Contents', []))
+        return keys
+
+
+class LocalArchiveStore:
+    """Filesystem stand-in for S3, used by tests and local runs."""
+
+    def __init__(self, root_dir):
+        self.root_dir = root_dir
+
+    def _path(self, key):
+        return os.path.join(self.root_dir, *key.split('/'))
+
+    def put(self, key, data):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def delete(self, key):
+        os.remove(self._path(key))
+
+    def list(self, prefix):
+        base = self._path(prefix)
+        if not os.path.isdir(base):
+            return []
+        keys = []
+        for dirpath, _, filenames in os.walk(base):
+            for filename in filenames:
+                if filename.endswith(SEGMENT_SUFFIX):
+                    relative = os.path.relpath(os.path.join(dirpath, filename), self.root_dir)
+                    keys.append(relative.replace(os.sep, '/'))
+        return keys
+
+
+_store = None
+
+
+def get_archive_store():
+    # ARCHIVE_BUCKET_NAME selects S3; ARCHIVE_LOCAL_DIR selects the filesystem stand-in.
+    global _store
+    if _store is None:
+        if os.environ.get('ARCHIVE_BUCKET_NAME'):
+            _store = S3ArchiveStore(os.environ['ARCHIVE_BUCKET_NAME'])
+        elif os.environ.get('ARCHIVE_LOCAL_DIR'):
+            _store = LocalArchiveStore(os.environ['ARCHIVE_LOCAL_DIR'])
+        else:
+            raise KeyError('ARCHIVE_BUCKET_NAME')
+    return _store
+
+
+def set_archive_store(store):
+    global _store
+    _store = store
+
+
+#####################################################################
+# SEGMENTS
+#####################################################################
+
+# Segments are immutable once written, so warm containers keep recent ones.
+_segment_cache = OrderedDict()
+
+
+def write_segment(store, key, records):
+    lines = ''.join(json.dumps(record, default=decimal_default, separators=(',', ':')) + '\n'
+                    for record in records)
+    store.put(key, gzip.compress(lines.encode('utf-8')))
+    _segment_cache.pop(key, None)
+
+
+def read_segment(store, key):
+    if key in _segment_cache:
+        _segment_cache.move_to_end(key)
+        return _segment_cache[key]
+
+    data = store.get(key)
+    if data is None:
+        return None
+    raw = gzip.decompress(data).decode('utf-8')
+    records = [json.loads(line) for line in raw.splitlines() if line]
+
+    _segment_cache[key] = records
+    if len(_segment_cache) > SEGMENT_CACHE_SIZE:
+        _segment_cache.popitem(last=False)
+    return records
+
+
+def load_archived_record(store, archive_key, post_id):
+    records = read_segment(store, archive_key)
+    if records is None:
+        # Archived by a run that has not finished its final segment yet
+        records = read_segment(store, pending_segment_key(archive_key)) or []
+    for record in records:
+        if record['post']['post_id'] == post_id:
+            return record
+    return None
+
+
+def read_user_archive(store, user_id, before, limit):
+    """
+    Return (records, has_more): up to `limit` archived records for a user with
+    created_at < before (newest first). Only segments whose time range can
+    contain such posts are read.
+    """
+    before_token = _time_token(before) if before else None
+    segments = []
+    for key in store.list(f'{SEGMENT_PREFIX}/{user_id}/'):
+        oldest, newest = parse_segment_key(key)
+        if before_token is None or oldest < before_token:
+            segments.append((newest, key))
+    segments.sort(reverse=True)
+
+    records = {}
+    unread = len(segments)
+    for newest, key in segments:
+        # Stop once the page is full and no unread segment can hold a newer post
+        if len(records) >= limit:
+            page_floor = sorted(records.values(), key=lambda r: r['post']['created_at'], reverse=True)[limit - 1]
+            if newest < _time_token(page_floor['post']['created_at']):
+                break
+        unread -= 1
+        for record in read_segment(store, key):
+            post = record['post']
+            if before is None or post['created_at'] < before:
+                records.setdefault(post['post_id'], record)
+
+    ordered = sorted(records.values(), key=lambda r: r['post']['created_at'], reverse=True)
+    return (ordered[:limit], len(ordered) > limit or unread > 0)
+
+
+def archived_post_view(record, user_id):
+    # Shape an archived record like a live post with its counters.
+    post = dict(record['post'])
+    post_likes = [like for like in record.get('likes', []) if like.get('target_type') == 'post']
+    post['like_count'] = len(post_likes)
+    post['liked_by_user'] = any(like['user_id'] == user_id for like in post_likes)
+    post['comment_count'] = len(record.get('comments', []))
+    post['latest_comments'] = latest_previews(record.get('comments', []))
+    post['archived'] = True
+    return post
@@ -0,0 +1,61 @@
+"""
+Fixed-size Bloom filter over string keys.
+Positions come from double hashing one BLAKE2b digest (Kirsch-Mitzenmacher), so
+a lookup costs a single hash regardless of the number of hash functions.
+The filter serializes to raw bytes for storage in a DynamoDB Binary attribute.
+
+Kept free of AWS imports so benchmarks can load it on its own.
+"""
+import math
+import hashlib
+
+
+def optimal_num_bits(capacity, false_positive_rate):
+    # m = -n ln p / (ln 2)^2, rounded up to whole bytes
+    bits = math.ceil(-capacity * math.log(false_positive_rate) / (math.log(2) ** 2))
+    return max(8, (bits + 7) // 8 * 8)
+
+
+def optimal_num_hashes(num_bits, capacity):
+    # k = (m / n) ln 2
+    return max(1, round(num_bits / capacity * math.log(2)))
+
+
+def expected_false_positive_rate(num_bits, num_hashes, item_count):
+    return (1 - math.exp(-num_hashes * item_count / num_bits)) ** num_hashes
+
+
+class BloomFilter:
+    def __init__(self, num_bits, num_hashes, bits=None):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bytearray(bits) if bits is not None else bytearray((num_bits + 7) // 8)
+        if len(self.bits) * 8 < num_bits:
+            raise ValueError('Bloom filter bits are shorter than num_bits')
+
+    @classmethod
+    def for_capacity(cls, capacity, false_positive_rate):
+        num_bits = optimal_num_bits(capacity, false_positive_rate)
+        return cls(num_bits, optimal_num_hashes(num_bits, capacity))
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key):
+        # Returns True when the key set at least one new bit
+        changed = False
+        for position in self._positions(key):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not self.bits[byte] & mask:
+                self.bits[byte] |= mask
+                changed = True
+        return changed
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def to_bytes(self):
+        return bytes(self.bits)
@@ -0,0 +1,95 @@
+"""
+Cognito ID token verification for routes that API Gateway cannot authorize
+itself (the WebSocket $connect route receives the token as a query parameter).
+Tokens are RS256 JWTs checked against the user pool's published JWKS.
+"""
+import os
+import hmac
+import json
+import time
+import base64
+import hashlib
+import urllib.request
+
+
+# DER prefix of a SHA-256 DigestInfo, as embedded in PKCS#1 v1.5 signatures
+_SHA256_DIGEST_INFO = bytes.fromhex('3031300d060960864801650304020105000420')
+JWKS_TIMEOUT_SECONDS = 3
+# An unknown kid refetches the JWKS at most this often per container, so
+# forged tokens cannot make every $connect call out to Cognito
+JWKS_REFETCH_SECONDS = 60
+
+_jwks = {}
+_jwks_fetched_at = None
+
+
+def _b64decode(segment):
+    return base64.urlsafe_b64decode(segment + '=' * (-len(segment) % 4))
+
+
+def _issuer():
+    region = os.environ['AWS_REGION']
+    return f"https://cognito-idp.{region}.amazonaws.com/{os.environ['COGNITO_USER_POOL_ID']}"
+
+
+def _load_jwks():
+    with urllib.request.urlopen(f'{_issuer()}/.well-known/jwks.json', timeout=JWKS_TIMEOUT_SECONDS) as response:
+        keys = json.loads(response.read())['keys']
+    return {
+        key['kid']: (int.from_bytes(_b64decode(key['n']), 'big'), int.from_bytes(_b64decode(key['e']), 'big'))
+        for key in keys if key.get('kty') == 'RSA'
+    }
+
+
+def _get_key(kid):
+    # Keys are cached per container; an unknown kid triggers a refetch (key
+    # rotation), rate limited unless no keys have been loaded yet
+    global _jwks, _jwks_fetched_at
+    if not kid:
+        raise ValueError('Token has no signing key id')
+    now = time.monotonic()
+    if kid not in _jwks and (not _jwks or now - _jwks_fetched_at >= JWKS_REFETCH_SECONDS):
+        _jwks_fetched_at = now
+        _jwks = _load_jwks()
+    if kid not in _jwks:
+        raise ValueError('Unknown signing key')
+    return _jwks[kid]
+
+
+def rsa_sha256_verify(message, signature, modulus, exponent):
+    # RSASSA-PKCS1-v1_5 verification with SHA-256
+    key_length = (modulus.bit_length() + 7) // 8
+    if len(signature) != key_length:
+        return False
+    decoded = pow(int.from_bytes(signature, 'big'), exponent, modulus).to_bytes(key_length, 'big')
+    digest = _SHA256_DIGEST_INFO + hashlib.sha256(message).digest()
+    expected = b'\x00\x01' + b'\xff' * (key_length - len(digest) - 3) + b'\x00' + digest
+    return hmac.compare_digest(decoded, expected)
+
+
+def verify_id_token(token):
+    """
+    Return the claims of a valid Cognito ID token for this app's client.
+    Raises ValueError for anything malformed, forged, expired or foreign.
+    """
+    try:
+        header_segment, payload_segment, signature_segment = token.split('.')
+        header = json.loads(_b64decode(header_segment))
+        claims = json.loads(_b64decode(payload_segment))
+        signature = _b64decode(signature_segment)
+    except (AttributeError, ValueError, UnicodeError):
+        raise ValueError('Malformed token')
+
+    if header.get('alg') != 'RS256':
+        raise ValueError('Unsupported token algorithm')
+    modulus, exponent = _get_key(header.get('kid'))
+    if not rsa_sha256_verify(f'{header_segment}.{payload_segment}'.encode('ascii'), signature, modulus, exponent):
+        raise ValueError('Invalid token signature')
+
+    if claims.get('exp', 0) <= time.time():
+        raise ValueError('Token expired')
+    if claims.get('iss') != _issuer():
+        raise ValueError('Token issuer mismatch')
+    if claims.get('aud') != os.environ['COGNITO_CLIENT_ID'] or claims.get('token_use') != 'id':
+        raise ValueError('Token is not an ID token for this app')
+    return claims
@@ -0,0 +1,108 @@
+"""
+Compact column-oriented JSON for list-heavy responses.
+
+A list of objects repeats every key name per row, and columns such as user_id
+and display_name repeat the same few strings. Clients that send
+    Accept: application/vnd.politicnz.columnar+json
+get every list of two or more objects rewritten as a table:
+    {"$cols": ["post_id", "user_id", ...], "$rows": 100,
+     "$data": [[...post ids...], {"$dict": ["u1", "u2"], "$idx": [0, 1, 0, ...]}, ...],
+     "$absent": {"edited_at": [0, 3]}}
+Each entry of $data is one column, in $cols order: either a plain array of
+values, or - for a string column with repeats - a dictionary of its distinct
+strings plus an index per row. A row without a key holds null in that column
+and is listed under $absent, so decoding restores the exact original objects.
+Tables nest: values inside a column are encoded the same way.
+
+Decoded by website/api-client.js. Runs without AWS dependencies so
+benchmarks/response_formats.py can import it directly.
+"""
+
+
+COLUMNAR_MEDIA_TYPE = 'application/vnd.politicnz.columnar+json'
+
+# A list needs at least this many objects before a table beats plain rows
+MIN_TABLE_ROWS = 2
+
+
+def accepts_columnar(event):
+    """True when the request's Accept header lists the columnar media type."""
+    headers = (event or {}).get('headers') or {}
+    accept = next((value for name, value in headers.items() if name.lower() == 'accept'), '') or ''
+    for media_range in accept.split(','):
+        media_type, *params = [part.strip().lower() for part in media_range.split(';')]
+        if media_type != COLUMNAR_MEDIA_TYPE:
+            continue
+        # An explicit q=0 means "not acceptable"
+        quality = next((param[2:] for param in params if param.startswith('q=')), '1')
+        try:
+            return float(quality) > 0
+        except ValueError:
+            return False
+    return False
+
+
+def _encode_column(values, present):
+    # Dictionary-encode a string column when it repeats values; otherwise plain
+    strings = [value for value, is_present in zip(values, present) if is_present and value is not None]
+    if strings and all(isinstance(value, str) for value in strings) and len(set(strings)) < len(strings):
+        dictionary = {}
+        indexes = []
+        for value, is_present in zip(values, present):
+            if not is_present or value is None:
+                indexes.append(None)
+            else:
+                indexes.append(dictionary.setdefault(value, len(dictionary)))
+        return {'$dict': list(dictionary), '$idx': indexes}
+    return [encode_columnar(value) if is_present else None for value, is_present in zip(values, present)]
+
+
+def _encode_table(rows):
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    data = []
+    absent = {}
+    for column in columns:
+        present = [column in row for row in rows]
+        if not all(present):
+            absent[column] = [index for index, is_present in enumerate(present) if not is_present]
+        data.append(_encode_column([row.get(column) for row in rows], present))
+
+    table = {'$cols': columns, '$rows': len(rows), '$data': data}
+    if absent:
+        table['$absent'] = absent
+    return table
+
+
+def encode_columnar(value):
+    """Rewrite lists of objects anywhere in a response body as column tables."""
+    if isinstance(value, dict):
+        return {key: encode_columnar(item) for key, item in value.items()}
+    if isinstance(value, list):
+        if len(value) >= MIN_TABLE_ROWS and all(isinstance(item, dict) for item in value):
+            return _encode_table(value)
+        return [encode_columnar(item) for item in value]
+    return value
+
+
+def decode_columnar(value):
+    """Inverse of encode_columnar (the browser has its own copy in api-client.js)."""
+    if isinstance(value, list):
+        return [decode_columnar(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if '$cols' not in value or '$data' not in value:
+        return {key: decode_columnar(item) for key, item in value.items()}
+
+    rows = [{} for _ in range(value['$rows'])]
+    absent = value.get('$absent', {})
+    for column, encoded in zip(value['$cols'], value['$data']):
+        if isinstance(encoded, dict):
+            dictionary = encoded['$dict']
+            values = [None if index is None else dictionary[index] for index in encoded['$idx']]
+        else:
+            values = [decode_columnar(item) for item in encoded]
+        skip = set(absent.get(column, ()))
+        for index, (row, item) in enumerate(zip(rows, values)):
+            if index not in skip:
+                row[column] = item
+    return rows
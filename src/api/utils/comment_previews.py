@@ -0,0 +1,104 @@
+"""
+Latest-comment previews stored on post items.
+create_comment and delete_comment keep a bounded `latest_comments` list on the
+post so feed pages can render recent discussion without a get_comments call per
+post. Updates are optimistic: each write is conditional on the
+`latest_comments_version` counter read alongside the list, and is retried on
+conflict.
+"""
+from datetime import datetime
+from botocore.exceptions import ClientError
+from .shared_cache import invalidate_cached_item
+
+
+MAX_PREVIEW_COMMENTS = 3
+MAX_UPDATE_ATTEMPTS = 5
+PREVIEW_FIELDS = ('comment_id', 'user_id', 'display_name', 'content', 'created_at')
+
+
+def preview_entry(comment):
+    return {field: comment[field] for field in PREVIEW_FIELDS if field in comment}
+
+
+def latest_previews(comments):
+    # Newest first, bounded to MAX_PREVIEW_COMMENTS
+    ordered = sorted(comments, key=lambda c: c.get('created_at', ''), reverse=True)
+    return [preview_entry(comment) for comment in ordered[:MAX_PREVIEW_COMMENTS]]
+
+
+def _update_previews(posts_table, post_id, build):
+    """
+    Read-modify-write of a post's previews. `build(current)` returns the new
+    list. Archived or missing posts are left untouched.
+    """
+    for _ in range(MAX_UPDATE_ATTEMPTS):
+        post = posts_table.get_item(
+            Key={'post_id': post_id},
+            ProjectionExpression='post_id, latest_comments, latest_comments_version, archived',
+            ConsistentRead=True
+        ).get('Item')
+        if post is None or post.get('archived'):
+            return
+
+        current = post.get('latest_comments', [])
+        previews = build(current)
+        if previews == current:
+            return
+
+        changed_at = datetime.utcnow().isoformat()
+        try:
+            posts_table.update_item(
+                Key={'post_id': post_id},
+                # changed_at lets delta-syncing feeds pick up the new preview
+                UpdateExpression=('SET latest_comments = :previews, latest_comments_version = :next_version, '
+                                  'changed_at = :changed_at'),
+                ConditionExpression=(
+                    'attribute_exists(post_id) AND attribute_not_exists(archived) AND '
+                    '(attribute_not_exists(latest_comments_version) OR latest_comments_version = :version)'
+                ),
+                ExpressionAttributeValues={
+                    ':previews': previews,
+                    ':version': post.get('latest_comments_version', 0),
+                    ':next_version': post.get('latest_comments_version', 0) + 1,
+                    ':changed_at': changed_at
+                }
+            )
+            invalidate_cached_item({'post_id': post_id}, 'posts', changed_at)
+            return
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            # Another comment landed in between - re-read and try again
+
+    print(f"Gave up updating comment previews for post {post_id} after {MAX_UPDATE_ATTEMPTS} attempts")
+
+
+def add_comment_preview(posts_table, comment):
+    def build(current):
+        others = [entry for entry in current if entry['comment_id'] != comment['comment_id']]
+        return latest_previews(others + [comment])
+
+    _update_previews(posts_table, comment['post_id'], build)
+
+
+def remove_comment_preview(posts_table, comments_table, post_id, comment_id):
+    # Only a deleted comment that was previewed needs the list rebuilt, and
+    # then the next-newest comment comes from the comments table.
+    def build(current):
+        if not any(entry['comment_id'] == comment_id for entry in current):
+            return current
+
+        comments = []
+        query_kwargs = {
+            'KeyConditionExpression': 'post_id = :post_id',
+            'ExpressionAttributeValues': {':post_id': post_id}
+        }
+        while True:
+            response = comments_table.query(**query_kwargs)
+            comments.extend(c for c in response.get('Items', []) if c['comment_id'] != comment_id)
+            if 'LastEvaluatedKey' not in response:
+                break
+            query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        return latest_previews(comments)
+
+    _update_previews(posts_table, post_id, build)
@@ -0,0 +1,53 @@
+"""
+Unique display names.
+DISPLAY_NAMES_TABLE_NAME holds one reservation per normalized name, keyed by
+name_key, recording the user_id that owns it. create_profile and
+update_profile write the profile and the reservation in one transaction, so
+two users can never commit the same name, and a rename releases the old name
+in that same transaction. Checking availability is a single GetItem.
+
+Names compare after NFKC normalization, case folding and whitespace
+collapsing, so "Jane  Doe" and "jane doe" are the same name.
+"""
+import unicodedata
+
+
+def normalize_display_name(display_name):
+    return ' '.join(unicodedata.normalize('NFKC', display_name).casefold().split())
+
+
+def reservation_put(names_table_name, display_name, user_id, timestamp):
+    """TransactWriteItems entry claiming a name; succeeds if it is free or already ours."""
+    return {
+        'Put': {
+            'TableName': names_table_name,
+            'Item': {
+                'name_key': normalize_display_name(display_name),
+                'user_id': user_id,
+                'display_name': display_name,
+                'reserved_at': timestamp
+            },
+            'ConditionExpression': 'attribute_not_exists(name_key) OR user_id = :user_id',
+            'ExpressionAttributeValues': {':user_id': user_id}
+        }
+    }
+
+
+def reservation_delete(names_table_name, display_name, user_id):
+    """TransactWriteItems entry releasing a name - only if we hold it (or nobody does)."""
+    return {
+        'Delete': {
+            'TableName': names_table_name,
+            'Key': {'name_key': normalize_display_name(display_name)},
+            'ConditionExpression': 'attribute_not_exists(name_key) OR user_id = :user_id',
+            'ExpressionAttributeValues': {':user_id': user_id}
+        }
+    }
+
+
+def failed_transaction_items(error):
+    """Indexes of the TransactWriteItems entries whose condition failed."""
+    if error.response['Error']['Code'] != 'TransactionCanceledException':
+        return None
+    reasons = error.response.get('CancellationReasons') or []
+    return {index for index, reason in enumerate(reasons) if reason.get('Code') == 'ConditionalCheckFailed'}
@@ -0,0 +1,94 @@
+"""
+Delta sync support for post listings.
+get_feed and get_user_posts accept a `since` watermark and return only posts
+changed after it, plus the ids of posts deleted after it. Deletions are kept in
+a short-lived log table (DELETIONS_TABLE_NAME) written by delete_post.
+archive_posts logs the posts it archives there too, so they leave cached feeds.
+Those entries carry no user_id and so stay out of UserDeletedIndex: a user's
+post listing keeps showing archived posts, read through from the archive.
+
+A post counts as changed when its `updated_at` (create/edit) or `changed_at`
+(likes, comment previews) is newer than the watermark.
+"""
+from datetime import datetime, timedelta
+from botocore.exceptions import ClientError
+from .shared_cache import invalidate_cached_item
+
+
+# Watermarks trail the clock so writes stamped just before a sync but committed
+# just after it are picked up by the next one. Clients merge by post_id, so the
+# overlap only costs a few repeated posts.
+SYNC_OVERLAP_SECONDS = 5
+DELETION_RETENTION_DAYS = 30
+
+CHANGED_SINCE_FILTER = 'updated_at > :since OR changed_at > :since'
+
+
+def new_watermark():
+    return (datetime.utcnow() - timedelta(seconds=SYNC_OVERLAP_SECONDS)).isoformat()
+
+
+def watermark_expired(since):
+    # Deletions older than the retention window are gone, so the client must resync
+    return since < (datetime.utcnow() - timedelta(days=DELETION_RETENTION_DAYS)).isoformat()
+
+
+def touch_post(posts_table, post_id, timestamp):
+    # Mark a post changed for delta sync without touching updated_at (which means "edited")
+    try:
+        posts_table.update_item(
+            Key={'post_id': post_id},
+            UpdateExpression='SET changed_at = :changed_at',
+            ConditionExpression='attribute_exists(post_id) AND attribute_not_exists(archived)',
+            ExpressionAttributeValues={':changed_at': timestamp}
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        return
+    invalidate_cached_item({'post_id': post_id}, 'posts', timestamp)
+
+
+def record_deletion(deletions_table, post, timestamp):
+    deletions_table.put_item(Item={
+        'post_id': post['post_id'],
+        'user_id': post['user_id'],
+        'deleted_at': timestamp,
+        'expires_at': int((datetime.utcnow() + timedelta(days=DELETION_RETENTION_DAYS)).timestamp())
+    })
+
+
+def record_archival(deletions_table, post_id, timestamp):
+    # No user_id: archived posts drop out of the feed but not the author's listing
+    deletions_table.put_item(Item={
+        'post_id': post_id,
+        'deleted_at': timestamp,
+        'archived': True,
+        'expires_at': int((datetime.utcnow() + timedelta(days=DELETION_RETENTION_DAYS)).timestamp())
+    })
+
+
+def deleted_post_ids(deletions_table, since, user_id=None):
+    # One user's deletions come from the index; the whole feed's from a scan of
+    # the (small, TTL-bounded) log.
+    if user_id:
+        request = {
+            'IndexName': 'UserDeletedIndex',
+            'KeyConditionExpression': 'user_id = :user_id AND deleted_at > :since',
+            'ExpressionAttributeValues': {':user_id': user_id, ':since': since}
+        }
+        read = deletions_table.query
+    else:
+        request = {
+            'FilterExpression': 'deleted_at > :since',
+            'ExpressionAttributeValues': {':since': since}
+        }
+        read = deletions_table.scan
+
+    post_ids = []
+    while True:
+        response = read(**request)
+        post_ids.extend(item['post_id'] for item in response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return post_ids
+        request['ExclusiveStartKey'] = response['LastEvaluatedKey']
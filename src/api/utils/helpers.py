@@ -3,12 +3,18 @@ Helper utilities for Lambda functions
 Provides common helper functions for auth, database, and timestamps
 """
 import os
+import json
+import time
+import base64
 import boto3
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from .tracing import span, instrument_client
 
 
 # Initialize DynamoDB resource (shared across all functions)
 dynamodb = boto3.resource('dynamodb')
+instrument_client(dynamodb.meta.client)
 
 
 def get_user_id_from_event(event):
@@ -23,8 +29,8 @@ def get_current_timestamp():
     return datetime.utcnow().isoformat()
 
 def parse_request_body(event):
-    import json
-    return json.loads(event.get('body', '{}'))
+    with span('parse_body'):
+        return json.loads(event.get('body', '{}'))
 
 def get_query_param(event, param_name, default=None):
     query_params = event.get('queryStringParameters', {}) or {}
@@ -34,3 +40,71 @@ def get_path_param(event, param_name):
     # Get path parameter from API Gateway event.
     return event['pathParameters'][param_name]
 
+
+def encode_cursor(last_evaluated_key):
+    # Turn a DynamoDB LastEvaluatedKey into an opaque, URL-safe pagination cursor.
+    if not last_evaluated_key:
+        return None
+    raw = json.dumps(last_evaluated_key, separators=(',', ':'), default=str)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+def is_key(value, names):
+    # True for a dict holding exactly the string attributes `names` (a key we can hand to DynamoDB).
+    return isinstance(value, dict) and set(value) == set(names) and all(isinstance(value[name], str) for name in names)
+
+def decode_cursor(cursor, keys=None):
+    # Inverse of encode_cursor. Returns None for a missing or malformed cursor: one that
+    # does not decode to an object or, when `keys` is given, is not a key of exactly those.
+    if not cursor:
+        return None
+    try:
+        decoded = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+    except (ValueError, UnicodeError):
+        return None
+    if not isinstance(decoded, dict) or (keys is not None and not is_key(decoded, keys)):
+        return None
+    return decoded
+
+def batch_get_items(table, keys, projection_expression=None, expression_attribute_names=None, max_retries=5):
+    # Fetch many items by key with BatchGetItem (100 keys per request),
+    # retrying UnprocessedKeys with a short exponential backoff.
+    items = []
+    keys = list(keys)
+    for start in range(0, len(keys), 100):
+        request = {'Keys': keys[start:start + 100]}
+        if projection_expression:
+            request['ProjectionExpression'] = projection_expression
+        if expression_attribute_names:
+            request['ExpressionAttributeNames'] = expression_attribute_names
+        request_items = {table.name: request}
+        attempt = 0
+        while request_items:
+            response = dynamodb.batch_get_item(RequestItems=request_items)
+            items.extend(response.get('Responses', {}).get(table.name, []))
+            request_items = response.get('UnprocessedKeys') or {}
+            if request_items:
+                attempt += 1
+                if attempt > max_retries:
+                    raise RuntimeError(f'BatchGetItem left unprocessed keys on {table.name}')
+                time.sleep(min(0.05 * (2 ** attempt), 1.0))
+    return items
+
+def scan_segment(table, segment, total_segments, **scan_kwargs):
+    # Yield every item in one segment of a parallel scan, following pagination.
+    scan_kwargs = dict(scan_kwargs, Segment=segment, TotalSegments=total_segments)
+    while True:
+        response = table.scan(**scan_kwargs)
+        yield from response.get('Items', [])
+        if 'LastEvaluatedKey' not in response:
+            return
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def parallel_scan(table, reduce_segment, total_segments=4, **scan_kwargs):
+    # Scan a table with `total_segments` concurrent workers. reduce_segment is
+    # called with each segment's item iterator; the per-segment results are returned.
+    with ThreadPoolExecutor(max_workers=total_segments) as executor:
+        futures = [
+            executor.submit(lambda segment: reduce_segment(scan_segment(table, segment, total_segments, **scan_kwargs)), segment)
+            for segment in range(total_segments)
+        ]
+        return [future.result() for future in futures]
@@ -0,0 +1,265 @@
+"""
+Hot partition key detection.
+
+Every DynamoDB call made through an instrumented client (see
+tracing.instrument_client) is attributed to the partition key it touches, for
+the tables listed in HOT_KEY_TABLES ("table-name:hash_key,..." - Terraform
+fills it in from the table definitions). Per table and access kind
+(read/write), a count-min sketch estimates how often each key was touched and
+a top-K heap keeps the heaviest keys, in fixed memory however many distinct
+keys a container sees.
+
+Counts accumulate across invocations in the container. error_handler calls
+flush_if_due after each request; once HOT_KEY_FLUSH_SECONDS have passed the
+window is logged as CloudWatch Embedded Metric Format lines - request counts
+and the top key's share as metrics per table, and the top keys themselves as
+a log property (so they can be found with Logs Insights without turning every
+post_id into a metric) - and the counters start over.
+
+Keys are the base table's partition key; queries on an index are not counted.
+"""
+import os
+import re
+import json
+import time
+import heapq
+import hashlib
+import threading
+
+
+DEFAULT_FLUSH_SECONDS = 60
+DEFAULT_TOP_K = 10
+SKETCH_WIDTH = 1024
+SKETCH_DEPTH = 4
+METRICS_NAMESPACE = 'PoliticNZ/HotKeys'
+
+READ_OPERATIONS = {'GetItem', 'Query', 'BatchGetItem'}
+
+# "pk = :value" at the start of a KeyConditionExpression
+_PARTITION_CONDITION = re.compile(r'^\s*\(?\s*(#?\w+)\s*=\s*(:\w+)')
+
+
+class CountMinSketch:
+    """Frequency estimates that never undercount; overcount is bounded by width."""
+
+    def __init__(self, width=SKETCH_WIDTH, depth=SKETCH_DEPTH):
+        self.width = width
+        self.depth = depth
+        self.rows = [[0] * width for _ in range(depth)]
+
+    def _columns(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + row * h2) % self.width for row in range(self.depth)]
+
+    def add(self, key, count=1):
+        # Returns the key's estimated count after adding
+        estimate = None
+        for row, column in zip(self.rows, self._columns(key)):
+            row[column] += count
+            estimate = row[column] if estimate is None else min(estimate, row[column])
+        return estimate
+
+    def estimate(self, key):
+        return min(row[column] for row, column in zip(self.rows, self._columns(key)))
+
+
+class TopK:
+    """
+    The k keys with the highest estimates. A min-heap holds (estimate, key)
+    entries; entries made stale by a later update are skipped when popped and
+    the heap is compacted when stale entries pile up.
+    """
+
+    def __init__(self, k):
+        self.k = k
+        self.counts = {}
+        self._heap = []
+
+    def update(self, key, estimate):
+        if key not in self.counts and len(self.counts) >= self.k:
+            self._drop_stale()
+            if estimate <= self._heap[0][0]:
+                return
+            _, evicted = heapq.heappop(self._heap)
+            del self.counts[evicted]
+        self.counts[key] = estimate
+        heapq.heappush(self._heap, (estimate, key))
+        if len(self._heap) > 4 * self.k:
+            self._heap = [(count, key) for key, count in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def _drop_stale(self):
+        while self._heap and self.counts.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def items(self):
+        return sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+
+
+class KeyStream:
+    def __init__(self, top_k):
+        self.sketch = CountMinSketch()
+        self.top = TopK(top_k)
+        self.requests = 0
+
+    def add(self, key):
+        self.requests += 1
+        self.top.update(key, self.sketch.add(key))
+
+
+#####################################################################
+# CONTAINER STATE
+#####################################################################
+
+_lock = threading.Lock()  # table calls may come from worker threads
+_streams = {}
+_window_started_at = time.time()
+_tables = None
+
+
+def tracked_tables():
+    # {table name: partition key attribute}, parsed once from HOT_KEY_TABLES
+    global _tables
+    if _tables is None:
+        _tables = {}
+        for entry in os.environ.get('HOT_KEY_TABLES', '').split(','):
+            table_name, _, key_name = entry.strip().partition(':')
+            if table_name and key_name:
+                _tables[table_name] = key_name
+    return _tables
+
+
+def _top_k():
+    try:
+        return max(1, int(os.environ.get('HOT_KEY_TOP_K', DEFAULT_TOP_K)))
+    except ValueError:
+        return DEFAULT_TOP_K
+
+
+def record(table_name, access, key):
+    with _lock:
+        stream = _streams.get((table_name, access))
+        if stream is None:
+            stream = _streams[(table_name, access)] = KeyStream(_top_k())
+        stream.add(key)
+
+
+#####################################################################
+# KEY EXTRACTION
+#####################################################################
+
+def _plain(value):
+    # Parameters may already be in wire format ({'S': 'abc'}) by the time we see them
+    if isinstance(value, dict) and len(value) == 1:
+        type_name, inner = next(iter(value.items()))
+        if type_name in ('S', 'N', 'B'):
+            return inner
+    return value
+
+
+def _item_key(table_name, item):
+    key_name = tracked_tables().get(table_name)
+    if key_name and item and key_name in item:
+        return str(_plain(item[key_name]))
+    return None
+
+
+def _query_key(params):
+    key_name = tracked_tables().get(params.get('TableName'))
+    if not key_name or params.get('IndexName'):
+        return None
+    match = _PARTITION_CONDITION.match(params.get('KeyConditionExpression') or '')
+    if not match:
+        return None
+    name, placeholder = match.groups()
+    name = (params.get('ExpressionAttributeNames') or {}).get(name, name)
+    value = (params.get('ExpressionAttributeValues') or {}).get(placeholder)
+    return str(_plain(value)) if name == key_name and value is not None else None
+
+
+def partition_keys(operation, params):
+    """(table name, partition key) pairs a DynamoDB call touches, for tracked tables."""
+    if operation in ('GetItem', 'DeleteItem', 'UpdateItem'):
+        return [(params.get('TableName'), _item_key(params.get('TableName'), params.get('Key')))]
+    if operation == 'PutItem':
+        return [(params.get('TableName'), _item_key(params.get('TableName'), params.get('Item')))]
+    if operation == 'Query':
+        return [(params.get('TableName'), _query_key(params))]
+    if operation == 'BatchGetItem':
+        return [(table_name, _item_key(table_name, key))
+                for table_name, request in (params.get('RequestItems') or {}).items()
+                for key in request.get('Keys', [])]
+    if operation == 'BatchWriteItem':
+        return [(table_name, _item_key(table_name, (request.get('PutRequest') or {}).get('Item')
+                                       or (request.get('DeleteRequest') or {}).get('Key')))
+                for table_name, requests in (params.get('RequestItems') or {}).items()
+                for request in requests]
+    if operation in ('TransactWriteItems', 'TransactGetItems'):
+        pairs = []
+        for entry in params.get('TransactItems') or []:
+            for action in entry.values():
+                pairs.append((action.get('TableName'), _item_key(action.get('TableName'), action.get('Key') or action.get('Item'))))
+        return pairs
+    return []
+
+
+def observe_call(operation, params):
+    """Count one DynamoDB call against the partition keys it touches."""
+    if not tracked_tables():
+        return
+    access = 'read' if operation in READ_OPERATIONS or operation == 'TransactGetItems' else 'write'
+    for table_name, key in partition_keys(operation, params):
+        if key is not None:
+            record(table_name, access, key)
+
+
+#####################################################################
+# FLUSHING
+#####################################################################
+
+def metric_lines(streams, window_seconds, now):
+    lines = []
+    for (table_name, access), stream in sorted(streams.items()):
+        top = stream.top.items()
+        top_count = top[0][1] if top else 0
+        lines.append({
+            '_aws': {
+                'Timestamp': int(now * 1000),
+                'CloudWatchMetrics': [{
+                    'Namespace': METRICS_NAMESPACE,
+                    'Dimensions': [['Table', 'Access']],
+                    'Metrics': [
+                        {'Name': 'Requests', 'Unit': 'Count'},
+                        {'Name': 'TopKeyRequests', 'Unit': 'Count'},
+                        {'Name': 'TopKeyShare', 'Unit': 'Percent'}
+                    ]
+                }]
+            },
+            'Table': table_name,
+            'Access': access,
+            'Requests': stream.requests,
+            'TopKeyRequests': top_count,
+            'TopKeyShare': round(min(top_count, stream.requests) / stream.requests * 100, 1),
+            'hot_keys': [[key, count] for key, count in top],
+            'window_seconds': round(window_seconds, 1)
+        })
+    return lines
+
+
+def flush_if_due():
+    """Log and reset the container's counters once the flush interval has passed."""
+    global _streams, _window_started_at
+    try:
+        interval = float(os.environ.get('HOT_KEY_FLUSH_SECONDS', DEFAULT_FLUSH_SECONDS))
+    except ValueError:
+        interval = DEFAULT_FLUSH_SECONDS
+    now = time.time()
+    with _lock:
+        if now - _window_started_at < interval:
+            return
+        streams, _streams = _streams, {}
+        window_seconds, _window_started_at = now - _window_started_at, now
+    for line in metric_lines(streams, window_seconds, now):
+        print(json.dumps(line, separators=(',', ':')))
@@ -0,0 +1,170 @@
+"""
+Idempotency-Key support for create handlers.
+A client that retries a POST with the same Idempotency-Key header gets the
+stored response of the first attempt instead of creating a duplicate.
+"""
+import os
+import json
+import time
+import hashlib
+from functools import wraps
+from botocore.exceptions import ClientError
+from boto3.dynamodb.types import TypeDeserializer
+from .response_builder import error_response, renegotiate_response
+from .helpers import get_table, get_user_id_from_event
+
+
+IDEMPOTENCY_HEADER = 'idempotency-key'
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+IN_PROGRESS_LOCK_SECONDS = 30  # comfortably longer than the Lambda timeout
+
+STATUS_IN_PROGRESS = 'IN_PROGRESS'
+STATUS_COMPLETED = 'COMPLETED'
+
+_deserializer = TypeDeserializer()
+_table = None
+
+
+def _get_idempotency_table():
+    global _table
+    if _table is None:
+        _table = get_table('IDEMPOTENCY_TABLE_NAME')
+    return _table
+
+
+def get_idempotency_key(event):
+    # Header names are case-insensitive; API Gateway passes them through as sent.
+    headers = event.get('headers') or {}
+    for name, value in headers.items():
+        if name.lower() == IDEMPOTENCY_HEADER:
+            return value.strip() if value else None
+    return None
+
+
+def request_fingerprint(event):
+    # Identifies the request payload so a reused key with a different body is rejected.
+    parts = [
+        event.get('httpMethod') or '',
+        event.get('path') or '',
+        json.dumps(event.get('pathParameters') or {}, sort_keys=True),
+        event.get('body') or ''
+    ]
+    return hashlib.sha256('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+def _record_key(event, scope, key):
+    return {'idempotency_key': f'{get_user_id_from_event(event)}#{scope}#{key}'}
+
+
+def is_completed_replay(event, scope):
+    """
+    Whether the request repeats an Idempotency-Key whose first attempt already
+    completed, so idempotent will replay the stored response. rate_limited
+    uses it to let such retries through without spending a token.
+    """
+    key = get_idempotency_key(event)
+    if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        return False
+    try:
+        record = _get_idempotency_table().get_item(Key=_record_key(event, scope, key), ConsistentRead=True).get('Item')
+    except ClientError as e:
+        # Fall back to rate limiting the request like any other
+        print(f"Idempotency lookup failed for {scope}: {str(e)}")
+        return False
+    return (record is not None
+            and record.get('status') == STATUS_COMPLETED
+            and record.get('fingerprint') == request_fingerprint(event)
+            and record.get('expires_at', 0) >= int(time.time()))
+
+
+def _deserialize(raw_item):
+    return {name: _deserializer.deserialize(value) for name, value in raw_item.items()}
+
+
+def _replay(record):
+    # The stored response is in the format the first attempt negotiated
+    response = renegotiate_response(json.loads(record['response']))
+    response['headers'] = dict(response.get('headers') or {}, **{'Idempotent-Replayed': 'true'})
+    return response
+
+
+def idempotent(scope):
+    """
+    Decorator for POST handlers, applied inside error_handler:
+
+        @error_handler
+        @idempotent('create_post')
+        def lambda_handler(event, context): ...
+
+    Requests without an Idempotency-Key header run unchanged.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(event, context):
+            key = get_idempotency_key(event)
+            if not key:
+                return func(event, context)
+            if len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+                return error_response(f'Idempotency-Key must not exceed {IDEMPOTENCY_KEY_MAX_LENGTH} characters')
+
+            table = _get_idempotency_table()
+            record_key = _record_key(event, scope, key)
+            fingerprint = request_fingerprint(event)
+            now = int(time.time())
+            ttl_seconds = int(os.environ.get('IDEMPOTENCY_TTL_SECONDS', DEFAULT_TTL_SECONDS))
+
+            # Claim the key; fails if a live record already exists for it
+            try:
+                table.put_item(
+                    Item=dict(record_key, **{
+                        'status': STATUS_IN_PROGRESS,
+                        'fingerprint': fingerprint,
+                        'lock_expires_at': now + IN_PROGRESS_LOCK_SECONDS,
+                        'expires_at': now + ttl_seconds
+                    }),
+                    ConditionExpression=(
+                        'attribute_not_exists(idempotency_key) OR expires_at < :now '
+                        'OR (#status = :in_progress AND lock_expires_at < :now)'
+                    ),
+                    ExpressionAttributeNames={'#status': 'status'},
+                    ExpressionAttributeValues={':now': now, ':in_progress': STATUS_IN_PROGRESS},
+                    ReturnValuesOnConditionCheckFailure='ALL_OLD'
+                )
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+                existing = _deserialize(e.response.get('Item', {}))
+                if not existing:
+                    return error_response('A request with this Idempotency-Key is still in progress', 409)
+                if existing.get('fingerprint') != fingerprint:
+                    return error_response('Idempotency-Key was already used for a different request', 422)
+                if existing.get('status') == STATUS_COMPLETED:
+                    return _replay(existing)
+                return error_response('A request with this Idempotency-Key is still in progress', 409)
+
+            try:
+                response = func(event, context)
+            except Exception:
+                # Release the claim so the client can retry
+                table.delete_item(Key=record_key)
+                raise
+
+            if response.get('statusCode', 500) >= 500:
+                table.delete_item(Key=record_key)
+            else:
+                table.update_item(
+                    Key=record_key,
+                    UpdateExpression='SET #status = :completed, #response = :response',
+                    ExpressionAttributeNames={'#status': 'status', '#response': 'response'},
+                    ExpressionAttributeValues={
+                        ':completed': STATUS_COMPLETED,
+                        ':response': json.dumps(response)
+                    }
+                )
+            return response
+
+        # Lets rate_limited, applied outside, find replays of this scope
+        wrapper.idempotency_scope = scope
+        return wrapper
+    return decorator
@@ -0,0 +1,253 @@
+"""
+Write-sharded like counters for posts.
+
+LIKE_COUNTERS_TABLE_NAME is keyed by target_id and a numeric shard. A like or
+unlike ADDs +1/-1 to `likes` on one shard picked at random, so a viral post's
+counter writes spread over several items instead of queueing on one, and a
+post's count is the sum of its shards - a single Query over a partition of at
+most MAX_SHARDS tiny items, instead of counting every like item.
+
+A meta item (shard -1), which likes never touch, records `shards`: writers
+spread over shards 0 to shards - 1 (just shard 0 when absent). Only targets
+that actually run hot grow: a write that is throttled is retried on another
+shard after doubling the target's shard count, with a conditional update so
+concurrent writers never shrink it. Writers cache the count per container for
+SHARD_COUNT_TTL_SECONDS, and readers refresh that cache for free from the meta
+item their Query returns anyway. Summed counts are cached per container for
+COUNT_TTL_SECONDS, so a hot feed costs one Query per post per container every
+few seconds; a writer's own container sees its change at once.
+
+The migration runs in phases chosen by LIKE_COUNTER_MODE:
+    off   - counts come from the likes table only (default)
+    write - like_post also maintains the counters; reads stay on the likes
+            table. migrations/like_counters.py seeds existing posts and can be
+            rerun until a pass repairs nothing.
+    read  - counts come from the counters
+Counter writes are best effort: a failure is logged, not retried. Every like
+also marks its post changed (changed_at), so the daily repair_like_counters
+job recounts each post liked since its last run and corrects any drift.
+"""
+import os
+import time
+import random
+from collections import OrderedDict
+from botocore.exceptions import ClientError
+
+
+MODES = ('off', 'write', 'read')
+META_SHARD = -1
+MAX_SHARDS = 64
+MAX_WRITE_ATTEMPTS = 3
+SHARD_COUNT_TTL_SECONDS = 30
+COUNT_TTL_SECONDS = 5
+CACHE_SIZE = 4096
+
+THROTTLE_ERRORS = {
+    'ThrottlingException',
+    'ProvisionedThroughputExceededException',
+    'RequestLimitExceeded'
+}
+
+_shard_counts = OrderedDict()
+_counts = OrderedDict()
+
+
+def like_counter_mode():
+    mode = os.environ.get('LIKE_COUNTER_MODE', 'off')
+    if mode not in MODES:
+        raise ValueError(f'LIKE_COUNTER_MODE must be one of {", ".join(MODES)}')
+    return mode
+
+
+def like_counter_writes_enabled():
+    return like_counter_mode() != 'off'
+
+
+def like_counter_reads_enabled():
+    return like_counter_mode() == 'read'
+
+
+#####################################################################
+# CONTAINER CACHES
+#####################################################################
+
+def _cache_get(cache, key, ttl, now):
+    entry = cache.get(key)
+    if entry is None or now - entry[1] >= ttl:
+        return None
+    return entry[0]
+
+
+def _cache_put(cache, key, value, now):
+    cache[key] = (value, now)
+    cache.move_to_end(key)
+    if len(cache) > CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+#####################################################################
+# WRITES
+#####################################################################
+
+def shard_count(table, target_id):
+    now = time.monotonic()
+    shards = _cache_get(_shard_counts, target_id, SHARD_COUNT_TTL_SECONDS, now)
+    if shards is None:
+        response = table.get_item(
+            Key={'target_id': target_id, 'shard': META_SHARD},
+            ProjectionExpression='#shards',
+            ExpressionAttributeNames={'#shards': 'shards'}
+        )
+        shards = int(response.get('Item', {}).get('shards', 1))
+        _cache_put(_shard_counts, target_id, shards, now)
+    return shards
+
+
+def grow_shards(table, target_id, current):
+    """Double the target's shard count (up to MAX_SHARDS); returns the count to use."""
+    grown = min(MAX_SHARDS, current * 2)
+    if grown <= current:
+        return current
+    try:
+        table.update_item(
+            Key={'target_id': target_id, 'shard': META_SHARD},
+            UpdateExpression='SET #shards = :grown',
+            ConditionExpression='attribute_not_exists(#shards) OR #shards < :grown',
+            ExpressionAttributeNames={'#shards': 'shards'},
+            ExpressionAttributeValues={':grown': grown}
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        # Another writer already grew it at least as far
+        _shard_counts.pop(target_id, None)
+        return max(grown, shard_count(table, target_id))
+    _cache_put(_shard_counts, target_id, grown, time.monotonic())
+    return grown
+
+
+def add_like(table, target_id, delta):
+    """ADD delta (+1 like, -1 unlike) to a random shard of the target's counter."""
+    if not like_counter_writes_enabled():
+        return
+    try:
+        shards = shard_count(table, target_id)
+        for attempt in range(MAX_WRITE_ATTEMPTS):
+            try:
+                table.update_item(
+                    Key={'target_id': target_id, 'shard': random.randrange(shards)},
+                    UpdateExpression='ADD likes :delta',
+                    ExpressionAttributeValues={':delta': delta}
+                )
+                break
+            except ClientError as e:
+                if e.response['Error']['Code'] not in THROTTLE_ERRORS or attempt == MAX_WRITE_ATTEMPTS - 1:
+                    raise
+                shards = grow_shards(table, target_id, shards)
+    except ClientError as e:
+        print(f"Failed to update like counter for {target_id}: {str(e)}")
+        return
+    cached = _counts.get(target_id)
+    if cached is not None:
+        _counts[target_id] = (cached[0] + delta, cached[1])
+
+
+def delete_like_counter(table, target_id):
+    # Best effort - an orphaned counter is never read once its post is gone
+    if not like_counter_writes_enabled():
+        return
+    try:
+        response = table.query(
+            KeyConditionExpression='target_id = :target_id',
+            ExpressionAttributeValues={':target_id': target_id},
+            ProjectionExpression='#shard',
+            ExpressionAttributeNames={'#shard': 'shard'}
+        )
+        with table.batch_writer() as batch:
+            for item in response.get('Items', []):
+                batch.delete_item(Key={'target_id': target_id, 'shard': item['shard']})
+    except ClientError as e:
+        print(f"Failed to delete like counter for {target_id}: {str(e)}")
+    _counts.pop(target_id, None)
+    _shard_counts.pop(target_id, None)
+
+
+#####################################################################
+# READS
+#####################################################################
+
+def sum_shards(table, target_id):
+    """(summed likes, shard count) for one target, uncached."""
+    response = table.query(
+        KeyConditionExpression='target_id = :target_id',
+        ExpressionAttributeValues={':target_id': target_id},
+        ProjectionExpression='likes, #shards',
+        ExpressionAttributeNames={'#shards': 'shards'}
+    )
+    items = response.get('Items', [])
+    total = sum(int(item.get('likes', 0)) for item in items)
+    shards = max([int(item['shards']) for item in items if 'shards' in item] or [1])
+    return total, shards
+
+
+def read_like_counts(table, target_ids):
+    """{target_id: like count} from the counters, through the container cache."""
+    now = time.monotonic()
+    counts = {}
+    for target_id in target_ids:
+        count = _cache_get(_counts, target_id, COUNT_TTL_SECONDS, now)
+        if count is None:
+            count, shards = sum_shards(table, target_id)
+            _cache_put(_counts, target_id, count, now)
+            _cache_put(_shard_counts, target_id, shards, now)
+        if count < 0:
+            # Only a lost +1 can do this; repair_like_counters will fix it
+            print(f"Like counter for {target_id} has drifted below zero ({count})")
+        counts[target_id] = max(0, count)
+    return counts
+
+
+def count_post_likes(likes_table, post_id):
+    # Legacy count: every like item in the post's partition
+    query_kwargs = {
+        'KeyConditionExpression': 'target_id = :target_id',
+        'FilterExpression': 'target_type = :target_type',
+        'ExpressionAttributeValues': {
+            ':target_id': post_id,
+            ':target_type': 'post'
+        },
+        'Select': 'COUNT'
+    }
+    count = 0
+    while True:
+        response = likes_table.query(**query_kwargs)
+        count += response.get('Count', 0)
+        if 'LastEvaluatedKey' not in response:
+            return count
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def post_like_counts(counters_table, likes_table, post_ids):
+    """{post_id: like count}, from the counters once LIKE_COUNTER_MODE is read."""
+    if like_counter_reads_enabled():
+        return read_like_counts(counters_table, post_ids)
+    return {post_id: count_post_likes(likes_table, post_id) for post_id in post_ids}
+
+
+def repair_like_counter(likes_table, counters_table, post_id):
+    """
+    Recount a post's likes and ADD any difference to shard 0. Returns the
+    correction made (0 when the counter was right). A like racing the two reads
+    can leave the counter off by one until the next repair.
+    """
+    likes = count_post_likes(likes_table, post_id)
+    counted, _ = sum_shards(counters_table, post_id)
+    if likes == counted:
+        return 0
+    counters_table.update_item(
+        Key={'target_id': post_id, 'shard': 0},
+        UpdateExpression='ADD likes :delta',
+        ExpressionAttributeValues={':delta': likes - counted}
+    )
+    _counts.pop(post_id, None)
+    return likes - counted
@@ -0,0 +1,176 @@
+"""
+Per-user Bloom filters of liked target ids (posts and comments).
+Read handlers use a user's filter to settle `liked_by_user` for most targets
+without reading the likes table: a miss means "definitely not liked", and only
+the possible matches are confirmed with one BatchGetItem.
+
+Filters live in LIKE_FILTERS_TABLE_NAME, one item per user:
+    filter_bits     - the Bloom filter bit array (Binary)
+    num_bits, num_hashes, item_count
+    filter_version  - bumped on every write; updates are conditional on it
+
+like_post/like_comment add the target before writing the like, so a filter
+never misses a like that exists. Unlikes leave their bits set (a Bloom filter
+cannot forget); rebuild_like_filters replaces each filter daily from the likes
+table, which clears them and resizes filters that have outgrown their capacity.
+A user without a filter (new, never rebuilt yet, or invalidated) has every
+target confirmed. Liking without a filter still bumps filter_version, so a
+rebuild whose scan missed that like cannot install a filter without it.
+"""
+from datetime import datetime
+from botocore.exceptions import ClientError
+from .bloom_filter import BloomFilter
+from .helpers import batch_get_items
+
+
+FALSE_POSITIVE_RATE = 0.01
+# Room for this many likes before the false-positive rate climbs past target
+DEFAULT_CAPACITY = 256
+# Rebuilt filters leave room to double before the next rebuild
+REBUILD_HEADROOM = 2
+MAX_UPDATE_ATTEMPTS = 5
+
+
+def filter_from_item(item):
+    # boto3 hands Binary attributes back wrapped; plain bytes come from local stand-ins
+    raw = item['filter_bits']
+    return BloomFilter(int(item['num_bits']), int(item['num_hashes']), getattr(raw, 'value', raw))
+
+
+def build_like_filter(target_ids):
+    target_ids = set(target_ids)
+    capacity = max(DEFAULT_CAPACITY, len(target_ids) * REBUILD_HEADROOM)
+    like_filter = BloomFilter.for_capacity(capacity, FALSE_POSITIVE_RATE)
+    for target_id in target_ids:
+        like_filter.add(target_id)
+    return like_filter
+
+
+def load_like_filter(filters_table, user_id):
+    # Consistent read, so a like the user just made is never ruled out
+    item = filters_table.get_item(Key={'user_id': user_id}, ConsistentRead=True).get('Item')
+    return filter_from_item(item) if item and 'filter_bits' in item else None
+
+
+#####################################################################
+# READS
+#####################################################################
+
+def liked_target_ids(filters_table, likes_table, user_id, target_ids):
+    """Return the subset of target_ids the user has liked."""
+    target_ids = list(dict.fromkeys(target_ids))
+    if not target_ids:
+        return set()
+
+    like_filter = load_like_filter(filters_table, user_id)
+    if like_filter is None:
+        candidates = target_ids
+    else:
+        candidates = [target_id for target_id in target_ids if target_id in like_filter]
+    if not candidates:
+        return set()
+
+    likes = batch_get_items(
+        likes_table,
+        [{'target_id': target_id, 'user_id': user_id} for target_id in candidates],
+        projection_expression='target_id'
+    )
+    return {like['target_id'] for like in likes}
+
+
+#####################################################################
+# WRITES
+#####################################################################
+
+def add_liked_target(filters_table, user_id, target_id):
+    """
+    Set a target's bits in the user's filter (read-modify-write, conditional on
+    filter_version and retried on conflict). The version is bumped even when the
+    bits were already set; users without a filter only get their version bumped.
+    If the update keeps losing races the filter is dropped rather than left
+    missing a like; reads then fall back to confirming every target until the
+    next rebuild.
+    """
+    for _ in range(MAX_UPDATE_ATTEMPTS):
+        item = filters_table.get_item(Key={'user_id': user_id}, ConsistentRead=True).get('Item')
+        if item is None or 'filter_bits' not in item:
+            invalidate_like_filter(filters_table, user_id)
+            return
+
+        like_filter = filter_from_item(item)
+        if like_filter.add(target_id):
+            update = {
+                'UpdateExpression': ('SET filter_bits = :bits, item_count = item_count + :one, '
+                                     'filter_version = :next_version'),
+                'ExpressionAttributeValues': {':bits': like_filter.to_bytes(), ':one': 1}
+            }
+        else:
+            # Bits already set (an earlier unlike, or a false positive): still bump
+            # the version, or a rebuild whose scan missed this like could install
+            # a filter without it
+            update = {
+                'UpdateExpression': 'SET filter_version = :next_version',
+                'ExpressionAttributeValues': {}
+            }
+        update['ExpressionAttributeValues'].update({
+            ':version': item['filter_version'],
+            ':next_version': item['filter_version'] + 1
+        })
+
+        try:
+            filters_table.update_item(
+                Key={'user_id': user_id},
+                ConditionExpression='filter_version = :version',
+                **update
+            )
+            return
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            # Another like (or a rebuild) landed in between - re-read and try again
+
+    print(f"Gave up updating like filter for user {user_id}, dropping it until the next rebuild")
+    invalidate_like_filter(filters_table, user_id)
+
+
+def invalidate_like_filter(filters_table, user_id):
+    # Drop the bits but bump the version, which fails any rebuild already in flight
+    filters_table.update_item(
+        Key={'user_id': user_id},
+        UpdateExpression='REMOVE filter_bits ADD filter_version :one',
+        ExpressionAttributeValues={':one': 1}
+    )
+
+
+def save_rebuilt_filter(filters_table, user_id, target_ids, snapshot_version):
+    """
+    Replace a user's filter with one built from target_ids. The write only
+    succeeds if the filter is unchanged since snapshot_version was read (None
+    means it did not exist), so a like added during the rebuild's scan is never
+    dropped - that user is left for the next run. Returns True when written.
+    """
+    like_filter = build_like_filter(target_ids)
+    item = {
+        'user_id': user_id,
+        'filter_bits': like_filter.to_bytes(),
+        'num_bits': like_filter.num_bits,
+        'num_hashes': like_filter.num_hashes,
+        'item_count': len(set(target_ids)),
+        'filter_version': (snapshot_version or 0) + 1,
+        'rebuilt_at': datetime.utcnow().isoformat()
+    }
+    if snapshot_version is None:
+        condition = {'ConditionExpression': 'attribute_not_exists(user_id)'}
+    else:
+        condition = {
+            'ConditionExpression': 'filter_version = :version',
+            'ExpressionAttributeValues': {':version': snapshot_version}
+        }
+
+    try:
+        filters_table.put_item(Item=item, **condition)
+        return True
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        return False
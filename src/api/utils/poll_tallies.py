@@ -0,0 +1,87 @@
+"""
+Poll result tallies, cross-tabbed by the voter's political_alignment.
+One item per poll in POLL_TALLIES_TABLE_NAME holds every counter, so results
+are a single GetItem instead of a read of every vote plus a profile per voter:
+    total          - all votes
+    Yes, No, ...   - votes per answer
+    Labour|Yes ... - votes per alignment and answer ('none' for no alignment)
+Answers are attribute names as they stand, so polls_api.tf refuses options
+that would collide with the total or an item key (total, poll_id, bucket) or
+that contain the '|' separator.
+
+vote_poll adds to the counters in the same transaction that writes the vote.
+A voter's alignment is taken at vote time; rebuild_poll_tallies recounts from
+the votes table against current profiles after alignments change.
+"""
+from decimal import Decimal
+
+
+TOTAL_FIELD = 'total'
+NO_ALIGNMENT = 'none'
+CELL_SEPARATOR = '|'
+
+
+def cell_field(alignment, answer):
+    return f'{alignment or NO_ALIGNMENT}{CELL_SEPARATOR}{answer}'
+
+
+def tally_update(tallies_table_name, poll_id, alignment, answer):
+    """TransactWriteItems entry that counts one vote."""
+    return {
+        'Update': {
+            'TableName': tallies_table_name,
+            'Key': {'poll_id': poll_id},
+            'UpdateExpression': 'ADD #total :one, #answer :one, #cell :one',
+            'ExpressionAttributeNames': {
+                '#total': TOTAL_FIELD,
+                '#answer': answer,
+                '#cell': cell_field(alignment, answer)
+            },
+            'ExpressionAttributeValues': {':one': 1}
+        }
+    }
+
+
+def count_votes(votes, alignments):
+    """Counters for a set of votes; alignments maps user_id -> political_alignment."""
+    counts = {TOTAL_FIELD: 0}
+    for vote in votes:
+        answer = vote['answer']
+        cell = cell_field(alignments.get(vote['user_id'], ''), answer)
+        counts[TOTAL_FIELD] += 1
+        counts[answer] = counts.get(answer, 0) + 1
+        counts[cell] = counts.get(cell, 0) + 1
+    return counts
+
+
+def _percentage(count, total):
+    return round(count / total * 100, 1) if total > 0 else 0
+
+
+def build_results(poll_id, options, tally):
+    """Shape a tally item as poll results with a per-alignment breakdown."""
+    tally = {name: int(value) for name, value in tally.items()
+             if isinstance(value, (int, Decimal))}
+    total = tally.get(TOTAL_FIELD, 0)
+
+    results = {'poll_id': poll_id, 'total_votes': total}
+    for option in options:
+        key = option.lower()
+        results[f'{key}_votes'] = tally.get(option, 0)
+        results[f'{key}_percentage'] = _percentage(tally.get(option, 0), total)
+
+    by_alignment = {}
+    for name, count in tally.items():
+        if CELL_SEPARATOR not in name:
+            continue
+        alignment, answer = name.rsplit(CELL_SEPARATOR, 1)
+        by_alignment.setdefault(alignment, {'total_votes': 0, 'answers': {}})
+        by_alignment[alignment]['answers'][answer] = count
+        by_alignment[alignment]['total_votes'] += count
+    for breakdown in by_alignment.values():
+        breakdown['percentages'] = {
+            answer: _percentage(count, breakdown['total_votes'])
+            for answer, count in breakdown['answers'].items()
+        }
+    results['by_alignment'] = by_alignment
+    return results
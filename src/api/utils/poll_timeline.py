@@ -0,0 +1,171 @@
+"""
+Poll vote time series for trend charts.
+POLL_TIMELINE_TABLE_NAME is keyed by poll_id and bucket, with counters per
+answer plus a total (the same layout as a poll tally item):
+    H#2026-10-19T13 - votes cast in that UTC hour
+    D#2026-10-19    - votes cast on that UTC day
+
+vote_poll adds to the hour bucket in the same transaction that writes the
+vote. Day buckets are never written on the vote path; the first timeline read
+that needs a finished day sums its hours and stores the result, so later reads
+of that day cost one item instead of 24.
+"""
+from datetime import datetime, timedelta
+from decimal import Decimal
+from botocore.exceptions import ClientError
+from .poll_tallies import TOTAL_FIELD
+
+
+HOUR = 'hour'
+DAY = 'day'
+
+BUCKET_PREFIXES = {HOUR: 'H#', DAY: 'D#'}
+BUCKET_FORMATS = {HOUR: '%Y-%m-%dT%H', DAY: '%Y-%m-%d'}
+BUCKET_STEPS = {HOUR: timedelta(hours=1), DAY: timedelta(days=1)}
+
+# Longest range one request may ask for
+MAX_BUCKETS = {HOUR: 168, DAY: 90}
+
+# A day is only rolled up once it ended this long ago, so a vote from a
+# container whose clock runs slightly behind still lands in an open day
+ROLLUP_GRACE = timedelta(hours=1)
+
+
+def bucket_label(moment, granularity):
+    return moment.strftime(BUCKET_FORMATS[granularity])
+
+
+def parse_bucket_label(label, granularity):
+    """datetime for a bucket label, or None if it is not one."""
+    try:
+        return datetime.strptime(label, BUCKET_FORMATS[granularity])
+    except (TypeError, ValueError):
+        return None
+
+
+def _bucket_key(label, granularity):
+    return BUCKET_PREFIXES[granularity] + label
+
+
+def timeline_update(timeline_table_name, poll_id, voted_at, answer):
+    """TransactWriteItems entry that counts one vote in its hour bucket."""
+    # voted_at is an ISO timestamp; its first 13 characters are the hour label
+    return {
+        'Update': {
+            'TableName': timeline_table_name,
+            'Key': {'poll_id': poll_id, 'bucket': _bucket_key(voted_at[:13], HOUR)},
+            'UpdateExpression': 'ADD #total :one, #answer :one',
+            'ExpressionAttributeNames': {
+                '#total': TOTAL_FIELD,
+                '#answer': answer
+            },
+            'ExpressionAttributeValues': {':one': 1}
+        }
+    }
+
+
+#####################################################################
+# READING A RANGE
+#####################################################################
+
+def _query_buckets(timeline_table, poll_id, first_key, last_key):
+    # Every stored bucket between two keys, as {key: counters}
+    buckets = {}
+    query_kwargs = {
+        'KeyConditionExpression': 'poll_id = :poll_id AND #bucket BETWEEN :first AND :last',
+        'ExpressionAttributeNames': {'#bucket': 'bucket'},
+        'ExpressionAttributeValues': {
+            ':poll_id': poll_id,
+            ':first': first_key,
+            ':last': last_key
+        }
+    }
+    while True:
+        response = timeline_table.query(**query_kwargs)
+        for item in response.get('Items', []):
+            buckets[item['bucket']] = {
+                name: int(value) for name, value in item.items()
+                if isinstance(value, (int, Decimal))
+            }
+        if 'LastEvaluatedKey' not in response:
+            return buckets
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def _sum_hours(hours, day_label):
+    # Counters for one day from its stored hour buckets
+    prefix = _bucket_key(day_label, HOUR)
+    counts = {TOTAL_FIELD: 0}
+    for key, hour_counts in hours.items():
+        if key.startswith(prefix):
+            for name, count in hour_counts.items():
+                counts[name] = counts.get(name, 0) + count
+    return counts
+
+
+def _store_day(timeline_table, poll_id, day_label, counts):
+    # Persist a rolled-up day. Concurrent readers compute the same sums, so
+    # whichever write lands first wins and the rest are dropped.
+    try:
+        timeline_table.put_item(
+            Item=dict(counts, poll_id=poll_id, bucket=_bucket_key(day_label, DAY)),
+            ConditionExpression='attribute_not_exists(#bucket)',
+            ExpressionAttributeNames={'#bucket': 'bucket'}
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            print(f"Failed to store day bucket {day_label} for poll {poll_id}: {e}")
+
+
+def _fill_days(timeline_table, poll_id, days, labels, now):
+    """
+    Fill in days with no stored bucket from their hour buckets - one query
+    over the hours of every missing day. Days that have finished are stored.
+    """
+    missing = [label for label in labels if _bucket_key(label, DAY) not in days]
+    if not missing:
+        return
+
+    hours = _query_buckets(
+        timeline_table, poll_id,
+        _bucket_key(f'{missing[0]}T00', HOUR),
+        _bucket_key(f'{missing[-1]}T23', HOUR)
+    )
+    rollup_before = bucket_label(now - ROLLUP_GRACE, DAY)
+    for label in missing:
+        counts = _sum_hours(hours, label)
+        days[_bucket_key(label, DAY)] = counts
+        if label < rollup_before:
+            _store_day(timeline_table, poll_id, label, counts)
+
+
+def read_timeline(timeline_table, poll_id, granularity, start, end, now=None):
+    """
+    Bucket counters for start..end inclusive (datetimes at bucket boundaries),
+    oldest first. Empty buckets are included with zero counts.
+    """
+    now = now or datetime.utcnow()
+    step = BUCKET_STEPS[granularity]
+    labels = []
+    moment = start
+    while moment <= end:
+        labels.append(bucket_label(moment, granularity))
+        moment += step
+
+    buckets = _query_buckets(
+        timeline_table, poll_id,
+        _bucket_key(labels[0], granularity),
+        _bucket_key(labels[-1], granularity)
+    )
+    if granularity == DAY:
+        _fill_days(timeline_table, poll_id, buckets, labels, now)
+
+    timeline = []
+    for label in labels:
+        counts = buckets.get(_bucket_key(label, granularity), {})
+        timeline.append({
+            'bucket': label,
+            'total_votes': counts.get(TOTAL_FIELD, 0),
+            'answers': {name: count for name, count in counts.items() if name != TOTAL_FIELD}
+        })
+    return timeline
@@ -0,0 +1,78 @@
+"""
+Poll definitions, read from the polls table and cached per warm container.
+
+Each poll is an item keyed by poll_id (question, info_text, options,
+created_at, active). A catalog item (poll_id '#catalog') carries a `version`
+that changes whenever any definition does - Terraform derives it from the poll
+definitions themselves (see polls_api.tf).
+
+The whole catalog is cached in the container. Once the cache is older than
+CATALOG_TTL_SECONDS, only the catalog item is read; the polls are rescanned
+only if its version has moved, so steady-state cost is one small GetItem per
+container per TTL.
+"""
+import time
+
+
+CATALOG_POLL_ID = '#catalog'
+CATALOG_TTL_SECONDS = 60
+
+# Sparse GSI on the votes table: only votes with a reason carry reason_key
+REASONS_INDEX = 'ReasonsIndex'
+
+_catalog = {'version': None, 'polls': {}, 'checked_at': 0.0}
+
+
+def _scan_polls(polls_table):
+    polls = {}
+    scan_kwargs = {}
+    while True:
+        response = polls_table.scan(**scan_kwargs)
+        for item in response.get('Items', []):
+            if item['poll_id'] != CATALOG_POLL_ID:
+                polls[item['poll_id']] = item
+        if 'LastEvaluatedKey' not in response:
+            return polls
+        scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def load_poll_catalog(polls_table):
+    """Return {poll_id: definition} for every poll, active or not."""
+    now = time.monotonic()
+    if _catalog['version'] is not None and now - _catalog['checked_at'] < CATALOG_TTL_SECONDS:
+        return _catalog['polls']
+
+    response = polls_table.get_item(Key={'poll_id': CATALOG_POLL_ID})
+    version = response.get('Item', {}).get('version', '')
+    if version != _catalog['version']:
+        _catalog['polls'] = _scan_polls(polls_table)
+        _catalog['version'] = version
+    _catalog['checked_at'] = now
+    return _catalog['polls']
+
+
+def get_poll(polls_table, poll_id):
+    # A copy, so callers can add per-request fields without touching the cache
+    poll = load_poll_catalog(polls_table).get(poll_id)
+    return dict(poll) if poll else None
+
+
+def get_active_polls(polls_table):
+    # Active polls, oldest first
+    polls = [dict(poll) for poll in load_poll_catalog(polls_table).values() if poll.get('active')]
+    return sorted(polls, key=lambda poll: poll.get('created_at', ''))
+
+
+def add_poll_questions(polls_table, votes):
+    # Enrich votes with the question and info text of the poll they belong to
+    polls = load_poll_catalog(polls_table)
+    for vote in votes:
+        poll = polls.get(vote.get('poll_id'))
+        if poll:
+            vote['question'] = poll.get('question', '')
+            vote['info_text'] = poll.get('info_text', '')
+
+
+def reason_key(poll_id, answer):
+    # ReasonsIndex partition for one answer of one poll
+    return f'{poll_id}#{answer}'
@@ -0,0 +1,356 @@
+"""
+Single-table layout for a post and everything hanging off it.
+A post, its counters, its likes and its comments (with their likes) share the
+partition key post_id in POST_AGGREGATES_TABLE_NAME, told apart by sort key:
+    POST                                          - the post itself
+    COUNTERS                                      - like_count, comment_count
+    COMMENT#{created_at}#{comment_id}             - a comment
+    COMMENT#{created_at}#{comment_id}#LIKE#{uid}  - a like on that comment
+    LIKE#{uid}                                    - a like on the post
+so post detail is one paginated Query, and comments come back oldest first
+with each comment's likes right behind it.
+
+The migration runs in phases chosen by POST_AGGREGATE_MODE:
+    off        - legacy tables only (default)
+    dual_write - write handlers also write the aggregate; reads stay legacy.
+                 migrations/post_aggregates.py copies existing posts across
+                 and can be rerun until a pass repairs nothing.
+    read       - reads come from the aggregate, falling back to the legacy
+                 tables for posts it does not hold (archived, not backfilled)
+The legacy tables remain the source of truth until the last phase, so
+aggregate writes are best effort: failures are logged and left for the backfill.
+"""
+import os
+from botocore.exceptions import ClientError
+from .helpers import batch_get_items
+
+
+POST_SK = 'POST'
+COUNTERS_SK = 'COUNTERS'
+COMMENT_PREFIX = 'COMMENT#'
+LIKE_PREFIX = 'LIKE#'
+COMMENT_LIKE_INFIX = '#LIKE#'
+
+MODES = ('off', 'dual_write', 'read')
+# Feed-only post attributes; the aggregate holds the comments themselves
+FEED_ONLY_POST_FIELDS = ('latest_comments', 'latest_comments_version', 'changed_at')
+
+
+def aggregate_mode():
+    mode = os.environ.get('POST_AGGREGATE_MODE', 'off')
+    if mode not in MODES:
+        raise ValueError(f'POST_AGGREGATE_MODE must be one of {", ".join(MODES)}')
+    return mode
+
+
+def aggregate_writes_enabled():
+    return aggregate_mode() != 'off'
+
+
+def aggregate_reads_enabled():
+    return aggregate_mode() == 'read'
+
+
+def comment_sk(comment):
+    return f"{COMMENT_PREFIX}{comment['created_at']}#{comment['comment_id']}"
+
+
+def comment_like_sk(comment, user_id):
+    return f"{comment_sk(comment)}{COMMENT_LIKE_INFIX}{user_id}"
+
+
+def post_like_sk(user_id):
+    return LIKE_PREFIX + user_id
+
+
+def post_item(post):
+    item = {name: value for name, value in post.items() if name not in FEED_ONLY_POST_FIELDS}
+    item['sk'] = POST_SK
+    return item
+
+
+def _best_effort(write):
+    # Skipped before the dual-write phase; failures are left for the backfill
+    def wrapper(table, *args):
+        if not aggregate_writes_enabled():
+            return
+        try:
+            write(table, *args)
+        except ClientError as e:
+            print(f"Failed to write post aggregate ({write.__name__}): {str(e)}")
+    wrapper.__name__ = write.__name__
+    return wrapper
+
+
+#####################################################################
+# ITEMS
+#####################################################################
+
+def aggregate_items(post, comments, likes):
+    """Every item of a post's partition, built from its legacy-table items."""
+    post_id = post['post_id']
+    comments_by_id = {comment['comment_id']: comment for comment in comments}
+    post_likes = [like for like in likes if like['target_id'] == post_id and like.get('target_type') == 'post']
+
+    items = [post_item(post), {
+        'post_id': post_id,
+        'sk': COUNTERS_SK,
+        'like_count': len(post_likes),
+        'comment_count': len(comments)
+    }]
+    items.extend(dict(comment, sk=comment_sk(comment)) for comment in comments)
+    for like in post_likes:
+        items.append(dict(like, post_id=post_id, sk=post_like_sk(like['user_id'])))
+    for like in likes:
+        comment = comments_by_id.get(like['target_id'])
+        if comment and like.get('target_type') == 'comment':
+            items.append(dict(like, post_id=post_id, sk=comment_like_sk(comment, like['user_id'])))
+    return items
+
+
+def _strip_keys(item):
+    return {name: value for name, value in item.items() if name != 'sk'}
+
+
+def build_post_detail(post, comments, likes, user_id):
+    """
+    Post detail in one shape for either layout: the post with counts, who liked
+    it, and its comments oldest first, each with its own like count.
+    """
+    post_likes = [like for like in likes if like['target_id'] == post['post_id']]
+    comment_likes = {}
+    for like in likes:
+        if like['target_id'] != post['post_id']:
+            comment_likes.setdefault(like['target_id'], []).append(like)
+
+    detail = dict(post)
+    detail['like_count'] = len(post_likes)
+    detail['liked_by_user'] = any(like['user_id'] == user_id for like in post_likes)
+    detail['likes'] = [{
+        'user_id': like['user_id'],
+        'display_name': like.get('display_name', 'Unknown User')
+    } for like in post_likes]
+    detail['comments'] = []
+    for comment in sorted(comments, key=lambda c: c.get('created_at', '')):
+        likes_on_comment = comment_likes.get(comment['comment_id'], [])
+        detail['comments'].append(dict(
+            comment,
+            like_count=len(likes_on_comment),
+            liked_by_user=any(like['user_id'] == user_id for like in likes_on_comment)
+        ))
+    detail['comment_count'] = len(detail['comments'])
+    return detail
+
+
+#####################################################################
+# READS
+#####################################################################
+
+def _query_all(table, **query_kwargs):
+    items = []
+    while True:
+        response = table.query(**query_kwargs)
+        items.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return items
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def query_partition(table, post_id, sk_condition=None, sk_values=None):
+    key_condition = 'post_id = :post_id'
+    if sk_condition:
+        key_condition += ' AND ' + sk_condition
+    return _query_all(
+        table,
+        KeyConditionExpression=key_condition,
+        ExpressionAttributeValues=dict(sk_values or {}, **{':post_id': post_id})
+    )
+
+
+def read_legacy_post(comments_table, likes_table, post_id):
+    """
+    A post's comments and likes from the legacy tables: one comments query,
+    then one likes query for the post and for each comment.
+    """
+    comments = _query_all(
+        comments_table,
+        KeyConditionExpression='post_id = :post_id',
+        ExpressionAttributeValues={':post_id': post_id}
+    )
+    likes = []
+    for target_id in [post_id] + [comment['comment_id'] for comment in comments]:
+        likes.extend(_query_all(
+            likes_table,
+            KeyConditionExpression='target_id = :target_id',
+            ExpressionAttributeValues={':target_id': target_id}
+        ))
+    return comments, likes
+
+
+def split_partition(items):
+    # Sort the partition's items back into (post, comments, likes)
+    post = None
+    comments = []
+    likes = []
+    for item in items:
+        sk = item['sk']
+        if sk == POST_SK:
+            post = _strip_keys(item)
+        elif sk.startswith(LIKE_PREFIX) or COMMENT_LIKE_INFIX in sk:
+            likes.append(_strip_keys(item))
+        elif sk.startswith(COMMENT_PREFIX):
+            comments.append(_strip_keys(item))
+    return post, comments, likes
+
+
+def load_post_detail(table, post_id, user_id):
+    """Post detail from a single Query of the post's partition, or None if it is not held."""
+    post, comments, likes = split_partition(query_partition(table, post_id))
+    if post is None:
+        return None
+    return build_post_detail(post, comments, likes, user_id)
+
+
+def load_post_summary(table, post_id, user_id):
+    """
+    The post with its counters and the caller's like, read as three keys in
+    one BatchGetItem. None if the aggregate does not hold the post.
+    """
+    items = batch_get_items(table, [
+        {'post_id': post_id, 'sk': POST_SK},
+        {'post_id': post_id, 'sk': COUNTERS_SK},
+        {'post_id': post_id, 'sk': post_like_sk(user_id)}
+    ])
+    by_sk = {item['sk']: item for item in items}
+    if POST_SK not in by_sk or COUNTERS_SK not in by_sk:
+        return None
+    post = _strip_keys(by_sk[POST_SK])
+    post['like_count'] = by_sk[COUNTERS_SK].get('like_count', 0)
+    post['comment_count'] = by_sk[COUNTERS_SK].get('comment_count', 0)
+    post['liked_by_user'] = post_like_sk(user_id) in by_sk
+    return post
+
+
+def load_comments(table, post_id, user_id):
+    """
+    The post's comments with like counts, from one Query over the COMMENT#
+    range (which also takes in the COUNTERS item). None if the post was never
+    copied into the aggregate.
+    """
+    items = query_partition(table, post_id, 'sk BETWEEN :first AND :last',
+                            {':first': COMMENT_PREFIX, ':last': COUNTERS_SK})
+    if not any(item['sk'] == COUNTERS_SK for item in items):
+        return None
+    _, comments, likes = split_partition(items)
+    return build_post_detail({'post_id': post_id}, comments, likes, user_id)['comments']
+
+
+#####################################################################
+# DUAL WRITES
+#####################################################################
+
+def _add_counters(table, post_id, **deltas):
+    # Only posts already in the aggregate have counters; the rest get theirs from the backfill
+    try:
+        table.update_item(
+            Key={'post_id': post_id, 'sk': COUNTERS_SK},
+            UpdateExpression='ADD ' + ', '.join(f'{field} :{field}' for field in deltas),
+            ConditionExpression='attribute_exists(sk)',
+            ExpressionAttributeValues={f':{field}': delta for field, delta in deltas.items()}
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+
+
+@_best_effort
+def aggregate_put_post(table, post):
+    with table.batch_writer() as batch:
+        batch.put_item(Item=post_item(post))
+        batch.put_item(Item={'post_id': post['post_id'], 'sk': COUNTERS_SK, 'like_count': 0, 'comment_count': 0})
+
+
+@_best_effort
+def aggregate_update_post(table, post):
+    try:
+        table.put_item(Item=post_item(post), ConditionExpression='attribute_exists(sk)')
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+
+
+@_best_effort
+def aggregate_delete_post(table, post_id):
+    # Post, counters, comments and likes all go with the partition
+    items = query_partition(table, post_id)
+    with table.batch_writer() as batch:
+        for item in items:
+            batch.delete_item(Key={'post_id': post_id, 'sk': item['sk']})
+
+
+@_best_effort
+def aggregate_add_post_like(table, like):
+    try:
+        table.put_item(
+            Item=dict(like, post_id=like['target_id'], sk=post_like_sk(like['user_id'])),
+            ConditionExpression='attribute_not_exists(sk)'
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        return
+    _add_counters(table, like['target_id'], like_count=1)
+
+
+@_best_effort
+def aggregate_remove_post_like(table, post_id, user_id):
+    response = table.delete_item(Key={'post_id': post_id, 'sk': post_like_sk(user_id)}, ReturnValues='ALL_OLD')
+    if 'Attributes' in response:
+        _add_counters(table, post_id, like_count=-1)
+
+
+@_best_effort
+def aggregate_add_comment(table, comment):
+    table.put_item(Item=dict(comment, sk=comment_sk(comment)))
+    _add_counters(table, comment['post_id'], comment_count=1)
+
+
+@_best_effort
+def aggregate_remove_comment(table, comment):
+    # The comment's likes sort directly after it, so one range covers both
+    items = query_partition(table, comment['post_id'], 'begins_with(sk, :prefix)',
+                            {':prefix': comment_sk(comment)})
+    with table.batch_writer() as batch:
+        for item in items:
+            batch.delete_item(Key={'post_id': comment['post_id'], 'sk': item['sk']})
+    if any(item['sk'] == comment_sk(comment) for item in items):
+        _add_counters(table, comment['post_id'], comment_count=-1)
+
+
+@_best_effort
+def aggregate_add_comment_like(table, comment, like):
+    table.put_item(Item=dict(like, post_id=comment['post_id'], sk=comment_like_sk(comment, like['user_id'])))
+
+
+@_best_effort
+def aggregate_remove_comment_like(table, comment, user_id):
+    table.delete_item(Key={'post_id': comment['post_id'], 'sk': comment_like_sk(comment, user_id)})
+
+
+#####################################################################
+# BACKFILL
+#####################################################################
+
+def plan_post_aggregate_sync(table, post, comments, likes):
+    """
+    What it takes to make a post's partition match its legacy-table items:
+    (items to put, keys to delete). Puts cover anything missing or different,
+    including the counters.
+    """
+    post_id = post['post_id']
+    desired = {item['sk']: item for item in aggregate_items(post, comments, likes)}
+    existing = {item['sk']: item for item in query_partition(table, post_id)}
+
+    puts = [item for sk, item in desired.items() if existing.get(sk) != item]
+    deletes = [{'post_id': post_id, 'sk': sk} for sk in existing if sk not in desired]
+    return puts, deletes
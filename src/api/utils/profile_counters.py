@@ -0,0 +1,101 @@
+"""
+Activity counters kept on profile items.
+Write handlers adjust them with atomic ADD updates so profile pages can show a
+user's activity without querying posts, likes, comments and votes. The
+reconcile_profile_counters job repairs any drift from failed or partial writes.
+
+Archived posts (and the comments and likes archived with them) keep counting.
+archive_posts adds what each finished segment contributes to the user's item
+in ARCHIVE_TOTALS_TABLE_NAME, so reconcile reads one small item per user
+instead of every segment. The segment key is held in `counted_segments` until
+the segment's pending copy is gone, which makes a retried finish count once.
+"""
+from datetime import datetime
+from collections import Counter
+from botocore.exceptions import ClientError
+from .shared_cache import invalidate_cached_item
+
+
+COUNTER_FIELDS = ('post_count', 'likes_received', 'comment_count', 'poll_votes')
+ARCHIVED_COUNTER_FIELDS = ('post_count', 'likes_received', 'comment_count')
+
+
+def increment_profile_counters(profiles_table, user_id, **deltas):
+    """
+    Atomically add deltas to counters, e.g. increment_profile_counters(t, uid, post_count=1).
+    Best effort: the triggering write has already happened, so a failure is
+    logged and left for the reconcile job rather than failing the request.
+    changed_at is set so the shared profile cache can tell the item moved on.
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    changed_at = datetime.utcnow().isoformat()
+    values = {f':{field}': delta for field, delta in deltas.items()}
+    values[':changed_at'] = changed_at
+    try:
+        profiles_table.update_item(
+            Key={'user_id': user_id},
+            UpdateExpression=('SET changed_at = :changed_at ADD ' +
+                              ', '.join(f'#{field} :{field}' for field in deltas)),
+            # ADD would otherwise create a bare item for a user with no profile
+            ConditionExpression='attribute_exists(user_id)',
+            ExpressionAttributeNames={f'#{field}': field for field in deltas},
+            ExpressionAttributeValues=values
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            print(f"Failed to update profile counters for {user_id}: {str(e)}")
+        return
+    invalidate_cached_item({'user_id': user_id}, 'profiles', changed_at)
+
+
+def with_counter_defaults(profile):
+    # Profiles created before the counters existed have no counter attributes yet.
+    for field in COUNTER_FIELDS:
+        profile.setdefault(field, 0)
+    return profile
+
+
+#####################################################################
+# ARCHIVED TOTALS
+#####################################################################
+
+def archived_totals(records):
+    """{user_id: Counter} of what archived records add to each user's counters."""
+    totals = {}
+    for record in records:
+        author = totals.setdefault(record['post']['user_id'], Counter())
+        author['post_count'] += 1
+        author['likes_received'] += sum(1 for like in record.get('likes', []) if like.get('target_type') == 'post')
+        for comment in record.get('comments', []):
+            totals.setdefault(comment['user_id'], Counter())['comment_count'] += 1
+    return totals
+
+
+def add_archived_totals(totals_table, segment_key, records):
+    # Once per user per segment: a finish retried after a crash adds nothing
+    for user_id, counts in archived_totals(records).items():
+        fields = [field for field in ARCHIVED_COUNTER_FIELDS if counts[field]]
+        values = {f':{field}': counts[field] for field in fields}
+        values.update({':segment': {segment_key}, ':segment_key': segment_key})
+        try:
+            totals_table.update_item(
+                Key={'user_id': user_id},
+                UpdateExpression='ADD counted_segments :segment' + ''.join(f', {field} :{field}' for field in fields),
+                ConditionExpression='NOT contains(counted_segments, :segment_key)',
+                ExpressionAttributeValues=values
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+
+
+def release_archived_segment(totals_table, segment_key, records):
+    # The segment can no longer be finished again, so stop remembering it
+    for user_id in archived_totals(records):
+        totals_table.update_item(
+            Key={'user_id': user_id},
+            UpdateExpression='DELETE counted_segments :segment',
+            ExpressionAttributeValues={':segment': {segment_key}}
+        )
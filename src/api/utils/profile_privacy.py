@@ -0,0 +1,22 @@
+"""
+Privacy filtering for profiles returned to other users.
+Every handler that returns someone else's profile passes it through
+filter_private_profile so a private profile shows the same fields everywhere.
+"""
+
+
+def filter_private_profile(profile, is_own_profile):
+    # If viewing own profile or profile is not private, return full profile
+    if is_own_profile or not profile.get('profile_private', False):
+        return profile
+    
+    # For private profiles viewed by others, only show name and metadata
+    return {
+        'user_id': profile.get('user_id'),
+        'display_name': profile.get('display_name'),
+        'bio': '',
+        'political_alignment': '',
+        'profile_private': True,
+        'created_at': profile.get('created_at'),
+        'updated_at': profile.get('updated_at')
+    }
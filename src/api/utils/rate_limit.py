@@ -0,0 +1,205 @@
+"""
+Per-user write rate limiting.
+Each user has a token bucket per scope, stored in RATE_LIMITS_TABLE_NAME. A
+request takes one token; tokens refill continuously at the scope's rate up to
+its burst. Buckets are updated with a version-conditioned write so concurrent
+containers never both spend the same tokens, and expire via TTL once they
+would have refilled anyway.
+
+Warm containers keep the last bucket state they saw. Refill is a function of
+time and other containers can only take tokens, so that state is an upper
+bound on the real balance:
+- when it is already empty the request is rejected without a round trip
+- when it is well above empty and was synced recently, the request is
+  allowed locally and the token is written back with the next sync
+"""
+import math
+import time
+from decimal import Decimal
+from functools import wraps
+from botocore.exceptions import ClientError
+from .response_builder import too_many_requests_response
+from .helpers import get_table, get_user_id_from_event
+from .idempotency import is_completed_replay
+
+
+# scope -> (requests per minute, burst)
+RATE_LIMITS = {
+    'posts': (10, 5),
+    'post_edits': (30, 10),
+    'comments': (20, 10),
+    'comment_edits': (30, 10),
+    'likes': (60, 20),
+    'votes': (30, 10),
+    'profile_edits': (10, 5)
+}
+
+MAX_SYNC_ATTEMPTS = 3
+LOCAL_ALLOW_FRACTION = 0.5  # allow locally while at least this share of the burst is left
+LOCAL_SYNC_SECONDS = 5      # ...and the last sync is this recent
+LOCAL_MAX_BUCKETS = 1000
+EXPIRY_MARGIN_SECONDS = 60
+
+_table = None
+_local_buckets = {}
+
+
+def _get_rate_limits_table():
+    global _table
+    if _table is None:
+        _table = get_table('RATE_LIMITS_TABLE_NAME')
+    return _table
+
+
+#####################################################################
+# BUCKET STATE
+#####################################################################
+
+def _refill(state, rate, burst, now):
+    # Tokens available at `now` from a synced state, before unsynced local spend
+    if state is None:
+        return float(burst)
+    return min(float(burst), state['tokens'] + max(0.0, now - state['updated_at']) * rate)
+
+
+def _retry_after(balance, rate):
+    return max(1, math.ceil((1 - balance) / rate))
+
+
+def _state_from_raw(raw_item):
+    if not raw_item:
+        return None
+    return {
+        'tokens': float(raw_item['tokens']['N']),
+        'updated_at': float(raw_item['updated_at']['N']),
+        'version': int(raw_item['version']['N']),
+        'synced_at': time.time(),
+        'pending': 0
+    }
+
+
+def _local_check(bucket_key, rate, burst, now):
+    """Returns (allowed, retry_after) when the cached state decides the request, else None."""
+    state = _local_buckets.get(bucket_key)
+    if state is None:
+        return None
+    balance = _refill(state, rate, burst, now) - state['pending']
+    if balance < 1:
+        return False, _retry_after(balance, rate)
+    if balance - 1 >= burst * LOCAL_ALLOW_FRACTION and now - state['synced_at'] < LOCAL_SYNC_SECONDS:
+        state['pending'] += 1
+        return True, 0
+    return None
+
+
+def _remember(bucket_key, state):
+    if bucket_key not in _local_buckets and len(_local_buckets) >= LOCAL_MAX_BUCKETS:
+        _local_buckets.clear()
+    _local_buckets[bucket_key] = state
+
+
+def _sync(table, bucket_key, rate, burst, now):
+    """
+    Spend a token (plus any spent locally since the last sync) in DynamoDB.
+    Returns (allowed, retry_after).
+    """
+    state = _local_buckets.get(bucket_key)
+    for _ in range(MAX_SYNC_ATTEMPTS):
+        pending = state['pending'] if state else 0
+        balance = _refill(state, rate, burst, now) - pending
+        allowed = balance >= 1
+        if not allowed and not pending and state is not None:
+            # Nothing to record - the stored bucket is already at least this empty
+            return False, _retry_after(balance, rate)
+        tokens = balance - 1 if allowed else balance
+        version = state['version'] + 1 if state else 1
+
+        put_kwargs = {
+            'Item': {
+                'bucket_key': bucket_key,
+                'tokens': Decimal(str(round(tokens, 3))),
+                'updated_at': Decimal(str(round(now, 3))),
+                'version': version,
+                'expires_at': int(now + (burst - tokens) / rate + EXPIRY_MARGIN_SECONDS)
+            },
+            'ConditionExpression': 'attribute_not_exists(bucket_key)',
+            'ReturnValuesOnConditionCheckFailure': 'ALL_OLD'
+        }
+        if state is not None:
+            put_kwargs['ConditionExpression'] = 'version = :version'
+            put_kwargs['ExpressionAttributeValues'] = {':version': state['version']}
+        try:
+            table.put_item(**put_kwargs)
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            # Another container moved the bucket; retry from its state. Tokens
+            # spent locally against the stale state still have to be paid.
+            current = _state_from_raw(e.response.get('Item'))
+            if current is not None:
+                current['pending'] = pending
+            state = current
+            continue
+
+        _remember(bucket_key, {
+            'tokens': tokens,
+            'updated_at': now,
+            'version': version,
+            'synced_at': now,
+            'pending': 0
+        })
+        return allowed, 0 if allowed else _retry_after(balance, rate)
+
+    print(f"Rate limit bucket {bucket_key} still contended after {MAX_SYNC_ATTEMPTS} attempts; allowing request")
+    return True, 0
+
+
+def check_rate_limit(user_id, scope):
+    """Take a token from the user's bucket for `scope`. Returns 0 if allowed, else Retry-After seconds."""
+    per_minute, burst = RATE_LIMITS[scope]
+    rate = per_minute / 60.0
+    bucket_key = f'{user_id}#{scope}'
+    now = time.time()
+
+    decided = _local_check(bucket_key, rate, burst, now)
+    if decided is None:
+        try:
+            decided = _sync(_get_rate_limits_table(), bucket_key, rate, burst, now)
+        except ClientError as e:
+            # Limiting is protective, not critical - don't fail the write over it
+            print(f"Rate limit check failed for {bucket_key}, allowing request: {str(e)}")
+            return 0
+    allowed, retry_after = decided
+    return 0 if allowed else retry_after
+
+
+def rate_limited(scope):
+    """
+    Decorator for write handlers, applied inside error_handler and outside
+    idempotent so rejected requests never claim an Idempotency-Key:
+
+        @error_handler
+        @rate_limited('posts')
+        @idempotent('create_post')
+        def lambda_handler(event, context): ...
+
+    Over-limit requests get 429 with a Retry-After header, unless they retry a
+    request that already completed under their Idempotency-Key, so a client
+    whose response was lost always gets the stored response back.
+    """
+    if scope not in RATE_LIMITS:
+        raise ValueError(f'Unknown rate limit scope: {scope}')
+
+    def decorator(func):
+        idempotency_scope = getattr(func, 'idempotency_scope', None)
+
+        @wraps(func)
+        def wrapper(event, context):
+            retry_after = check_rate_limit(get_user_id_from_event(event), scope)
+            # Only an over-limit request pays for the replay lookup
+            if retry_after and not (idempotency_scope and is_completed_replay(event, idempotency_scope)):
+                return too_many_requests_response(retry_after)
+            return func(event, context)
+
+        return wrapper
+    return decorator
@@ -0,0 +1,210 @@
+"""
+Push channel for live post, like and comment updates.
+Browsers hold an API Gateway WebSocket and subscribe to topics:
+    feed           - new, edited and deleted posts plus like/comment activity
+    post:{post_id} - everything happening on one post
+A DynamoDB Streams consumer turns table changes into compact events and sends
+each subscribed connection one batched message per stream batch.
+
+Connections and subscriptions share one table keyed by (topic, connection_id);
+the row under CONNECTION_TOPIC holds a connection's owner and its topics so
+disconnect can clean up.
+
+Sends go through a connection manager chosen by environment variable:
+    WEBSOCKET_ENDPOINT - API Gateway management API (https://{api}.execute-api.../{stage})
+    WEBSOCKET_LOCAL    - in-process stand-in that records messages, for local runs and tests
+"""
+import os
+import re
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .response_builder import decimal_default
+
+
+CONNECTION_TOPIC = '$connection'
+FEED_TOPIC = 'feed'
+POST_TOPIC_PREFIX = 'post:'
+MAX_TOPICS_PER_CONNECTION = 20
+# API Gateway closes WebSockets after 2 hours; rows outlive that slightly
+CONNECTION_TTL_SECONDS = 2 * 60 * 60 + 300
+# Keep each frame well under the 128 KB WebSocket message limit
+MAX_EVENTS_PER_MESSAGE = 50
+SEND_WORKERS = 16
+
+_POST_ID_PATTERN = re.compile(r'^[A-Za-z0-9-]{1,64}$')
+
+
+def post_topic(post_id):
+    return POST_TOPIC_PREFIX + post_id
+
+
+def is_valid_topic(topic):
+    if topic == FEED_TOPIC:
+        return True
+    return (isinstance(topic, str) and topic.startswith(POST_TOPIC_PREFIX)
+            and bool(_POST_ID_PATTERN.match(topic[len(POST_TOPIC_PREFIX):])))
+
+
+#####################################################################
+# CONNECTION MANAGERS
+#####################################################################
+
+class ApiGatewayConnectionManager:
+    def __init__(self, endpoint_url):
+        import boto3
+        self._client = boto3.client('apigatewaymanagementapi', endpoint_url=endpoint_url)
+
+    def send(self, connection_id, data):
+        # Returns False when the connection is gone and should be forgotten.
+        try:
+            self._client.post_to_connection(ConnectionId=connection_id, Data=data)
+            return True
+        except self._client.exceptions.GoneException:
+            return False
+
+
+class LocalConnectionManager:
+    """Stand-in that keeps sent messages in memory, keyed by connection id."""
+
+    def __init__(self):
+        self.sent = {}
+        self.gone = set()
+
+    def send(self, connection_id, data):
+        if connection_id in self.gone:
+            return False
+        self.sent.setdefault(connection_id, []).append(json.loads(data))
+        return True
+
+
+_manager = None
+
+
+def get_connection_manager():
+    global _manager
+    if _manager is None:
+        if os.environ.get('WEBSOCKET_ENDPOINT'):
+            _manager = ApiGatewayConnectionManager(os.environ['WEBSOCKET_ENDPOINT'])
+        elif os.environ.get('WEBSOCKET_LOCAL'):
+            _manager = LocalConnectionManager()
+        else:
+            raise KeyError('WEBSOCKET_ENDPOINT')
+    return _manager
+
+
+def set_connection_manager(manager):
+    global _manager
+    _manager = manager
+
+
+#####################################################################
+# CONNECTIONS AND SUBSCRIPTIONS
+#####################################################################
+
+def register_connection(connections_table, connection_id, user_id):
+    connections_table.put_item(Item={
+        'topic': CONNECTION_TOPIC,
+        'connection_id': connection_id,
+        'user_id': user_id,
+        'connected_at': int(time.time()),
+        'expires_at': int(time.time()) + CONNECTION_TTL_SECONDS
+    })
+
+
+def subscribe(connections_table, connection_id, topics):
+    """
+    Subscribe a connection to topics. Returns the connection's full topic list,
+    or None if the connection is unknown.
+    """
+    connection = connections_table.get_item(
+        Key={'topic': CONNECTION_TOPIC, 'connection_id': connection_id}
+    ).get('Item')
+    if connection is None:
+        return None
+
+    current = set(connection.get('topics', set()))
+    new_topics = [topic for topic in dict.fromkeys(topics) if topic not in current]
+    if len(current) + len(new_topics) > MAX_TOPICS_PER_CONNECTION:
+        raise ValueError(f'A connection can subscribe to at most {MAX_TOPICS_PER_CONNECTION} topics')
+    if not new_topics:
+        return sorted(current)
+
+    with connections_table.batch_writer() as batch:
+        for topic in new_topics:
+            batch.put_item(Item={
+                'topic': topic,
+                'connection_id': connection_id,
+                'expires_at': connection['expires_at']
+            })
+    connections_table.update_item(
+        Key={'topic': CONNECTION_TOPIC, 'connection_id': connection_id},
+        UpdateExpression='ADD topics :topics',
+        ExpressionAttributeValues={':topics': set(new_topics)}
+    )
+    return sorted(current | set(new_topics))
+
+
+def remove_connection(connections_table, connection_id):
+    connection = connections_table.get_item(
+        Key={'topic': CONNECTION_TOPIC, 'connection_id': connection_id}
+    ).get('Item') or {}
+    with connections_table.batch_writer() as batch:
+        for topic in connection.get('topics', set()):
+            batch.delete_item(Key={'topic': topic, 'connection_id': connection_id})
+        batch.delete_item(Key={'topic': CONNECTION_TOPIC, 'connection_id': connection_id})
+
+
+def subscribers(connections_table, topic):
+    connection_ids = []
+    query_kwargs = {
+        'KeyConditionExpression': 'topic = :topic',
+        'ExpressionAttributeValues': {':topic': topic},
+        'ProjectionExpression': 'connection_id'
+    }
+    while True:
+        response = connections_table.query(**query_kwargs)
+        connection_ids.extend(item['connection_id'] for item in response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return connection_ids
+        query_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+#####################################################################
+# BROADCAST
+#####################################################################
+
+def broadcast(connections_table, manager, events):
+    """
+    Deliver events, given as (topics, payload) pairs, to every subscriber.
+    Each connection gets its events in order, batched into as few messages as
+    possible, and receives an event once even when subscribed to several of
+    its topics. Returns the number of messages sent.
+    """
+    topic_subscribers = {}
+    outbox = {}
+    for topics, payload in events:
+        recipients = set()
+        for topic in topics:
+            if topic not in topic_subscribers:
+                topic_subscribers[topic] = subscribers(connections_table, topic)
+            recipients.update(topic_subscribers[topic])
+        for connection_id in recipients:
+            outbox.setdefault(connection_id, []).append(payload)
+
+    def deliver(connection_id):
+        pending = outbox[connection_id]
+        sent = 0
+        for start in range(0, len(pending), MAX_EVENTS_PER_MESSAGE):
+            data = json.dumps({'type': 'events', 'events': pending[start:start + MAX_EVENTS_PER_MESSAGE]},
+                              default=decimal_default, separators=(',', ':'))
+            if not manager.send(connection_id, data):
+                remove_connection(connections_table, connection_id)
+                break
+            sent += 1
+        return sent
+
+    if not outbox:
+        return 0
+    with ThreadPoolExecutor(max_workers=min(SEND_WORKERS, len(outbox))) as executor:
+        return sum(executor.map(deliver, list(outbox)))
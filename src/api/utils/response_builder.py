@@ -6,6 +6,13 @@ import json
 from decimal import Decimal
 from functools import wraps
 from botocore.exceptions import ClientError
+from .tracing import span, trace_request
+from .hot_keys import flush_if_due
+from .columnar import COLUMNAR_MEDIA_TYPE, accepts_columnar, encode_columnar, decode_columnar
+
+
+# Response format negotiated for the invocation in flight (set by error_handler)
+_negotiated = {'columnar': False}
 
 
 # Helper to convert Decimal to native Python types for JSON serialization
@@ -16,17 +23,48 @@ def decimal_default(obj):
     raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
 
 
+def serialize_body(body):
+    with span('serialize'):
+        return json.dumps(body, default=decimal_default)
+
+
 def build_response(status_code, body):
+    # Successful bodies go out column-oriented when the client asked for it
+    # (see utils/columnar.py); errors always stay plain JSON
+    content_type = 'application/json'
+    if _negotiated['columnar'] and status_code < 300:
+        content_type = COLUMNAR_MEDIA_TYPE
+        with span('encode_columnar'):
+            body = encode_columnar(body)
     return {
         'statusCode': status_code,
         'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*'
+            'Content-Type': content_type,
+            'Access-Control-Allow-Origin': '*',
+            'Vary': 'Accept'
         },
-        'body': json.dumps(body, default=decimal_default)
+        'body': serialize_body(body)
     }
 
 
+def renegotiate_response(response):
+    """
+    Re-encode a response built for an earlier request (an idempotent replay)
+    in the format this request negotiated, so a client never gets a columnar
+    body it did not ask for, or plain JSON when it did.
+    """
+    headers = response.get('headers') or {}
+    stored_columnar = headers.get('Content-Type') == COLUMNAR_MEDIA_TYPE
+    if stored_columnar == _negotiated['columnar'] or response.get('statusCode', 500) >= 300:
+        return response
+    body = json.loads(response['body'])
+    if stored_columnar:
+        body = decode_columnar(body)
+    rebuilt = build_response(response['statusCode'], body)
+    rebuilt['headers'] = dict(headers, **rebuilt['headers'])
+    return rebuilt
+
+
 def success_response(body, status_code=200):
     return build_response(status_code, body)
 
@@ -51,21 +89,81 @@ def server_error_response(message='Internal server error'):
     return error_response(message, 500)
 
 
+def too_many_requests_response(retry_after, message='Too many requests - please slow down'):
+    response = error_response(message, 429)
+    response['headers']['Retry-After'] = str(retry_after)
+    # Let browser clients read the header across origins
+    response['headers']['Access-Control-Expose-Headers'] = 'Retry-After'
+    return response
+
+
+def conditional_failure_response(error, not_found_message, forbidden_message):
+    """
+    Map a failed ownership-checked write to 404/403.
+    Writes pass ReturnValuesOnConditionCheckFailure='ALL_OLD', so the error
+    carries the current item when it exists and no extra read is needed.
+    Any other ClientError is re-raised for error_handler.
+    """
+    if error.response['Error']['Code'] != 'ConditionalCheckFailedException':
+        raise error
+    if 'Item' not in error.response:
+        return not_found_response(not_found_message)
+    return forbidden_response(forbidden_message)
+
+
 def error_handler(func):
+    # Also traces each invocation (see utils.tracing) when TRACE_ENABLED or
+    # PROFILE_SAMPLE_RATE is set, negotiates the response format from the
+    # Accept header, and periodically logs hot partition keys (utils.hot_keys).
+    trace_name = func.__module__
+    
     @wraps(func)
     def wrapper(event, context):
+        _negotiated['columnar'] = accepts_columnar(event)
         try:
-            return func(event, context)
-        except KeyError as e:
-            print(f"KeyError: Missing required field or claim - {str(e)}")
-            return unauthorized_response('Unauthorized - Invalid token or missing required fields')
-        except ClientError as e:
-            error_code = e.response['Error']['Code']
-            print(f"AWS ClientError: {error_code} - {str(e)}")
-            return server_error_response()
-        except Exception as e:
-            print(f"Unexpected error: {str(e)}")
-            return server_error_response()
+            with trace_request(trace_name, context) as trace:
+                response = _call_handler(func, event, context)
+                if trace is not None:
+                    trace.record_status(response)
+                return response
+        finally:
+            _negotiated['columnar'] = False
+            flush_if_due()
     
     return wrapper
 
+
+def event_handler(func):
+    # For handlers invoked by an event source (streams, schedules) rather than
+    # API Gateway: traced and hot-key flushed like error_handler, but errors
+    # propagate so Lambda reports the invocation as failed and the source
+    # retries it instead of treating a 500 response as success.
+    trace_name = func.__module__
+    
+    @wraps(func)
+    def wrapper(event, context):
+        try:
+            with trace_request(trace_name, context):
+                with span('handler'):
+                    return func(event, context)
+        finally:
+            flush_if_due()
+    
+    return wrapper
+
+
+def _call_handler(func, event, context):
+    try:
+        with span('handler'):
+            return func(event, context)
+    except KeyError as e:
+        print(f"KeyError: Missing required field or claim - {str(e)}")
+        return unauthorized_response('Unauthorized - Invalid token or missing required fields')
+    except ClientError as e:
+        error_code = e.response['Error']['Code']
+        print(f"AWS ClientError: {error_code} - {str(e)}")
+        return server_error_response()
+    except Exception as e:
+        print(f"Unexpected error: {str(e)}")
+        return server_error_response()
+
@@ -0,0 +1,187 @@
+"""
+Inverted index utilities for full-text post search.
+Posts are tokenized into normalized terms and stored as postings
+(term -> created_at#post_id) so that a search only reads the postings
+of the terms being searched for.
+"""
+import re
+import unicodedata
+
+
+MIN_TERM_LENGTH = 2
+MAX_TERMS_PER_POST = 64
+MAX_QUERY_TERMS = 5
+POSTING_PAGE_SIZE = 50
+
+STOPWORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'but', 'by', 'for', 'from',
+    'has', 'have', 'i', 'if', 'in', 'is', 'it', 'its', 'of', 'on', 'or',
+    'so', 'that', 'the', 'this', 'to', 'was', 'we', 'were', 'will', 'with'
+])
+
+_TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+
+def normalize_text(text):
+    # Lowercase and strip diacritics so "Māori" and "maori" index the same term.
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text, max_terms=MAX_TERMS_PER_POST):
+    # Split text into unique, normalized search terms (order of first appearance).
+    terms = []
+    seen = set()
+    for token in _TOKEN_PATTERN.findall(normalize_text(text)):
+        if len(token) < MIN_TERM_LENGTH or token in STOPWORDS or token in seen:
+            continue
+        seen.add(token)
+        terms.append(token)
+        if len(terms) >= max_terms:
+            break
+    return terms
+
+
+def posting_sort_key(post):
+    # Postings sort by creation time; post_id breaks ties between identical timestamps.
+    return f"{post['created_at']}#{post['post_id']}"
+
+
+def _posting(term, post):
+    return {
+        'term': term,
+        'sort_key': posting_sort_key(post),
+        'post_id': post['post_id'],
+        'created_at': post['created_at']
+    }
+
+
+def index_post(index_table, post):
+    """Write a posting for every term in the post's content."""
+    with index_table.batch_writer() as batch:
+        for term in tokenize(post.get('content', '')):
+            batch.put_item(Item=_posting(term, post))
+
+
+def unindex_post(index_table, post):
+    """Remove every posting written for the post's content."""
+    sort_key = posting_sort_key(post)
+    with index_table.batch_writer() as batch:
+        for term in tokenize(post.get('content', '')):
+            batch.delete_item(Key={'term': term, 'sort_key': sort_key})
+
+
+def reindex_post(index_table, old_post, new_post):
+    """Apply only the posting changes between two versions of a post."""
+    old_terms = set(tokenize(old_post.get('content', '')))
+    new_terms = set(tokenize(new_post.get('content', '')))
+    sort_key = posting_sort_key(new_post)
+    with index_table.batch_writer() as batch:
+        for term in old_terms - new_terms:
+            batch.delete_item(Key={'term': term, 'sort_key': sort_key})
+        for term in new_terms - old_terms:
+            batch.put_item(Item=_posting(term, new_post))
+
+
+class _PostingCursor:
+    """
+    Walks one term's postings newest-first, a page at a time.
+    seek() jumps straight to a sort key with a range condition instead of
+    paging through everything in between.
+    """
+
+    def __init__(self, index_table, term, page_size):
+        self.index_table = index_table
+        self.term = term
+        self.page_size = page_size
+        self.head = None
+        self.post_id = None
+        self._buffer = []
+        self._position = 0
+        self._more = False
+
+    def _load(self, upper_bound, inclusive):
+        operator = '<=' if inclusive else '<'
+        query_kwargs = {
+            'KeyConditionExpression': '#term = :term',
+            'ExpressionAttributeNames': {'#term': 'term', '#sort_key': 'sort_key'},
+            'ExpressionAttributeValues': {':term': self.term},
+            'ProjectionExpression': '#sort_key, post_id',
+            'ScanIndexForward': False,
+            'Limit': self.page_size
+        }
+        if upper_bound is not None:
+            query_kwargs['KeyConditionExpression'] += f' AND #sort_key {operator} :upper'
+            query_kwargs['ExpressionAttributeValues'][':upper'] = upper_bound
+        response = self.index_table.query(**query_kwargs)
+        self._buffer = response.get('Items', [])
+        self._position = 0
+        self._more = 'LastEvaluatedKey' in response
+        self._set_head()
+
+    def _set_head(self):
+        if self._position < len(self._buffer):
+            posting = self._buffer[self._position]
+            self.head = posting['sort_key']
+            self.post_id = posting['post_id']
+        else:
+            self.head = None
+            self.post_id = None
+
+    def start(self, before=None):
+        self._load(before, inclusive=False)
+
+    def advance(self):
+        previous = self.head
+        self._position += 1
+        if self._position >= len(self._buffer) and self._more:
+            self._load(previous, inclusive=False)
+        else:
+            self._set_head()
+
+    def seek(self, target):
+        # Move to the newest posting whose sort key is <= target.
+        while self._position < len(self._buffer) and self._buffer[self._position]['sort_key'] > target:
+            self._position += 1
+        if self._position >= len(self._buffer) and self._more:
+            self._load(target, inclusive=True)
+        else:
+            self._set_head()
+
+
+def search_post_ids(index_table, query, limit, before=None):
+    """
+    Return (post_ids, next_before) for posts containing every query term,
+    newest first. Posting lists are intersected with a leapfrog join, so the
+    reads are proportional to the postings of the searched terms rather than
+    to the number of posts.
+    """
+    terms = tokenize(query, max_terms=MAX_QUERY_TERMS)
+    if not terms:
+        return ([], None)
+
+    cursors = [_PostingCursor(index_table, term, POSTING_PAGE_SIZE) for term in terms]
+    for cursor in cursors:
+        cursor.start(before)
+
+    post_ids = []
+    last_sort_key = None
+    while len(post_ids) < limit:
+        if any(cursor.head is None for cursor in cursors):
+            return (post_ids, None)
+
+        # Postings are descending, so the smallest head is the newest candidate
+        # every list could still contain.
+        target = min(cursor.head for cursor in cursors)
+        if all(cursor.head == target for cursor in cursors):
+            post_ids.append(cursors[0].post_id)
+            last_sort_key = target
+            for cursor in cursors:
+                cursor.advance()
+        else:
+            for cursor in cursors:
+                if cursor.head > target:
+                    cursor.seek(target)
+
+    has_more = all(cursor.head is not None for cursor in cursors)
+    return (post_ids, last_sort_key if has_more else None)
@@ -0,0 +1,318 @@
+"""
+Shared read-through cache for hot DynamoDB items.
+Lets every Lambda container share one cache of posts and profiles instead of
+each going to DynamoDB for the same viral item.
+
+The backend is chosen by the SHARED_CACHE_URL environment variable:
+    redis://host:6379/0     - Redis (requires the `redis` package)
+    memcache://host:11211   - Memcached (requires the `pymemcache` package)
+    local://                - in-process stand-in for local runs and tests
+When unset the cache is disabled and reads go straight to DynamoDB.
+
+Entries are stamped with the item's version: the newest of its `updated_at`
+and `changed_at`. Writers invalidate by storing a tombstone stamped with the
+write time, and a fill is only accepted when its stamp is newer than what is
+cached, so a slow reader can never put a stale item back after a concurrent
+update. Writes that leave updated_at alone (likes, comment previews, profile
+counters) set changed_at to the time they invalidate with, so the item they
+leave behind can be cached again straight away.
+"""
+import os
+import json
+import time
+import threading
+from decimal import Decimal
+
+
+DEFAULT_TTL_SECONDS = 300
+TOMBSTONE_TTL_SECONDS = 60
+METRICS_FLUSH_INTERVAL_SECONDS = 60
+
+
+def _encode_value(obj):
+    # Keep Decimal exact across the round trip (json would turn it into float).
+    if isinstance(obj, Decimal):
+        return {'$d': str(obj)}
+    if isinstance(obj, set):
+        return {'$s': sorted(obj, key=str)}
+    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+
+def _decode_value(obj):
+    if '$d' in obj and len(obj) == 1:
+        return Decimal(obj['$d'])
+    if '$s' in obj and len(obj) == 1:
+        return set(obj['$s'])
+    return obj
+
+
+def serialize_entry(version, item, tombstone=False):
+    entry = {'v': version, 'd': item}
+    if tombstone:
+        entry['t'] = 1
+    return json.dumps(entry, separators=(',', ':'), default=_encode_value)
+
+
+def deserialize_entry(raw):
+    if raw is None:
+        return None
+    if isinstance(raw, bytes):
+        raw = raw.decode('utf-8')
+    return json.loads(raw, object_hook=_decode_value)
+
+
+def item_version(item):
+    # ISO timestamps, so the newest also sorts last
+    return max(item.get('updated_at') or item.get('created_at') or '', item.get('changed_at') or '')
+
+
+def is_newer(current_raw, version):
+    # A fill replaces an entry with an older stamp, or a tombstone with the same
+    # stamp (the write that invalidated it produced exactly this version).
+    current = deserialize_entry(current_raw)
+    if current is None:
+        return True
+    if current.get('t'):
+        return version >= current['v']
+    return version > current['v']
+
+
+#####################################################################
+# BACKENDS
+#####################################################################
+
+class CacheBackend:
+    """Minimal interface every shared cache backend implements."""
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set_if_newer(self, key, version, value, ttl):
+        # Store value only if is_newer() holds for the currently cached entry.
+        raise NotImplementedError
+
+
+class LocalCacheBackend(CacheBackend):
+    """In-process stand-in with the same semantics as the network backends."""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            raw, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            return raw
+
+    def set_if_newer(self, key, version, value, ttl):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.time() and not is_newer(entry[0], version):
+                return False
+            self._entries[key] = (value, time.time() + ttl)
+            return True
+
+
+class RedisCacheBackend(CacheBackend):
+    # Compare-and-set done server side so concurrent containers cannot interleave.
+    _SET_IF_NEWER_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if current then
+  local ok, decoded = pcall(cjson.decode, current)
+  if ok and decoded['v'] then
+    if decoded['t'] and decoded['v'] > ARGV[1] then
+      return 0
+    end
+    if not decoded['t'] and decoded['v'] >= ARGV[1] then
+      return 0
+    end
+  end
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+    def __init__(self, url):
+        import redis
+        self._client = redis.Redis.from_url(url, socket_timeout=0.05, socket_connect_timeout=0.1)
+        self._set_if_newer = self._client.register_script(self._SET_IF_NEWER_SCRIPT)
+
+    def get(self, key):
+        return self._client.get(key)
+
+    def set_if_newer(self, key, version, value, ttl):
+        return bool(self._set_if_newer(keys=[key], args=[version, value, int(ttl)]))
+
+
+class MemcachedCacheBackend(CacheBackend):
+    MAX_CAS_ATTEMPTS = 3
+
+    def __init__(self, url):
+        from pymemcache.client.base import Client
+        host_port = url.split('://', 1)[1].rstrip('/')
+        host, _, port = host_port.partition(':')
+        self._client = Client((host, int(port or 11211)), timeout=0.05, connect_timeout=0.1)
+
+    def get(self, key):
+        return self._client.get(key)
+
+    def set_if_newer(self, key, version, value, ttl):
+        for _ in range(self.MAX_CAS_ATTEMPTS):
+            current, cas_token = self._client.gets(key)
+            if current is None:
+                # add() fails if another container stored the key first; retry via gets/cas
+                if self._client.add(key, value, expire=int(ttl), noreply=False):
+                    return True
+                continue
+            if not is_newer(current, version):
+                return False
+            if self._client.cas(key, value, cas_token, expire=int(ttl), noreply=False):
+                return True
+        return False
+
+
+def create_backend(url):
+    if not url:
+        return None
+    if url.startswith('redis://') or url.startswith('rediss://'):
+        return RedisCacheBackend(url)
+    if url.startswith('memcache://'):
+        return MemcachedCacheBackend(url)
+    if url.startswith('local://'):
+        return LocalCacheBackend()
+    raise ValueError(f'Unsupported SHARED_CACHE_URL scheme: {url}')
+
+
+#####################################################################
+# READ-THROUGH CACHE
+#####################################################################
+
+class CacheMetrics:
+    """Per-container hit/miss counters, flushed as CloudWatch EMF log lines."""
+
+    FIELDS = ('hits', 'misses', 'fills', 'stale_fills', 'invalidations', 'errors')
+
+    def __init__(self):
+        self._counts = {}
+        self._last_flush = time.time()
+
+    def incr(self, namespace, field):
+        counts = self._counts.setdefault(namespace, dict.fromkeys(self.FIELDS, 0))
+        counts[field] += 1
+        if time.time() - self._last_flush >= METRICS_FLUSH_INTERVAL_SECONDS:
+            self.flush()
+
+    def snapshot(self):
+        snapshot = {}
+        for namespace, counts in self._counts.items():
+            lookups = counts['hits'] + counts['misses']
+            snapshot[namespace] = dict(counts, hit_ratio=(counts['hits'] / lookups) if lookups else 0.0)
+        return snapshot
+
+    def flush(self):
+        for namespace, counts in self.snapshot().items():
+            print(json.dumps({
+                '_aws': {
+                    'Timestamp': int(time.time() * 1000),
+                    'CloudWatchMetrics': [{
+                        'Namespace': 'PoliticNZ/SharedCache',
+                        'Dimensions': [['CacheNamespace']],
+                        'Metrics': [{'Name': name} for name in self.FIELDS + ('hit_ratio',)]
+                    }]
+                },
+                'CacheNamespace': namespace,
+                **counts
+            }))
+        self._counts = {}
+        self._last_flush = time.time()
+
+
+metrics = CacheMetrics()
+_backend = None
+_backend_loaded = False
+
+
+def get_backend():
+    # Lazily build the backend once per warm container.
+    global _backend, _backend_loaded
+    if not _backend_loaded:
+        _backend_loaded = True
+        try:
+            _backend = create_backend(os.environ.get('SHARED_CACHE_URL', ''))
+        except Exception as e:
+            print(f"Shared cache disabled: {str(e)}")
+            _backend = None
+    return _backend
+
+
+def set_backend(backend):
+    # Override the configured backend (e.g. with LocalCacheBackend in tests).
+    global _backend, _backend_loaded
+    _backend = backend
+    _backend_loaded = True
+
+
+def _cache_key(namespace, key):
+    return namespace + ':' + '|'.join(str(key[name]) for name in sorted(key))
+
+
+def cached_get_item(table, key, namespace, ttl=DEFAULT_TTL_SECONDS):
+    """
+    Read-through get_item. Returns the item dict, or None if it does not exist.
+    Falls back to a plain get_item whenever the cache is disabled or failing.
+    """
+    backend = get_backend()
+    if backend is None:
+        return table.get_item(Key=key).get('Item')
+
+    cache_key = _cache_key(namespace, key)
+    try:
+        entry = deserialize_entry(backend.get(cache_key))
+    except Exception as e:
+        print(f"Shared cache read error: {str(e)}")
+        metrics.incr(namespace, 'errors')
+        entry = None
+
+    if entry is not None and entry.get('d') is not None:
+        metrics.incr(namespace, 'hits')
+        return entry['d']
+
+    metrics.incr(namespace, 'misses')
+    item = table.get_item(Key=key).get('Item')
+    if item is None:
+        return None
+
+    version = item_version(item)
+    try:
+        if backend.set_if_newer(cache_key, version, serialize_entry(version, item), ttl):
+            metrics.incr(namespace, 'fills')
+        else:
+            metrics.incr(namespace, 'stale_fills')
+    except Exception as e:
+        print(f"Shared cache write error: {str(e)}")
+        metrics.incr(namespace, 'errors')
+    return item
+
+
+def invalidate_cached_item(key, namespace, version):
+    """
+    Invalidate after a write. `version` is the write's timestamp: fills
+    carrying an older version are rejected until the tombstone expires.
+    """
+    backend = get_backend()
+    if backend is None:
+        return
+
+    try:
+        backend.set_if_newer(_cache_key(namespace, key), version,
+                             serialize_entry(version, None, tombstone=True), TOMBSTONE_TTL_SECONDS)
+        metrics.incr(namespace, 'invalidations')
+    except Exception as e:
+        print(f"Shared cache invalidation error: {str(e)}")
+        metrics.incr(namespace, 'errors')
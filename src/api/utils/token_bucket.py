@@ -0,0 +1,48 @@
+"""
+In-process token bucket.
+Tokens refill continuously at `rate` per second up to `capacity`. Callers that
+only learn the cost of an operation afterwards (DynamoDB consumed capacity)
+wait for a positive balance, do the work, then charge the actual cost - the
+balance may go negative, which makes the next wait longer.
+"""
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError('Token bucket rate must be positive')
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self.tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_consume(self, amount=1):
+        # Take tokens if available; never waits
+        self._refill()
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return True
+        return False
+
+    def seconds_until(self, amount=1):
+        self._refill()
+        return max(0.0, (amount - self.tokens) / self.rate)
+
+    def wait(self, amount=0):
+        # Block until the balance covers `amount` (default: until it is no longer negative)
+        delay = self.seconds_until(amount)
+        if delay:
+            self._sleep(delay)
+            self._refill()
+
+    def charge(self, amount):
+        self._refill()
+        self.tokens -= amount
@@ -0,0 +1,168 @@
+"""
+Per-request phase tracing for Lambda handlers.
+error_handler opens a trace around every invocation. When tracing is enabled
+(TRACE_ENABLED=1) the time spent in named spans - container init, body parsing,
+each DynamoDB operation, response serialization - is logged as one compact JSON
+line per request:
+
+    {"trace": "posts.get_feed", "cold_start": true, "total_ms": 182.4,
+     "spans": {"init": [412.0, 1], "dynamodb.Scan": [61.3, 1], ...}}
+
+PROFILE_SAMPLE_RATE (0.0-1.0) additionally runs cProfile on that fraction of
+invocations and prints the top functions when the request took at least
+PROFILE_SLOW_MS milliseconds.
+"""
+import io
+import os
+import json
+import time
+import random
+import cProfile
+import pstats
+import threading
+from contextlib import contextmanager
+from . import hot_keys
+
+
+DEFAULT_PROFILE_SLOW_MS = 500
+PROFILE_TOP_FUNCTIONS = 20
+
+# Imported by response_builder before any handler module finishes loading, so
+# the gap until the first request approximates this container's init cost.
+_module_loaded_at = time.perf_counter()
+_cold_start = True
+_current = None
+
+
+def tracing_enabled():
+    return os.environ.get('TRACE_ENABLED', '').lower() in ('1', 'true', 'yes')
+
+
+def profile_sample_rate():
+    try:
+        return float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+    except ValueError:
+        return 0.0
+
+
+class RequestTrace:
+    """Accumulated span timings for one invocation."""
+
+    def __init__(self, name, request_id):
+        self.name = name
+        self.request_id = request_id
+        self.started_at = time.perf_counter()
+        self.status = None
+        self._spans = {}
+        self._lock = threading.Lock()  # table calls may come from worker threads
+
+    def add(self, span_name, elapsed_ms):
+        with self._lock:
+            total, count = self._spans.get(span_name, (0.0, 0))
+            self._spans[span_name] = (total + elapsed_ms, count + 1)
+
+    def record_status(self, response):
+        if isinstance(response, dict):
+            self.status = response.get('statusCode')
+
+    def summary(self, cold_start):
+        return {
+            'trace': self.name,
+            'request_id': self.request_id,
+            'cold_start': cold_start,
+            'status': self.status,
+            'total_ms': round((time.perf_counter() - self.started_at) * 1000, 2),
+            'spans': {name: [round(total, 2), count] for name, (total, count) in self._spans.items()}
+        }
+
+
+def current_trace():
+    return _current
+
+
+@contextmanager
+def span(name):
+    # Time a block under `name`. A no-op outside a traced request.
+    trace = _current
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, (time.perf_counter() - started) * 1000)
+
+
+@contextmanager
+def trace_request(name, context):
+    """Wrap one handler invocation; yields the RequestTrace (or None when off)."""
+    global _current, _cold_start
+    cold_start = _cold_start
+    _cold_start = False
+
+    sample_rate = profile_sample_rate()
+    profiler = cProfile.Profile() if sample_rate > 0 and random.random() < sample_rate else None
+    if not tracing_enabled() and profiler is None:
+        yield None
+        return
+
+    trace = RequestTrace(name, getattr(context, 'aws_request_id', None))
+    if cold_start:
+        trace.add('init', (trace.started_at - _module_loaded_at) * 1000)
+    _current = trace
+    if profiler:
+        profiler.enable()
+    try:
+        yield trace
+    finally:
+        if profiler:
+            profiler.disable()
+        _current = None
+        summary = trace.summary(cold_start)
+        if tracing_enabled():
+            print(json.dumps(summary, separators=(',', ':')))
+        slow_ms = float(os.environ.get('PROFILE_SLOW_MS', DEFAULT_PROFILE_SLOW_MS))
+        if profiler and summary['total_ms'] >= slow_ms:
+            print(format_profile(profiler, name, summary['total_ms']))
+
+
+def format_profile(profiler, name, total_ms):
+    output = io.StringIO()
+    output.write(f"Profile for slow request {name} ({total_ms} ms):\n")
+    stats = pstats.Stats(profiler, stream=output)
+    stats.sort_stats('cumulative').print_stats(PROFILE_TOP_FUNCTIONS)
+    return output.getvalue()
+
+
+def _before_call(event_name, context, **kwargs):
+    if _current is not None:
+        context['trace_started_at'] = time.perf_counter()
+
+
+def _after_call(event_name, context, **kwargs):
+    trace = _current
+    started = context.get('trace_started_at')
+    if trace is not None and started is not None:
+        # event_name looks like "after-call.dynamodb.Query"
+        service, operation = event_name.split('.')[1:3]
+        trace.add(f'{service}.{operation}', (time.perf_counter() - started) * 1000)
+
+
+def _observe_keys(params, model, **kwargs):
+    # Feed the partition keys of every DynamoDB call to hot key detection;
+    # instrumentation must never fail the call itself
+    try:
+        hot_keys.observe_call(model.name, params)
+    except Exception as e:
+        print(f"Hot key tracking failed for {model.name}: {e}")
+
+
+def instrument_client(client):
+    # Attribute the time of every API call made through a boto3 client to a span,
+    # and for DynamoDB count the partition keys it touches (see utils.hot_keys).
+    service = client.meta.service_model.endpoint_prefix
+    client.meta.events.register(f'before-call.{service}', _before_call)
+    client.meta.events.register(f'after-call.{service}', _after_call)
+    if service == 'dynamodb':
+        client.meta.events.register(f'before-parameter-build.{service}', _observe_keys)
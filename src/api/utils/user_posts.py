@@ -0,0 +1,118 @@
+"""
+Paging through one user's posts, shared by get_user_posts and the composite
+profile page.
+Pages run through live posts first (UserIdIndex, newest first), then continue
+into the S3 archive once the cursor passes the oldest post still held in
+DynamoDB. Cursors are the decoded form of the opaque `next_cursor` strings:
+    {'live': <LastEvaluatedKey>}    - more live posts
+    {'archive_before': <created_at>} - continue in the archive
+"""
+from .archive_store import (
+    get_archive_store,
+    load_archived_record,
+    read_user_archive,
+    archived_post_view
+)
+from .like_filter import liked_target_ids
+from .like_counters import post_like_counts
+from .helpers import is_key
+
+# UserIdIndex keys, as they come back in LastEvaluatedKey
+LIVE_CURSOR_KEYS = ('post_id', 'user_id', 'created_at')
+
+
+def hydrate_tombstones(posts, auth_user_id):
+    # Swap archived tombstones for the full post read from its archive segment.
+    hydrated = []
+    for post in posts:
+        if not post.get('archived'):
+            hydrated.append(post)
+            continue
+        record = load_archived_record(get_archive_store(), post['archive_key'], post['post_id'])
+        if record:
+            hydrated.append(archived_post_view(record, auth_user_id))
+    return hydrated
+
+
+def add_post_counts(likes_table, comments_table, like_filters_table, like_counters_table, posts, auth_user_id):
+    # Live posts the viewer liked, checked against their like filter first
+    live_posts = [post for post in posts if not post.get('archived')]
+    liked_ids = liked_target_ids(like_filters_table, likes_table, auth_user_id, [post['post_id'] for post in live_posts])
+    like_counts = post_like_counts(like_counters_table, likes_table, [post['post_id'] for post in live_posts])
+
+    # For each live post, add like and comment counts
+    for post in live_posts:
+        post_id = post['post_id']
+
+        post['like_count'] = like_counts[post_id]
+        post['liked_by_user'] = post_id in liked_ids
+
+        # Get comment count
+        comments_response = comments_table.query(
+            KeyConditionExpression='post_id = :post_id',
+            ExpressionAttributeValues={
+                ':post_id': post_id
+            },
+            Select='COUNT'
+        )
+        post['comment_count'] = comments_response.get('Count', 0)
+
+
+def valid_page_cursor(cursor, target_user_id):
+    # A decoded cursor this user's listing could have handed out
+    if set(cursor) == {'live'}:
+        return is_key(cursor['live'], LIVE_CURSOR_KEYS) and cursor['live']['user_id'] == target_user_id
+    if set(cursor) == {'archive_before'}:
+        return cursor['archive_before'] is None or isinstance(cursor['archive_before'], str)
+    return False
+
+
+def read_user_posts_page(posts_table, target_user_id, auth_user_id, cursor, limit):
+    """
+    Return (posts, next_cursor) for one page of a user's posts, newest first.
+    `cursor` is a decoded cursor or None for the first page; next_cursor is
+    None once there is nothing older. Counts are not added here.
+    """
+    cursor = cursor or {}
+    posts = []
+    next_cursor = None
+    archive_before = cursor.get('archive_before')
+
+    if 'archive_before' not in cursor:
+        # Query posts by user_id using GSI
+        query_kwargs = {
+            'IndexName': 'UserIdIndex',
+            'KeyConditionExpression': 'user_id = :user_id',
+            'ExpressionAttributeValues': {
+                ':user_id': target_user_id
+            },
+            'ScanIndexForward': False,  # Sort by created_at descending (newest first)
+            'Limit': limit
+        }
+        if cursor.get('live'):
+            query_kwargs['ExclusiveStartKey'] = cursor['live']
+        response = posts_table.query(**query_kwargs)
+
+        items = response.get('Items', [])
+        posts = hydrate_tombstones(items, auth_user_id)
+
+        if 'LastEvaluatedKey' in response:
+            next_cursor = {'live': response['LastEvaluatedKey']}
+        else:
+            # Live posts exhausted - continue below the oldest one we have seen
+            if items:
+                archive_before = items[-1]['created_at']
+            elif cursor.get('live'):
+                archive_before = cursor['live']['created_at']
+            cursor = {'archive_before': archive_before}
+
+    if 'archive_before' in cursor and len(posts) < limit:
+        records, has_more = read_user_archive(get_archive_store(), target_user_id,
+                                              archive_before, limit - len(posts))
+        posts.extend(archived_post_view(record, auth_user_id) for record in records)
+        if has_more and records:
+            next_cursor = {'archive_before': records[-1]['post']['created_at']}
+    elif 'archive_before' in cursor:
+        next_cursor = {'archive_before': archive_before}
+
+    return posts, next_cursor
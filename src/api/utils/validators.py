@@ -7,7 +7,6 @@ POST_CONTENT_MAX_LENGTH = 280
 COMMENT_CONTENT_MAX_LENGTH = 200
 
 POLL_REASON_MAX_LENGTH = 280
-VALID_POLL_ANSWERS = ['Yes', 'No']
 
 
 def validate_display_name(display_name):
@@ -100,15 +99,16 @@ def validate_profile_data(display_name, bio=None, political_alignment=None, prof
     return (True, None)
 
 
-def validate_poll_answer(answer):
+def validate_poll_answer(answer, options):
+    # options come from the poll's definition in the polls table
     if not answer or not answer.strip():
         return (False, 'Answer is required')
     
     answer = answer.strip()
     
-    if answer not in VALID_POLL_ANSWERS:
-        options_str = ', '.join(VALID_POLL_ANSWERS)
-        return (False, f'Answer must be either {options_str}')
+    if answer not in options:
+        options_str = ', '.join(options)
+        return (False, f'Answer must be one of: {options_str}')
     
     return (True, None)
 
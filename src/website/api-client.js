@@ -3,6 +3,48 @@
  * Provides centralized request handling with authentication, error handling, and logging
  */
 
+// Compact column-oriented responses (see src/api/utils/columnar.py)
+const COLUMNAR_MEDIA_TYPE = 'application/vnd.politicnz.columnar+json';
+
+/**
+ * Restore the row objects of a columnar response body
+ * Tables ({$cols, $rows, $data, $absent}) become arrays of objects again;
+ * anything else is decoded recursively as-is
+ * @param {*} value - Parsed columnar JSON
+ * @returns {*} The body as the plain JSON format would have returned it
+ */
+function decodeColumnar(value) {
+  if (Array.isArray(value)) {
+    return value.map(decodeColumnar);
+  }
+  if (value === null || typeof value !== 'object') {
+    return value;
+  }
+  if (!('$cols' in value) || !('$data' in value)) {
+    const decoded = {};
+    for (const [key, item] of Object.entries(value)) {
+      decoded[key] = decodeColumnar(item);
+    }
+    return decoded;
+  }
+
+  const rows = Array.from({ length: value.$rows }, () => ({}));
+  const absent = value.$absent || {};
+  value.$cols.forEach((column, columnIndex) => {
+    const encoded = value.$data[columnIndex];
+    const values = Array.isArray(encoded)
+      ? encoded.map(decodeColumnar)
+      : encoded.$idx.map(index => (index === null ? null : encoded.$dict[index]));
+    const skip = new Set(absent[column] || []);
+    rows.forEach((row, rowIndex) => {
+      if (!skip.has(rowIndex)) {
+        row[column] = values[rowIndex];
+      }
+    });
+  });
+  return rows;
+}
+
 /**
  * Make an authenticated API request
  * @param {string} endpoint - API endpoint path (e.g., '/posts', '/profile')
@@ -11,6 +53,7 @@
  * @param {Object} [options.body] - Request body (will be JSON stringified)
  * @param {Object} [options.queryParams] - URL query parameters
  * @param {boolean} [options.requireAuth=true] - Whether authentication is required
+ * @param {string} [options.idempotencyKey] - Idempotency-Key header so retries are not applied twice
  * @returns {Promise<Object|null>} Response data or null
  * @throws {Error} If request fails or authentication is required but missing
  */
@@ -19,7 +62,8 @@ async function apiRequest(endpoint, options = {}) {
     method = 'GET',
     body = null,
     queryParams = null,
-    requireAuth = true
+    requireAuth = true,
+    idempotencyKey = null
   } = options;
 
   try {
@@ -42,7 +86,9 @@ async function apiRequest(endpoint, options = {}) {
     const config = {
       method,
       headers: {
-        'Content-Type': 'application/json'
+        'Content-Type': 'application/json',
+        // List responses are much smaller column-oriented; decoded below
+        'Accept': `${COLUMNAR_MEDIA_TYPE}, application/json`
       }
     };
 
@@ -52,6 +98,11 @@ async function apiRequest(endpoint, options = {}) {
       config.headers['Authorization'] = token;
     }
 
+    // Add idempotency key if the caller wants retry-safe creation
+    if (idempotencyKey) {
+      config.headers['Idempotency-Key'] = idempotencyKey;
+    }
+
     // Add body if present
     if (body) {
       config.body = JSON.stringify(body);
@@ -74,11 +125,19 @@ async function apiRequest(endpoint, options = {}) {
       } catch (e) {
         // If error parsing fails, use default message
       }
-      throw new Error(errorMessage);
+      const requestError = new Error(errorMessage);
+      requestError.status = response.status;
+      // Rate-limited writes say how long to wait before retrying
+      if (response.status === 429) {
+        requestError.retryAfter = parseInt(response.headers.get('Retry-After'), 10) || null;
+      }
+      throw requestError;
     }
 
     // Parse and return response
-    return await response.json();
+    const data = await response.json();
+    const contentType = response.headers.get('Content-Type') || '';
+    return contentType.startsWith(COLUMNAR_MEDIA_TYPE) ? decodeColumnar(data) : data;
 
   } catch (error) {
     // Log error with context
@@ -104,12 +163,14 @@ async function apiGet(endpoint, queryParams = null) {
  * Make a POST request
  * @param {string} endpoint - API endpoint path
  * @param {Object} body - Request body
+ * @param {string} [idempotencyKey] - Optional Idempotency-Key header value
  * @returns {Promise<Object>} Response data
  */
-async function apiPost(endpoint, body) {
+async function apiPost(endpoint, body, idempotencyKey = null) {
   return apiRequest(endpoint, {
     method: 'POST',
-    body
+    body,
+    idempotencyKey
   });
 }
 
@@ -74,6 +74,9 @@ const auth = {
   logout() {
     localStorage.removeItem('id_token');
     localStorage.removeItem('access_token');
+    Object.keys(localStorage)
+      .filter(key => key.startsWith('feed_cache_'))
+      .forEach(key => localStorage.removeItem(key));
     window.location.href = this.getLogoutUrl();
   },
 
@@ -9,7 +9,7 @@ async function getPostLikes(postId) {
 }
 
 async function createComment(postId, content) {
-  return apiPost(`/posts/${postId}/comments`, { content });
+  return apiPost(`/posts/${postId}/comments`, { content }, crypto.randomUUID());
 }
 
 async function getComments(postId) {
@@ -4,6 +4,8 @@
 const CONFIG = {
   COGNITO_DOMAIN: 'politicnz-auth.auth.ap-southeast-2.amazoncognito.com',
   CLIENT_ID: '1vuusuh3i8fspdh15009reimrm',
-  API_URL: 'https://q8calg25b4.execute-api.ap-southeast-2.amazonaws.com/sandbox'
+  API_URL: 'https://q8calg25b4.execute-api.ap-southeast-2.amazonaws.com/sandbox',
+  // Terraform output websocket_url; leave empty to disable live updates
+  WEBSOCKET_URL: ''
 };
 
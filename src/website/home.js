@@ -17,7 +17,8 @@ let currentUserId = null;
     
     // Load polls and feed after profile check
     initializePolls();
-    loadFeed();
+    await loadFeed();
+    connectRealtime(['feed'], handleFeedEvent);
   } catch (error) {
     console.error('Error checking profile:', error);
     // If there's an error, still allow access but log it
@@ -74,6 +75,43 @@ postBtn.addEventListener('click', async () => {
   }
 });
 
+// Feed is cached per user and refreshed with delta syncs against its watermark
+function feedCacheKey() {
+  return `feed_cache_${currentUserId}`;
+}
+
+function readFeedCache() {
+  try {
+    return JSON.parse(localStorage.getItem(feedCacheKey()));
+  } catch (error) {
+    return null;
+  }
+}
+
+async function syncFeed() {
+  const cache = readFeedCache();
+  const result = await getFeed(cache ? cache.watermark : '');
+  
+  let posts = result.posts;
+  if (cache && !result.full) {
+    // Merge changed posts over the cached ones and drop deletions
+    const postsById = new Map(cache.posts.map(post => [post.post_id, post]));
+    result.posts.forEach(post => postsById.set(post.post_id, post));
+    result.deleted.forEach(postId => postsById.delete(postId));
+    posts = [...postsById.values()]
+      .sort((a, b) => b.created_at.localeCompare(a.created_at))
+      .slice(0, 100);
+  }
+  
+  try {
+    localStorage.setItem(feedCacheKey(), JSON.stringify({ watermark: result.watermark, posts }));
+  } catch (error) {
+    // Storage full or unavailable - the next load just does a full sync
+    localStorage.removeItem(feedCacheKey());
+  }
+  return posts;
+}
+
 // Load and display feed
 async function loadFeed() {
   const feedElement = document.getElementById('feed');
@@ -85,7 +123,7 @@ async function loadFeed() {
     errorElement.style.display = 'none';
     feedElement.innerHTML = '';
     
-    const posts = await getFeed();
+    const posts = await syncFeed();
     
     loadingElement.style.display = 'none';
     
@@ -109,3 +147,29 @@ async function loadFeed() {
     errorElement.style.display = 'block';
   }
 }
+
+// Live feed updates pushed over the realtime channel
+let feedReloadTimer = null;
+
+function handleFeedEvent(event) {
+  const postCard = document.querySelector(`.post-card[data-post-id="${event.post_id}"]`);
+  
+  switch (event.type) {
+    case 'like':
+      // The liker's own page already updated optimistically
+      if (event.user_id !== currentUserId && postCard) {
+        adjustCount(postCard.querySelector('.like-count'), event.liked ? 1 : -1);
+      }
+      break;
+    case 'comment_created':
+    case 'comment_deleted':
+      if (postCard) {
+        adjustCount(postCard.querySelector('.comment-count'), event.type === 'comment_created' ? 1 : -1);
+      }
+      break;
+    default:
+      // New, edited or deleted posts - coalesce bursts into one delta sync
+      clearTimeout(feedReloadTimer);
+      feedReloadTimer = setTimeout(loadFeed, 1000);
+  }
+}
@@ -68,6 +68,28 @@ document.getElementById('onboardingForm').addEventListener('submit', async (e) =
   }
 });
 
+// Tell the user as they type if their display name is already taken
+let nameCheckTimer = null;
+document.getElementById('display_name').addEventListener('input', (e) => {
+  const small = e.target.parentElement.querySelector('small');
+  const displayName = e.target.value.trim();
+  clearTimeout(nameCheckTimer);
+  small.textContent = '2-20 characters';
+  if (!validateDisplayName(displayName).isValid) {
+    return;
+  }
+  nameCheckTimer = setTimeout(async () => {
+    try {
+      const available = await isDisplayNameAvailable(displayName);
+      if (e.target.value.trim() === displayName) {
+        small.textContent = available ? `${displayName} is available` : `${displayName} is already taken`;
+      }
+    } catch (error) {
+      // The check is only a hint; creating the profile enforces uniqueness
+    }
+  }, 400);
+});
+
 // Real-time character counter for bio
 const bioConstants = getValidationConstants();
 document.getElementById('bio').addEventListener('input', (e) => {
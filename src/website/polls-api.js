@@ -9,7 +9,7 @@ async function votePoll(pollId, answer, reason = '') {
   if (reason) {
     body.reason = reason;
   }
-  return apiPost(`/polls/${pollId}/vote`, body);
+  return apiPost(`/polls/${pollId}/vote`, body, crypto.randomUUID());
 }
 
 // Gets the aggregated results for a specific poll
@@ -17,9 +17,27 @@ async function getPollResults(pollId) {
   return apiGet(`/polls/${pollId}/results`);
 }
 
+// Gets one page of the reasons voters gave for an answer, newest first
+async function getPollReasons(pollId, answer, cursor = null, limit = 20) {
+  const queryParams = buildQueryParams({ answer, cursor, limit });
+  return apiGet(`/polls/${pollId}/reasons`, queryParams);
+}
+
+// Gets votes per answer over time, in 'hour' or 'day' buckets (from/to are bucket labels)
+async function getPollTimeline(pollId, granularity = 'day', from = null, to = null) {
+  const queryParams = buildQueryParams({ granularity, from, to });
+  return apiGet(`/polls/${pollId}/timeline`, queryParams);
+}
+
 // Gets all poll votes made by a specific user
 async function getUserPollVotes(userId = null) {
   const queryParams = buildQueryParams({ user_id: userId });
   return apiGet('/polls/user/votes', queryParams);
 }
 
+
+// Gets one page of a user's poll votes, newest first, continuing from a cursor
+async function getUserPollVotesPage(userId = null, cursor = null, limit = 20) {
+  const queryParams = buildQueryParams({ user_id: userId, cursor, limit });
+  return apiGet('/polls/user/votes', queryParams);
+}
@@ -236,6 +236,7 @@ async function loadPollResults(pollId) {
         </div>
       </div>
       <p class="poll-total-votes">${results.total_votes} vote${results.total_votes !== 1 ? 's' : ''}</p>
+      ${renderAlignmentBreakdown(results.by_alignment)}
     `;
     
   } catch (error) {
@@ -244,6 +245,36 @@ async function loadPollResults(pollId) {
   }
 }
 
+// Per-alignment breakdown, largest groups first
+function renderAlignmentBreakdown(byAlignment) {
+  const groups = Object.entries(byAlignment || {})
+    .sort(([, a], [, b]) => b.total_votes - a.total_votes);
+  
+  if (groups.length === 0) {
+    return '';
+  }
+  
+  const rows = groups.map(([alignment, breakdown]) => {
+    const label = alignment === 'none' ? 'No alignment' : escapeHtml(alignment);
+    const answers = Object.entries(breakdown.percentages)
+      .map(([answer, percentage]) => `${escapeHtml(answer)} ${percentage}%`)
+      .join(' · ');
+    return `
+      <div class="poll-alignment-row">
+        <span class="poll-alignment-label">${label}</span>
+        <span class="poll-alignment-answers">${answers} (${breakdown.total_votes})</span>
+      </div>
+    `;
+  }).join('');
+  
+  return `
+    <div class="poll-alignment-breakdown">
+      <p class="poll-alignment-title">By political alignment</p>
+      ${rows}
+    </div>
+  `;
+}
+
 // Navigate between polls
 function navigatePoll(direction) {
   const newIndex = currentPollIndex + direction;
@@ -20,7 +20,7 @@ if (!postId) {
     currentUserId = profile.user_id;
     
     await loadPost();
-    await loadComments();
+    connectRealtime([`post:${postId}`], handlePostEvent);
   } catch (error) {
     console.error('Error initializing page:', error);
   }
@@ -37,9 +37,8 @@ async function loadPost() {
     errorElement.style.display = 'none';
     postContainer.innerHTML = '';
     
-    // Get all posts and find the one we need (or create a dedicated endpoint)
-    const posts = await getFeed();
-    currentPost = posts.find(p => p.post_id === postId);
+    // Fetch the post with its likes and comments (returns null when it does not exist)
+    currentPost = await getPostDetail(postId);
     
     if (!currentPost) {
       errorElement.textContent = 'Post not found.';
@@ -56,12 +55,11 @@ async function loadPost() {
     postContainer.appendChild(postElement);
     
     // Show likes section
-    if (currentPost.like_count > 0) {
-      loadLikes();
-    }
+    renderLikes(currentPost.likes || []);
     
     // Show comments section
     document.getElementById('comments-section').style.display = 'block';
+    renderComments(currentPost.comments || []);
     
   } catch (error) {
     console.error('Failed to load post:', error);
@@ -73,25 +71,27 @@ async function loadPost() {
 
 // Load likes
 async function loadLikes() {
-  const likesSection = document.getElementById('likes-section');
-  const likesList = document.getElementById('likes-list');
-  
   try {
     const result = await getPostLikes(postId);
-    
-    if (result.count > 0) {
-      likesSection.style.display = 'block';
-      likesList.innerHTML = result.likes.map(user => `
-        <div class="like-item">
-          <a href="profile.html?user_id=${user.user_id}">${escapeHtml(user.display_name)}</a>
-        </div>
-      `).join('');
-    }
+    renderLikes(result.likes);
   } catch (error) {
     console.error('Failed to load likes:', error);
   }
 }
 
+// Render the list of users who liked the post
+function renderLikes(likes) {
+  const likesSection = document.getElementById('likes-section');
+  const likesList = document.getElementById('likes-list');
+  
+  likesSection.style.display = likes.length > 0 ? 'block' : 'none';
+  likesList.innerHTML = likes.map(user => `
+    <div class="like-item">
+      <a href="profile.html?user_id=${user.user_id}">${escapeHtml(user.display_name)}</a>
+    </div>
+  `).join('');
+}
+
 // Load comments
 async function loadComments() {
   const commentsLoadingElement = document.getElementById('comments-loading');
@@ -102,18 +102,7 @@ async function loadComments() {
     commentsListElement.innerHTML = '';
     
     const comments = await getComments(postId);
-    
-    commentsLoadingElement.style.display = 'none';
-    
-    if (comments.length === 0) {
-      commentsListElement.innerHTML = '<p class="no-comments">No comments yet. Be the first to comment!</p>';
-      return;
-    }
-    
-    comments.forEach(comment => {
-      const commentElement = createCommentElement(comment);
-      commentsListElement.appendChild(commentElement);
-    });
+    renderComments(comments);
     
   } catch (error) {
     console.error('Failed to load comments:', error);
@@ -122,6 +111,24 @@ async function loadComments() {
   }
 }
 
+// Render the comments list
+function renderComments(comments) {
+  const commentsListElement = document.getElementById('comments-list');
+  
+  document.getElementById('comments-loading').style.display = 'none';
+  commentsListElement.innerHTML = '';
+  
+  if (comments.length === 0) {
+    commentsListElement.innerHTML = '<p class="no-comments">No comments yet. Be the first to comment!</p>';
+    return;
+  }
+  
+  comments.forEach(comment => {
+    const commentElement = createCommentElement(comment);
+    commentsListElement.appendChild(commentElement);
+  });
+}
+
 // Create comment element
 function createCommentElement(comment) {
   const commentDiv = document.createElement('div');
@@ -292,3 +299,25 @@ commentBtn.addEventListener('click', async () => {
   }
 });
 
+// Live updates for this post pushed over the realtime channel
+function handlePostEvent(event) {
+  // Our own actions already updated the page
+  if (event.user_id === currentUserId) return;
+  
+  const postCard = document.querySelector(`.post-card[data-post-id="${postId}"]`);
+  switch (event.type) {
+    case 'like':
+      adjustCount(postCard && postCard.querySelector('.like-count'), event.liked ? 1 : -1);
+      loadLikes();
+      break;
+    case 'comment_created':
+    case 'comment_deleted':
+      adjustCount(postCard && postCard.querySelector('.comment-count'), event.type === 'comment_created' ? 1 : -1);
+      loadComments();
+      break;
+    case 'post_updated':
+    case 'post_deleted':
+      loadPost();
+      break;
+  }
+}
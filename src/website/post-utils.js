@@ -86,9 +86,14 @@ function createPostElement(post, isOwner, showEditButton = false, showDeleteButt
     });
   }
   
-  // Load comments preview if enabled
+  // Show comments preview if enabled - inline from the post when the API included it
   if (showCommentsPreview && commentCount > 0) {
-    loadCommentsPreview(post.post_id);
+    if (post.latest_comments) {
+      const previewContainer = postCard.querySelector('.comments-preview');
+      renderCommentsPreview(previewContainer, post.post_id, [...post.latest_comments].reverse(), commentCount);
+    } else {
+      loadCommentsPreview(post.post_id);
+    }
   }
   
   return postCard;
@@ -251,7 +256,7 @@ async function togglePostLike(postId, likeBtn) {
   }
 }
 
-// Load comments preview (first 2-3 comments)
+// Load comments preview (first 2-3 comments) for posts without an inline preview
 async function loadCommentsPreview(postId) {
   const previewContainer = document.querySelector(`.comments-preview[data-post-id="${postId}"]`);
   if (!previewContainer) return;
@@ -259,39 +264,41 @@ async function loadCommentsPreview(postId) {
   try {
     const comments = await getComments(postId);
     
-    if (comments.length === 0) {
-      previewContainer.style.display = 'none';
-      return;
-    }
-    
     // Show first 2 comments
-    const previewComments = comments.slice(0, 2);
-    
-    let previewHtml = '<div class="comments-preview-list">';
-    previewComments.forEach(comment => {
-      previewHtml += `
-        <div class="comment-preview">
-          <strong>${escapeHtml(comment.display_name)}</strong>
-          <span>${escapeHtml(comment.content)}</span>
-        </div>
-      `;
-    });
-    
-    if (comments.length > 2) {
-      previewHtml += `<a href="post-detail.html?post_id=${postId}" class="view-all-comments">View all ${comments.length} comments</a>`;
-    } else if (comments.length > 0) {
-      previewHtml += `<a href="post-detail.html?post_id=${postId}" class="view-all-comments">View comments</a>`;
-    }
-    
-    previewHtml += '</div>';
-    previewContainer.innerHTML = previewHtml;
-    previewContainer.style.display = 'block';
+    renderCommentsPreview(previewContainer, postId, comments.slice(0, 2), comments.length);
   } catch (error) {
     console.error('Failed to load comments preview:', error);
     previewContainer.style.display = 'none';
   }
 }
 
+function renderCommentsPreview(previewContainer, postId, previewComments, totalComments) {
+  if (previewComments.length === 0) {
+    previewContainer.style.display = 'none';
+    return;
+  }
+  
+  let previewHtml = '<div class="comments-preview-list">';
+  previewComments.forEach(comment => {
+    previewHtml += `
+      <div class="comment-preview">
+        <strong>${escapeHtml(comment.display_name)}</strong>
+        <span>${escapeHtml(comment.content)}</span>
+      </div>
+    `;
+  });
+  
+  if (totalComments > previewComments.length) {
+    previewHtml += `<a href="post-detail.html?post_id=${postId}" class="view-all-comments">View all ${totalComments} comments</a>`;
+  } else {
+    previewHtml += `<a href="post-detail.html?post_id=${postId}" class="view-all-comments">View comments</a>`;
+  }
+  
+  previewHtml += '</div>';
+  previewContainer.innerHTML = previewHtml;
+  previewContainer.style.display = 'block';
+}
+
 // Navigate to post detail page
 window.viewPostDetail = function(postId) {
   window.location.href = `post-detail.html?post_id=${postId}`;
@@ -1,15 +1,27 @@
 // Posts API Client
 
 async function createPost(content) {
-  return apiPost('/posts', { content });
+  return apiPost('/posts', { content }, crypto.randomUUID());
 }
 
-async function getFeed() {
-  return apiGet('/posts');
+// Pass `since` (a watermark from a previous call, or '' for the first sync)
+// to get {posts, deleted, watermark, full} instead of the plain post list
+async function getFeed(since = null) {
+  const queryParams = buildQueryParams({ since });
+  return apiGet('/posts', queryParams);
 }
 
-async function getUserPosts(userId = null) {
-  const queryParams = buildQueryParams({ user_id: userId });
+async function getPost(postId) {
+  return apiGet(`/posts/${postId}`);
+}
+
+// The post plus who liked it (`likes`) and its `comments`, in one request
+async function getPostDetail(postId) {
+  return apiGet(`/posts/${postId}`, buildQueryParams({ detail: 'true' }));
+}
+
+async function getUserPosts(userId = null, cursor = null) {
+  const queryParams = buildQueryParams({ user_id: userId, cursor });
   return apiGet('/posts/user', queryParams);
 }
 
@@ -20,3 +32,8 @@ async function updatePost(postId, content) {
 async function deletePost(postId) {
   return apiDelete(`/posts/${postId}`);
 }
+
+async function searchPosts(query, cursor = null) {
+  const queryParams = buildQueryParams({ query, cursor });
+  return apiGet('/posts/search', queryParams);
+}
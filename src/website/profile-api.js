@@ -26,4 +26,19 @@ async function hasProfile() {
 async function searchProfiles(query) {
   const queryParams = buildQueryParams({ query });
   return apiGet('/profile/search', queryParams);
-}
\ No newline at end of file
+}
+async function getProfiles(userIds) {
+  // Batch lookup (up to 100 IDs); resolves to { profiles: { [userId]: profile }, missing: [...] }
+  return apiGet('/profiles', { ids: userIds.join(',') });
+}
+
+async function getProfilePage(userId = 'me') {
+  // Profile plus the first page of posts and poll votes; null if the profile does not exist
+  return apiGet(`/profile/${encodeURIComponent(userId)}/page`);
+}
+
+async function isDisplayNameAvailable(displayName) {
+  // Free, or already held by the caller
+  const result = await apiGet('/profile/name-available', { name: displayName });
+  return result.available;
+}
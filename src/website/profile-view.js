@@ -38,14 +38,37 @@ function displayPrivacyNotice(profile, isOwnProfile) {
   }
 }
 
+function displayActivityCounts(profile) {
+  const countsField = document.getElementById('activity-counts-field');
+  
+  // Private profiles viewed by others do not include counters
+  if (profile.post_count === undefined) {
+    countsField.style.display = 'none';
+    return;
+  }
+  
+  const plural = (count, word) => `${count} ${word}${count === 1 ? '' : 's'}`;
+  document.getElementById('activity_counts').textContent = [
+    plural(profile.post_count, 'post'),
+    plural(profile.likes_received, 'like') + ' received',
+    plural(profile.comment_count, 'comment'),
+    plural(profile.poll_votes, 'poll vote')
+  ].join(' · ');
+  countsField.style.display = 'block';
+}
+
 async function loadProfile() {
   const loading = document.getElementById('loading');
   const profileContent = document.getElementById('profile-content');
   const errorContent = document.getElementById('error-content');
   
   try {
-    // Get current user's profile to establish their identity
-    const currentUserProfile = await getProfile();
+    // One request returns the profile with its first page of posts and poll votes.
+    // When viewing someone else, the caller's own profile is fetched alongside it
+    // to establish their identity.
+    const [currentUserProfile, page] = ProfileView.viewedUserId
+      ? await Promise.all([getProfile(), getProfilePage(ProfileView.viewedUserId)])
+      : await getProfilePage('me').then(ownPage => [ownPage && ownPage.profile, ownPage]);
     
     if (!currentUserProfile) {
       // Current user has no profile, redirect to onboarding
@@ -58,8 +81,7 @@ async function loadProfile() {
     // Determine if viewing own profile or another user's
     ProfileView.isOwnProfile = !ProfileView.viewedUserId || ProfileView.viewedUserId === ProfileView.currentUserId;
     
-    // Load the appropriate profile
-    const profile = ProfileView.isOwnProfile ? currentUserProfile : await getProfile(ProfileView.viewedUserId);
+    const profile = page && page.profile;
     
     if (!profile) {
       loading.style.display = 'none';
@@ -89,6 +111,7 @@ async function loadProfile() {
     document.getElementById('user_id').textContent = profile.user_id || 'N/A';
     document.getElementById('created_at').textContent = formatDate(profile.created_at);
     document.getElementById('updated_at').textContent = formatDate(profile.updated_at);
+    displayActivityCounts(profile);
     
     updateBioCounter();
     
@@ -105,7 +128,7 @@ async function loadProfile() {
     loading.style.display = 'none';
     profileContent.style.display = 'block';
     
-    loadUserPosts();
+    renderUserActivity(page);
     
   } catch (error) {
     console.error('Failed to load profile:', error);
@@ -164,65 +187,17 @@ function updateBioCounter() {
 }
 
 async function loadUserPosts() {
-  const postsSection = document.getElementById('user-posts-section');
-  const postsElement = document.getElementById('user-posts');
   const loadingElement = document.getElementById('posts-loading');
   const errorElement = document.getElementById('posts-error');
   
   try {
-    postsSection.style.display = 'block';
+    document.getElementById('user-posts-section').style.display = 'block';
     loadingElement.style.display = 'block';
     errorElement.style.display = 'none';
-    postsElement.innerHTML = '';
-    
-    // Load posts and poll votes for the viewed user
-    const targetUserId = ProfileView.isOwnProfile ? null : ProfileView.viewedUserId;
-    const [posts, pollVotes] = await Promise.all([
-      getUserPosts(targetUserId),
-      getUserPollVotes(targetUserId)
-    ]);
     
-    loadingElement.style.display = 'none';
-    
-    if (posts.length === 0 && pollVotes.length === 0) {
-      const noActivityMessage = ProfileView.isOwnProfile 
-        ? "You haven't posted or voted on any polls yet."
-        : "This user hasn't posted or voted on any polls yet.";
-      postsElement.innerHTML = `<p class="no-posts">${noActivityMessage}</p>`;
-      return;
-    }
-    
-    // Update section title
-    const sectionTitle = postsSection.querySelector('h2');
-    if (sectionTitle) {
-      sectionTitle.textContent = ProfileView.isOwnProfile ? 'My Activity' : 'Activity';
-    }
-    
-    // Merge posts and poll votes, sorted by timestamp
-    const activities = [
-      ...posts.map(p => ({ type: 'post', data: p, timestamp: p.created_at })),
-      ...pollVotes.map(v => ({ type: 'poll_vote', data: v, timestamp: v.voted_at }))
-    ];
-    
-    // Sort by timestamp descending (newest first)
-    activities.sort((a, b) => {
-      return new Date(b.timestamp) - new Date(a.timestamp);
-    });
-    
-    // Display each activity
-    activities.forEach(activity => {
-      if (activity.type === 'post') {
-        const post = activity.data;
-        const showEditButton = ProfileView.isOwnProfile;
-        const showDeleteButton = ProfileView.isOwnProfile;
-        const postElement = createPostElement(post, ProfileView.isOwnProfile, showEditButton, showDeleteButton);
-        postsElement.appendChild(postElement);
-      } else if (activity.type === 'poll_vote') {
-        const vote = activity.data;
-        const voteElement = createPollVoteElement(vote);
-        postsElement.appendChild(voteElement);
-      }
-    });
+    // Reload the first page of posts and poll votes for the viewed user
+    const page = await getProfilePage(ProfileView.viewedUserId || 'me');
+    renderUserActivity(page);
     
   } catch (error) {
     console.error('Failed to load user activity:', error);
@@ -232,3 +207,97 @@ async function loadUserPosts() {
   }
 }
 
+function appendActivities(posts, pollVotes) {
+  const postsElement = document.getElementById('user-posts');
+  
+  // Merge posts and poll votes, sorted by timestamp
+  const activities = [
+    ...posts.map(p => ({ type: 'post', data: p, timestamp: p.created_at })),
+    ...pollVotes.map(v => ({ type: 'poll_vote', data: v, timestamp: v.voted_at }))
+  ];
+  
+  // Sort by timestamp descending (newest first)
+  activities.sort((a, b) => {
+    return new Date(b.timestamp) - new Date(a.timestamp);
+  });
+  
+  // Display each activity
+  activities.forEach(activity => {
+    if (activity.type === 'post') {
+      const post = activity.data;
+      const canModify = ProfileView.isOwnProfile && !post.archived;
+      const postElement = createPostElement(post, ProfileView.isOwnProfile, canModify, canModify);
+      postsElement.appendChild(postElement);
+    } else if (activity.type === 'poll_vote') {
+      const vote = activity.data;
+      const voteElement = createPollVoteElement(vote);
+      postsElement.appendChild(voteElement);
+    }
+  });
+}
+
+function renderUserActivity(page) {
+  const postsSection = document.getElementById('user-posts-section');
+  const postsElement = document.getElementById('user-posts');
+  const loadingElement = document.getElementById('posts-loading');
+  
+  postsSection.style.display = 'block';
+  loadingElement.style.display = 'none';
+  document.getElementById('posts-error').style.display = 'none';
+  postsElement.innerHTML = '';
+  
+  if (page.posts.length === 0 && page.votes.length === 0) {
+    const noActivityMessage = ProfileView.isOwnProfile 
+      ? "You haven't posted or voted on any polls yet."
+      : "This user hasn't posted or voted on any polls yet.";
+    postsElement.innerHTML = `<p class="no-posts">${noActivityMessage}</p>`;
+    updateOlderPostsButton(null, null);
+    return;
+  }
+  
+  // Update section title
+  const sectionTitle = postsSection.querySelector('h2');
+  if (sectionTitle) {
+    sectionTitle.textContent = ProfileView.isOwnProfile ? 'My Activity' : 'Activity';
+  }
+  
+  appendActivities(page.posts, page.votes);
+  
+  // Older posts (including archived ones) and votes are fetched a page at a time
+  updateOlderPostsButton(page.posts_next_cursor, page.votes_next_cursor);
+}
+
+function updateOlderPostsButton(postsCursor, votesCursor) {
+  const postsElement = document.getElementById('user-posts');
+  let button = document.getElementById('load-older-posts');
+  
+  if (!postsCursor && !votesCursor) {
+    if (button) button.remove();
+    return;
+  }
+  
+  if (!button) {
+    button = document.createElement('button');
+    button.id = 'load-older-posts';
+    button.className = 'load-more-button';
+    button.textContent = 'Load older activity';
+    postsElement.after(button);
+  }
+  
+  button.onclick = async () => {
+    button.disabled = true;
+    try {
+      const targetUserId = ProfileView.isOwnProfile ? null : ProfileView.viewedUserId;
+      const [postsPage, votesPage] = await Promise.all([
+        postsCursor ? getUserPosts(targetUserId, postsCursor) : { posts: [], next_cursor: null },
+        votesCursor ? getUserPollVotesPage(targetUserId, votesCursor) : { votes: [], next_cursor: null }
+      ]);
+      appendActivities(postsPage.posts, votesPage.votes);
+      updateOlderPostsButton(postsPage.next_cursor, votesPage.next_cursor);
+    } catch (error) {
+      console.error('Failed to load older activity:', error);
+    } finally {
+      button.disabled = false;
+    }
+  };
+}
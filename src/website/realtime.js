@@ -0,0 +1,54 @@
+// Realtime updates over WebSocket
+// Subscribes to topics ('feed', 'post:{post_id}') and hands each pushed event
+// to a callback, reconnecting with backoff when the connection drops
+
+const REALTIME_MAX_RETRY_DELAY_MS = 30000;
+
+function connectRealtime(topics, onEvent) {
+  // Realtime is optional - pages keep working on plain requests without it
+  if (!CONFIG.WEBSOCKET_URL || !window.WebSocket) return;
+  
+  let retryDelay = 1000;
+  
+  function open() {
+    const { idToken } = auth.getTokens();
+    if (!isTokenValid(idToken)) return;
+    
+    const socket = new WebSocket(`${CONFIG.WEBSOCKET_URL}?token=${encodeURIComponent(idToken)}`);
+    
+    socket.addEventListener('open', () => {
+      retryDelay = 1000;
+      socket.send(JSON.stringify({ action: 'subscribe', topics }));
+    });
+    
+    socket.addEventListener('message', (message) => {
+      let payload;
+      try {
+        payload = JSON.parse(message.data);
+      } catch (e) {
+        return;
+      }
+      // Broadcasts arrive batched; subscribe acknowledgements have no events
+      (payload.events || []).forEach(event => {
+        try {
+          onEvent(event);
+        } catch (error) {
+          console.error('Realtime event handler failed:', error);
+        }
+      });
+    });
+    
+    socket.addEventListener('close', () => {
+      setTimeout(open, retryDelay);
+      retryDelay = Math.min(retryDelay * 2, REALTIME_MAX_RETRY_DELAY_MS);
+    });
+  }
+  
+  open();
+}
+
+// Shift a number shown in an element (like/comment counters) by delta
+function adjustCount(element, delta) {
+  if (!element) return;
+  element.textContent = Math.max(0, (parseInt(element.textContent, 10) || 0) + delta);
+}
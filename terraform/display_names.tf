@@ -0,0 +1,165 @@
+#####################################################################
+# DISPLAY NAME RESERVATIONS
+# Unique display names, reserved in the same transaction that writes
+# the profile:
+# - DynamoDB table with one item per normalized name
+# - IAM policy for Lambda execution
+# - Lambda function and API Gateway endpoint for
+#   /profile/name-available
+#####################################################################
+
+#####################################################################
+# DYNAMODB TABLE FOR DISPLAY NAMES
+#####################################################################
+
+resource "aws_dynamodb_table" "display_names" {
+  name         = "politicnz-display-names"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "name_key"
+
+  attribute {
+    name = "name_key"
+    type = "S"
+  }
+}
+
+#####################################################################
+# IAM POLICY FOR DISPLAY NAMES TABLE ACCESS
+#####################################################################
+
+resource "aws_iam_role_policy" "lambda_display_names_dynamodb_policy" {
+  name = "lambda-display-names-dynamodb-policy"
+  role = aws_iam_role.lambda_execution.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:GetItem",
+          "dynamodb:PutItem",
+          "dynamodb:DeleteItem"
+        ]
+        Resource = aws_dynamodb_table.display_names.arn
+      }
+    ]
+  })
+}
+
+#####################################################################
+# LAMBDA FUNCTION
+#####################################################################
+
+data "archive_file" "check_name_available_lambda" {
+  type        = "zip"
+  source_dir  = "${path.module}/../src/api"
+  output_path = "${path.module}/lambda_check_name_available.zip"
+}
+
+resource "aws_lambda_function" "check_name_available" {
+  filename         = data.archive_file.check_name_available_lambda.output_path
+  function_name    = "politicnz-check-name-available"
+  role            = aws_iam_role.lambda_execution.arn
+  handler         = "profiles/check_name_available.lambda_handler"
+  source_code_hash = data.archive_file.check_name_available_lambda.output_base64sha256
+  runtime         = "python3.12"
+  timeout         = 10
+
+  environment {
+    variables = {
+      DISPLAY_NAMES_TABLE_NAME = aws_dynamodb_table.display_names.name
+      TRACE_ENABLED            = var.trace_enabled
+      PROFILE_SAMPLE_RATE      = var.profile_sample_rate
+      HOT_KEY_TABLES           = local.hot_key_tables
+    }
+  }
+}
+
+#####################################################################
+# API GATEWAY RESOURCES AND METHODS
+#####################################################################
+
+# /profile/name-available resource
+resource "aws_api_gateway_resource" "profile_name_available" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_resource.profile.id
+  path_part   = "name-available"
+}
+
+# GET /profile/name-available - Check whether a display name is free
+resource "aws_api_gateway_method" "check_name_available" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.profile_name_available.id
+  http_method   = "GET"
+  authorization = "COGNITO_USER_POOLS"
+  authorizer_id = aws_api_gateway_authorizer.cognito.id
+}
+
+resource "aws_api_gateway_integration" "check_name_available" {
+  rest_api_id             = aws_api_gateway_rest_api.main.id
+  resource_id             = aws_api_gateway_resource.profile_name_available.id
+  http_method             = aws_api_gateway_method.check_name_available.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.check_name_available.invoke_arn
+}
+
+# CORS OPTIONS for /profile/name-available
+resource "aws_api_gateway_method" "profile_name_available_options" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.profile_name_available.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "profile_name_available_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.profile_name_available.id
+  http_method = aws_api_gateway_method.profile_name_available_options.http_method
+  type        = "MOCK"
+
+  request_templates = {
+    "application/json" = "{\"statusCode\": 200}"
+  }
+}
+
+resource "aws_api_gateway_method_response" "profile_name_available_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.profile_name_available.id
+  http_method = aws_api_gateway_method.profile_name_available_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+
+  response_models = {
+    "application/json" = "Empty"
+  }
+}
+
+resource "aws_api_gateway_integration_response" "profile_name_available_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.profile_name_available.id
+  http_method = aws_api_gateway_method.profile_name_available_options.http_method
+  status_code = aws_api_gateway_method_response.profile_name_available_options.status_code
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+
+  depends_on = [aws_api_gateway_integration.profile_name_available_options]
+}
+
+resource "aws_lambda_permission" "check_name_available" {
+  statement_id  = "AllowAPIGatewayInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.check_name_available.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_api_gateway_rest_api.main.execution_arn}/*/*"
+}
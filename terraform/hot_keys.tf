@@ -0,0 +1,19 @@
+#####################################################################
+# HOT KEY DETECTION
+# Tables whose partition keys every Lambda tracks (see
+# src/api/utils/hot_keys.py), as "table-name:hash_key" pairs. The
+# hottest keys are logged as CloudWatch Embedded Metric Format lines
+# in the PoliticNZ/HotKeys namespace.
+#####################################################################
+
+locals {
+  hot_key_tables = var.hot_key_tracking ? join(",", [
+    for table in [
+      aws_dynamodb_table.posts,
+      aws_dynamodb_table.post_likes,
+      aws_dynamodb_table.post_comments,
+      aws_dynamodb_table.user_profiles,
+      aws_dynamodb_table.like_counters
+    ] : "${table.name}:${table.hash_key}"
+  ]) : ""
+}
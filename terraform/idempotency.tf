@@ -0,0 +1,53 @@
+#####################################################################
+# IDEMPOTENCY KEYS
+# Stores the first response for each Idempotency-Key so retried
+# create requests are replayed instead of written twice:
+# - DynamoDB table with TTL expiry
+# - IAM policy for Lambda execution
+#####################################################################
+
+#####################################################################
+# DYNAMODB TABLE FOR IDEMPOTENCY RECORDS
+#####################################################################
+
+resource "aws_dynamodb_table" "idempotency_keys" {
+  name         = "politicnz-idempotency-keys"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "idempotency_key"
+
+  attribute {
+    name = "idempotency_key"
+    type = "S"
+  }
+
+  # Records are removed automatically once their replay window has passed
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+}
+
+#####################################################################
+# IAM POLICY FOR IDEMPOTENCY TABLE ACCESS
+#####################################################################
+
+resource "aws_iam_role_policy" "lambda_idempotency_dynamodb_policy" {
+  name = "lambda-idempotency-dynamodb-policy"
+  role = aws_iam_role.lambda_execution.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:GetItem",
+          "dynamodb:PutItem",
+          "dynamodb:UpdateItem",
+          "dynamodb:DeleteItem"
+        ]
+        Resource = aws_dynamodb_table.idempotency_keys.arn
+      }
+    ]
+  })
+}
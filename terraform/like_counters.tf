@@ -0,0 +1,112 @@
+#####################################################################
+# LIKE COUNTERS
+# Write-sharded like counts for posts (see
+# src/api/utils/like_counters.py):
+# - DynamoDB table keyed by target_id and shard number; a meta item
+#   (shard -1) records how many shards writers spread over
+# - IAM policy for Lambda execution
+# - Daily repair job for counters that missed a best-effort write
+# The backfill is migrations/like_counters.py - run it after
+# switching like_counter_mode to write, and rerun until it repairs
+# nothing before switching to read.
+#####################################################################
+
+#####################################################################
+# DYNAMODB TABLE FOR LIKE COUNTERS
+#####################################################################
+
+resource "aws_dynamodb_table" "like_counters" {
+  name         = "politicnz-like-counters"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "target_id"
+  range_key    = "shard"
+
+  attribute {
+    name = "target_id"
+    type = "S"
+  }
+
+  attribute {
+    name = "shard"
+    type = "N"
+  }
+}
+
+#####################################################################
+# IAM POLICY
+#####################################################################
+
+resource "aws_iam_role_policy" "lambda_like_counters_policy" {
+  name = "lambda-like-counters-policy"
+  role = aws_iam_role.lambda_execution.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:GetItem",
+          "dynamodb:UpdateItem",
+          "dynamodb:DeleteItem",
+          "dynamodb:Query",
+          "dynamodb:BatchWriteItem"
+        ]
+        Resource = aws_dynamodb_table.like_counters.arn
+      }
+    ]
+  })
+}
+
+#####################################################################
+# REPAIR JOB
+# Recounts recently liked posts and corrects drifted counters
+#####################################################################
+
+data "archive_file" "repair_like_counters_lambda" {
+  type        = "zip"
+  source_dir  = "${path.module}/../src/api"
+  output_path = "${path.module}/lambda_repair_like_counters.zip"
+}
+
+resource "aws_lambda_function" "repair_like_counters" {
+  filename         = data.archive_file.repair_like_counters_lambda.output_path
+  function_name    = "politicnz-repair-like-counters"
+  role            = aws_iam_role.lambda_execution.arn
+  handler         = "posts/repair_like_counters.lambda_handler"
+  source_code_hash = data.archive_file.repair_like_counters_lambda.output_base64sha256
+  runtime         = "python3.12"
+  timeout         = 300
+
+  environment {
+    variables = {
+      POSTS_TABLE_NAME                   = aws_dynamodb_table.posts.name
+      LIKES_TABLE_NAME                   = aws_dynamodb_table.post_likes.name
+      LIKE_COUNTERS_TABLE_NAME           = aws_dynamodb_table.like_counters.name
+      LIKE_COUNTER_MODE                  = var.like_counter_mode
+      LIKE_COUNTER_REPAIR_LOOKBACK_HOURS = "48"
+      TRACE_ENABLED                      = var.trace_enabled
+      PROFILE_SAMPLE_RATE                = var.profile_sample_rate
+      HOT_KEY_TABLES                     = local.hot_key_tables
+    }
+  }
+}
+
+resource "aws_cloudwatch_event_rule" "repair_like_counters" {
+  name                = "politicnz-repair-like-counters"
+  description         = "Recount recently liked posts and repair drifted like counters once a day"
+  schedule_expression = "rate(1 day)"
+}
+
+resource "aws_cloudwatch_event_target" "repair_like_counters" {
+  rule = aws_cloudwatch_event_rule.repair_like_counters.name
+  arn  = aws_lambda_function.repair_like_counters.arn
+}
+
+resource "aws_lambda_permission" "repair_like_counters" {
+  statement_id  = "AllowEventBridgeInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.repair_like_counters.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.repair_like_counters.arn
+}
@@ -0,0 +1,100 @@
+#####################################################################
+# LIKE FILTERS
+# Per-user Bloom filters of liked posts and comments, so feed and
+# comment reads can skip the likes table for targets not liked:
+# - DynamoDB table holding one filter per user
+# - IAM policy for Lambda execution
+# - Scheduled Lambda that rebuilds every filter daily
+#####################################################################
+
+#####################################################################
+# DYNAMODB TABLE FOR LIKE FILTERS
+#####################################################################
+
+resource "aws_dynamodb_table" "like_filters" {
+  name         = "politicnz-like-filters"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "user_id"
+
+  attribute {
+    name = "user_id"
+    type = "S"
+  }
+}
+
+#####################################################################
+# IAM POLICY
+#####################################################################
+
+resource "aws_iam_role_policy" "lambda_like_filters_policy" {
+  name = "lambda-like-filters-policy"
+  role = aws_iam_role.lambda_execution.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:GetItem",
+          "dynamodb:PutItem",
+          "dynamodb:UpdateItem",
+          "dynamodb:Scan"
+        ]
+        Resource = aws_dynamodb_table.like_filters.arn
+      }
+    ]
+  })
+}
+
+#####################################################################
+# REBUILD JOB
+# Clears bits left by unlikes and resizes filters that outgrew
+# their capacity
+#####################################################################
+
+data "archive_file" "rebuild_like_filters_lambda" {
+  type        = "zip"
+  source_dir  = "${path.module}/../src/api"
+  output_path = "${path.module}/lambda_rebuild_like_filters.zip"
+}
+
+resource "aws_lambda_function" "rebuild_like_filters" {
+  filename         = data.archive_file.rebuild_like_filters_lambda.output_path
+  function_name    = "politicnz-rebuild-like-filters"
+  role            = aws_iam_role.lambda_execution.arn
+  handler         = "posts/rebuild_like_filters.lambda_handler"
+  source_code_hash = data.archive_file.rebuild_like_filters_lambda.output_base64sha256
+  runtime         = "python3.12"
+  timeout         = 300
+
+  environment {
+    variables = {
+      LIKE_FILTERS_TABLE_NAME   = aws_dynamodb_table.like_filters.name
+      LIKES_TABLE_NAME          = aws_dynamodb_table.post_likes.name
+      LIKE_FILTER_SCAN_SEGMENTS = "4"
+      TRACE_ENABLED             = var.trace_enabled
+      PROFILE_SAMPLE_RATE       = var.profile_sample_rate
+      HOT_KEY_TABLES            = local.hot_key_tables
+    }
+  }
+}
+
+resource "aws_cloudwatch_event_rule" "rebuild_like_filters" {
+  name                = "politicnz-rebuild-like-filters"
+  description         = "Rebuild per-user like filters once a day"
+  schedule_expression = "rate(1 day)"
+}
+
+resource "aws_cloudwatch_event_target" "rebuild_like_filters" {
+  rule = aws_cloudwatch_event_rule.rebuild_like_filters.name
+  arn  = aws_lambda_function.rebuild_like_filters.arn
+}
+
+resource "aws_lambda_permission" "rebuild_like_filters" {
+  statement_id  = "AllowEventBridgeInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.rebuild_like_filters.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.rebuild_like_filters.arn
+}
@@ -0,0 +1,24 @@
+#####################################################################
+# MIGRATIONS
+# Checkpoints for the resumable migration runner
+# (src/api/migrations/runner.py), which operators run from their own
+# machine with MIGRATIONS_TABLE_NAME set to this table's name
+#####################################################################
+
+# One row per (migration run, scan segment) holding its LastEvaluatedKey
+resource "aws_dynamodb_table" "migration_checkpoints" {
+  name         = "politicnz-migration-checkpoints"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "migration_id"
+  range_key    = "segment"
+
+  attribute {
+    name = "migration_id"
+    type = "S"
+  }
+
+  attribute {
+    name = "segment"
+    type = "N"
+  }
+}
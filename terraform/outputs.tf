@@ -43,3 +43,13 @@ output "api_gateway_url" {
   value       = aws_api_gateway_stage.main.invoke_url
 }
 
+
+output "websocket_url" {
+  description = "WebSocket URL for realtime updates (CONFIG.WEBSOCKET_URL)"
+  value       = aws_apigatewayv2_stage.realtime.invoke_url
+}
+
+output "migration_checkpoints_table_name" {
+  description = "DynamoDB table the migration runner checkpoints to (MIGRATIONS_TABLE_NAME)"
+  value       = aws_dynamodb_table.migration_checkpoints.name
+}
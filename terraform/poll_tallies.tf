@@ -0,0 +1,102 @@
+#####################################################################
+# POLL TALLIES
+# Incremental poll result counters, cross-tabbed by the voter's
+# political alignment:
+# - DynamoDB table with one counter item per poll
+# - IAM policy for Lambda execution
+# - Scheduled job that rebuilds tallies from the votes table
+#####################################################################
+
+#####################################################################
+# DYNAMODB TABLE FOR POLL TALLIES
+#####################################################################
+
+resource "aws_dynamodb_table" "poll_tallies" {
+  name         = "politicnz-poll-tallies"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "poll_id"
+
+  attribute {
+    name = "poll_id"
+    type = "S"
+  }
+}
+
+#####################################################################
+# IAM POLICY FOR POLL TALLIES TABLE ACCESS
+#####################################################################
+
+resource "aws_iam_role_policy" "lambda_poll_tallies_dynamodb_policy" {
+  name = "lambda-poll-tallies-dynamodb-policy"
+  role = aws_iam_role.lambda_execution.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:GetItem",
+          "dynamodb:PutItem",
+          "dynamodb:UpdateItem",
+          "dynamodb:Scan"
+        ]
+        Resource = aws_dynamodb_table.poll_tallies.arn
+      }
+    ]
+  })
+}
+
+#####################################################################
+# POLL TALLY REBUILD
+# Scheduled job that recounts every poll against voters' current
+# alignments. Run it once by hand after the first deploy so polls
+# with existing votes get their tallies.
+#####################################################################
+
+data "archive_file" "rebuild_poll_tallies_lambda" {
+  type        = "zip"
+  source_dir  = "${path.module}/../src/api"
+  output_path = "${path.module}/lambda_rebuild_poll_tallies.zip"
+}
+
+resource "aws_lambda_function" "rebuild_poll_tallies" {
+  filename         = data.archive_file.rebuild_poll_tallies_lambda.output_path
+  function_name    = "politicnz-rebuild-poll-tallies"
+  role            = aws_iam_role.lambda_execution.arn
+  handler         = "polls/rebuild_poll_tallies.lambda_handler"
+  source_code_hash = data.archive_file.rebuild_poll_tallies_lambda.output_base64sha256
+  runtime         = "python3.12"
+  timeout         = 300
+
+  environment {
+    variables = {
+      PROFILES_TABLE_NAME      = aws_dynamodb_table.user_profiles.name
+      POLL_VOTES_TABLE_NAME    = aws_dynamodb_table.poll_votes.name
+      POLL_TALLIES_TABLE_NAME  = aws_dynamodb_table.poll_tallies.name
+      POLL_TALLY_SCAN_SEGMENTS = "4"
+      TRACE_ENABLED            = var.trace_enabled
+      PROFILE_SAMPLE_RATE      = var.profile_sample_rate
+      HOT_KEY_TABLES           = local.hot_key_tables
+    }
+  }
+}
+
+resource "aws_cloudwatch_event_rule" "rebuild_poll_tallies" {
+  name                = "politicnz-rebuild-poll-tallies"
+  description         = "Recount poll tallies against current alignments once a day"
+  schedule_expression = "rate(1 day)"
+}
+
+resource "aws_cloudwatch_event_target" "rebuild_poll_tallies" {
+  rule = aws_cloudwatch_event_rule.rebuild_poll_tallies.name
+  arn  = aws_lambda_function.rebuild_poll_tallies.arn
+}
+
+resource "aws_lambda_permission" "rebuild_poll_tallies" {
+  statement_id  = "AllowEventBridgeInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.rebuild_poll_tallies.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.rebuild_poll_tallies.arn
+}
@@ -0,0 +1,174 @@
+#####################################################################
+# POLL TIMELINE
+# Vote counts per answer in hourly and daily buckets, for trend
+# charts:
+# - DynamoDB table keyed by poll and bucket
+# - IAM policy for Lambda execution
+# - Lambda function and API Gateway endpoint for
+#   /polls/{poll_id}/timeline
+#####################################################################
+
+#####################################################################
+# DYNAMODB TABLE FOR POLL TIMELINE BUCKETS
+#####################################################################
+
+resource "aws_dynamodb_table" "poll_timeline" {
+  name         = "politicnz-poll-timeline"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "poll_id"
+  range_key    = "bucket"
+
+  attribute {
+    name = "poll_id"
+    type = "S"
+  }
+
+  # H#2026-10-19T13 for an hour, D#2026-10-19 for a rolled-up day
+  attribute {
+    name = "bucket"
+    type = "S"
+  }
+}
+
+#####################################################################
+# IAM POLICY FOR POLL TIMELINE TABLE ACCESS
+#####################################################################
+
+resource "aws_iam_role_policy" "lambda_poll_timeline_dynamodb_policy" {
+  name = "lambda-poll-timeline-dynamodb-policy"
+  role = aws_iam_role.lambda_execution.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:PutItem",
+          "dynamodb:UpdateItem",
+          "dynamodb:Query"
+        ]
+        Resource = aws_dynamodb_table.poll_timeline.arn
+      }
+    ]
+  })
+}
+
+#####################################################################
+# LAMBDA FUNCTION
+#####################################################################
+
+data "archive_file" "get_poll_timeline_lambda" {
+  type        = "zip"
+  source_dir  = "${path.module}/../src/api"
+  output_path = "${path.module}/lambda_get_poll_timeline.zip"
+}
+
+resource "aws_lambda_function" "get_poll_timeline" {
+  filename         = data.archive_file.get_poll_timeline_lambda.output_path
+  function_name    = "politicnz-get-poll-timeline"
+  role            = aws_iam_role.lambda_execution.arn
+  handler         = "polls/get_poll_timeline.lambda_handler"
+  source_code_hash = data.archive_file.get_poll_timeline_lambda.output_base64sha256
+  runtime         = "python3.12"
+  timeout         = 10
+
+  environment {
+    variables = {
+      POLLS_TABLE_NAME         = aws_dynamodb_table.polls.name
+      POLL_VOTES_TABLE_NAME    = aws_dynamodb_table.poll_votes.name
+      POLL_TIMELINE_TABLE_NAME = aws_dynamodb_table.poll_timeline.name
+      TRACE_ENABLED            = var.trace_enabled
+      PROFILE_SAMPLE_RATE      = var.profile_sample_rate
+      HOT_KEY_TABLES           = local.hot_key_tables
+    }
+  }
+}
+
+#####################################################################
+# API GATEWAY RESOURCES AND METHODS
+#####################################################################
+
+# /polls/{poll_id}/timeline resource
+resource "aws_api_gateway_resource" "poll_timeline" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_resource.poll_item.id
+  path_part   = "timeline"
+}
+
+# GET /polls/{poll_id}/timeline - Get votes over time
+resource "aws_api_gateway_method" "get_poll_timeline" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.poll_timeline.id
+  http_method   = "GET"
+  authorization = "COGNITO_USER_POOLS"
+  authorizer_id = aws_api_gateway_authorizer.cognito.id
+}
+
+resource "aws_api_gateway_integration" "get_poll_timeline" {
+  rest_api_id             = aws_api_gateway_rest_api.main.id
+  resource_id             = aws_api_gateway_resource.poll_timeline.id
+  http_method             = aws_api_gateway_method.get_poll_timeline.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.get_poll_timeline.invoke_arn
+}
+
+# CORS OPTIONS for /polls/{poll_id}/timeline
+resource "aws_api_gateway_method" "poll_timeline_options" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.poll_timeline.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "poll_timeline_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.poll_timeline.id
+  http_method = aws_api_gateway_method.poll_timeline_options.http_method
+  type        = "MOCK"
+
+  request_templates = {
+    "application/json" = "{\"statusCode\": 200}"
+  }
+}
+
+resource "aws_api_gateway_method_response" "poll_timeline_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.poll_timeline.id
+  http_method = aws_api_gateway_method.poll_timeline_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+
+  response_models = {
+    "application/json" = "Empty"
+  }
+}
+
+resource "aws_api_gateway_integration_response" "poll_timeline_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.poll_timeline.id
+  http_method = aws_api_gateway_method.poll_timeline_options.http_method
+  status_code = aws_api_gateway_method_response.poll_timeline_options.status_code
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+
+  depends_on = [aws_api_gateway_integration.poll_timeline_options]
+}
+
+resource "aws_lambda_permission" "get_poll_timeline" {
+  statement_id  = "AllowAPIGatewayInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.get_poll_timeline.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_api_gateway_rest_api.main.execution_arn}/*/*"
+}
@@ -34,6 +34,65 @@ resource "aws_dynamodb_table" "polls" {
   }
 }
 
+#####################################################################
+# POLL DEFINITIONS
+# Each poll is an item in the polls table. Lambdas cache the whole set
+# per container and only rescan it when the catalog version changes,
+# which it does automatically whenever anything below is edited.
+#####################################################################
+
+locals {
+  polls = {
+    "national-coalition-2024" = {
+      question   = "Do you support the current government (National led coalition)?"
+      info_text  = "Current government includes; National, ACT, NZ First"
+      options    = ["Yes", "No"]
+      created_at = "2024-01-01T00:00:00.000000"
+      active     = true
+    }
+  }
+}
+
+resource "aws_dynamodb_table_item" "polls" {
+  for_each = local.polls
+
+  table_name = aws_dynamodb_table.polls.name
+  hash_key   = aws_dynamodb_table.polls.hash_key
+
+  item = jsonencode({
+    poll_id    = { S = each.key }
+    question   = { S = each.value.question }
+    info_text  = { S = each.value.info_text }
+    options    = { L = [for option in each.value.options : { S = option }] }
+    created_at = { S = each.value.created_at }
+    active     = { BOOL = each.value.active }
+  })
+
+  # Answers double as attribute names on tally and timeline items
+  # (utils/poll_tallies.py), next to their keys and the vote total
+  lifecycle {
+    precondition {
+      condition = alltrue([
+        for option in each.value.options :
+        !contains(["total", "poll_id", "bucket"], option) && length(split("|", option)) == 1
+      ])
+      error_message = "Poll options cannot be total, poll_id or bucket, or contain |."
+    }
+  }
+}
+
+resource "aws_dynamodb_table_item" "poll_catalog" {
+  table_name = aws_dynamodb_table.polls.name
+  hash_key   = aws_dynamodb_table.polls.hash_key
+
+  item = jsonencode({
+    poll_id = { S = "#catalog" }
+    version = { S = sha1(jsonencode(local.polls)) }
+  })
+
+  depends_on = [aws_dynamodb_table_item.polls]
+}
+
 #####################################################################
 # DYNAMODB TABLE FOR POLL VOTES
 #####################################################################
@@ -59,6 +118,11 @@ resource "aws_dynamodb_table" "poll_votes" {
     type = "S"
   }
 
+  attribute {
+    name = "reason_key"
+    type = "S"
+  }
+
   # Global Secondary Index for querying votes by user
   global_secondary_index {
     name            = "UserVotesIndex"
@@ -66,6 +130,16 @@ resource "aws_dynamodb_table" "poll_votes" {
     range_key       = "voted_at"
     projection_type = "ALL"
   }
+
+  # Sparse Global Secondary Index of votes with a reason, keyed poll_id#answer,
+  # projecting only what the reasons list displays
+  global_secondary_index {
+    name               = "ReasonsIndex"
+    hash_key           = "reason_key"
+    range_key          = "voted_at"
+    projection_type    = "INCLUDE"
+    non_key_attributes = ["display_name", "answer", "reason"]
+  }
 }
 
 #####################################################################
@@ -87,7 +161,8 @@ resource "aws_iam_role_policy" "lambda_polls_dynamodb_policy" {
           "dynamodb:UpdateItem",
           "dynamodb:DeleteItem",
           "dynamodb:Query",
-          "dynamodb:Scan"
+          "dynamodb:Scan",
+          "dynamodb:BatchGetItem"
         ]
         Resource = [
           aws_dynamodb_table.polls.arn,
@@ -122,6 +197,12 @@ data "archive_file" "get_poll_results_lambda" {
   output_path = "${path.module}/lambda_get_poll_results.zip"
 }
 
+data "archive_file" "get_poll_reasons_lambda" {
+  type        = "zip"
+  source_dir  = "${path.module}/../src/api"
+  output_path = "${path.module}/lambda_get_poll_reasons.zip"
+}
+
 data "archive_file" "get_user_poll_votes_lambda" {
   type        = "zip"
   source_dir  = "${path.module}/../src/api"
@@ -139,8 +220,11 @@ resource "aws_lambda_function" "get_polls" {
 
   environment {
     variables = {
-      POLLS_TABLE_NAME = aws_dynamodb_table.polls.name
+      POLLS_TABLE_NAME      = aws_dynamodb_table.polls.name
       POLL_VOTES_TABLE_NAME = aws_dynamodb_table.poll_votes.name
+      TRACE_ENABLED         = var.trace_enabled
+      PROFILE_SAMPLE_RATE   = var.profile_sample_rate
+      HOT_KEY_TABLES        = local.hot_key_tables
     }
   }
 }
@@ -156,9 +240,17 @@ resource "aws_lambda_function" "vote_poll" {
 
   environment {
     variables = {
-      POLLS_TABLE_NAME = aws_dynamodb_table.polls.name
-      POLL_VOTES_TABLE_NAME = aws_dynamodb_table.poll_votes.name
-      PROFILES_TABLE_NAME = aws_dynamodb_table.user_profiles.name
+      POLLS_TABLE_NAME         = aws_dynamodb_table.polls.name
+      POLL_VOTES_TABLE_NAME    = aws_dynamodb_table.poll_votes.name
+      PROFILES_TABLE_NAME      = aws_dynamodb_table.user_profiles.name
+      SHARED_CACHE_URL         = var.shared_cache_url
+      IDEMPOTENCY_TABLE_NAME   = aws_dynamodb_table.idempotency_keys.name
+      TRACE_ENABLED            = var.trace_enabled
+      PROFILE_SAMPLE_RATE      = var.profile_sample_rate
+      RATE_LIMITS_TABLE_NAME   = aws_dynamodb_table.rate_limits.name
+      POLL_TALLIES_TABLE_NAME  = aws_dynamodb_table.poll_tallies.name
+      POLL_TIMELINE_TABLE_NAME = aws_dynamodb_table.poll_timeline.name
+      HOT_KEY_TABLES           = local.hot_key_tables
     }
   }
 }
@@ -174,8 +266,32 @@ resource "aws_lambda_function" "get_poll_results" {
 
   environment {
     variables = {
-      POLLS_TABLE_NAME = aws_dynamodb_table.polls.name
+      POLLS_TABLE_NAME        = aws_dynamodb_table.polls.name
+      POLL_VOTES_TABLE_NAME   = aws_dynamodb_table.poll_votes.name
+      TRACE_ENABLED           = var.trace_enabled
+      PROFILE_SAMPLE_RATE     = var.profile_sample_rate
+      POLL_TALLIES_TABLE_NAME = aws_dynamodb_table.poll_tallies.name
+      HOT_KEY_TABLES          = local.hot_key_tables
+    }
+  }
+}
+
+resource "aws_lambda_function" "get_poll_reasons" {
+  filename         = data.archive_file.get_poll_reasons_lambda.output_path
+  function_name    = "politicnz-get-poll-reasons"
+  role            = aws_iam_role.lambda_execution.arn
+  handler         = "polls/get_poll_reasons.lambda_handler"
+  source_code_hash = data.archive_file.get_poll_reasons_lambda.output_base64sha256
+  runtime         = "python3.12"
+  timeout         = 10
+
+  environment {
+    variables = {
+      POLLS_TABLE_NAME      = aws_dynamodb_table.polls.name
       POLL_VOTES_TABLE_NAME = aws_dynamodb_table.poll_votes.name
+      TRACE_ENABLED         = var.trace_enabled
+      PROFILE_SAMPLE_RATE   = var.profile_sample_rate
+      HOT_KEY_TABLES        = local.hot_key_tables
     }
   }
 }
@@ -191,8 +307,11 @@ resource "aws_lambda_function" "get_user_poll_votes" {
 
   environment {
     variables = {
-      POLLS_TABLE_NAME = aws_dynamodb_table.polls.name
+      POLLS_TABLE_NAME      = aws_dynamodb_table.polls.name
       POLL_VOTES_TABLE_NAME = aws_dynamodb_table.poll_votes.name
+      TRACE_ENABLED         = var.trace_enabled
+      PROFILE_SAMPLE_RATE   = var.profile_sample_rate
+      HOT_KEY_TABLES        = local.hot_key_tables
     }
   }
 }
@@ -283,6 +402,31 @@ resource "aws_api_gateway_integration" "get_poll_results" {
   uri                     = aws_lambda_function.get_poll_results.invoke_arn
 }
 
+# /polls/{poll_id}/reasons resource
+resource "aws_api_gateway_resource" "poll_reasons" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_resource.poll_item.id
+  path_part   = "reasons"
+}
+
+# GET /polls/{poll_id}/reasons - Get vote reasons for an answer
+resource "aws_api_gateway_method" "get_poll_reasons" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.poll_reasons.id
+  http_method   = "GET"
+  authorization = "COGNITO_USER_POOLS"
+  authorizer_id = aws_api_gateway_authorizer.cognito.id
+}
+
+resource "aws_api_gateway_integration" "get_poll_reasons" {
+  rest_api_id             = aws_api_gateway_rest_api.main.id
+  resource_id             = aws_api_gateway_resource.poll_reasons.id
+  http_method             = aws_api_gateway_method.get_poll_reasons.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.get_poll_reasons.invoke_arn
+}
+
 # /polls/user resource
 resource "aws_api_gateway_resource" "polls_user" {
   rest_api_id = aws_api_gateway_rest_api.main.id
@@ -413,7 +557,7 @@ resource "aws_api_gateway_integration_response" "poll_vote_options" {
   status_code = aws_api_gateway_method_response.poll_vote_options.status_code
 
   response_parameters = {
-    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token'"
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,Idempotency-Key'"
     "method.response.header.Access-Control-Allow-Methods" = "'POST,OPTIONS'"
     "method.response.header.Access-Control-Allow-Origin"  = "'*'"
   }
@@ -472,6 +616,57 @@ resource "aws_api_gateway_integration_response" "poll_results_options" {
   depends_on = [aws_api_gateway_integration.poll_results_options]
 }
 
+# CORS OPTIONS for /polls/{poll_id}/reasons
+resource "aws_api_gateway_method" "poll_reasons_options" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.poll_reasons.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "poll_reasons_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.poll_reasons.id
+  http_method = aws_api_gateway_method.poll_reasons_options.http_method
+  type        = "MOCK"
+
+  request_templates = {
+    "application/json" = "{\"statusCode\": 200}"
+  }
+}
+
+resource "aws_api_gateway_method_response" "poll_reasons_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.poll_reasons.id
+  http_method = aws_api_gateway_method.poll_reasons_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+
+  response_models = {
+    "application/json" = "Empty"
+  }
+}
+
+resource "aws_api_gateway_integration_response" "poll_reasons_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.poll_reasons.id
+  http_method = aws_api_gateway_method.poll_reasons_options.http_method
+  status_code = aws_api_gateway_method_response.poll_reasons_options.status_code
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+
+  depends_on = [aws_api_gateway_integration.poll_reasons_options]
+}
+
 # CORS OPTIONS for /polls/user/votes
 resource "aws_api_gateway_method" "user_poll_votes_options" {
   rest_api_id   = aws_api_gateway_rest_api.main.id
@@ -551,6 +746,14 @@ resource "aws_lambda_permission" "get_poll_results" {
   source_arn    = "${aws_api_gateway_rest_api.main.execution_arn}/*/*"
 }
 
+resource "aws_lambda_permission" "get_poll_reasons" {
+  statement_id  = "AllowAPIGatewayInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.get_poll_reasons.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_api_gateway_rest_api.main.execution_arn}/*/*"
+}
+
 resource "aws_lambda_permission" "get_user_poll_votes" {
   statement_id  = "AllowAPIGatewayInvoke"
   action        = "lambda:InvokeFunction"
@@ -0,0 +1,61 @@
+#####################################################################
+# POST AGGREGATES
+# Single-table layout for post detail - a post, its counters, its
+# comments and all their likes under one partition key:
+# - DynamoDB table keyed by post_id and a typed sort key
+# - IAM policy for Lambda execution
+# The backfill is migrations/post_aggregates.py - run it after
+# switching post_aggregate_mode to dual_write, and rerun until it
+# writes nothing before switching to read.
+#####################################################################
+
+#####################################################################
+# DYNAMODB TABLE FOR POST AGGREGATES
+#####################################################################
+
+# Sort keys: POST, COUNTERS, LIKE#{user_id}, COMMENT#{created_at}#{comment_id}
+# and COMMENT#{created_at}#{comment_id}#LIKE#{user_id}
+resource "aws_dynamodb_table" "post_aggregates" {
+  name         = "politicnz-post-aggregates"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "post_id"
+  range_key    = "sk"
+
+  attribute {
+    name = "post_id"
+    type = "S"
+  }
+
+  attribute {
+    name = "sk"
+    type = "S"
+  }
+}
+
+#####################################################################
+# IAM POLICY
+#####################################################################
+
+resource "aws_iam_role_policy" "lambda_post_aggregates_policy" {
+  name = "lambda-post-aggregates-policy"
+  role = aws_iam_role.lambda_execution.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:GetItem",
+          "dynamodb:PutItem",
+          "dynamodb:UpdateItem",
+          "dynamodb:DeleteItem",
+          "dynamodb:Query",
+          "dynamodb:BatchGetItem",
+          "dynamodb:BatchWriteItem"
+        ]
+        Resource = aws_dynamodb_table.post_aggregates.arn
+      }
+    ]
+  })
+}
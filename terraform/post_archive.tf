@@ -0,0 +1,153 @@
+#####################################################################
+# POST ARCHIVE
+# Moves old posts (with their comments and likes) out of DynamoDB
+# into gzip JSONL segments in S3:
+# - Private S3 bucket for archive segments
+# - DynamoDB table of per-user archived counter totals
+# - IAM policy for Lambda execution
+# - Scheduled Lambda that runs the archive job daily
+#####################################################################
+
+#####################################################################
+# S3 BUCKET FOR ARCHIVE SEGMENTS
+#####################################################################
+
+resource "aws_s3_bucket" "post_archive" {
+  bucket_prefix = "politicnz-post-archive-"
+}
+
+# Archive segments are only ever read by the Lambda functions
+resource "aws_s3_bucket_public_access_block" "post_archive" {
+  bucket = aws_s3_bucket.post_archive.id
+
+  block_public_acls       = true
+  block_public_policy     = true
+  ignore_public_acls      = true
+  restrict_public_buckets = true
+}
+
+#####################################################################
+# DYNAMODB TABLE FOR ARCHIVED TOTALS
+# What each user's archived posts, comments and likes add to their
+# profile counters, read by the reconcile job
+#####################################################################
+
+resource "aws_dynamodb_table" "archive_totals" {
+  name         = "politicnz-archive-totals"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "user_id"
+
+  attribute {
+    name = "user_id"
+    type = "S"
+  }
+}
+
+resource "aws_iam_role_policy" "lambda_archive_totals_policy" {
+  name = "lambda-archive-totals-policy"
+  role = aws_iam_role.lambda_execution.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:PutItem",
+          "dynamodb:UpdateItem",
+          "dynamodb:BatchWriteItem",
+          "dynamodb:Scan"
+        ]
+        Resource = aws_dynamodb_table.archive_totals.arn
+      }
+    ]
+  })
+}
+
+#####################################################################
+# IAM POLICY FOR ARCHIVE BUCKET ACCESS
+#####################################################################
+
+resource "aws_iam_role_policy" "lambda_post_archive_s3_policy" {
+  name = "lambda-post-archive-s3-policy"
+  role = aws_iam_role.lambda_execution.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "s3:GetObject",
+          "s3:PutObject",
+          "s3:DeleteObject"
+        ]
+        Resource = "${aws_s3_bucket.post_archive.arn}/*"
+      },
+      {
+        Effect   = "Allow"
+        Action   = "s3:ListBucket"
+        Resource = aws_s3_bucket.post_archive.arn
+      }
+    ]
+  })
+}
+
+#####################################################################
+# ARCHIVE JOB
+#####################################################################
+
+data "archive_file" "archive_posts_lambda" {
+  type        = "zip"
+  source_dir  = "${path.module}/../src/api"
+  output_path = "${path.module}/lambda_archive_posts.zip"
+}
+
+resource "aws_lambda_function" "archive_posts" {
+  filename         = data.archive_file.archive_posts_lambda.output_path
+  function_name    = "politicnz-archive-posts"
+  role            = aws_iam_role.lambda_execution.arn
+  handler         = "posts/archive_posts.lambda_handler"
+  source_code_hash = data.archive_file.archive_posts_lambda.output_base64sha256
+  runtime         = "python3.12"
+  timeout         = 300
+
+  environment {
+    variables = {
+      POSTS_TABLE_NAME           = aws_dynamodb_table.posts.name
+      COMMENTS_TABLE_NAME        = aws_dynamodb_table.post_comments.name
+      LIKES_TABLE_NAME           = aws_dynamodb_table.post_likes.name
+      SEARCH_INDEX_TABLE_NAME    = aws_dynamodb_table.post_search_index.name
+      SHARED_CACHE_URL           = var.shared_cache_url
+      ARCHIVE_BUCKET_NAME        = aws_s3_bucket.post_archive.id
+      ARCHIVE_AFTER_DAYS         = var.archive_after_days
+      ARCHIVE_TOMBSTONE_TTL_DAYS = var.archive_tombstone_ttl_days
+      TRACE_ENABLED              = var.trace_enabled
+      PROFILE_SAMPLE_RATE        = var.profile_sample_rate
+      POST_AGGREGATES_TABLE_NAME = aws_dynamodb_table.post_aggregates.name
+      POST_AGGREGATE_MODE        = var.post_aggregate_mode
+      HOT_KEY_TABLES             = local.hot_key_tables
+      DELETIONS_TABLE_NAME       = aws_dynamodb_table.post_deletions.name
+      ARCHIVE_TOTALS_TABLE_NAME  = aws_dynamodb_table.archive_totals.name
+    }
+  }
+}
+
+resource "aws_cloudwatch_event_rule" "archive_posts" {
+  name                = "politicnz-archive-posts"
+  description         = "Archive old posts once a day"
+  schedule_expression = "rate(1 day)"
+}
+
+resource "aws_cloudwatch_event_target" "archive_posts" {
+  rule = aws_cloudwatch_event_rule.archive_posts.name
+  arn  = aws_lambda_function.archive_posts.arn
+}
+
+resource "aws_lambda_permission" "archive_posts" {
+  statement_id  = "AllowEventBridgeInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.archive_posts.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.archive_posts.arn
+}
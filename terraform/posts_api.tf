@@ -16,6 +16,10 @@ resource "aws_dynamodb_table" "posts" {
   billing_mode = "PAY_PER_REQUEST"
   hash_key     = "post_id"
 
+  # Change stream feeds the WebSocket broadcaster (realtime_api.tf)
+  stream_enabled   = true
+  stream_view_type = "NEW_AND_OLD_IMAGES"
+
   attribute {
     name = "post_id"
     type = "S"
@@ -45,6 +49,12 @@ resource "aws_dynamodb_table" "posts" {
     hash_key        = "created_at"
     projection_type = "ALL"
   }
+
+  # Tombstones left behind by the archive job expire on their own
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
 }
 
 #####################################################################
@@ -57,6 +67,10 @@ resource "aws_dynamodb_table" "post_likes" {
   hash_key     = "target_id"
   range_key    = "user_id"
 
+  # Change stream feeds the WebSocket broadcaster (realtime_api.tf)
+  stream_enabled   = true
+  stream_view_type = "NEW_AND_OLD_IMAGES"
+
   attribute {
     name = "target_id"
     type = "S"
@@ -91,6 +105,10 @@ resource "aws_dynamodb_table" "post_comments" {
   hash_key     = "post_id"
   range_key    = "comment_id"
 
+  # Change stream feeds the WebSocket broadcaster (realtime_api.tf)
+  stream_enabled   = true
+  stream_view_type = "NEW_AND_OLD_IMAGES"
+
   attribute {
     name = "post_id"
     type = "S"
@@ -115,6 +133,68 @@ resource "aws_dynamodb_table" "post_comments" {
   }
 }
 
+#####################################################################
+# DYNAMODB TABLE FOR POST SEARCH INDEX
+#####################################################################
+
+# Inverted index: one posting per (term, post), sorted by created_at#post_id
+resource "aws_dynamodb_table" "post_search_index" {
+  name         = "politicnz-post-search-index"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "term"
+  range_key    = "sort_key"
+
+  attribute {
+    name = "term"
+    type = "S"
+  }
+
+  attribute {
+    name = "sort_key"
+    type = "S"
+  }
+}
+
+#####################################################################
+# DYNAMODB TABLE FOR POST DELETIONS
+#####################################################################
+
+# Short-lived deletion log read by delta-syncing feeds (?since=)
+resource "aws_dynamodb_table" "post_deletions" {
+  name         = "politicnz-post-deletions"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "post_id"
+
+  attribute {
+    name = "post_id"
+    type = "S"
+  }
+
+  attribute {
+    name = "user_id"
+    type = "S"
+  }
+
+  attribute {
+    name = "deleted_at"
+    type = "S"
+  }
+
+  # Global Secondary Index for one user's deletions since a watermark
+  global_secondary_index {
+    name            = "UserDeletedIndex"
+    hash_key        = "user_id"
+    range_key       = "deleted_at"
+    projection_type = "ALL"
+  }
+
+  # Entries only need to outlive the oldest watermark clients may still hold
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+}
+
 #####################################################################
 # IAM POLICY FOR POSTS TABLE ACCESS
 #####################################################################
@@ -134,7 +214,9 @@ resource "aws_iam_role_policy" "lambda_posts_dynamodb_policy" {
           "dynamodb:UpdateItem",
           "dynamodb:DeleteItem",
           "dynamodb:Query",
-          "dynamodb:Scan"
+          "dynamodb:Scan",
+          "dynamodb:BatchGetItem",
+          "dynamodb:BatchWriteItem"
         ]
         Resource = [
           aws_dynamodb_table.posts.arn,
@@ -142,7 +224,10 @@ resource "aws_iam_role_policy" "lambda_posts_dynamodb_policy" {
           aws_dynamodb_table.post_likes.arn,
           "${aws_dynamodb_table.post_likes.arn}/index/*",
           aws_dynamodb_table.post_comments.arn,
-          "${aws_dynamodb_table.post_comments.arn}/index/*"
+          "${aws_dynamodb_table.post_comments.arn}/index/*",
+          aws_dynamodb_table.post_search_index.arn,
+          aws_dynamodb_table.post_deletions.arn,
+          "${aws_dynamodb_table.post_deletions.arn}/index/*"
         ]
       }
     ]
@@ -194,8 +279,17 @@ resource "aws_lambda_function" "create_post" {
 
   environment {
     variables = {
-      POSTS_TABLE_NAME    = aws_dynamodb_table.posts.name
-      PROFILES_TABLE_NAME = aws_dynamodb_table.user_profiles.name
+      POSTS_TABLE_NAME           = aws_dynamodb_table.posts.name
+      PROFILES_TABLE_NAME        = aws_dynamodb_table.user_profiles.name
+      SEARCH_INDEX_TABLE_NAME    = aws_dynamodb_table.post_search_index.name
+      SHARED_CACHE_URL           = var.shared_cache_url
+      IDEMPOTENCY_TABLE_NAME     = aws_dynamodb_table.idempotency_keys.name
+      TRACE_ENABLED              = var.trace_enabled
+      PROFILE_SAMPLE_RATE        = var.profile_sample_rate
+      POST_AGGREGATES_TABLE_NAME = aws_dynamodb_table.post_aggregates.name
+      POST_AGGREGATE_MODE        = var.post_aggregate_mode
+      RATE_LIMITS_TABLE_NAME     = aws_dynamodb_table.rate_limits.name
+      HOT_KEY_TABLES             = local.hot_key_tables
     }
   }
 }
@@ -211,9 +305,16 @@ resource "aws_lambda_function" "get_feed" {
 
   environment {
     variables = {
-      POSTS_TABLE_NAME    = aws_dynamodb_table.posts.name
-      LIKES_TABLE_NAME    = aws_dynamodb_table.post_likes.name
-      COMMENTS_TABLE_NAME = aws_dynamodb_table.post_comments.name
+      POSTS_TABLE_NAME         = aws_dynamodb_table.posts.name
+      LIKES_TABLE_NAME         = aws_dynamodb_table.post_likes.name
+      COMMENTS_TABLE_NAME      = aws_dynamodb_table.post_comments.name
+      TRACE_ENABLED            = var.trace_enabled
+      PROFILE_SAMPLE_RATE      = var.profile_sample_rate
+      DELETIONS_TABLE_NAME     = aws_dynamodb_table.post_deletions.name
+      LIKE_FILTERS_TABLE_NAME  = aws_dynamodb_table.like_filters.name
+      HOT_KEY_TABLES           = local.hot_key_tables
+      LIKE_COUNTERS_TABLE_NAME = aws_dynamodb_table.like_counters.name
+      LIKE_COUNTER_MODE        = var.like_counter_mode
     }
   }
 }
@@ -229,9 +330,17 @@ resource "aws_lambda_function" "get_user_posts" {
 
   environment {
     variables = {
-      POSTS_TABLE_NAME    = aws_dynamodb_table.posts.name
-      LIKES_TABLE_NAME    = aws_dynamodb_table.post_likes.name
-      COMMENTS_TABLE_NAME = aws_dynamodb_table.post_comments.name
+      POSTS_TABLE_NAME         = aws_dynamodb_table.posts.name
+      LIKES_TABLE_NAME         = aws_dynamodb_table.post_likes.name
+      COMMENTS_TABLE_NAME      = aws_dynamodb_table.post_comments.name
+      ARCHIVE_BUCKET_NAME      = aws_s3_bucket.post_archive.id
+      TRACE_ENABLED            = var.trace_enabled
+      PROFILE_SAMPLE_RATE      = var.profile_sample_rate
+      DELETIONS_TABLE_NAME     = aws_dynamodb_table.post_deletions.name
+      LIKE_FILTERS_TABLE_NAME  = aws_dynamodb_table.like_filters.name
+      HOT_KEY_TABLES           = local.hot_key_tables
+      LIKE_COUNTERS_TABLE_NAME = aws_dynamodb_table.like_counters.name
+      LIKE_COUNTER_MODE        = var.like_counter_mode
     }
   }
 }
@@ -247,7 +356,15 @@ resource "aws_lambda_function" "update_post" {
 
   environment {
     variables = {
-      POSTS_TABLE_NAME = aws_dynamodb_table.posts.name
+      POSTS_TABLE_NAME           = aws_dynamodb_table.posts.name
+      SEARCH_INDEX_TABLE_NAME    = aws_dynamodb_table.post_search_index.name
+      SHARED_CACHE_URL           = var.shared_cache_url
+      TRACE_ENABLED              = var.trace_enabled
+      PROFILE_SAMPLE_RATE        = var.profile_sample_rate
+      POST_AGGREGATES_TABLE_NAME = aws_dynamodb_table.post_aggregates.name
+      POST_AGGREGATE_MODE        = var.post_aggregate_mode
+      RATE_LIMITS_TABLE_NAME     = aws_dynamodb_table.rate_limits.name
+      HOT_KEY_TABLES             = local.hot_key_tables
     }
   }
 }
@@ -263,7 +380,79 @@ resource "aws_lambda_function" "delete_post" {
 
   environment {
     variables = {
-      POSTS_TABLE_NAME = aws_dynamodb_table.posts.name
+      POSTS_TABLE_NAME           = aws_dynamodb_table.posts.name
+      SEARCH_INDEX_TABLE_NAME    = aws_dynamodb_table.post_search_index.name
+      SHARED_CACHE_URL           = var.shared_cache_url
+      LIKES_TABLE_NAME           = aws_dynamodb_table.post_likes.name
+      PROFILES_TABLE_NAME        = aws_dynamodb_table.user_profiles.name
+      TRACE_ENABLED              = var.trace_enabled
+      PROFILE_SAMPLE_RATE        = var.profile_sample_rate
+      DELETIONS_TABLE_NAME       = aws_dynamodb_table.post_deletions.name
+      POST_AGGREGATES_TABLE_NAME = aws_dynamodb_table.post_aggregates.name
+      POST_AGGREGATE_MODE        = var.post_aggregate_mode
+      RATE_LIMITS_TABLE_NAME     = aws_dynamodb_table.rate_limits.name
+      HOT_KEY_TABLES             = local.hot_key_tables
+      LIKE_COUNTERS_TABLE_NAME   = aws_dynamodb_table.like_counters.name
+      LIKE_COUNTER_MODE          = var.like_counter_mode
+    }
+  }
+}
+
+data "archive_file" "get_post_lambda" {
+  type        = "zip"
+  source_dir  = "${path.module}/../src/api"
+  output_path = "${path.module}/lambda_get_post.zip"
+}
+
+resource "aws_lambda_function" "get_post" {
+  filename         = data.archive_file.get_post_lambda.output_path
+  function_name    = "politicnz-get-post"
+  role            = aws_iam_role.lambda_execution.arn
+  handler         = "posts/get_post.lambda_handler"
+  source_code_hash = data.archive_file.get_post_lambda.output_base64sha256
+  runtime         = "python3.12"
+  timeout         = 10
+
+  environment {
+    variables = {
+      POSTS_TABLE_NAME           = aws_dynamodb_table.posts.name
+      LIKES_TABLE_NAME           = aws_dynamodb_table.post_likes.name
+      COMMENTS_TABLE_NAME        = aws_dynamodb_table.post_comments.name
+      ARCHIVE_BUCKET_NAME        = aws_s3_bucket.post_archive.id
+      TRACE_ENABLED              = var.trace_enabled
+      PROFILE_SAMPLE_RATE        = var.profile_sample_rate
+      LIKE_FILTERS_TABLE_NAME    = aws_dynamodb_table.like_filters.name
+      POST_AGGREGATES_TABLE_NAME = aws_dynamodb_table.post_aggregates.name
+      POST_AGGREGATE_MODE        = var.post_aggregate_mode
+      HOT_KEY_TABLES             = local.hot_key_tables
+      LIKE_COUNTERS_TABLE_NAME   = aws_dynamodb_table.like_counters.name
+      LIKE_COUNTER_MODE          = var.like_counter_mode
+    }
+  }
+}
+
+data "archive_file" "search_posts_lambda" {
+  type        = "zip"
+  source_dir  = "${path.module}/../src/api"
+  output_path = "${path.module}/lambda_search_posts.zip"
+}
+
+resource "aws_lambda_function" "search_posts" {
+  filename         = data.archive_file.search_posts_lambda.output_path
+  function_name    = "politicnz-search-posts"
+  role            = aws_iam_role.lambda_execution.arn
+  handler         = "posts/search_posts.lambda_handler"
+  source_code_hash = data.archive_file.search_posts_lambda.output_base64sha256
+  runtime         = "python3.12"
+  timeout         = 10
+
+  environment {
+    variables = {
+      POSTS_TABLE_NAME        = aws_dynamodb_table.posts.name
+      SEARCH_INDEX_TABLE_NAME = aws_dynamodb_table.post_search_index.name
+      TRACE_ENABLED           = var.trace_enabled
+      PROFILE_SAMPLE_RATE     = var.profile_sample_rate
+      HOT_KEY_TABLES          = local.hot_key_tables
     }
   }
 }
@@ -323,9 +512,19 @@ resource "aws_lambda_function" "like_post" {
 
   environment {
     variables = {
-      POSTS_TABLE_NAME    = aws_dynamodb_table.posts.name
-      LIKES_TABLE_NAME    = aws_dynamodb_table.post_likes.name
-      PROFILES_TABLE_NAME = aws_dynamodb_table.user_profiles.name
+      POSTS_TABLE_NAME           = aws_dynamodb_table.posts.name
+      LIKES_TABLE_NAME           = aws_dynamodb_table.post_likes.name
+      PROFILES_TABLE_NAME        = aws_dynamodb_table.user_profiles.name
+      SHARED_CACHE_URL           = var.shared_cache_url
+      TRACE_ENABLED              = var.trace_enabled
+      PROFILE_SAMPLE_RATE        = var.profile_sample_rate
+      LIKE_FILTERS_TABLE_NAME    = aws_dynamodb_table.like_filters.name
+      POST_AGGREGATES_TABLE_NAME = aws_dynamodb_table.post_aggregates.name
+      POST_AGGREGATE_MODE        = var.post_aggregate_mode
+      RATE_LIMITS_TABLE_NAME     = aws_dynamodb_table.rate_limits.name
+      HOT_KEY_TABLES             = local.hot_key_tables
+      LIKE_COUNTERS_TABLE_NAME   = aws_dynamodb_table.like_counters.name
+      LIKE_COUNTER_MODE          = var.like_counter_mode
     }
   }
 }
@@ -342,8 +541,13 @@ resource "aws_lambda_function" "get_post_likes" {
 
   environment {
     variables = {
-      POSTS_TABLE_NAME = aws_dynamodb_table.posts.name
-      LIKES_TABLE_NAME = aws_dynamodb_table.post_likes.name
+      POSTS_TABLE_NAME    = aws_dynamodb_table.posts.name
+      LIKES_TABLE_NAME    = aws_dynamodb_table.post_likes.name
+      SHARED_CACHE_URL    = var.shared_cache_url
+      ARCHIVE_BUCKET_NAME = aws_s3_bucket.post_archive.id
+      TRACE_ENABLED       = var.trace_enabled
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
+      HOT_KEY_TABLES      = local.hot_key_tables
     }
   }
 }
@@ -360,9 +564,17 @@ resource "aws_lambda_function" "create_comment" {
 
   environment {
     variables = {
-      POSTS_TABLE_NAME    = aws_dynamodb_table.posts.name
-      COMMENTS_TABLE_NAME = aws_dynamodb_table.post_comments.name
-      PROFILES_TABLE_NAME = aws_dynamodb_table.user_profiles.name
+      POSTS_TABLE_NAME           = aws_dynamodb_table.posts.name
+      COMMENTS_TABLE_NAME        = aws_dynamodb_table.post_comments.name
+      PROFILES_TABLE_NAME        = aws_dynamodb_table.user_profiles.name
+      SHARED_CACHE_URL           = var.shared_cache_url
+      IDEMPOTENCY_TABLE_NAME     = aws_dynamodb_table.idempotency_keys.name
+      TRACE_ENABLED              = var.trace_enabled
+      PROFILE_SAMPLE_RATE        = var.profile_sample_rate
+      POST_AGGREGATES_TABLE_NAME = aws_dynamodb_table.post_aggregates.name
+      POST_AGGREGATE_MODE        = var.post_aggregate_mode
+      RATE_LIMITS_TABLE_NAME     = aws_dynamodb_table.rate_limits.name
+      HOT_KEY_TABLES             = local.hot_key_tables
     }
   }
 }
@@ -379,9 +591,17 @@ resource "aws_lambda_function" "get_comments" {
 
   environment {
     variables = {
-      POSTS_TABLE_NAME    = aws_dynamodb_table.posts.name
-      COMMENTS_TABLE_NAME = aws_dynamodb_table.post_comments.name
-      LIKES_TABLE_NAME    = aws_dynamodb_table.post_likes.name
+      POSTS_TABLE_NAME           = aws_dynamodb_table.posts.name
+      COMMENTS_TABLE_NAME        = aws_dynamodb_table.post_comments.name
+      LIKES_TABLE_NAME           = aws_dynamodb_table.post_likes.name
+      SHARED_CACHE_URL           = var.shared_cache_url
+      ARCHIVE_BUCKET_NAME        = aws_s3_bucket.post_archive.id
+      TRACE_ENABLED              = var.trace_enabled
+      PROFILE_SAMPLE_RATE        = var.profile_sample_rate
+      LIKE_FILTERS_TABLE_NAME    = aws_dynamodb_table.like_filters.name
+      POST_AGGREGATES_TABLE_NAME = aws_dynamodb_table.post_aggregates.name
+      POST_AGGREGATE_MODE        = var.post_aggregate_mode
+      HOT_KEY_TABLES             = local.hot_key_tables
     }
   }
 }
@@ -398,7 +618,15 @@ resource "aws_lambda_function" "delete_comment" {
 
   environment {
     variables = {
-      COMMENTS_TABLE_NAME = aws_dynamodb_table.post_comments.name
+      COMMENTS_TABLE_NAME        = aws_dynamodb_table.post_comments.name
+      POSTS_TABLE_NAME           = aws_dynamodb_table.posts.name
+      PROFILES_TABLE_NAME        = aws_dynamodb_table.user_profiles.name
+      TRACE_ENABLED              = var.trace_enabled
+      PROFILE_SAMPLE_RATE        = var.profile_sample_rate
+      POST_AGGREGATES_TABLE_NAME = aws_dynamodb_table.post_aggregates.name
+      POST_AGGREGATE_MODE        = var.post_aggregate_mode
+      RATE_LIMITS_TABLE_NAME     = aws_dynamodb_table.rate_limits.name
+      HOT_KEY_TABLES             = local.hot_key_tables
     }
   }
 }
@@ -415,9 +643,17 @@ resource "aws_lambda_function" "like_comment" {
 
   environment {
     variables = {
-      COMMENTS_TABLE_NAME = aws_dynamodb_table.post_comments.name
-      LIKES_TABLE_NAME    = aws_dynamodb_table.post_likes.name
-      PROFILES_TABLE_NAME = aws_dynamodb_table.user_profiles.name
+      COMMENTS_TABLE_NAME        = aws_dynamodb_table.post_comments.name
+      LIKES_TABLE_NAME           = aws_dynamodb_table.post_likes.name
+      PROFILES_TABLE_NAME        = aws_dynamodb_table.user_profiles.name
+      SHARED_CACHE_URL           = var.shared_cache_url
+      TRACE_ENABLED              = var.trace_enabled
+      PROFILE_SAMPLE_RATE        = var.profile_sample_rate
+      LIKE_FILTERS_TABLE_NAME    = aws_dynamodb_table.like_filters.name
+      POST_AGGREGATES_TABLE_NAME = aws_dynamodb_table.post_aggregates.name
+      POST_AGGREGATE_MODE        = var.post_aggregate_mode
+      RATE_LIMITS_TABLE_NAME     = aws_dynamodb_table.rate_limits.name
+      HOT_KEY_TABLES             = local.hot_key_tables
     }
   }
 }
@@ -436,6 +672,9 @@ resource "aws_lambda_function" "get_comment_likes" {
     variables = {
       COMMENTS_TABLE_NAME = aws_dynamodb_table.post_comments.name
       LIKES_TABLE_NAME    = aws_dynamodb_table.post_likes.name
+      TRACE_ENABLED       = var.trace_enabled
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
+      HOT_KEY_TABLES      = local.hot_key_tables
     }
   }
 }
@@ -512,6 +751,31 @@ resource "aws_api_gateway_integration" "get_user_posts" {
   uri                     = aws_lambda_function.get_user_posts.invoke_arn
 }
 
+# /posts/search resource
+resource "aws_api_gateway_resource" "posts_search" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_resource.posts.id
+  path_part   = "search"
+}
+
+# GET /posts/search - Full-text search over post content
+resource "aws_api_gateway_method" "search_posts" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.posts_search.id
+  http_method   = "GET"
+  authorization = "COGNITO_USER_POOLS"
+  authorizer_id = aws_api_gateway_authorizer.cognito.id
+}
+
+resource "aws_api_gateway_integration" "search_posts" {
+  rest_api_id             = aws_api_gateway_rest_api.main.id
+  resource_id             = aws_api_gateway_resource.posts_search.id
+  http_method             = aws_api_gateway_method.search_posts.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.search_posts.invoke_arn
+}
+
 # /posts/{post_id} resource
 resource "aws_api_gateway_resource" "post_item" {
   rest_api_id = aws_api_gateway_rest_api.main.id
@@ -519,6 +783,24 @@ resource "aws_api_gateway_resource" "post_item" {
   path_part   = "{post_id}"
 }
 
+# GET /posts/{post_id} - Get a single post (live or archived)
+resource "aws_api_gateway_method" "get_post" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.post_item.id
+  http_method   = "GET"
+  authorization = "COGNITO_USER_POOLS"
+  authorizer_id = aws_api_gateway_authorizer.cognito.id
+}
+
+resource "aws_api_gateway_integration" "get_post" {
+  rest_api_id             = aws_api_gateway_rest_api.main.id
+  resource_id             = aws_api_gateway_resource.post_item.id
+  http_method             = aws_api_gateway_method.get_post.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.get_post.invoke_arn
+}
+
 # PUT /posts/{post_id} - Update post
 resource "aws_api_gateway_method" "update_post" {
   rest_api_id   = aws_api_gateway_rest_api.main.id
@@ -598,7 +880,7 @@ resource "aws_api_gateway_integration_response" "posts_options" {
   status_code = aws_api_gateway_method_response.posts_options.status_code
 
   response_parameters = {
-    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token'"
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,Idempotency-Key'"
     "method.response.header.Access-Control-Allow-Methods" = "'GET,POST,OPTIONS'"
     "method.response.header.Access-Control-Allow-Origin"  = "'*'"
   }
@@ -657,6 +939,57 @@ resource "aws_api_gateway_integration_response" "posts_user_options" {
   depends_on = [aws_api_gateway_integration.posts_user_options]
 }
 
+# CORS OPTIONS for /posts/search
+resource "aws_api_gateway_method" "posts_search_options" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.posts_search.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "posts_search_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.posts_search.id
+  http_method = aws_api_gateway_method.posts_search_options.http_method
+  type        = "MOCK"
+
+  request_templates = {
+    "application/json" = "{\"statusCode\": 200}"
+  }
+}
+
+resource "aws_api_gateway_method_response" "posts_search_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.posts_search.id
+  http_method = aws_api_gateway_method.posts_search_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+
+  response_models = {
+    "application/json" = "Empty"
+  }
+}
+
+resource "aws_api_gateway_integration_response" "posts_search_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.posts_search.id
+  http_method = aws_api_gateway_method.posts_search_options.http_method
+  status_code = aws_api_gateway_method_response.posts_search_options.status_code
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+
+  depends_on = [aws_api_gateway_integration.posts_search_options]
+}
+
 # CORS OPTIONS for /posts/{post_id}
 resource "aws_api_gateway_method" "post_item_options" {
   rest_api_id   = aws_api_gateway_rest_api.main.id
@@ -701,7 +1034,7 @@ resource "aws_api_gateway_integration_response" "post_item_options" {
 
   response_parameters = {
     "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token'"
-    "method.response.header.Access-Control-Allow-Methods" = "'PUT,DELETE,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,PUT,DELETE,OPTIONS'"
     "method.response.header.Access-Control-Allow-Origin"  = "'*'"
   }
 
@@ -1011,7 +1344,7 @@ resource "aws_api_gateway_integration_response" "post_comments_options" {
   http_method = aws_api_gateway_method.post_comments_options.http_method
   status_code = aws_api_gateway_method_response.post_comments_options.status_code
   response_parameters = {
-    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token'"
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,Idempotency-Key'"
     "method.response.header.Access-Control-Allow-Methods" = "'GET,POST,OPTIONS'"
     "method.response.header.Access-Control-Allow-Origin"  = "'*'"
   }
@@ -1200,6 +1533,22 @@ resource "aws_lambda_permission" "delete_post" {
   source_arn    = "${aws_api_gateway_rest_api.main.execution_arn}/*/*"
 }
 
+resource "aws_lambda_permission" "get_post" {
+  statement_id  = "AllowAPIGatewayInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.get_post.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_api_gateway_rest_api.main.execution_arn}/*/*"
+}
+
+resource "aws_lambda_permission" "search_posts" {
+  statement_id  = "AllowAPIGatewayInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.search_posts.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_api_gateway_rest_api.main.execution_arn}/*/*"
+}
+
 resource "aws_lambda_permission" "like_post" {
   statement_id  = "AllowAPIGatewayInvoke"
   action        = "lambda:InvokeFunction"
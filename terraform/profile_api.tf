@@ -58,7 +58,8 @@ resource "aws_iam_role_policy" "lambda_dynamodb_policy" {
           "dynamodb:UpdateItem",
           "dynamodb:DeleteItem",
           "dynamodb:Query",
-          "dynamodb:Scan"
+          "dynamodb:Scan",
+          "dynamodb:BatchGetItem"
         ]
         Resource = aws_dynamodb_table.user_profiles.arn
       }
@@ -99,6 +100,18 @@ data "archive_file" "search_profiles_lambda" {
   output_path = "${path.module}/lambda_search_profiles.zip"
 }
 
+data "archive_file" "get_profiles_lambda" {
+  type        = "zip"
+  source_dir  = "${path.module}/../src/api"
+  output_path = "${path.module}/lambda_get_profiles.zip"
+}
+
+data "archive_file" "get_profile_page_lambda" {
+  type        = "zip"
+  source_dir  = "${path.module}/../src/api"
+  output_path = "${path.module}/lambda_get_profile_page.zip"
+}
+
 resource "aws_lambda_function" "get_profile" {
   filename         = data.archive_file.get_profile_lambda.output_path
   function_name    = "politicnz-get-profile"
@@ -110,7 +123,11 @@ resource "aws_lambda_function" "get_profile" {
 
   environment {
     variables = {
-      TABLE_NAME = aws_dynamodb_table.user_profiles.name
+      TABLE_NAME          = aws_dynamodb_table.user_profiles.name
+      SHARED_CACHE_URL    = var.shared_cache_url
+      TRACE_ENABLED       = var.trace_enabled
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
+      HOT_KEY_TABLES      = local.hot_key_tables
     }
   }
 }
@@ -126,7 +143,12 @@ resource "aws_lambda_function" "create_profile" {
 
   environment {
     variables = {
-      TABLE_NAME = aws_dynamodb_table.user_profiles.name
+      TABLE_NAME               = aws_dynamodb_table.user_profiles.name
+      TRACE_ENABLED            = var.trace_enabled
+      PROFILE_SAMPLE_RATE      = var.profile_sample_rate
+      RATE_LIMITS_TABLE_NAME   = aws_dynamodb_table.rate_limits.name
+      DISPLAY_NAMES_TABLE_NAME = aws_dynamodb_table.display_names.name
+      HOT_KEY_TABLES           = local.hot_key_tables
     }
   }
 }
@@ -142,7 +164,13 @@ resource "aws_lambda_function" "update_profile" {
 
   environment {
     variables = {
-      TABLE_NAME = aws_dynamodb_table.user_profiles.name
+      TABLE_NAME               = aws_dynamodb_table.user_profiles.name
+      SHARED_CACHE_URL         = var.shared_cache_url
+      TRACE_ENABLED            = var.trace_enabled
+      PROFILE_SAMPLE_RATE      = var.profile_sample_rate
+      RATE_LIMITS_TABLE_NAME   = aws_dynamodb_table.rate_limits.name
+      DISPLAY_NAMES_TABLE_NAME = aws_dynamodb_table.display_names.name
+      HOT_KEY_TABLES           = local.hot_key_tables
     }
   }
 }
@@ -158,7 +186,59 @@ resource "aws_lambda_function" "search_profiles" {
 
   environment {
     variables = {
-      TABLE_NAME = aws_dynamodb_table.user_profiles.name
+      TABLE_NAME          = aws_dynamodb_table.user_profiles.name
+      TRACE_ENABLED       = var.trace_enabled
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
+      HOT_KEY_TABLES      = local.hot_key_tables
+    }
+  }
+}
+
+resource "aws_lambda_function" "get_profiles" {
+  filename         = data.archive_file.get_profiles_lambda.output_path
+  function_name    = "politicnz-get-profiles"
+  role            = aws_iam_role.lambda_execution.arn
+  handler         = "profiles/get_profiles.lambda_handler"
+  source_code_hash = data.archive_file.get_profiles_lambda.output_base64sha256
+  runtime         = "python3.12"
+  timeout         = 10
+
+  environment {
+    variables = {
+      TABLE_NAME          = aws_dynamodb_table.user_profiles.name
+      TRACE_ENABLED       = var.trace_enabled
+      PROFILE_SAMPLE_RATE = var.profile_sample_rate
+      HOT_KEY_TABLES      = local.hot_key_tables
+    }
+  }
+}
+
+# Composite profile page: profile, posts and poll votes in one request
+resource "aws_lambda_function" "get_profile_page" {
+  filename         = data.archive_file.get_profile_page_lambda.output_path
+  function_name    = "politicnz-get-profile-page"
+  role            = aws_iam_role.lambda_execution.arn
+  handler         = "profiles/get_profile_page.lambda_handler"
+  source_code_hash = data.archive_file.get_profile_page_lambda.output_base64sha256
+  runtime         = "python3.12"
+  timeout         = 10
+
+  environment {
+    variables = {
+      PROFILES_TABLE_NAME      = aws_dynamodb_table.user_profiles.name
+      POSTS_TABLE_NAME         = aws_dynamodb_table.posts.name
+      LIKES_TABLE_NAME         = aws_dynamodb_table.post_likes.name
+      COMMENTS_TABLE_NAME      = aws_dynamodb_table.post_comments.name
+      LIKE_FILTERS_TABLE_NAME  = aws_dynamodb_table.like_filters.name
+      POLL_VOTES_TABLE_NAME    = aws_dynamodb_table.poll_votes.name
+      ARCHIVE_BUCKET_NAME      = aws_s3_bucket.post_archive.id
+      SHARED_CACHE_URL         = var.shared_cache_url
+      TRACE_ENABLED            = var.trace_enabled
+      PROFILE_SAMPLE_RATE      = var.profile_sample_rate
+      POLLS_TABLE_NAME         = aws_dynamodb_table.polls.name
+      HOT_KEY_TABLES           = local.hot_key_tables
+      LIKE_COUNTERS_TABLE_NAME = aws_dynamodb_table.like_counters.name
+      LIKE_COUNTER_MODE        = var.like_counter_mode
     }
   }
 }
@@ -192,6 +272,25 @@ resource "aws_api_gateway_resource" "profile_search" {
   path_part   = "search"
 }
 
+# /profile/{user_id}/page resource
+resource "aws_api_gateway_resource" "profile_user" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_resource.profile.id
+  path_part   = "{user_id}"
+}
+
+resource "aws_api_gateway_resource" "profile_page" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_resource.profile_user.id
+  path_part   = "page"
+}
+
+resource "aws_api_gateway_resource" "profiles" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_rest_api.main.root_resource_id
+  path_part   = "profiles"
+}
+
 # GET /profile method
 resource "aws_api_gateway_method" "get_profile" {
   rest_api_id   = aws_api_gateway_rest_api.main.id
@@ -317,6 +416,32 @@ resource "aws_api_gateway_deployment" "main" {
       aws_api_gateway_method.profile_search_options.id,
       aws_api_gateway_integration.search_profiles.id,
       aws_api_gateway_integration.profile_search_options.id,
+      aws_api_gateway_resource.profiles.id,
+      aws_api_gateway_method.get_profiles.id,
+      aws_api_gateway_method.profiles_options.id,
+      aws_api_gateway_integration.get_profiles.id,
+      aws_api_gateway_integration.profiles_options.id,
+      aws_api_gateway_resource.profile_user.id,
+      aws_api_gateway_resource.profile_page.id,
+      aws_api_gateway_method.get_profile_page.id,
+      aws_api_gateway_method.profile_page_options.id,
+      aws_api_gateway_integration.get_profile_page.id,
+      aws_api_gateway_integration.profile_page_options.id,
+      aws_api_gateway_resource.poll_timeline.id,
+      aws_api_gateway_method.get_poll_timeline.id,
+      aws_api_gateway_method.poll_timeline_options.id,
+      aws_api_gateway_integration.get_poll_timeline.id,
+      aws_api_gateway_integration.poll_timeline_options.id,
+      aws_api_gateway_resource.poll_reasons.id,
+      aws_api_gateway_method.get_poll_reasons.id,
+      aws_api_gateway_method.poll_reasons_options.id,
+      aws_api_gateway_integration.get_poll_reasons.id,
+      aws_api_gateway_integration.poll_reasons_options.id,
+      aws_api_gateway_resource.profile_name_available.id,
+      aws_api_gateway_method.check_name_available.id,
+      aws_api_gateway_method.profile_name_available_options.id,
+      aws_api_gateway_integration.check_name_available.id,
+      aws_api_gateway_integration.profile_name_available_options.id,
       aws_api_gateway_resource.posts.id,
       aws_api_gateway_method.create_post.id,
       aws_api_gateway_method.get_feed.id,
@@ -342,6 +467,16 @@ resource "aws_api_gateway_deployment" "main" {
     aws_api_gateway_integration.profile_options,
     aws_api_gateway_integration.search_profiles,
     aws_api_gateway_integration.profile_search_options,
+    aws_api_gateway_integration.get_profiles,
+    aws_api_gateway_integration.profiles_options,
+    aws_api_gateway_integration.get_profile_page,
+    aws_api_gateway_integration.profile_page_options,
+    aws_api_gateway_integration.get_poll_timeline,
+    aws_api_gateway_integration.poll_timeline_options,
+    aws_api_gateway_integration.get_poll_reasons,
+    aws_api_gateway_integration.poll_reasons_options,
+    aws_api_gateway_integration.check_name_available,
+    aws_api_gateway_integration.profile_name_available_options,
     aws_api_gateway_integration.create_post,
     aws_api_gateway_integration.get_feed,
     aws_api_gateway_integration.get_user_posts,
@@ -457,3 +592,213 @@ resource "aws_api_gateway_integration_response" "profile_search_options" {
   depends_on = [aws_api_gateway_integration.profile_search_options]
 }
 
+resource "aws_lambda_permission" "get_profiles" {
+  statement_id  = "AllowAPIGatewayInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.get_profiles.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_api_gateway_rest_api.main.execution_arn}/*/*"
+}
+
+# GET /profiles?ids= method - batch profile lookup
+resource "aws_api_gateway_method" "get_profiles" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.profiles.id
+  http_method   = "GET"
+  authorization = "COGNITO_USER_POOLS"
+  authorizer_id = aws_api_gateway_authorizer.cognito.id
+}
+
+resource "aws_api_gateway_integration" "get_profiles" {
+  rest_api_id             = aws_api_gateway_rest_api.main.id
+  resource_id             = aws_api_gateway_resource.profiles.id
+  http_method             = aws_api_gateway_method.get_profiles.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.get_profiles.invoke_arn
+}
+
+# CORS OPTIONS method for /profiles
+resource "aws_api_gateway_method" "profiles_options" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.profiles.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "profiles_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.profiles.id
+  http_method = aws_api_gateway_method.profiles_options.http_method
+  type        = "MOCK"
+
+  request_templates = {
+    "application/json" = "{\"statusCode\": 200}"
+  }
+}
+
+resource "aws_api_gateway_method_response" "profiles_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.profiles.id
+  http_method = aws_api_gateway_method.profiles_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+
+  response_models = {
+    "application/json" = "Empty"
+  }
+}
+
+resource "aws_api_gateway_integration_response" "profiles_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.profiles.id
+  http_method = aws_api_gateway_method.profiles_options.http_method
+  status_code = aws_api_gateway_method_response.profiles_options.status_code
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+
+  depends_on = [aws_api_gateway_integration.profiles_options]
+}
+
+resource "aws_lambda_permission" "get_profile_page" {
+  statement_id  = "AllowAPIGatewayInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.get_profile_page.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_api_gateway_rest_api.main.execution_arn}/*/*"
+}
+
+# GET /profile/{user_id}/page method
+resource "aws_api_gateway_method" "get_profile_page" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.profile_page.id
+  http_method   = "GET"
+  authorization = "COGNITO_USER_POOLS"
+  authorizer_id = aws_api_gateway_authorizer.cognito.id
+}
+
+resource "aws_api_gateway_integration" "get_profile_page" {
+  rest_api_id             = aws_api_gateway_rest_api.main.id
+  resource_id             = aws_api_gateway_resource.profile_page.id
+  http_method             = aws_api_gateway_method.get_profile_page.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.get_profile_page.invoke_arn
+}
+
+# CORS OPTIONS method for /profile/{user_id}/page
+resource "aws_api_gateway_method" "profile_page_options" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.profile_page.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "profile_page_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.profile_page.id
+  http_method = aws_api_gateway_method.profile_page_options.http_method
+  type        = "MOCK"
+
+  request_templates = {
+    "application/json" = "{\"statusCode\": 200}"
+  }
+}
+
+resource "aws_api_gateway_method_response" "profile_page_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.profile_page.id
+  http_method = aws_api_gateway_method.profile_page_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+
+  response_models = {
+    "application/json" = "Empty"
+  }
+}
+
+resource "aws_api_gateway_integration_response" "profile_page_options" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  resource_id = aws_api_gateway_resource.profile_page.id
+  http_method = aws_api_gateway_method.profile_page_options.http_method
+  status_code = aws_api_gateway_method_response.profile_page_options.status_code
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token'"
+    "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+
+  depends_on = [aws_api_gateway_integration.profile_page_options]
+}
+
+
+#####################################################################
+# PROFILE COUNTER RECONCILIATION
+# Scheduled job that recomputes post/like/comment/vote counters on
+# profiles and repairs any drift
+#####################################################################
+
+data "archive_file" "reconcile_profile_counters_lambda" {
+  type        = "zip"
+  source_dir  = "${path.module}/../src/api"
+  output_path = "${path.module}/lambda_reconcile_profile_counters.zip"
+}
+
+resource "aws_lambda_function" "reconcile_profile_counters" {
+  filename         = data.archive_file.reconcile_profile_counters_lambda.output_path
+  function_name    = "politicnz-reconcile-profile-counters"
+  role            = aws_iam_role.lambda_execution.arn
+  handler         = "profiles/reconcile_profile_counters.lambda_handler"
+  source_code_hash = data.archive_file.reconcile_profile_counters_lambda.output_base64sha256
+  runtime         = "python3.12"
+  timeout         = 300
+
+  environment {
+    variables = {
+      PROFILES_TABLE_NAME       = aws_dynamodb_table.user_profiles.name
+      POSTS_TABLE_NAME          = aws_dynamodb_table.posts.name
+      LIKES_TABLE_NAME          = aws_dynamodb_table.post_likes.name
+      COMMENTS_TABLE_NAME       = aws_dynamodb_table.post_comments.name
+      POLL_VOTES_TABLE_NAME     = aws_dynamodb_table.poll_votes.name
+      RECONCILE_SCAN_SEGMENTS   = "4"
+      TRACE_ENABLED             = var.trace_enabled
+      PROFILE_SAMPLE_RATE       = var.profile_sample_rate
+      HOT_KEY_TABLES            = local.hot_key_tables
+      ARCHIVE_TOTALS_TABLE_NAME = aws_dynamodb_table.archive_totals.name
+    }
+  }
+}
+
+resource "aws_cloudwatch_event_rule" "reconcile_profile_counters" {
+  name                = "politicnz-reconcile-profile-counters"
+  description         = "Repair profile activity counters once a day"
+  schedule_expression = "rate(1 day)"
+}
+
+resource "aws_cloudwatch_event_target" "reconcile_profile_counters" {
+  rule = aws_cloudwatch_event_rule.reconcile_profile_counters.name
+  arn  = aws_lambda_function.reconcile_profile_counters.arn
+}
+
+resource "aws_lambda_permission" "reconcile_profile_counters" {
+  statement_id  = "AllowEventBridgeInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.reconcile_profile_counters.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.reconcile_profile_counters.arn
+}
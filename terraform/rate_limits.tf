@@ -0,0 +1,50 @@
+#####################################################################
+# WRITE RATE LIMITS
+# Per-user token buckets that throttle write endpoints before they
+# reach the on-demand tables:
+# - DynamoDB table with TTL expiry
+# - IAM policy for Lambda execution
+#####################################################################
+
+#####################################################################
+# DYNAMODB TABLE FOR RATE LIMIT BUCKETS
+#####################################################################
+
+resource "aws_dynamodb_table" "rate_limits" {
+  name         = "politicnz-rate-limits"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "bucket_key"
+
+  attribute {
+    name = "bucket_key"
+    type = "S"
+  }
+
+  # A bucket expires once it would have refilled, so idle users cost nothing
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+}
+
+#####################################################################
+# IAM POLICY FOR RATE LIMIT TABLE ACCESS
+#####################################################################
+
+resource "aws_iam_role_policy" "lambda_rate_limits_dynamodb_policy" {
+  name = "lambda-rate-limits-dynamodb-policy"
+  role = aws_iam_role.lambda_execution.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:PutItem"
+        ]
+        Resource = aws_dynamodb_table.rate_limits.arn
+      }
+    ]
+  })
+}
@@ -0,0 +1,304 @@
+#####################################################################
+# REALTIME API FEATURE
+# WebSocket push of new posts, likes and comments including:
+# - DynamoDB table for connections and topic subscriptions
+# - IAM policies for Lambda execution
+# - WebSocket API with $connect, $disconnect and subscribe routes
+# - DynamoDB Streams consumer that broadcasts changes
+#####################################################################
+
+#####################################################################
+# DYNAMODB TABLE FOR WEBSOCKET CONNECTIONS
+#####################################################################
+
+# One row per (topic, connection); topic "$connection" holds the connection itself
+resource "aws_dynamodb_table" "websocket_connections" {
+  name         = "politicnz-websocket-connections"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "topic"
+  range_key    = "connection_id"
+
+  attribute {
+    name = "topic"
+    type = "S"
+  }
+
+  attribute {
+    name = "connection_id"
+    type = "S"
+  }
+
+  # Connections missed by $disconnect expire after API Gateway's 2 hour limit
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+}
+
+#####################################################################
+# IAM POLICIES
+#####################################################################
+
+resource "aws_iam_role_policy" "lambda_realtime_policy" {
+  name = "lambda-realtime-policy"
+  role = aws_iam_role.lambda_execution.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:GetItem",
+          "dynamodb:PutItem",
+          "dynamodb:UpdateItem",
+          "dynamodb:DeleteItem",
+          "dynamodb:Query",
+          "dynamodb:BatchWriteItem"
+        ]
+        Resource = aws_dynamodb_table.websocket_connections.arn
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:DescribeStream",
+          "dynamodb:GetRecords",
+          "dynamodb:GetShardIterator",
+          "dynamodb:ListStreams"
+        ]
+        Resource = [
+          aws_dynamodb_table.posts.stream_arn,
+          aws_dynamodb_table.post_likes.stream_arn,
+          aws_dynamodb_table.post_comments.stream_arn
+        ]
+      },
+      {
+        Effect   = "Allow"
+        Action   = "execute-api:ManageConnections"
+        Resource = "${aws_apigatewayv2_api.realtime.execution_arn}/*"
+      }
+    ]
+  })
+}
+
+#####################################################################
+# LAMBDA FUNCTIONS
+#####################################################################
+
+data "archive_file" "ws_connect_lambda" {
+  type        = "zip"
+  source_dir  = "${path.module}/../src/api"
+  output_path = "${path.module}/lambda_ws_connect.zip"
+}
+
+data "archive_file" "ws_disconnect_lambda" {
+  type        = "zip"
+  source_dir  = "${path.module}/../src/api"
+  output_path = "${path.module}/lambda_ws_disconnect.zip"
+}
+
+data "archive_file" "ws_subscribe_lambda" {
+  type        = "zip"
+  source_dir  = "${path.module}/../src/api"
+  output_path = "${path.module}/lambda_ws_subscribe.zip"
+}
+
+data "archive_file" "broadcast_changes_lambda" {
+  type        = "zip"
+  source_dir  = "${path.module}/../src/api"
+  output_path = "${path.module}/lambda_broadcast_changes.zip"
+}
+
+resource "aws_lambda_function" "ws_connect" {
+  filename         = data.archive_file.ws_connect_lambda.output_path
+  function_name    = "politicnz-ws-connect"
+  role            = aws_iam_role.lambda_execution.arn
+  handler         = "realtime/ws_connect.lambda_handler"
+  source_code_hash = data.archive_file.ws_connect_lambda.output_base64sha256
+  runtime         = "python3.12"
+  timeout         = 10
+
+  environment {
+    variables = {
+      CONNECTIONS_TABLE_NAME = aws_dynamodb_table.websocket_connections.name
+      COGNITO_USER_POOL_ID   = aws_cognito_user_pool.main.id
+      COGNITO_CLIENT_ID      = aws_cognito_user_pool_client.main.id
+      TRACE_ENABLED          = var.trace_enabled
+      PROFILE_SAMPLE_RATE    = var.profile_sample_rate
+      HOT_KEY_TABLES         = local.hot_key_tables
+    }
+  }
+}
+
+resource "aws_lambda_function" "ws_disconnect" {
+  filename         = data.archive_file.ws_disconnect_lambda.output_path
+  function_name    = "politicnz-ws-disconnect"
+  role            = aws_iam_role.lambda_execution.arn
+  handler         = "realtime/ws_disconnect.lambda_handler"
+  source_code_hash = data.archive_file.ws_disconnect_lambda.output_base64sha256
+  runtime         = "python3.12"
+  timeout         = 10
+
+  environment {
+    variables = {
+      CONNECTIONS_TABLE_NAME = aws_dynamodb_table.websocket_connections.name
+      TRACE_ENABLED          = var.trace_enabled
+      PROFILE_SAMPLE_RATE    = var.profile_sample_rate
+      HOT_KEY_TABLES         = local.hot_key_tables
+    }
+  }
+}
+
+resource "aws_lambda_function" "ws_subscribe" {
+  filename         = data.archive_file.ws_subscribe_lambda.output_path
+  function_name    = "politicnz-ws-subscribe"
+  role            = aws_iam_role.lambda_execution.arn
+  handler         = "realtime/ws_subscribe.lambda_handler"
+  source_code_hash = data.archive_file.ws_subscribe_lambda.output_base64sha256
+  runtime         = "python3.12"
+  timeout         = 10
+
+  environment {
+    variables = {
+      CONNECTIONS_TABLE_NAME = aws_dynamodb_table.websocket_connections.name
+      TRACE_ENABLED          = var.trace_enabled
+      PROFILE_SAMPLE_RATE    = var.profile_sample_rate
+      HOT_KEY_TABLES         = local.hot_key_tables
+    }
+  }
+}
+
+resource "aws_lambda_function" "broadcast_changes" {
+  filename         = data.archive_file.broadcast_changes_lambda.output_path
+  function_name    = "politicnz-broadcast-changes"
+  role            = aws_iam_role.lambda_execution.arn
+  handler         = "realtime/broadcast_changes.lambda_handler"
+  source_code_hash = data.archive_file.broadcast_changes_lambda.output_base64sha256
+  runtime         = "python3.12"
+  timeout         = 30
+
+  environment {
+    variables = {
+      CONNECTIONS_TABLE_NAME = aws_dynamodb_table.websocket_connections.name
+      POSTS_TABLE_NAME       = aws_dynamodb_table.posts.name
+      LIKES_TABLE_NAME       = aws_dynamodb_table.post_likes.name
+      COMMENTS_TABLE_NAME    = aws_dynamodb_table.post_comments.name
+      WEBSOCKET_ENDPOINT     = "https://${aws_apigatewayv2_api.realtime.id}.execute-api.${var.aws_region}.amazonaws.com/${aws_apigatewayv2_stage.realtime.name}"
+      TRACE_ENABLED          = var.trace_enabled
+      PROFILE_SAMPLE_RATE    = var.profile_sample_rate
+      HOT_KEY_TABLES         = local.hot_key_tables
+    }
+  }
+}
+
+#####################################################################
+# CHANGE STREAM SUBSCRIPTIONS
+#####################################################################
+
+# Batching window lets one invocation (and one message per connection) cover a burst of changes.
+# A failed batch is retried a few times, then skipped - realtime events are stale after a few minutes
+resource "aws_lambda_event_source_mapping" "broadcast_posts" {
+  event_source_arn                   = aws_dynamodb_table.posts.stream_arn
+  function_name                      = aws_lambda_function.broadcast_changes.arn
+  starting_position                  = "LATEST"
+  batch_size                         = 100
+  maximum_batching_window_in_seconds = 1
+  maximum_retry_attempts             = 3
+  maximum_record_age_in_seconds      = 300
+}
+
+resource "aws_lambda_event_source_mapping" "broadcast_likes" {
+  event_source_arn                   = aws_dynamodb_table.post_likes.stream_arn
+  function_name                      = aws_lambda_function.broadcast_changes.arn
+  starting_position                  = "LATEST"
+  batch_size                         = 100
+  maximum_batching_window_in_seconds = 1
+  maximum_retry_attempts             = 3
+  maximum_record_age_in_seconds      = 300
+}
+
+resource "aws_lambda_event_source_mapping" "broadcast_comments" {
+  event_source_arn                   = aws_dynamodb_table.post_comments.stream_arn
+  function_name                      = aws_lambda_function.broadcast_changes.arn
+  starting_position                  = "LATEST"
+  batch_size                         = 100
+  maximum_batching_window_in_seconds = 1
+  maximum_retry_attempts             = 3
+  maximum_record_age_in_seconds      = 300
+}
+
+#####################################################################
+# WEBSOCKET API
+#####################################################################
+
+resource "aws_apigatewayv2_api" "realtime" {
+  name                       = "politicnz-realtime"
+  protocol_type              = "WEBSOCKET"
+  route_selection_expression = "$request.body.action"
+}
+
+resource "aws_apigatewayv2_integration" "ws_connect" {
+  api_id           = aws_apigatewayv2_api.realtime.id
+  integration_type = "AWS_PROXY"
+  integration_uri  = aws_lambda_function.ws_connect.invoke_arn
+}
+
+resource "aws_apigatewayv2_integration" "ws_disconnect" {
+  api_id           = aws_apigatewayv2_api.realtime.id
+  integration_type = "AWS_PROXY"
+  integration_uri  = aws_lambda_function.ws_disconnect.invoke_arn
+}
+
+resource "aws_apigatewayv2_integration" "ws_subscribe" {
+  api_id           = aws_apigatewayv2_api.realtime.id
+  integration_type = "AWS_PROXY"
+  integration_uri  = aws_lambda_function.ws_subscribe.invoke_arn
+}
+
+resource "aws_apigatewayv2_route" "ws_connect" {
+  api_id    = aws_apigatewayv2_api.realtime.id
+  route_key = "$connect"
+  target    = "integrations/${aws_apigatewayv2_integration.ws_connect.id}"
+}
+
+resource "aws_apigatewayv2_route" "ws_disconnect" {
+  api_id    = aws_apigatewayv2_api.realtime.id
+  route_key = "$disconnect"
+  target    = "integrations/${aws_apigatewayv2_integration.ws_disconnect.id}"
+}
+
+resource "aws_apigatewayv2_route" "ws_subscribe" {
+  api_id    = aws_apigatewayv2_api.realtime.id
+  route_key = "subscribe"
+  target    = "integrations/${aws_apigatewayv2_integration.ws_subscribe.id}"
+}
+
+resource "aws_apigatewayv2_stage" "realtime" {
+  api_id      = aws_apigatewayv2_api.realtime.id
+  name        = var.environment
+  auto_deploy = true
+}
+
+resource "aws_lambda_permission" "ws_connect" {
+  statement_id  = "AllowAPIGatewayInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.ws_connect.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_apigatewayv2_api.realtime.execution_arn}/*/*"
+}
+
+resource "aws_lambda_permission" "ws_disconnect" {
+  statement_id  = "AllowAPIGatewayInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.ws_disconnect.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_apigatewayv2_api.realtime.execution_arn}/*/*"
+}
+
+resource "aws_lambda_permission" "ws_subscribe" {
+  statement_id  = "AllowAPIGatewayInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.ws_subscribe.function_name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_apigatewayv2_api.realtime.execution_arn}/*/*"
+}
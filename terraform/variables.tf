@@ -36,3 +36,61 @@ variable "environment" {
   default     = "sandbox"
 }
 
+
+variable "shared_cache_url" {
+  description = "Optional shared cache for hot posts/profiles (redis://host:port/db or memcache://host:port). Empty disables it"
+  type        = string
+  default     = ""
+}
+
+variable "archive_after_days" {
+  description = "Posts older than this many days are moved to the S3 archive"
+  type        = number
+  default     = 365
+}
+
+variable "archive_tombstone_ttl_days" {
+  description = "Days an archived post's tombstone stays in DynamoDB before it expires"
+  type        = number
+  default     = 90
+}
+
+variable "trace_enabled" {
+  description = "Log a per-request phase timing breakdown from every Lambda handler"
+  type        = bool
+  default     = false
+}
+
+variable "profile_sample_rate" {
+  description = "Fraction of Lambda invocations (0-1) to run under cProfile; slow ones log their top functions"
+  type        = number
+  default     = 0
+}
+
+variable "hot_key_tracking" {
+  description = "Log the hottest partition keys of the posts, likes, comments, profiles and like counter tables as CloudWatch metrics"
+  type        = bool
+  default     = true
+}
+
+variable "post_aggregate_mode" {
+  description = "Single-table post aggregate migration phase: off, dual_write (write both layouts) or read (serve post detail from the aggregate)"
+  type        = string
+  default     = "dual_write"
+
+  validation {
+    condition     = contains(["off", "dual_write", "read"], var.post_aggregate_mode)
+    error_message = "post_aggregate_mode must be off, dual_write or read."
+  }
+}
+
+variable "like_counter_mode" {
+  description = "Sharded like counter migration phase: off, write (maintain the counters) or read (serve like counts from them)"
+  type        = string
+  default     = "write"
+
+  validation {
+    condition     = contains(["off", "write", "read"], var.like_counter_mode)
+    error_message = "like_counter_mode must be off, write or read."
+  }
+}
@@ -0,0 +1,12 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'api'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+# Handler modules resolve their tables at import time; the tests swap in fakes
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-southeast-2')
+for name in ('POSTS_TABLE_NAME', 'COMMENTS_TABLE_NAME', 'LIKES_TABLE_NAME', 'SEARCH_INDEX_TABLE_NAME',
+             'POST_AGGREGATES_TABLE_NAME', 'DELETIONS_TABLE_NAME', 'ARCHIVE_TOTALS_TABLE_NAME',
+             'LIKE_FILTERS_TABLE_NAME'):
+    os.environ.setdefault(name, name.lower())
@@ -0,0 +1,142 @@
+"""
+In-memory stand-ins for the DynamoDB Table calls the handlers make.
+
+FakeTable understands the subset of expression syntax this code base uses:
+conditions joined by AND/OR (no parentheses) over attribute_exists,
+attribute_not_exists, contains, NOT and `=`/`<`/`>` comparisons, and updates
+made of SET (`a = :v`, `a = a + :v`), ADD, REMOVE and DELETE clauses.
+"""
+import re
+from botocore.exceptions import ClientError
+
+
+def conditional_check_failed():
+    return ClientError({'Error': {'Code': 'ConditionalCheckFailedException', 'Message': ''}}, 'FakeTable')
+
+
+class FakeTable:
+    def __init__(self, name, *key_names):
+        self.name = name
+        self.key_names = key_names
+        self.items = {}
+
+    def _key(self, item):
+        return tuple(item[name] for name in self.key_names)
+
+    #####################################################################
+    # EXPRESSIONS
+    #####################################################################
+
+    def _value(self, token, item, names, values):
+        if token.startswith(':'):
+            return values[token]
+        return item.get(names.get(token, token))
+
+    def _check(self, clause, item, names, values):
+        clause = clause.strip()
+        if clause.startswith('NOT '):
+            return not self._check(clause[4:], item, names, values)
+        match = re.fullmatch(r'(attribute_exists|attribute_not_exists)\((\S+)\)', clause)
+        if match:
+            exists = names.get(match.group(2), match.group(2)) in item
+            return exists if match.group(1) == 'attribute_exists' else not exists
+        match = re.fullmatch(r'contains\((\S+),\s*(\S+)\)', clause)
+        if match:
+            container = self._value(match.group(1), item, names, values)
+            return container is not None and self._value(match.group(2), item, names, values) in container
+        left, operator, right = re.fullmatch(r'(\S+)\s*(=|<|>)\s*(\S+)', clause).groups()
+        left, right = self._value(left, item, names, values), self._value(right, item, names, values)
+        if left is None or right is None:
+            return False
+        return {'=': left == right, '<': left < right, '>': left > right}[operator]
+
+    def _matches(self, condition, item, names, values):
+        if not condition:
+            return True
+        return any(all(self._check(clause, item, names, values) for clause in alternative.split(' AND '))
+                   for alternative in condition.split(' OR '))
+
+    def _apply_update(self, item, expression, names, values):
+        for action, body in re.findall(r'(SET|ADD|REMOVE|DELETE)\s+(.*?)(?=\s+(?:SET|ADD|REMOVE|DELETE)\s|$)',
+                                       expression):
+            for part in (part.strip() for part in body.split(',')):
+                if action == 'SET':
+                    target, source = (side.strip() for side in part.split('=', 1))
+                    target = names.get(target, target)
+                    if '+' in source:
+                        base, delta = (side.strip() for side in source.split('+'))
+                        item[target] = self._value(base, item, names, values) + values[delta]
+                    else:
+                        item[target] = self._value(source, item, names, values)
+                elif action == 'REMOVE':
+                    item.pop(names.get(part, part), None)
+                else:
+                    target, placeholder = part.split()
+                    target = names.get(target, target)
+                    if action == 'ADD' and isinstance(values[placeholder], set):
+                        item[target] = item.get(target, set()) | values[placeholder]
+                    elif action == 'ADD':
+                        item[target] = item.get(target, 0) + values[placeholder]
+                    else:
+                        item[target] = item.get(target, set()) - values[placeholder]
+                        if not item[target]:
+                            del item[target]
+
+    #####################################################################
+    # TABLE API
+    #####################################################################
+
+    def get_item(self, Key, **kwargs):
+        item = self.items.get(self._key(Key))
+        return {'Item': dict(item)} if item is not None else {}
+
+    def put_item(self, Item, ConditionExpression=None, ExpressionAttributeNames=None,
+                 ExpressionAttributeValues=None):
+        current = self.items.get(self._key(Item), {})
+        if not self._matches(ConditionExpression, current, ExpressionAttributeNames or {},
+                             ExpressionAttributeValues or {}):
+            raise conditional_check_failed()
+        self.items[self._key(Item)] = dict(Item)
+
+    def update_item(self, Key, UpdateExpression, ConditionExpression=None, ExpressionAttributeNames=None,
+                    ExpressionAttributeValues=None, **kwargs):
+        names, values = ExpressionAttributeNames or {}, ExpressionAttributeValues or {}
+        item = dict(self.items.get(self._key(Key), Key))
+        if not self._matches(ConditionExpression, self.items.get(self._key(Key), {}), names, values):
+            raise conditional_check_failed()
+        self._apply_update(item, UpdateExpression, names, values)
+        self.items[self._key(Key)] = item
+
+    def delete_item(self, Key):
+        self.items.pop(self._key(Key), None)
+
+    def query(self, KeyConditionExpression, ExpressionAttributeValues, **kwargs):
+        # Partition key equality only, which is all the archive job asks for
+        name, placeholder = (side.strip() for side in KeyConditionExpression.split('='))
+        value = ExpressionAttributeValues[placeholder]
+        return {'Items': [dict(item) for item in self.items.values() if item.get(name) == value]}
+
+    def batch_writer(self):
+        return FakeBatchWriter(self)
+
+
+class FakeBatchWriter:
+    def __init__(self, table):
+        self._table = table
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def put_item(self, Item):
+        self._table.put_item(Item=Item)
+
+    def delete_item(self, Key):
+        self._table.delete_item(Key=Key)
+
+
+def fake_batch_get_items(table, keys, projection_expression=None, **kwargs):
+    # Same contract as utils.helpers.batch_get_items: found items only, any order
+    return [dict(table.items[table._key(key)]) for key in keys if table._key(key) in table.items]
@@ -0,0 +1,146 @@
+"""
+The archive job's pending -> tombstone -> final sequence (posts/archive_posts.py),
+run against LocalArchiveStore and in-memory tables.
+"""
+import pytest
+
+from fakes import FakeTable, fake_batch_get_items
+from posts import archive_posts
+from utils import archive_store
+from utils.archive_store import LocalArchiveStore, load_archived_record, read_segment
+
+USER_ID = 'author'
+TOMBSTONE_EXPIRES_AT = 1999999999
+
+
+@pytest.fixture
+def tables(monkeypatch):
+    tables = {
+        'posts_table': FakeTable('posts', 'post_id'),
+        'comments_table': FakeTable('comments', 'post_id', 'comment_id'),
+        'likes_table': FakeTable('likes', 'target_id', 'user_id'),
+        'search_index_table': FakeTable('search_index', 'term', 'sort_key'),
+        'deletions_table': FakeTable('deletions', 'post_id'),
+        'archive_totals_table': FakeTable('archive_totals', 'user_id')
+    }
+    for name, table in tables.items():
+        monkeypatch.setattr(archive_posts, name, table)
+    monkeypatch.setattr(archive_posts, 'batch_get_items', fake_batch_get_items)
+    archive_store._segment_cache.clear()
+    return tables
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalArchiveStore(str(tmp_path))
+
+
+def add_post(tables, post_id, created_at, likers=(), commenters=()):
+    post = {'post_id': post_id, 'user_id': USER_ID, 'created_at': created_at,
+            'updated_at': created_at, 'content': f'post {post_id}'}
+    tables['posts_table'].put_item(Item=post)
+    for liker in likers:
+        tables['likes_table'].put_item(Item={'target_id': post_id, 'user_id': liker, 'target_type': 'post'})
+    for index, commenter in enumerate(commenters):
+        tables['comments_table'].put_item(Item={'post_id': post_id, 'comment_id': f'{post_id}-c{index}',
+                                                'user_id': commenter, 'created_at': created_at})
+    return dict(post)
+
+
+def archived_records(store, key):
+    archive_store._segment_cache.clear()
+    return {record['post']['post_id']: record for record in read_segment(store, key)}
+
+
+def test_archives_tombstoned_posts_with_children_created_mid_run(tables, store, monkeypatch):
+    first = add_post(tables, 'p1', '2020-01-01T00:00:00', likers=['a'], commenters=['b'])
+    edited = add_post(tables, 'p2', '2020-01-02T00:00:00', likers=['a'])
+
+    write_tombstone = archive_posts.write_tombstone
+
+    def racing_write_tombstone(post, archive_key, expires_at):
+        # A like lands after the first read; the second post is edited before its tombstone
+        if post['post_id'] == 'p1':
+            tables['likes_table'].put_item(Item={'target_id': 'p1', 'user_id': 'late', 'target_type': 'post'})
+        else:
+            tables['posts_table'].items[('p2',)]['updated_at'] = '2021-01-01T00:00:00'
+        return write_tombstone(post, archive_key, expires_at)
+
+    monkeypatch.setattr(archive_posts, 'write_tombstone', racing_write_tombstone)
+
+    assert archive_posts.archive_user_posts(store, USER_ID, [first, edited], 'run1', TOMBSTONE_EXPIRES_AT) == 1
+
+    assert store.list('pending/') == []
+    [key] = store.list('posts/')
+    records = archived_records(store, key)
+    assert list(records) == ['p1']
+    assert sorted(like['user_id'] for like in records['p1']['likes']) == ['a', 'late']
+    assert [comment['user_id'] for comment in records['p1']['comments']] == ['b']
+
+    tombstone = tables['posts_table'].items[('p1',)]
+    assert tombstone['archived'] and tombstone['archive_key'] == key
+    assert not tables['posts_table'].items[('p2',)].get('archived')
+    # Nothing of the archived post is left behind in the hot tables
+    assert [like for like in tables['likes_table'].items.values() if like['target_id'] == 'p1'] == []
+    assert [c for c in tables['comments_table'].items.values() if c['post_id'] == 'p1'] == []
+
+    totals = tables['archive_totals_table'].items
+    assert totals[(USER_ID,)]['post_count'] == 1 and totals[(USER_ID,)]['likes_received'] == 2
+    assert totals[('b',)]['comment_count'] == 1
+    assert 'counted_segments' not in totals[(USER_ID,)]
+
+
+def test_run_interrupted_after_tombstone_is_finished_by_the_next_run(tables, store, monkeypatch):
+    post = add_post(tables, 'p1', '2020-01-01T00:00:00', likers=['a'])
+
+    finish_archived = archive_posts.finish_archived
+
+    def crash(*args):
+        raise RuntimeError('invocation timed out')
+
+    monkeypatch.setattr(archive_posts, 'finish_archived', crash)
+    with pytest.raises(RuntimeError):
+        archive_posts.archive_user_posts(store, USER_ID, [post], 'run1', TOMBSTONE_EXPIRES_AT)
+    monkeypatch.setattr(archive_posts, 'finish_archived', finish_archived)
+
+    # Tombstoned but not finished: reads fall back to the pending segment
+    assert store.list('posts/') == []
+    [pending_key] = store.list('pending/')
+    key = tables['posts_table'].items[('p1',)]['archive_key']
+    assert pending_key == f'pending/{key}'
+    assert load_archived_record(store, key, 'p1')['post']['post_id'] == 'p1'
+
+    # A like that raced the crashed run is still in the hot table
+    tables['likes_table'].put_item(Item={'target_id': 'p1', 'user_id': 'late', 'target_type': 'post'})
+
+    assert archive_posts.finish_pending_segments(store) == 1
+    assert store.list('pending/') == []
+    assert store.list('posts/') == [key]
+    records = archived_records(store, key)
+    assert sorted(like['user_id'] for like in records['p1']['likes']) == ['a', 'late']
+    assert tables['likes_table'].items == {}
+    assert tables['archive_totals_table'].items[(USER_ID,)]['likes_received'] == 2
+
+
+def test_retried_finish_counts_a_segment_once(tables, store, monkeypatch):
+    post = add_post(tables, 'p1', '2020-01-01T00:00:00', likers=['a'], commenters=['b'])
+    delete = store.delete
+
+    def crash_on_delete(key):
+        raise RuntimeError('invocation timed out')
+
+    # Crash after the final segment and totals are written, before the pending copy goes
+    monkeypatch.setattr(store, 'delete', crash_on_delete)
+    with pytest.raises(RuntimeError):
+        archive_posts.archive_user_posts(store, USER_ID, [post], 'run1', TOMBSTONE_EXPIRES_AT)
+    monkeypatch.setattr(store, 'delete', delete)
+
+    [key] = store.list('posts/')
+    assert archive_posts.finish_pending_segments(store) == 1
+    assert archive_posts.finish_pending_segments(store) == 0
+
+    assert list(archived_records(store, key)) == ['p1']
+    totals = tables['archive_totals_table'].items
+    assert totals[(USER_ID,)]['post_count'] == 1 and totals[(USER_ID,)]['likes_received'] == 1
+    assert totals[('b',)]['comment_count'] == 1
+    assert 'counted_segments' not in totals[(USER_ID,)]
@@ -0,0 +1,77 @@
+"""
+Likes landing while rebuild_like_filters runs (utils/like_filter.py): the rebuild
+must never install a filter that misses a like made after its snapshot.
+"""
+import pytest
+
+from fakes import FakeTable, fake_batch_get_items
+from utils import like_filter
+from utils.like_filter import add_liked_target, liked_target_ids, load_like_filter, save_rebuilt_filter
+
+USER_ID = 'liker'
+
+
+@pytest.fixture
+def filters_table():
+    return FakeTable('like_filters', 'user_id')
+
+
+@pytest.fixture
+def likes_table(monkeypatch):
+    monkeypatch.setattr(like_filter, 'batch_get_items', fake_batch_get_items)
+    return FakeTable('likes', 'target_id', 'user_id')
+
+
+def like(filters_table, likes_table, target_id):
+    # like_post's order: the filter first, then the like itself
+    add_liked_target(filters_table, USER_ID, target_id)
+    likes_table.put_item(Item={'target_id': target_id, 'user_id': USER_ID})
+
+
+def snapshot_version(filters_table):
+    return filters_table.get_item(Key={'user_id': USER_ID})['Item']['filter_version']
+
+
+def test_like_with_new_bits_during_rebuild_is_kept(filters_table, likes_table):
+    save_rebuilt_filter(filters_table, USER_ID, [], None)
+
+    snapshot = snapshot_version(filters_table)
+    scanned = []  # the rebuild's scan ran before the like
+    like(filters_table, likes_table, 'post-1')
+
+    assert not save_rebuilt_filter(filters_table, USER_ID, scanned, snapshot)
+    assert liked_target_ids(filters_table, likes_table, USER_ID, ['post-1']) == {'post-1'}
+
+
+def test_relike_whose_bits_are_already_set_during_rebuild_is_kept(filters_table, likes_table):
+    # post-1 was liked and then unliked: its bits stay set in the filter
+    save_rebuilt_filter(filters_table, USER_ID, ['post-1'], None)
+    assert 'post-1' in load_like_filter(filters_table, USER_ID)
+
+    snapshot = snapshot_version(filters_table)
+    scanned = []  # the scan saw the unlike
+    like(filters_table, likes_table, 'post-1')
+
+    assert snapshot_version(filters_table) == snapshot + 1
+    assert not save_rebuilt_filter(filters_table, USER_ID, scanned, snapshot)
+    assert 'post-1' in load_like_filter(filters_table, USER_ID)
+    assert liked_target_ids(filters_table, likes_table, USER_ID, ['post-1']) == {'post-1'}
+
+
+def test_rebuild_without_racing_likes_clears_unliked_targets(filters_table, likes_table):
+    save_rebuilt_filter(filters_table, USER_ID, ['post-1', 'post-2'], None)
+    likes_table.put_item(Item={'target_id': 'post-2', 'user_id': USER_ID})
+
+    assert save_rebuilt_filter(filters_table, USER_ID, ['post-2'], snapshot_version(filters_table))
+    assert 'post-1' not in load_like_filter(filters_table, USER_ID)
+    assert liked_target_ids(filters_table, likes_table, USER_ID, ['post-1', 'post-2']) == {'post-2'}
+
+
+def test_like_without_a_filter_still_fails_a_rebuild_in_flight(filters_table, likes_table):
+    like(filters_table, likes_table, 'post-1')  # no filter yet: only the version moves
+    snapshot = snapshot_version(filters_table)
+    scanned = []
+    like(filters_table, likes_table, 'post-2')
+
+    assert not save_rebuilt_filter(filters_table, USER_ID, scanned, snapshot)
+    assert liked_target_ids(filters_table, likes_table, USER_ID, ['post-1', 'post-2']) == {'post-1', 'post-2'}